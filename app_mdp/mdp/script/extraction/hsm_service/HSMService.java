@@ -1,7 +1,13 @@
 //package com.kasikornbank.dih.hsm;
 
+import java.io.BufferedReader;
+import java.io.BufferedWriter;
+import java.io.DataInputStream;
 import java.io.IOException;
 import java.io.InputStream;
+import java.io.InputStreamReader;
+import java.io.OutputStreamWriter;
+import java.io.Writer;
 import java.net.Socket;
 import java.net.SocketTimeoutException;
 import java.net.UnknownHostException;
@@ -37,6 +43,7 @@ public class HSMService {
     private final int port;
     private int timeout = 10000;
     private int bufferSize = 1024;
+    private Socket session;
 
     /**
      * Construct an instance to hold specified HSM properties
@@ -194,6 +201,131 @@ public class HSMService {
         }
     }
 
+    /**
+     * Decrypt a key on a connection to HSM server kept open across calls, instead of a
+     * connection per key. The reply is read by the length in its header, so replies are
+     * not mixed up on the shared connection. The connection is reopened once if it
+     * fails, e.g. when closed by HSM server while idle.
+     *
+     * @param hexData a key to decrypt in hexadecimal format
+     * @return the decrypted key in hexadecimal format, or <code>null</code> if got
+     * invalid reply from HSM server
+     * @throws UnknownHostException   if the IP address of the host could not be determined.
+     * @throws IOException            if an I/O error occurs on the reopened connection.
+     * @throws SocketTimeoutException if cannot get reply from HSM before timeout
+     */
+    public String decryptToHexOnSession(String hexData) throws UnknownHostException, IOException {
+        if (hexData == null) {
+            throw new NullPointerException();
+        }
+        String len = String.format("%02x", hexData.length() / 2).toUpperCase(Locale.ENGLISH);
+        byte[] req = Util.hexToBytes(header + decAesFn + fm + dpk + cm + icv + len + hexData);
+        try {
+            return exchangeOnSession(req);
+        } catch (IOException e) {
+            closeSession();
+            return exchangeOnSession(req);
+        }
+    }
+
+    private String exchangeOnSession(byte[] request) throws IOException {
+        if (session == null) {
+            session = new Socket(host, port);
+            session.setSoTimeout(timeout);
+        }
+        try {
+            session.getOutputStream().write(request);
+            DataInputStream is = new DataInputStream(session.getInputStream());
+            // The 6 byte header ends with the length of the rest of the message
+            byte[] replyHeader = new byte[6];
+            is.readFully(replyHeader);
+            int bodyLen = ((replyHeader[4] & 0xFF) << 8) | (replyHeader[5] & 0xFF);
+            byte[] b = Arrays.copyOf(replyHeader, replyHeader.length + bodyLen);
+            is.readFully(b, replyHeader.length, bodyLen);
+            if (b.length >= 27) {
+                int dataLen = b[26];
+                return Util.bytesToHex(Arrays.copyOfRange(b, 27, 27 + dataLen));
+            }
+            return null;
+        } catch (IOException e) {
+            // A reply may still be pending on the connection, it cannot be reused
+            closeSession();
+            throw e;
+        }
+    }
+
+    /**
+     * Close the connection kept open by <code>decryptToHexOnSession</code>, if any
+     */
+    public void closeSession() {
+        if (session != null) {
+            try {
+                session.close();
+            } catch (IOException e) {
+                // The connection is dropped either way
+            }
+            session = null;
+        }
+    }
+
+    /**
+     * Decrypt keys read from standard input on one connection to HSM server, for a
+     * caller to decrypt many keys without starting a JVM per key.
+     *
+     * <p>
+     * Writes <code>READY</code> once started, then reads one request per line,
+     * <code>id TAB encrypted key</code>, and writes one reply per request in the same
+     * order, <code>id TAB OK TAB key TAB micros</code> or
+     * <code>id TAB ERR TAB message TAB micros</code>, where micros is the time taken by
+     * HSM. Requests may be written before the previous replies are read, replies are
+     * flushed once no request is waiting. Stops at the end of standard input or an
+     * empty line.
+     *
+     * @param host the host name address of HSM server
+     * @param port the port number
+     * @param dpk  the key specifier for DPK
+     * @throws IOException if standard input or output fails
+     */
+    public static void serve(String host, int port, String dpk) throws IOException {
+        HSMService service = new HSMService(host, port, dpk);
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.US_ASCII));
+        Writer out = new BufferedWriter(new OutputStreamWriter(System.out, StandardCharsets.US_ASCII));
+        out.write("READY\n");
+        out.flush();
+        try {
+            String line;
+            while ((line = in.readLine()) != null && !line.isEmpty()) {
+                String[] request = line.split("\t", 2);
+                long start = System.nanoTime();
+                String status = "ERR";
+                String result;
+                if (request.length < 2) {
+                    result = "Malformed request";
+                } else {
+                    try {
+                        result = service.decryptToHexOnSession(request[1]);
+                        if (result == null) {
+                            result = "Invalid reply from HSM server";
+                        } else {
+                            status = "OK";
+                        }
+                    } catch (IOException | RuntimeException e) {
+                        result = e.getClass().getSimpleName() + ": " + e.getMessage();
+                    }
+                }
+                long elapsedMicros = (System.nanoTime() - start) / 1000;
+                out.write(request[0] + "\t" + status + "\t" + result.replaceAll("\\s+", " ") + "\t"
+                        + elapsedMicros + "\n");
+                if (!in.ready()) {
+                    out.flush();
+                }
+            }
+        } finally {
+            out.flush();
+            service.closeSession();
+        }
+    }
+
     public int getTimeout() {
         return timeout;
     }
@@ -220,6 +352,12 @@ public class HSMService {
 
     public static void main(String[] args) throws UnknownHostException, IOException, InvalidKeyException, BadPaddingException, IllegalBlockSizeException
     {
+        // Decrypt keys from standard input: --serve host port dpk
+        if (args.length == 4 && "--serve".equals(args[0])) {
+            serve(args[1], Integer.parseInt(args[2]), args[3]);
+            return;
+        }
+
         // Check if the required argument is provided
         if (args.length < 4) {
             System.out.println("Please provide the encrypted message as an argument.");
@@ -4,8 +4,10 @@
 import argparse
 import json
 import logging
+import os
 import sys
 from datetime import datetime
+from pathlib import Path
 
 # import: internal
 from mdp.framework.mdp_extraction_framework.config_validator.config_mapping import ConfigMapping
@@ -23,9 +25,37 @@ from mdp.framework.mdp_extraction_framework.pipeline.extraction import (
     ExtractionPipelineExecutedValues,
 )
 from mdp.framework.mdp_extraction_framework.utility.common.job_log import JobStatus
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    METRICS_TEXTFILE_DIR_ENV,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    OPERATION_ATTEMPTS,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import OPERATION_RETRIES
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    get_connection_name,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    render_run_metrics,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    write_metrics_textfile,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.task_metrics import TASK_METRICS_HEADER
+from mdp.framework.mdp_extraction_framework.utility.common.task_metrics import (
+    write_task_metrics_file,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import TRACE_FILE_EXTENSION
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import TRACER
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import SpanKind
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import trace_span
 from mdp.framework.mdp_extraction_framework.utility.common_function import get_class_object
+from mdp.framework.mdp_extraction_framework.utility.common_function import get_log_filename
 from mdp.framework.mdp_extraction_framework.utility.common_function import setup_logger
 from mdp.framework.mdp_extraction_framework.utility.file_reader.config_reader import JSONReader
+from mdp.framework.mdp_extraction_framework.utility.file_reader.template_service import (
+    invalidate_env_settings,
+)
 
 # import: external
 from dotenv import load_dotenv
@@ -59,6 +89,27 @@ def entrypoint(argv: list = sys.argv[1:]):
     parser.add_argument(
         "--verbose", action="store_true", help="Enable verbose output", required=False
     )
+    parser.add_argument(
+        "--profile",
+        help="Write one profile per task next to the run log. 'sampling' (default when the flag is given without a value) is a low-overhead stack sampler safe for production, 'cprofile' is a deterministic profiler.",
+        nargs="?",
+        const="sampling",
+        choices=["sampling", "cprofile"],
+        required=False,
+    )
+    parser.add_argument(
+        "--trace",
+        help="Record job, task, operation and subprocess spans and write them next to the run log. 'jsonl' (default when the flag is given without a value) writes one span per line, 'chrome' writes the Chrome trace event format viewable in Perfetto.",
+        nargs="?",
+        const="jsonl",
+        choices=["jsonl", "chrome"],
+        required=False,
+    )
+    parser.add_argument(
+        "--metrics_textfile_dir",
+        help=f"Directory to write the OpenMetrics textfile of the run for the node_exporter textfile collector. Defaults to the {METRICS_TEXTFILE_DIR_ENV} environment variable, the textfile is not written if neither is set.",
+        required=False,
+    )
 
     system_arguments = parser.parse_args(argv)
 
@@ -77,6 +128,7 @@ def entrypoint(argv: list = sys.argv[1:]):
 
     load_dotenv(f"/{root_path}/{project}/script/extraction/.env", override=True)
     load_dotenv(f"/{root_path}/{project}/script/extraction/.env.secret", override=True)
+    invalidate_env_settings()
 
     # Validate CLI arguments
     job_param = JobParameters(**vars(system_arguments))
@@ -118,19 +170,32 @@ def entrypoint(argv: list = sys.argv[1:]):
     error: Exception = None
     job_start_datetime = datetime.now()
     executed_values = ExtractionPipelineExecutedValues()
+    pipeline = None
     job_status = None
     job_message = None
+    if system_arguments.trace:
+        TRACER.start()
 
     try:
         # Execution pipeline
-        pipeline = pipeline_cls(job_parameters=job_param, config=config)
-        executed_values = pipeline.execute()
+        with trace_span(
+            job_param.job_name,
+            SpanKind.JOB.value,
+            pos_dt=job_param.pos_dt,
+            area_name=job_param.area_name,
+            scheduler_id=job_param.scheduler_id,
+        ):
+            pipeline = pipeline_cls(job_parameters=job_param, config=config)
+            executed_values = pipeline.execute()
         job_status = JobStatus.SUCCESS.value
     except Exception as e:
         error = e
         logger.exception(error)
         job_status = JobStatus.FAILED.value
         job_message = f"{str(error.__class__.__name__)}: {str(error)}"
+        # Keep the values of the tasks executed before the failure
+        if pipeline is not None:
+            executed_values = pipeline.executed_values
     finally:
         job_end_datetime = datetime.now()
         logger.info(
@@ -150,6 +215,79 @@ def entrypoint(argv: list = sys.argv[1:]):
         {'=' * 30}
         """
         )
+        task_metrics_lines = "\n        ".join(
+            task_metrics.to_summary_line() for task_metrics in executed_values.task_metrics
+        )
+        logger.info(
+            f"""
+        {'=' * 30}
+        Extraction Task Metrics
+        {TASK_METRICS_HEADER}
+        {task_metrics_lines}
+        {'=' * 30}
+        """
+        )
+        try:
+            metrics_directory, metrics_file_name = get_log_filename(
+                job_param.job_name,
+                job_param.pos_dt,
+                file_name="extraction_metrics",
+                file_extension="json",
+            )
+            write_task_metrics_file(
+                file_path=Path(metrics_directory, metrics_file_name),
+                job_metrics={
+                    "job_nm": job_param.job_name,
+                    "pos_dt": job_param.pos_dt,
+                    "scheduler_id": job_param.scheduler_id,
+                    "area_nm": job_param.area_name,
+                    "job_seq": job_param.job_seq,
+                    "job_start_datetime": job_start_datetime.isoformat(),
+                    "job_end_datetime": job_end_datetime.isoformat(),
+                    "job_status": job_status,
+                    "job_message": job_message,
+                    "operation_attempts": dict(OPERATION_ATTEMPTS),
+                    "operation_retries": dict(OPERATION_RETRIES),
+                },
+                task_metrics=executed_values.task_metrics,
+            )
+            logger.info(f"Task metrics written to {Path(metrics_directory, metrics_file_name)}")
+        except Exception as e:
+            logger.warning(f"Failed to write task metrics file: {e}")
+        metrics_textfile_dir = system_arguments.metrics_textfile_dir or os.getenv(
+            METRICS_TEXTFILE_DIR_ENV
+        )
+        if metrics_textfile_dir:
+            try:
+                metrics_textfile_path = write_metrics_textfile(
+                    directory=metrics_textfile_dir,
+                    job_name=job_param.job_name,
+                    content=render_run_metrics(
+                        job_name=job_param.job_name,
+                        area_name=job_param.area_name,
+                        connection_name=get_connection_name(config),
+                        job_status=job_status,
+                        job_start_datetime=job_start_datetime,
+                        job_end_datetime=job_end_datetime,
+                        task_metrics=executed_values.task_metrics,
+                    ),
+                )
+                logger.info(f"OpenMetrics textfile written to {metrics_textfile_path}")
+            except Exception as e:
+                logger.warning(f"Failed to write OpenMetrics textfile: {e}")
+        if system_arguments.trace:
+            TRACER.stop()
+            try:
+                trace_directory, trace_file_name = get_log_filename(
+                    job_param.job_name,
+                    job_param.pos_dt,
+                    file_name="extraction_trace",
+                    file_extension=TRACE_FILE_EXTENSION[system_arguments.trace],
+                )
+                TRACER.export(Path(trace_directory, trace_file_name), system_arguments.trace)
+                logger.info(f"Trace written to {Path(trace_directory, trace_file_name)}")
+            except Exception as e:
+                logger.warning(f"Failed to write trace file: {e}")
         # extraction_oper_log = ExtractionPipelineOperLog()
         # extraction_oper_log.create_log_table_if_not_exist()
         # extraction_oper_log.insert_log(
@@ -25,6 +25,7 @@ class JobParameters(BaseModel):
     job_seq: Optional[int] | None = 0
     pipeline_name: Optional[str] | None = ""
     run_only_task: Optional[str] | None = ""
+    profile: Optional[str] | None = None
     # TODO: validate pos_dt format
 
     # TODO: discuss on this step, especially when reading config
@@ -23,9 +23,21 @@ from mdp.framework.mdp_extraction_framework.task.data_extractor.mongodb_data_ext
 from mdp.framework.mdp_extraction_framework.task.data_extractor.odbc_data_extractor import (  # noqa
     OdbcDataExtractorTask,
 )
+from mdp.framework.mdp_extraction_framework.task.data_transfer.archive_stream_transfer import (  # noqa
+    ArchiveStreamTransferTask,
+)
 from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (  # noqa
     AzCopyDataTransferTask,
 )
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_rest_data_transfer import (  # noqa
+    BlobRestDataTransferTask,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.gpg_archive_stream_transfer import (  # noqa
+    GpgArchiveStreamTransferTask,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.remote_verification import (  # noqa
+    RemoteVerificationTask,
+)
 from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_encryption_key_file_generator import (  # noqa
     HSMEncryptionKeyFileGeneratorTask,
 )
@@ -42,6 +54,9 @@ from mdp.framework.mdp_extraction_framework.task.file_decryptor.gpg_file_decrypt
 from mdp.framework.mdp_extraction_framework.task.file_decryptor.pgp_file_decryptor import (  # noqa
     PgpFileDecryptorTask,
 )
+from mdp.framework.mdp_extraction_framework.task.file_extractor.archive_file_extractor import (  # noqa
+    ArchiveFileExtractorTask,
+)
 from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_file_extractor import (  # noqa
     ZipFileExtractorTask,
 )
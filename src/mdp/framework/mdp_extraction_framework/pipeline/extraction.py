@@ -1,8 +1,11 @@
 """Extraction Pipeline."""
 
 # import: standard
+from contextlib import contextmanager
 from dataclasses import dataclass
+from dataclasses import field
 from typing import Any
+from typing import Iterator
 from typing import List
 from typing import Optional
 
@@ -13,6 +16,14 @@ from mdp.framework.mdp_extraction_framework.pipeline.base_pipeline import BasePi
 from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
     DataFileInformation,
 )
+from mdp.framework.mdp_extraction_framework.utility.common.task_metrics import TaskMetrics
+from mdp.framework.mdp_extraction_framework.utility.common.task_metrics import measure_task
+from mdp.framework.mdp_extraction_framework.utility.common.task_profiler import (
+    get_profile_file_path,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.task_profiler import profile_task
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import SpanKind
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import trace_span
 
 
 @dataclass
@@ -23,6 +34,7 @@ class ExtractionPipelineExecutedValues:
     target_file_path: Optional[str] | None = None
     files_size: Optional[list[int]] | None = None
     ctl_file_details: Optional[str] | None = None
+    task_metrics: List[TaskMetrics] = field(default_factory=list)
 
 
 class ExtractionPipelineTaskModel(PipelineTaskModel):
@@ -40,6 +52,7 @@ class ExtractionPipelineTaskModel(PipelineTaskModel):
     preprocess_extractor_task: Any | None = None
     hsm_encryption_key_file_generator_task: Any | None = None
     azcopy_data_transfer_task: Any | None = None
+    remote_verification_task: Any | None = None
 
 
 class ExtractionPipeline(BasePipeline):
@@ -70,6 +83,43 @@ class ExtractionPipeline(BasePipeline):
             else self.job_parameters.run_only_task.split(",")
         )
 
+    @contextmanager
+    def instrument_task(
+        self, task_name: str, file_infos: Optional[List[DataFileInformation]] = None
+    ) -> Iterator[TaskMetrics]:
+        """Measure a task run and add its metrics to the executed values. The task is
+        recorded as a task span, and also profiled when the job runs with a profile mode.
+
+        Args:
+            task_name (str): The pipeline task name.
+            file_infos (Optional[List[DataFileInformation]]): Input files of the task.
+
+        Yields:
+            TaskMetrics: The metrics object of the task run.
+        """
+        profile_mode = self.job_parameters.profile
+        profile_file_path = (
+            get_profile_file_path(
+                profile_mode, task_name, self.job_parameters.job_name, self.job_parameters.pos_dt
+            )
+            if profile_mode
+            else None
+        )
+        with measure_task(task_name, file_infos) as task_metrics, trace_span(
+            task_name, SpanKind.TASK.value
+        ) as task_span, profile_task(profile_mode, profile_file_path):
+            self.executed_values.task_metrics.append(task_metrics)
+            yield task_metrics
+            task_span.set_attributes(
+                rows=task_metrics.rows_processed,
+                bytes_read=task_metrics.bytes_read,
+                bytes_written=task_metrics.bytes_written,
+            )
+        self.logger.info(
+            f"Task {task_name} completed in {task_metrics.wall_time_sec}s, "
+            f"rows: {task_metrics.rows_processed}, MB/s: {task_metrics.mb_per_sec}"
+        )
+
     def execute_eban_in_extractor_task(
         self,
     ) -> None:
@@ -78,11 +128,12 @@ class ExtractionPipeline(BasePipeline):
         if task_params and not task_params.bypass_flag:
             if self.run_only_task is None or "eban_in_extractor_task" in self.run_only_task:
                 self.logger.info("Start EBAN-IN Extractor Task")
-                eban_in_extractor_task_object = task_params.module_name(
-                    module_config=task_params,
-                    job_parameters=self.job_parameters,
-                )
-                eban_in_extractor_task_object.execute()
+                with self.instrument_task("eban_in_extractor_task"):
+                    eban_in_extractor_task_object = task_params.module_name(
+                        module_config=task_params,
+                        job_parameters=self.job_parameters,
+                    )
+                    eban_in_extractor_task_object.execute()
 
     def execute_source_data_extractor_task(
         self,
@@ -96,11 +147,13 @@ class ExtractionPipeline(BasePipeline):
         if task_params and not task_params.bypass_flag:
             if self.run_only_task is None or "source_data_extractor_task" in self.run_only_task:
                 self.logger.info("Start Source Data Extractor Task")
-                data_extractor_task_object = task_params.module_name(
-                    module_config=task_params,
-                    job_parameters=self.job_parameters,
-                )
-                file_infos = data_extractor_task_object.execute()
+                with self.instrument_task("source_data_extractor_task") as task_metrics:
+                    data_extractor_task_object = task_params.module_name(
+                        module_config=task_params,
+                        job_parameters=self.job_parameters,
+                    )
+                    file_infos = data_extractor_task_object.execute()
+                    task_metrics.record_output(file_infos)
                 self.executed_values.files_size = [file_info.file_size for file_info in file_infos]
                 self.executed_values.extract_file_path = [
                     file_info.file_location for file_info in file_infos
@@ -117,14 +170,15 @@ class ExtractionPipeline(BasePipeline):
         if task_params and not task_params.bypass_flag:
             if self.run_only_task is None or "generate_control_file_task" in self.run_only_task:
                 self.logger.info("Start Generate Control File Task")
-                control_file_gen_task_object = task_params.module_name(
-                    module_config=task_params,
-                    job_parameters=self.job_parameters,
-                )
-                (
-                    file_name,
-                    self.executed_values.ctl_file_details,
-                ) = control_file_gen_task_object.execute()
+                with self.instrument_task("generate_control_file_task"):
+                    control_file_gen_task_object = task_params.module_name(
+                        module_config=task_params,
+                        job_parameters=self.job_parameters,
+                    )
+                    (
+                        file_name,
+                        self.executed_values.ctl_file_details,
+                    ) = control_file_gen_task_object.execute()
 
     def execute_file_extractor_task(self, file_infos: List[DataFileInformation]) -> list:
         """Execute the File extractor Task.
@@ -139,11 +193,13 @@ class ExtractionPipeline(BasePipeline):
         if task_params and not task_params.bypass_flag:
             if self.run_only_task is None or "file_extractor_task" in self.run_only_task:
                 self.logger.info("Start File Extractor Task")
-                file_extractor_task_object = task_params.module_name(
-                    module_config=task_params,
-                    job_parameters=self.job_parameters,
-                )
-                extracted_files_list = file_extractor_task_object.execute()
+                with self.instrument_task("file_extractor_task") as task_metrics:
+                    file_extractor_task_object = task_params.module_name(
+                        module_config=task_params,
+                        job_parameters=self.job_parameters,
+                    )
+                    extracted_files_list = file_extractor_task_object.execute()
+                    task_metrics.record_output(extracted_files_list)
                 return extracted_files_list
             else:
                 return file_infos
@@ -156,11 +212,12 @@ class ExtractionPipeline(BasePipeline):
         if task_params and not task_params.bypass_flag:
             if self.run_only_task is None or "preprocess_extractor_task" in self.run_only_task:
                 self.logger.info("Start File Extractor Task")
-                preprocess_task_object = task_params.module_name(
-                    module_config=task_params,
-                    job_parameters=self.job_parameters,
-                )
-                preprocess_task_object.execute()
+                with self.instrument_task("preprocess_extractor_task"):
+                    preprocess_task_object = task_params.module_name(
+                        module_config=task_params,
+                        job_parameters=self.job_parameters,
+                    )
+                    preprocess_task_object.execute()
 
     def execute_hsm_encryption_key_file_generator_task(
         self, file_infos: List[DataFileInformation]
@@ -173,12 +230,18 @@ class ExtractionPipeline(BasePipeline):
                 or "hsm_encryption_key_file_generator_task" in self.run_only_task
             ):
                 self.logger.info("Start HSM encryption key generator Task")
-                hsm_encryption_key_file_generator_task_object = task_params.module_name(
-                    module_config=task_params,
-                    job_parameters=self.job_parameters,
-                    file_infos=file_infos,
-                )
-                extracted_key_files_list = hsm_encryption_key_file_generator_task_object.execute()
+                with self.instrument_task(
+                    "hsm_encryption_key_file_generator_task", file_infos
+                ) as task_metrics:
+                    hsm_encryption_key_file_generator_task_object = task_params.module_name(
+                        module_config=task_params,
+                        job_parameters=self.job_parameters,
+                        file_infos=file_infos,
+                    )
+                    extracted_key_files_list = (
+                        hsm_encryption_key_file_generator_task_object.execute()
+                    )
+                    task_metrics.record_output(extracted_key_files_list)
                 return extracted_key_files_list
             else:
                 return file_infos
@@ -198,34 +261,70 @@ class ExtractionPipeline(BasePipeline):
         if task_params and not task_params.bypass_flag:
             if self.run_only_task is None or "file_decryptor_task" in self.run_only_task:
                 self.logger.info("Start File Decryptor Task")
-                file_decryptor_task_object = task_params.module_name(
-                    module_config=task_params,
-                    job_parameters=self.job_parameters,
-                    file_infos=file_infos,
-                )
-                decrypted_files_infos = file_decryptor_task_object.execute()
+                with self.instrument_task("file_decryptor_task", file_infos) as task_metrics:
+                    file_decryptor_task_object = task_params.module_name(
+                        module_config=task_params,
+                        job_parameters=self.job_parameters,
+                        file_infos=file_infos,
+                    )
+                    decrypted_files_infos = file_decryptor_task_object.execute()
+                    task_metrics.record_output(decrypted_files_infos)
                 return decrypted_files_infos
             else:
                 return file_infos
         else:
             return file_infos
 
-    def execute_transfer_file_azcopy_task(self, file_infos: List[DataFileInformation]) -> None:
+    def execute_transfer_file_azcopy_task(self, file_infos: List[DataFileInformation]) -> list:
         """Execute the File Transfer Task.
 
         Args:
             file_infos (List[DataFileInformation]): A list containing paths of files to transfer.
+
+        Returns:
+            list: A list of transferred files, e.g. the members of streamed archives. If the
+                task is bypassed, returns the original `file_infos`.
         """
         task_params = self.module_parameters.azcopy_data_transfer_task
         if task_params and not task_params.bypass_flag:
             if self.run_only_task is None or "azcopy_data_transfer_task" in self.run_only_task:
                 self.logger.info("Start Transfer File Azcopy Task")
-                transfer_file_azcopy_task_object = task_params.module_name(
-                    module_config=task_params,
-                    job_parameters=self.job_parameters,
-                    file_infos=file_infos,
-                )
-                self.executed_values.target_file_path = transfer_file_azcopy_task_object.execute()
+                with self.instrument_task("azcopy_data_transfer_task", file_infos) as task_metrics:
+                    transfer_file_azcopy_task_object = task_params.module_name(
+                        module_config=task_params,
+                        job_parameters=self.job_parameters,
+                        file_infos=file_infos,
+                    )
+                    self.executed_values.target_file_path = (
+                        transfer_file_azcopy_task_object.execute()
+                    )
+                    transferred_file_infos = (
+                        transfer_file_azcopy_task_object.build_transferred_file_infos()
+                    )
+                    task_metrics.record_output(transferred_file_infos)
+                return transferred_file_infos
+            else:
+                return file_infos
+        else:
+            return file_infos
+
+    def execute_remote_verification_task(self, file_infos: List[DataFileInformation]) -> None:
+        """Execute the Remote Verification Task.
+
+        Args:
+            file_infos (List[DataFileInformation]): A list containing paths of transferred files.
+        """
+        task_params = self.module_parameters.remote_verification_task
+        if task_params and not task_params.bypass_flag:
+            if self.run_only_task is None or "remote_verification_task" in self.run_only_task:
+                self.logger.info("Start Remote Verification Task")
+                with self.instrument_task("remote_verification_task", file_infos):
+                    remote_verification_task_object = task_params.module_name(
+                        module_config=task_params,
+                        job_parameters=self.job_parameters,
+                        file_infos=file_infos,
+                    )
+                    remote_verification_task_object.execute()
 
     def execute(self) -> ExtractionPipelineExecutedValues:
         """Method to run the pipeline.
@@ -259,7 +358,12 @@ class ExtractionPipeline(BasePipeline):
         )
 
         # Task 7: Transfer File
-        self.execute_transfer_file_azcopy_task(extracted_encrypted_file_infos)
+        transferred_file_infos = self.execute_transfer_file_azcopy_task(
+            extracted_encrypted_file_infos
+        )
+
+        # Task 8: Verify the transferred files on the target
+        self.execute_remote_verification_task(transferred_file_infos)
 
         self.logger.info("Extraction Pipeline Execution Completed.")
         return self.executed_values
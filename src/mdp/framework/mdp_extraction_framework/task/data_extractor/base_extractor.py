@@ -20,18 +20,25 @@ class DataFileInformation(BaseModel):
         file_location (str): The path to the file location.
         file_size (int): The file size
         file_created_datetime (datetime): The datetime of the file creation.
+        row_count (Optional[int]): The number of data rows written, if known.
+        content_md5 (Optional[str]): The base64 encoded MD5 of the file, if known.
     """
 
     file_location: str
     file_size: int
     file_created_datetime: Optional[datetime]
+    row_count: Optional[int] = None
+    content_md5: Optional[str] = None
 
 
-def generate_data_file_info(file_location: str) -> DataFileInformation:
+def generate_data_file_info(
+    file_location: str, row_count: Optional[int] = None
+) -> DataFileInformation:
     """Generate a DataFileInformation object.
 
     Args:
         file_location (str): genearted file path
+        row_count (Optional[int]): number of data rows written to the file, if known
 
     Returns:
         DataFileInformation: DataFileInformation object representing file detail.
@@ -40,6 +47,7 @@ def generate_data_file_info(file_location: str) -> DataFileInformation:
         file_location=file_location,
         file_size=os.path.getsize(file_location),
         file_created_datetime=datetime.now(),
+        row_count=row_count,
     )
     return file_info
 
@@ -6,6 +6,10 @@ from mdp.framework.mdp_extraction_framework.config_validator.job_parameters impo
 from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
     BaseDataExtractorTask,
 )
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    record_retry_attempt,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import traced_operation
 from mdp.framework.mdp_extraction_framework.utility.shell_script.common import run_command
 
 # import: external
@@ -49,8 +53,10 @@ class EBANInExtractorTask(BaseDataExtractorTask):
     @retry(
         wait=wait_exponential(multiplier=1.5, min=20, max=300),
         stop=stop_after_attempt(MAX_RETRY),
+        before=record_retry_attempt("eban_in_script"),
         reraise=True,
     )
+    @traced_operation("eban_in_script")
     def execute_eban_in_script(
         self,
     ) -> None:
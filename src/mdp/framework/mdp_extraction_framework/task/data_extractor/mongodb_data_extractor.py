@@ -315,7 +315,7 @@ class MongoDatabaseConnector:
                             file_name, header_col, batch_data, write_property, file_option
                         )
 
-                    file_infos.append(generate_data_file_info(file_name))
+                    file_infos.append(generate_data_file_info(file_name, row_count=len(batch_data)))
                     record_exist = True
                     part_number += 1
                     batch_data.clear()  # Clear the batch for the next partition
@@ -332,7 +332,7 @@ class MongoDatabaseConnector:
                         file_name, header_col, batch_data, write_property, file_option
                     )
 
-                file_infos.append(generate_data_file_info(file_name))
+                file_infos.append(generate_data_file_info(file_name, row_count=len(batch_data)))
                 record_exist = True
 
         except Exception as e:
@@ -344,7 +344,7 @@ class MongoDatabaseConnector:
                 rendered_base_name = self.replaced_full_file_name(base_filename, 0)
                 file_name = f"{rendered_base_name}.{file_extension}"
                 self.write_to_csv(file_name, header_col or [], [], write_property, file_option)
-                file_infos.append(generate_data_file_info(file_name))
+                file_infos.append(generate_data_file_info(file_name, row_count=0))
             else:
                 self.logger.error("No records found and 'allow_zero_record' is False.")
                 raise DataExtractorNoRecordError("No records found.")
@@ -348,7 +348,7 @@ class OdbcDatabaseConnector:
                         self.write_to_csv(
                             file_name, header_col, partition, write_property, file_option
                         )
-                        file_info = generate_data_file_info(file_name)
+                        file_info = generate_data_file_info(file_name, row_count=len(partition))
                         file_infos.append(file_info)
                         part_number += 1
                 if not record_exist and allow_zero_record:
@@ -356,7 +356,7 @@ class OdbcDatabaseConnector:
                     file_name = f"{rendered_base_name}.{file_extension}"
                     self.logger.info(f"Writing {file_name} with zero record.")
                     self.write_to_csv(file_name, header_col, [], write_property, file_option)
-                    file_info = generate_data_file_info(file_name)
+                    file_info = generate_data_file_info(file_name, row_count=0)
                     file_infos.append(file_info)
                 elif not record_exist and not allow_zero_record:
                     message = "Found zero record. No writing to file as the allow_zero_record flag is set to False."
@@ -0,0 +1,390 @@
+"""Archive Stream Transfer Module.
+
+A data transfer task uploading the members of archives to ADLS without extracting them
+to the staging disk first. Each member is decompressed as a stream straight into the
+upload backend, either the in-process block uploader of `BlobRestDataTransferTask` or
+an AzCopy process reading the member from its stdin. An optional checksum of every
+member is computed on the fly while it is uploaded.
+"""
+
+# import: standard
+import hashlib
+import os
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO
+from typing import Iterator
+from typing import List
+from typing import Optional
+from urllib.parse import quote
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.config_validator.job_parameters import JobParameters
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    DataFileInformation,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
+    AZCOPY_CAP_MBPS,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
+    AzCopyJobSummary,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_rest_data_transfer import (
+    BlobRestDataTransferTask,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_rest_data_transfer import (
+    BlobRestDataTransferTaskConfigModel,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import (
+    DEFAULT_BLOCK_SIZE,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import (
+    DEFAULT_MAX_WORKERS,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import BlobUploader
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import split_url
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import BYTES_PER_MB
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import (
+    TransferSettings,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.archive_extractor import (
+    ArchiveExtractor,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.archive_extractor import (
+    ArchiveMember,
+)
+from mdp.framework.mdp_extraction_framework.utility.shell_script.common import pipe_to_command
+
+STREAM_BACKENDS = ("blob_rest", "azcopy")
+
+
+class ChecksumReader:
+    """Read a binary stream, hashing and counting the bytes read."""
+
+    def __init__(self, stream: BinaryIO, algorithm: Optional[str] = None) -> None:
+        """Initialize the ChecksumReader.
+
+        Args:
+            stream (BinaryIO): The stream to read.
+            algorithm (Optional[str]): A hashlib algorithm name, e.g. 'sha256', bytes
+                are only counted if None.
+        """
+        self.stream = stream
+        self.hash = hashlib.new(algorithm) if algorithm else None
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """Read bytes from the stream, `size` bytes unless the stream ends first, as
+        decompressing streams may return fewer bytes than requested.
+
+        Args:
+            size (int): Bytes to read, all remaining bytes if negative.
+
+        Returns:
+            bytes: The bytes read, empty at the end of the stream.
+        """
+        data = self.stream.read(size)
+        while 0 < len(data) < size:
+            chunk = self.stream.read(size - len(data))
+            if not chunk:
+                break
+            data += chunk
+        if self.hash is not None:
+            self.hash.update(data)
+        self.bytes_read += len(data)
+        return data
+
+    def hexdigest(self) -> Optional[str]:
+        """Get the checksum of the bytes read so far.
+
+        Returns:
+            Optional[str]: The hex checksum, None without algorithm.
+        """
+        return self.hash.hexdigest() if self.hash is not None else None
+
+
+@dataclass
+class StreamedMember:
+    """Dataclass to store the outcome of an archive member upload.
+
+    Attributes:
+        archive_path (str): The local archive.
+        member_name (str): The member path within the archive.
+        blob_path (str): The blob path, starting with the container.
+        size (int): Number of bytes uploaded.
+        checksum (Optional[str]): The hex checksum of the member, None if not computed.
+        content_md5 (Optional[str]): The base64 encoded MD5 set on the blob, None when
+            uploaded by AzCopy.
+        elapsed_sec (float): Wall time of the upload.
+    """
+
+    archive_path: str
+    member_name: str
+    blob_path: str
+    size: int
+    checksum: Optional[str]
+    content_md5: Optional[str]
+    elapsed_sec: float
+
+
+class ArchiveStreamTransferTaskConfigModel(BlobRestDataTransferTaskConfigModel):
+    """Pydantic class to validate the ArchiveStreamTransferTask.
+
+    Args:
+        BlobRestDataTransferTaskConfigModel: The Blob REST data transfer config model
+    """
+
+    cleanup_dest_flag: Optional[str] | None = "False"
+    stream_backend: Optional[str] | None = "blob_rest"
+    stream_checksum_algorithm: Optional[str] | None = None
+
+
+class ArchiveStreamTransferTask(BlobRestDataTransferTask):
+    """Class for transfer the members of zip, tar, gzip, zstd, tar.gz or tar.zst archives
+    to ADLS, streamed from the archive without writing them to disk.
+
+    Each member is uploaded to the target directory under its path within the archive.
+    'stream_backend' is 'blob_rest' to upload with parallel Put Block requests, or
+    'azcopy' to pipe the member to 'azcopy cp --from-to=PipeBlob'. When
+    'stream_checksum_algorithm' is set, e.g. 'sha256', the checksum of every member is
+    computed while it is uploaded, logged and kept in `streamed_members`. The transferred
+    file information are those of the members, located where `ArchiveFileExtractorTask`
+    would have extracted them. 'cleanup_dest_flag' is not supported, as the destination
+    cleanup matches the archive name and not the members uploaded by a previous run.
+    """
+
+    parameter_config_model = ArchiveStreamTransferTaskConfigModel
+
+    def __init__(
+        self,
+        module_config: dict,
+        job_parameters: JobParameters,
+        file_infos: List[DataFileInformation] = None,
+    ):
+        """Initializes an ArchiveStreamTransferTask instance.
+
+        Args:
+            module_config (dict): A dictionary containing module configuration settings.
+            job_parameters (JobParameters): An object containing job parameters.
+            file_infos (List[DataFileInformation]): A list containing paths of archives to
+                transfer.
+
+        Raises:
+            ValueError: If the target is not an ADLS location, the destination cleanup is
+                enabled, the stream backend or the checksum algorithm is not supported.
+        """
+        super().__init__(module_config, job_parameters, file_infos)
+        if self.module_config.cleanup_dest_flag == "True":
+            raise ValueError(
+                f"'cleanup_dest_flag' is not supported by {self.__class__.__name__}: the "
+                "cleanup pattern is the archive name, not the names of its members."
+            )
+        if self.module_config.stream_backend not in STREAM_BACKENDS:
+            raise ValueError(
+                f"Stream backend '{self.module_config.stream_backend}' not in {STREAM_BACKENDS}."
+            )
+        algorithm = self.module_config.stream_checksum_algorithm
+        if algorithm and algorithm not in hashlib.algorithms_available:
+            raise ValueError(f"Checksum algorithm '{algorithm}' is not available.")
+        self.streamed_members: List[StreamedMember] = []
+
+    def iter_source_members(
+        self, file_path: str, archive_extractor: ArchiveExtractor
+    ) -> Iterator[ArchiveMember]:
+        """Iterate the members of a source archive as decompressed streams.
+
+        Args:
+            file_path (str): The local archive.
+            archive_extractor (ArchiveExtractor): The archive extractor.
+
+        Yields:
+            ArchiveMember: The members, in archive order.
+        """
+        yield from archive_extractor.iter_members(file_path)
+
+    def get_extract_directory(self, archive_path: str) -> str:
+        """Get the `_tmp_<name>` directory `ArchiveFileExtractorTask` would extract an
+        archive to.
+
+        Args:
+            archive_path (str): The archive.
+
+        Returns:
+            str: The extraction directory.
+        """
+        return str(Path(archive_path).parent / f"_tmp_{Path(archive_path).stem}")
+
+    def build_transferred_file_infos(self) -> List[DataFileInformation]:
+        """Build the file information of the uploaded members.
+
+        Returns:
+            List[DataFileInformation]: The members, in upload order.
+        """
+        transferred_datetime = datetime.now()
+        return [
+            DataFileInformation(
+                file_location=os.path.join(
+                    self.get_extract_directory(streamed_member.archive_path),
+                    streamed_member.member_name,
+                ),
+                file_size=streamed_member.size,
+                file_created_datetime=transferred_datetime,
+                content_md5=streamed_member.content_md5,
+            )
+            for streamed_member in self.streamed_members
+        ]
+
+    def pipe_member_to_azcopy(
+        self,
+        reader: ChecksumReader,
+        blob_path: str,
+        data_target_location: str,
+        settings: TransferSettings,
+    ) -> None:
+        """Upload a member to a blob with an AzCopy process reading it from its stdin.
+
+        Args:
+            reader (ChecksumReader): The member stream.
+            blob_path (str): The blob path, starting with the container.
+            data_target_location (str): The target directory URL with its SAS token.
+            settings (TransferSettings): The settings of the transfer.
+
+        Raises:
+            RuntimeError: If AzCopy failed to upload the member.
+        """
+        scheme, host, _, sas_token = split_url(data_target_location)
+        blob_url = f"{scheme}://{host}{quote(blob_path)}?{sas_token}"
+        azcopy_options = f"{self.get_azcopy_options()} {settings.to_azcopy_options()}".strip()
+        command_result = pipe_to_command(
+            f"azcopy cp '{blob_url}' --from-to=PipeBlob {azcopy_options}",
+            reader,
+            env=settings.to_env(),
+        )
+        if command_result.exit_code != 0:
+            raise RuntimeError(
+                f"AzCopy failed to upload {blob_path} from stdin, exit code "
+                f"{command_result.exit_code}: {command_result.error or command_result.output}"
+            )
+
+    def upload_member(
+        self,
+        archive_path: str,
+        member: ArchiveMember,
+        data_target_location: str,
+        uploader: BlobUploader,
+        settings: TransferSettings,
+    ) -> StreamedMember:
+        """Upload an archive member to the target directory as it is decompressed.
+
+        Args:
+            archive_path (str): The local archive.
+            member (ArchiveMember): The member.
+            data_target_location (str): The target directory URL with its SAS token.
+            uploader (BlobUploader): The uploader of the 'blob_rest' backend.
+            settings (TransferSettings): The settings of the transfer.
+
+        Returns:
+            StreamedMember: The outcome of the upload.
+        """
+        start_time = time.perf_counter()
+        directory_path = split_url(data_target_location)[2].rstrip("/")
+        blob_path = f"{directory_path}/{member.name}"
+        reader = ChecksumReader(member.stream, self.module_config.stream_checksum_algorithm)
+        content_md5 = None
+        if self.module_config.stream_backend == "azcopy":
+            self.pipe_member_to_azcopy(reader, blob_path, data_target_location, settings)
+        else:
+            content_md5 = uploader.upload_stream(blob_path, reader).content_md5
+        return StreamedMember(
+            archive_path=archive_path,
+            member_name=member.name,
+            blob_path=blob_path,
+            size=reader.bytes_read,
+            checksum=reader.hexdigest(),
+            content_md5=content_md5,
+            elapsed_sec=round(time.perf_counter() - start_time, 3),
+        )
+
+    def upload_files(
+        self,
+        source_files: List[str],
+        data_target_location: str,
+        allow_empty_file: str = "False",
+        cap_mbps: int = AZCOPY_CAP_MBPS,
+    ) -> List[str]:
+        """Upload the members of local archives to a target directory, one member at a
+        time, each streamed from its archive to the upload backend.
+
+        Args:
+            source_files (List[str]): The local archives.
+            data_target_location (str): The target directory URL with its SAS token.
+            allow_empty_file (str, optional): "False" to fail when every member is empty.
+                Defaults to "False".
+            cap_mbps (int, optional): The bandwidth cap. Defaults to AZCOPY_CAP_MBPS.
+
+        Returns:
+            List[str]: The archives whose members were uploaded.
+
+        Raises:
+            FileNotFoundError: Raised when planned local archives do not exist.
+            ValueError: Raised when only empty members were uploaded and they are not
+                allowed.
+        """
+        missing = [file_path for file_path in source_files if not Path(file_path).is_file()]
+        if missing:
+            raise FileNotFoundError(f"Planned source files not found: {missing}")
+
+        planned_bytes = sum(os.path.getsize(file_path) for file_path in source_files)
+        settings = self.get_transfer_settings(planned_bytes, cap_mbps)
+        block_size = (
+            settings.block_size_mb * BYTES_PER_MB if settings.block_size_mb else DEFAULT_BLOCK_SIZE
+        )
+        uploader = BlobUploader(
+            client=self.get_client(data_target_location),
+            block_size=block_size,
+            max_workers=settings.concurrency or DEFAULT_MAX_WORKERS,
+            cap_mbps=settings.cap_mbps,
+        )
+        archive_extractor = ArchiveExtractor(chunk_size=block_size)
+
+        start_time = time.perf_counter()
+        streamed_members = []
+        for file_path in source_files:
+            with closing(self.iter_source_members(file_path, archive_extractor)) as members:
+                for member in members:
+                    streamed_member = self.upload_member(
+                        file_path, member, data_target_location, uploader, settings
+                    )
+                    streamed_members.append(streamed_member)
+                    self.logger.info(
+                        f"Uploaded {member.name} of {file_path}: {streamed_member.size} bytes "
+                        f"in {streamed_member.elapsed_sec}s"
+                        + (
+                            f", {self.module_config.stream_checksum_algorithm} "
+                            f"{streamed_member.checksum}"
+                            if streamed_member.checksum
+                            else ""
+                        )
+                    )
+        elapsed_sec = time.perf_counter() - start_time
+
+        bytes_uploaded = sum(streamed_member.size for streamed_member in streamed_members)
+        if bytes_uploaded == 0 and allow_empty_file == "False":
+            raise ValueError(f"Only empty members uploaded from: {source_files}")
+        self.streamed_members.extend(streamed_members)
+
+        self.record_transfer(
+            bytes_uploaded,
+            AzCopyJobSummary(
+                total_transfers=len(streamed_members),
+                transfers_completed=len(streamed_members),
+                transfers_failed=0,
+                bytes_transferred=bytes_uploaded,
+            ),
+            elapsed_sec,
+            settings,
+        )
+        return source_files
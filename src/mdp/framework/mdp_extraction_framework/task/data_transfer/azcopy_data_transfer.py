@@ -4,7 +4,15 @@
 import glob
 import json
 import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
 from pathlib import Path
+from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
 
@@ -13,22 +21,97 @@ from mdp.framework.mdp_extraction_framework.config_validator.job_parameters impo
 from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
     DataFileInformation,
 )
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_progress import (
+    DEFAULT_PROGRESS_LOG_INTERVAL_SEC,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_progress import (
+    AzCopyProgressMonitor,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_retry import AzCopyFailedJob
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_retry import (
+    AzCopyTransferError,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_retry import (
+    build_azcopy_resume_command,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_retry import (
+    classify_azcopy_failure,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_retry import (
+    stop_on_non_retryable_failure,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_retry import (
+    wait_for_failure_class,
+)
 from mdp.framework.mdp_extraction_framework.task.data_transfer.base_data_transfer import (
     BaseDataTransferTask,
 )
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import BlobRestClient
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import (
+    split_container_path,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import split_url
+from mdp.framework.mdp_extraction_framework.task.data_transfer.cleanup_planner import CleanupPlan
+from mdp.framework.mdp_extraction_framework.task.data_transfer.cleanup_planner import (
+    build_part_file_pattern,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.cleanup_planner import plan_cleanup
+from mdp.framework.mdp_extraction_framework.task.data_transfer.file_archiver import (
+    DEFAULT_ARCHIVE_WORKERS,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.file_archiver import FileArchiver
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_scheduler import (
+    BandwidthLedger,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_scheduler import (
+    TransferScheduler,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import (
+    TransferHistoryStore,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import (
+    TransferSettings,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import (
+    build_transfer_observation,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import (
+    get_transfer_target_key,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import (
+    recommend_transfer_settings,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import (
+    UPLOAD_MANIFEST_FILE_NAME,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import UploadManifest
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import build_blob_url
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import (
+    get_remote_content_md5,
+)
 from mdp.framework.mdp_extraction_framework.utility.common.file_utils import cleanup_files
+from mdp.framework.mdp_extraction_framework.utility.common.job_log import JobStatus
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    record_retry_attempt,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import record_retry_cost
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import traced_operation
 from mdp.framework.mdp_extraction_framework.utility.common_function import get_class_object
 from mdp.framework.mdp_extraction_framework.utility.shell_script.common import CommandResult
 from mdp.framework.mdp_extraction_framework.utility.shell_script.common import run_command
+from mdp.framework.mdp_extraction_framework.utility.shell_script.common import stream_command
 
 # import: external
 from pydantic import BaseModel
 from tenacity import retry
 from tenacity import stop_after_attempt
+from tenacity import stop_any
 from tenacity import wait_exponential
 
 MAX_AZCOPY_RETRY = 5
 AZCOPY_CAP_MBPS = 150
+# AzCopy commands accepting '--list-of-files'
+AZCOPY_LIST_OF_FILES_COMMANDS = ("cp", "copy")
 os.environ["AZCOPY_DISABLE_SYSLOG"] = "true"
 
 
@@ -49,10 +132,17 @@ class ADLSLocation(BaseModel, extra="allow"):  # type: ignore[call-arg]
     filepath: str
     filepath_without_token: Optional[str] | None = ""
     cleanup_file_pattern: str
+    blob_endpoint: Optional[str] | None = ""
 
     def update_adls_filepath_url(self):
-        """Function for getting the ADLS storage url from each attribute."""
-        storage_url = f"https://{self.account_name}.blob.core.windows.net/{self.container_name}/{self.filepath}"
+        """Function for getting the ADLS storage url from each attribute. The
+        'blob_endpoint' replaces the account's public endpoint, e.g. for an emulator."""
+        endpoint = (
+            self.blob_endpoint.rstrip("/")
+            if self.blob_endpoint
+            else f"https://{self.account_name}.blob.core.windows.net"
+        )
+        storage_url = f"{endpoint}/{self.container_name}/{self.filepath}"
         storage_url_token = f"{storage_url}?{self.sas_token}"
         return self.model_copy(
             update={"filepath_without_token": storage_url, "filepath": storage_url_token}
@@ -71,12 +161,152 @@ class DataTransferTaskConfigModel(BaseModel):
     source: Optional[dict] | None = {}
     cleanup_dest_flag: Optional[str] | None = "True"
     cleanup_options: Optional[str] | None = ""
+    batch_cleanup_flag: Optional[str] | None = "False"
+    cleanup_part_file_name: Optional[str] | None = ""
     azcopy_options: Optional[str] | None = ""
     allow_empty_file: Optional[str] | None = "False"
     allow_zero_file: Optional[str] | None = "False"
     archive_flag: Optional[str] | None = "False"
     archive_path: Optional[str] | None = ""
+    archive_compression: Optional[str] | None = "none"
+    archive_max_workers: Optional[int] | None = DEFAULT_ARCHIVE_WORKERS
+    archive_retention_budget_mb: Optional[int] | None = None
     cleanup_source_flag: Optional[str] | None = "False"
+    batch_transfer_flag: Optional[str] | None = "False"
+    max_concurrent_transfers: Optional[int] | None = 1
+    adaptive_tuning_flag: Optional[str] | None = "False"
+    azcopy_concurrency: Optional[int] | None = None
+    azcopy_block_size_mb: Optional[int] | None = None
+    azcopy_cap_mbps: Optional[int] | None = None
+    skip_unchanged_flag: Optional[str] | None = "False"
+    upload_manifest_path: Optional[str] | None = ""
+    upload_manifest_to_target_flag: Optional[str] | None = "False"
+    stream_progress_flag: Optional[str] | None = "False"
+    progress_log_interval_sec: Optional[int] | None = DEFAULT_PROGRESS_LOG_INTERVAL_SEC
+    azcopy_stall_timeout_sec: Optional[int] | None = None
+    resume_failed_jobs_flag: Optional[str] | None = "False"
+
+
+@dataclass
+class AzCopyJobSummary:
+    """Summary of an AzCopy job parsed from its JSON-line stdout.
+
+    Attributes:
+        total_transfers (Optional[int]): Number of planned transfers.
+        transfers_completed (Optional[int]): Number of completed transfers.
+        transfers_failed (Optional[int]): Number of failed transfers.
+        job_status (Optional[str]): The final job status, e.g. 'Completed'.
+        job_id (Optional[str]): The AzCopy job id.
+        bytes_transferred (Optional[int]): Number of bytes transferred.
+        failed_sources (List[str]): Source paths of the failed transfers.
+        skipped_sources (List[str]): Source paths of the skipped transfers.
+    """
+
+    total_transfers: Optional[int] = None
+    transfers_completed: Optional[int] = None
+    transfers_failed: Optional[int] = None
+    job_status: Optional[str] = None
+    job_id: Optional[str] = None
+    bytes_transferred: Optional[int] = None
+    failed_sources: List[str] = field(default_factory=list)
+    skipped_sources: List[str] = field(default_factory=list)
+
+
+def parse_azcopy_summary(stdout: Optional[str]) -> AzCopyJobSummary:
+    """Parse the transfer counts, job status and per-file failures from the
+    `--output-type=json` stdout of AzCopy.
+
+    The job id is read from any 'Init', 'Progress' or 'EndOfJob' message carrying it, as
+    the 'Init' message may be missing from a truncated output. The counts are read from
+    the last 'Progress' or
+    'EndOfJob' message, the failed and skipped transfers from the 'FailedTransfers' and
+    'SkippedTransfers' lists of the job summary.
+
+    Args:
+        stdout (Optional[str]): The AzCopy stdout, one JSON message per line.
+
+    Returns:
+        AzCopyJobSummary: The parsed summary, values missing from the output are None.
+    """
+    summary = AzCopyJobSummary()
+    count_fields = {
+        "TotalTransfers": "total_transfers",
+        "TransfersCompleted": "transfers_completed",
+        "TransfersFailed": "transfers_failed",
+        "TotalBytesTransferred": "bytes_transferred",
+    }
+    transfer_list_fields = {
+        "FailedTransfers": "failed_sources",
+        "SkippedTransfers": "skipped_sources",
+    }
+
+    for line in (stdout or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            evt = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+
+        if evt.get("MessageType") not in ("Init", "Progress", "EndOfJob"):
+            continue
+
+        msg = evt.get("MessageContent")
+        if not isinstance(msg, str):
+            continue
+
+        try:
+            inner = json.loads(msg)
+        except json.JSONDecodeError:
+            continue
+
+        if not isinstance(inner, dict):
+            continue
+        summary.job_id = inner.get("JobID") or summary.job_id
+        if evt["MessageType"] == "Init":
+            continue
+
+        for key, attribute in count_fields.items():
+            if key in inner:
+                try:
+                    setattr(summary, attribute, int(inner[key]))
+                except (TypeError, ValueError):
+                    pass
+
+        for key, attribute in transfer_list_fields.items():
+            if isinstance(inner.get(key), list):
+                setattr(
+                    summary,
+                    attribute,
+                    [
+                        transfer["Src"]
+                        for transfer in inner[key]
+                        if isinstance(transfer, dict) and transfer.get("Src")
+                    ],
+                )
+
+        if "JobStatus" in inner:
+            summary.job_status = inner["JobStatus"]
+
+    return summary
+
+
+def group_files_by_directory(file_paths: List[str]) -> Dict[str, List[str]]:
+    """Group file paths by their parent directory, keeping the input order.
+
+    Args:
+        file_paths (List[str]): Local file paths.
+
+    Returns:
+        Dict[str, List[str]]: File names grouped by their resolved parent directory.
+    """
+    file_groups: Dict[str, List[str]] = {}
+    for file_path in file_paths:
+        resolved_path = Path(file_path).resolve()
+        file_groups.setdefault(str(resolved_path.parent), []).append(resolved_path.name)
+    return file_groups
 
 
 def check_file_exists(file_path):
@@ -175,15 +405,547 @@ class AzCopyDataTransferTask(BaseDataTransferTask):
         super().__init__(module_config, job_parameters)
         self.copy_retry_count = 0
         self.cleanup_retry_count = 0
+        self.transfer_results = []
+        self.transfer_history = (
+            TransferHistoryStore() if self.module_config.adaptive_tuning_flag == "True" else None
+        )
+        self.transfer_target_key = get_transfer_target_key(self.module_config.target)
+        self.file_infos = file_infos or []
         self.files_to_transfer = (
             [file_info.file_location for file_info in file_infos] if file_infos else None
         )
+        self.upload_manifest = None
+        self.file_md5s = {}
+        self.failed_azcopy_jobs: Dict[str, AzCopyFailedJob] = {}
+        # Guards the retry counters and failed jobs, updated by concurrent transfers
+        self.retry_state_lock = threading.Lock()
+        self.bandwidth_ledger = BandwidthLedger()
+        self.retry_wall_time_sec = 0.0
+        self.retried_bytes = 0
+        self.files_to_archive = []
+        self.archived_files = []
+        self.cleanup_plan: Optional[CleanupPlan] = None
+
+    def release_source_files(self, file_paths: List[str]) -> None:
+        """Hand transferred source files to the archive stage when 'archive_flag' is set,
+        or remove them when 'cleanup_source_flag' is set.
+
+        Args:
+            file_paths (List[str]): The transferred source files.
+        """
+        if self.module_config.archive_flag == "True":
+            self.files_to_archive.extend(file_paths)
+        elif self.module_config.cleanup_source_flag == "True":
+            self.logger.info(f"Cleaning up source files: {file_paths}")
+            cleanup_files(file_paths)
+
+    def archive_source_files(self) -> None:
+        """Archive the transferred source files into the position date directory of the
+        archive path, then evict the oldest archives exceeding the retention budget."""
+        if self.module_config.archive_flag != "True" or not self.files_to_archive:
+            return
+        archiver = FileArchiver(
+            archive_path=self.module_config.archive_path,
+            compression=self.module_config.archive_compression,
+            max_workers=self.module_config.archive_max_workers,
+            retention_budget_mb=self.module_config.archive_retention_budget_mb,
+        )
+        self.archived_files = archiver.archive(self.files_to_archive, self.job_parameters.pos_dt)
+        self.files_to_archive = []
+        archiver.sweep(keep_directory_name=self.job_parameters.pos_dt)
+
+    def use_batch_cleanup(self) -> bool:
+        """Check if the destination is cleaned up once for every file of the previous task,
+        instead of once per file or per source directory.
+
+        Returns:
+            bool: True if 'batch_cleanup_flag' is set and applies to the transfer.
+        """
+        if (
+            self.module_config.batch_cleanup_flag != "True"
+            or self.module_config.cleanup_dest_flag != "True"
+            or self.module_config.source
+            or not self.files_to_transfer
+        ):
+            return False
+        if self.module_config.target["type"] != "ADLSLocation" or self.upload_manifest is not None:
+            self.logger.warning(
+                "batch_cleanup_flag only applies to an ADLSLocation target without "
+                "skip_unchanged_flag, cleaning up the destination per transfer."
+            )
+            return False
+        return True
+
+    def get_cleanup_patterns(self, file_paths: List[str]) -> List[str]:
+        """Get the file name patterns of the blobs replaced by a set of files.
+
+        Args:
+            file_paths (List[str]): The files to transfer.
+
+        Returns:
+            List[str]: The file names and, if 'cleanup_part_file_name' is set, the pattern
+                of every part file of the extractor's file name.
+        """
+        patterns = sorted({os.path.basename(file_path) for file_path in file_paths})
+        if self.module_config.cleanup_part_file_name:
+            patterns.append(build_part_file_pattern(self.module_config.cleanup_part_file_name))
+        return patterns
+
+    def cleanup_destination(self, file_paths: List[str]) -> CleanupPlan:
+        """Clean up the destination of a set of files before transferring them: the target
+        directory is listed once, and the blobs of the files and of their part-file
+        pattern are deleted with a single call.
+
+        Args:
+            file_paths (List[str]): The files to transfer.
+
+        Returns:
+            CleanupPlan: The executed cleanup plan.
+        """
+        target_configs = ADLSLocation(
+            **self.module_config.target, cleanup_file_pattern=""
+        ).update_adls_filepath_url()
+        container_path, prefix = split_container_path(
+            split_url(str(target_configs.filepath_without_token))[2],
+            target_configs.container_name,
+        )
+        start_time = time.perf_counter()
+        client = BlobRestClient.from_url(str(target_configs.filepath))
+        try:
+            plan = plan_cleanup(
+                client,
+                container_path,
+                prefix,
+                self.get_cleanup_patterns(file_paths),
+                recursive="--recursive" in (self.module_config.cleanup_options or ""),
+            )
+            self.logger.info(
+                f"Planned the deletion of {len(plan.blob_names)} of {plan.listed_blob_count} "
+                f"blobs under {container_path}/{prefix} in {plan.elapsed_sec}s"
+            )
+            if plan.blob_names:
+                self.delete_cleanup_plan(plan, target_configs)
+        finally:
+            client.close()
+        plan.elapsed_sec = round(time.perf_counter() - start_time, 3)
+        self.logger.info(
+            f"Cleaned up {len(plan.blob_names)} blobs on the destination in {plan.elapsed_sec}s"
+        )
+        return plan
 
     @retry(
         wait=wait_exponential(multiplier=1.5, min=20, max=300),
         stop=stop_after_attempt(MAX_AZCOPY_RETRY),
+        before=record_retry_attempt("azcopy_batch_cleanup"),
         reraise=True,
     )
+    @traced_operation("azcopy_batch_cleanup")
+    def delete_cleanup_plan(self, plan: CleanupPlan, target_configs: BaseModel) -> None:
+        """Delete the blobs of a cleanup plan with one 'azcopy rm --list-of-files'.
+
+        Args:
+            plan (CleanupPlan): The cleanup plan.
+            target_configs (BaseModel): The ADLS target location.
+
+        Raises:
+            ValueError: If AzCopy returned a non-zero exit code.
+        """
+        with tempfile.NamedTemporaryFile(
+            mode="w", prefix="azcopy_list_of_files_", suffix=".txt", delete=False
+        ) as list_file:
+            list_file.write("\n".join(plan.relative_blob_names) + "\n")
+        try:
+            self.logger.info(
+                f"Cleanup command: azcopy rm '{target_configs.filepath_without_token}?<sas_token>' "
+                f"--list-of-files '{list_file.name}'"
+            )
+            command_result = run_command(
+                command=f"azcopy rm '{target_configs.filepath}' --list-of-files '{list_file.name}'"
+            )
+        finally:
+            os.remove(list_file.name)
+        if command_result.exit_code != 0:
+            raise ValueError(
+                f"Azcopy rm returned with exit_code: {command_result.exit_code}.\n"
+                f"Output: \n{command_result.output}\nError_message: \n{command_result.error}"
+            )
+
+    def setup_upload_manifest(self) -> None:
+        """Load the upload manifest when skipping unchanged files is enabled.
+
+        Only files of the previous task transferred to ADLS can be compared with the
+        target, the manifest defaults to the directory of the first file.
+        """
+        if self.module_config.skip_unchanged_flag != "True":
+            return
+        if self.module_config.source or self.module_config.target["type"] != "ADLSLocation":
+            self.logger.warning(
+                "skip_unchanged_flag only applies to files of the previous task transferred "
+                "to an ADLSLocation target, transferring every file."
+            )
+            return
+        manifest_path = self.module_config.upload_manifest_path or Path(
+            self.files_to_transfer[0]
+        ).resolve().with_name(UPLOAD_MANIFEST_FILE_NAME)
+        self.upload_manifest = UploadManifest(manifest_path)
+
+    def get_azcopy_options(self) -> str:
+        """Get the AzCopy options of an upload, storing the MD5 of the uploaded blobs when
+        skipping unchanged files is enabled.
+
+        Returns:
+            str: The AzCopy options.
+        """
+        if self.upload_manifest is not None:
+            return f"{self.module_config.azcopy_options} --put-md5".strip()
+        return self.module_config.azcopy_options
+
+    def is_unchanged_on_target(self, file_path: str, target_configs: BaseModel) -> bool:
+        """Check if the blob of a file on the target has the same MD5 as the local file.
+
+        Args:
+            file_path (str): The local file.
+            target_configs (BaseModel): The ADLS target location.
+
+        Returns:
+            bool: True if the target blob's Content-MD5 matches the file's MD5.
+        """
+        md5 = self.upload_manifest.get_md5(file_path)
+        self.file_md5s[str(Path(file_path).resolve())] = md5
+        blob_url = build_blob_url(
+            str(target_configs.filepath_without_token),
+            os.path.basename(file_path),
+            target_configs.sas_token,
+        )
+        try:
+            remote_md5 = get_remote_content_md5(blob_url)
+        except Exception as e:
+            self.logger.warning(f"Failed to read the Content-MD5 of {file_path} target: {e}")
+            return False
+        return remote_md5 == md5
+
+    def record_upload(self, file_paths: List[str], target_configs: BaseModel) -> None:
+        """Record the uploaded files in the upload manifest.
+
+        Args:
+            file_paths (List[str]): The uploaded local files.
+            target_configs (BaseModel): The ADLS target location.
+        """
+        if self.upload_manifest is None:
+            return
+        for file_path in file_paths:
+            md5 = self.file_md5s.get(str(Path(file_path).resolve()))
+            md5 = md5 or self.upload_manifest.get_md5(file_path)
+            self.upload_manifest.record(file_path, md5, str(target_configs.filepath_without_token))
+
+    def build_transferred_file_infos(self) -> List[DataFileInformation]:
+        """Build the file information of the files on the target once executed, with the
+        MD5 computed while transferring them when known.
+
+        Returns:
+            List[DataFileInformation]: The files of the previous task.
+        """
+        return [
+            file_info.model_copy(
+                update={
+                    "content_md5": self.file_md5s.get(str(Path(file_info.file_location).resolve()))
+                    or file_info.content_md5
+                }
+            )
+            for file_info in self.file_infos
+        ]
+
+    def upload_manifest_to_target(self) -> None:
+        """Copy the upload manifest next to the target files, failures are only logged."""
+        if (
+            self.upload_manifest is None
+            or self.module_config.upload_manifest_to_target_flag != "True"
+            or not self.upload_manifest.manifest_path.exists()
+        ):
+            return
+        target_configs = ADLSLocation(
+            **self.module_config.target, cleanup_file_pattern=UPLOAD_MANIFEST_FILE_NAME
+        ).update_adls_filepath_url()
+        manifest_url = build_blob_url(
+            str(target_configs.filepath_without_token),
+            UPLOAD_MANIFEST_FILE_NAME,
+            target_configs.sas_token,
+        )
+        command_result = run_command(
+            command=f"azcopy cp '{self.upload_manifest.manifest_path}' '{manifest_url}' "
+            "--output-type=json"
+        )
+        if command_result.exit_code != 0:
+            self.logger.warning(f"Failed to upload the upload manifest: {command_result.error}")
+        else:
+            self.logger.info("Uploaded the upload manifest next to the target files.")
+
+    def run_azcopy(self, command: str, env: Optional[dict] = None) -> CommandResult:
+        """Run an AzCopy transfer command. With 'stream_progress_flag', the JSON output is
+        followed while the job runs to log its progress, and the job is killed when it
+        makes no progress for 'azcopy_stall_timeout_sec', so the retry starts early.
+
+        Args:
+            command (str): The AzCopy command.
+            env (Optional[dict]): Environment variables of the AzCopy process.
+
+        Returns:
+            CommandResult: The AzCopy output, error and exit code.
+        """
+        if self.module_config.stream_progress_flag != "True":
+            return run_command(command=command, env=env)
+        monitor = AzCopyProgressMonitor(
+            log_interval_sec=self.module_config.progress_log_interval_sec,
+            metrics_name=self.job_parameters.job_name,
+        )
+        command_result = stream_command(
+            command=command,
+            env=env,
+            on_line=monitor.handle_line,
+            stall_timeout_sec=self.module_config.azcopy_stall_timeout_sec,
+        )
+        monitor.report()
+        # Only the last output lines are kept, put back the Init message with the job id
+        if monitor.init_line and monitor.init_line not in command_result.output:
+            command_result.output = f"{monitor.init_line}\n{command_result.output}"
+        return command_result
+
+    def run_transfer_attempt(
+        self,
+        command: str,
+        settings: TransferSettings,
+        data_source_location: str,
+        data_target_location: str,
+    ) -> CommandResult:
+        """Run an attempt of an AzCopy transfer. With 'resume_failed_jobs_flag', a retry
+        of a job whose transfers failed resumes it with 'azcopy jobs resume', so only the
+        failed and pending transfers run again. The whole command runs if the job cannot
+        be resumed. The resumed job keeps the bandwidth cap of the transfer.
+
+        Args:
+            command (str): The AzCopy transfer command.
+            settings (TransferSettings): The settings the transfer runs with.
+            data_source_location (str): The source location, the key of the failed job.
+            data_target_location (str): The target location with its SAS token.
+
+        Returns:
+            CommandResult: The AzCopy output, error and exit code.
+        """
+        env = settings.to_env()
+        failed_job = self.failed_azcopy_jobs.get(data_source_location)
+        if (
+            failed_job is not None
+            and failed_job.job_id
+            and self.module_config.resume_failed_jobs_flag == "True"
+        ):
+            self.logger.info(
+                f"Resuming AzCopy job {failed_job.job_id} after a "
+                f"{failed_job.failure_class} failure."
+            )
+            command_result = self.run_azcopy(
+                build_azcopy_resume_command(
+                    failed_job.job_id,
+                    data_source_location,
+                    data_target_location,
+                    cap_mbps=settings.cap_mbps,
+                ),
+                env=env,
+            )
+            if parse_azcopy_summary(command_result.output).total_transfers is not None:
+                return command_result
+            self.logger.warning(
+                f"Failed to resume AzCopy job {failed_job.job_id}, running the whole "
+                f"transfer again: {command_result.error}"
+            )
+        return self.run_azcopy(command, env=env)
+
+    def record_failed_attempt(
+        self,
+        operation: str,
+        data_source_location: str,
+        summary: AzCopyJobSummary,
+        command_result: CommandResult,
+    ) -> str:
+        """Remember a failed AzCopy attempt for the next one and count the cost of the
+        retry that failed again.
+
+        Args:
+            operation (str): The retried operation, e.g. 'azcopy_transfer'.
+            data_source_location (str): The source location, the key of the failed job.
+            summary (AzCopyJobSummary): The parsed summary of the attempt.
+            command_result (CommandResult): The AzCopy output of the attempt.
+
+        Returns:
+            str: The failure class of the attempt.
+        """
+        failure_class = classify_azcopy_failure(f"{command_result.output}\n{command_result.error}")
+        with self.retry_state_lock:
+            failed_job = self.failed_azcopy_jobs.get(data_source_location)
+            if failed_job is None:
+                self.failed_azcopy_jobs[data_source_location] = AzCopyFailedJob(
+                    job_id=summary.job_id, failure_class=failure_class
+                )
+            else:
+                self.record_retry(operation, failed_job, summary)
+                failed_job.job_id = summary.job_id or failed_job.job_id
+                failed_job.failure_class = failure_class
+        self.logger.warning(f"AzCopy attempt failed: {failure_class}, job id: {summary.job_id}")
+        return failure_class
+
+    def record_successful_attempt(
+        self, operation: str, data_source_location: str, summary: AzCopyJobSummary
+    ) -> None:
+        """Count the cost of the retry that succeeded, if the transfer failed before.
+
+        Args:
+            operation (str): The retried operation, e.g. 'azcopy_transfer'.
+            data_source_location (str): The source location, the key of the failed job.
+            summary (AzCopyJobSummary): The parsed summary of the attempt.
+        """
+        with self.retry_state_lock:
+            failed_job = self.failed_azcopy_jobs.pop(data_source_location, None)
+            if failed_job is None:
+                return
+            self.record_retry(operation, failed_job, summary)
+        self.logger.info(
+            f"AzCopy transfer succeeded after "
+            f"{round(failed_job.last_failure_time - failed_job.first_failure_time, 3)}s "
+            f"of retries, total retry time: {round(self.retry_wall_time_sec, 3)}s, "
+            f"bytes transferred again: {self.retried_bytes}"
+        )
+
+    def record_retry(
+        self, operation: str, failed_job: AzCopyFailedJob, summary: AzCopyJobSummary
+    ) -> None:
+        """Add the wall time since the previous failure, backoff included, and the bytes
+        transferred by a retry to the task and process retry counters. Called with
+        'retry_state_lock' held.
+
+        Args:
+            operation (str): The retried operation, e.g. 'azcopy_transfer'.
+            failed_job (AzCopyFailedJob): The failed job, its last failure time is updated.
+            summary (AzCopyJobSummary): The parsed summary of the retry.
+        """
+        now = time.monotonic()
+        retry_sec = now - failed_job.last_failure_time
+        retried_bytes = summary.bytes_transferred or 0
+        failed_job.last_failure_time = now
+        self.retry_wall_time_sec += retry_sec
+        self.retried_bytes += retried_bytes
+        record_retry_cost(operation, retry_sec, retried_bytes)
+
+    def count_copy_attempt(self) -> int:
+        """Count a transfer attempt, transfers of the concurrent mode share the counter.
+
+        Returns:
+            int: The number of attempts before this one.
+        """
+        with self.retry_state_lock:
+            self.copy_retry_count += 1
+            return self.copy_retry_count - 1
+
+    def count_cleanup_attempt(self) -> int:
+        """Count a cleanup attempt, cleanups of the concurrent mode share the counter.
+
+        Returns:
+            int: The number of attempts before this one.
+        """
+        with self.retry_state_lock:
+            self.cleanup_retry_count += 1
+            return self.cleanup_retry_count - 1
+
+    @contextmanager
+    def bandwidth_lease(self, cap_mbps: Optional[int] = None) -> Iterator[int]:
+        """Context manager holding a share of the host bandwidth budget for a transfer,
+        so the transfers of every job on the host stay within the budget.
+
+        Args:
+            cap_mbps (Optional[int]): A cap the caller already leased, e.g. by the
+                TransferScheduler, used as is. Defaults to None, to lease up to
+                'azcopy_cap_mbps' or AZCOPY_CAP_MBPS from the host ledger.
+
+        Yields:
+            int: The bandwidth cap of the transfer.
+        """
+        if cap_mbps is not None:
+            yield cap_mbps
+            return
+        with self.bandwidth_ledger.lease(
+            self.module_config.azcopy_cap_mbps or AZCOPY_CAP_MBPS
+        ) as lease:
+            yield lease.mbps
+
+    def get_transfer_settings(
+        self, file_size: int, cap_mbps: int = AZCOPY_CAP_MBPS
+    ) -> TransferSettings:
+        """Get the AzCopy settings of a transfer. The config values override the settings
+        picked from the target's throughput history when adaptive tuning is enabled, the
+        config cap only lowers the leased cap.
+
+        Args:
+            file_size (int): Size of the transfer in bytes.
+            cap_mbps (int, optional): The bandwidth cap. Defaults to AZCOPY_CAP_MBPS.
+
+        Returns:
+            TransferSettings: The settings of the transfer.
+        """
+        if self.module_config.azcopy_cap_mbps:
+            cap_mbps = min(cap_mbps, self.module_config.azcopy_cap_mbps)
+        if self.transfer_history is None:
+            return TransferSettings(
+                cap_mbps=cap_mbps,
+                concurrency=self.module_config.azcopy_concurrency,
+                block_size_mb=self.module_config.azcopy_block_size_mb,
+            )
+        settings = recommend_transfer_settings(
+            file_size=file_size,
+            observations=self.transfer_history.get(self.transfer_target_key),
+            cap_mbps=cap_mbps,
+            concurrency=self.module_config.azcopy_concurrency,
+            block_size_mb=self.module_config.azcopy_block_size_mb,
+        )
+        self.logger.info(f"AzCopy settings for {file_size} bytes: {settings}")
+        return settings
+
+    def record_transfer(
+        self,
+        file_size: int,
+        summary: AzCopyJobSummary,
+        elapsed_sec: float,
+        settings: TransferSettings,
+    ) -> None:
+        """Log the effective throughput of a transfer and add it to the target's history
+        when adaptive tuning is enabled.
+
+        Args:
+            file_size (int): The planned size of the transfer in bytes.
+            summary (AzCopyJobSummary): The parsed AzCopy job summary.
+            elapsed_sec (float): Wall time of the AzCopy run.
+            settings (TransferSettings): The settings the transfer ran with.
+        """
+        observation = build_transfer_observation(
+            file_size=file_size or summary.bytes_transferred or 0,
+            bytes_transferred=summary.bytes_transferred,
+            elapsed_sec=elapsed_sec,
+            settings=settings,
+        )
+        self.logger.info(
+            f"AzCopy effective throughput: {observation.mb_per_sec} MB/s "
+            f"({observation.bytes_transferred} bytes in {observation.elapsed_sec}s)"
+        )
+        if self.transfer_history is not None:
+            try:
+                self.transfer_history.add(self.transfer_target_key, observation)
+            except Exception as e:
+                self.logger.warning(f"Failed to record transfer history: {e}")
+
+    @retry(
+        wait=wait_for_failure_class,
+        stop=stop_any(stop_after_attempt(MAX_AZCOPY_RETRY), stop_on_non_retryable_failure),
+        before=record_retry_attempt("azcopy_transfer"),
+        reraise=True,
+    )
+    @traced_operation("azcopy_transfer")
     def azcopy_transfer_file(
         self,
         data_source_location: str,
@@ -192,6 +954,7 @@ class AzCopyDataTransferTask(BaseDataTransferTask):
         azcopy_options: str = "",
         allow_empty_file: str = "False",
         allow_zero_file: str = "True",
+        cap_mbps: int = AZCOPY_CAP_MBPS,
     ) -> List[str]:
         """Transfer files from a source location to a target location using AzCopy and
         return a list of successfully transferred files.
@@ -233,6 +996,9 @@ class AzCopyDataTransferTask(BaseDataTransferTask):
                 Controls how zero-transfer scenarios are handled. When "True", zero
                 transfers are treated as success and the function returns an empty list
                 rather than raising an exception. Defaults to "True".
+            cap_mbps (int, optional):
+                The bandwidth cap passed to AzCopy as '--cap-mbps'. Defaults to
+                AZCOPY_CAP_MBPS.
 
         Returns:
             List[str]:
@@ -259,8 +1025,8 @@ class AzCopyDataTransferTask(BaseDataTransferTask):
             * This function does not invoke 'azcopy jobs show' and relies solely on the
             structured progress messages emitted by AzCopy for determining success.
         """
-        self.logger.info(f"Start AzCopy file transfer. Retry count: {self.copy_retry_count}")
-        self.copy_retry_count += 1
+        retry_count = self.count_copy_attempt()
+        self.logger.info(f"Start AzCopy file transfer. Retry count: {retry_count}")
 
         # -------------------------------------------------------------------------
         # 1) Build planned source_files list (local paths or the original source)
@@ -298,77 +1064,49 @@ class AzCopyDataTransferTask(BaseDataTransferTask):
         # -------------------------------------------------------------------------
         # 2) Run AzCopy with JSON output
         # -------------------------------------------------------------------------
+        planned_bytes = sum(
+            os.path.getsize(f)
+            for f in source_files
+            if not f.startswith("http") and Path(f).is_file()
+        )
+        settings = self.get_transfer_settings(planned_bytes, cap_mbps)
         cmd = (
             f"azcopy {azcopy_command} '{data_source_location}' '{data_target_location}' "
-            f"{azcopy_options} --cap-mbps={AZCOPY_CAP_MBPS} --output-type=json"
+            f"{azcopy_options} {settings.to_azcopy_options()} --output-type=json"
         )
-        command_result = run_command(command=cmd)
+        start_time = time.perf_counter()
+        command_result = self.run_transfer_attempt(
+            cmd, settings, data_source_location, data_target_location
+        )
+        elapsed_sec = time.perf_counter() - start_time
+        summary = parse_azcopy_summary(command_result.output)
 
         # -------------------------------------------------------------------------
         # 3) Global validation (exit code, zero transfers, etc.)
         # -------------------------------------------------------------------------
-        validate_transfer_file(
-            azcopy_output=command_result,
-            retry_count=self.copy_retry_count - 1,
-            allow_empty_file=allow_empty_file,
-            allow_zero_file=allow_zero_file,
-            file_exists=True,
-        )
+        try:
+            validate_transfer_file(
+                azcopy_output=command_result,
+                retry_count=retry_count,
+                allow_empty_file=allow_empty_file,
+                allow_zero_file=allow_zero_file,
+                file_exists=True,
+            )
+        except ValueError:
+            self.record_failed_attempt(
+                "azcopy_transfer", data_source_location, summary, command_result
+            )
+            raise
 
         self.logger.debug(f"AzCopy stdout:\n{command_result.output}")
 
         # -------------------------------------------------------------------------
-        # 4) Parse summary from AzCopy JSON-line stdout
+        # 4) Read the summary parsed from AzCopy JSON-line stdout
         # -------------------------------------------------------------------------
-        total: Optional[int] = None
-        completed: Optional[int] = None
-        failed: Optional[int] = None
-        job_status: Optional[str] = None
-
-        stdout = command_result.output or ""
-
-        for line in stdout.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-
-            try:
-                evt = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-            if evt.get("MessageType") not in ("Progress", "EndOfJob"):
-                continue
-
-            msg = evt.get("MessageContent")
-            if not isinstance(msg, str):
-                continue
-
-            try:
-                inner = json.loads(msg)
-            except json.JSONDecodeError:
-                continue
-
-            if "TotalTransfers" in inner:
-                try:
-                    total = int(inner["TotalTransfers"])
-                except (TypeError, ValueError):
-                    pass
-
-            if "TransfersCompleted" in inner:
-                try:
-                    completed = int(inner["TransfersCompleted"])
-                except (TypeError, ValueError):
-                    pass
-
-            if "TransfersFailed" in inner:
-                try:
-                    failed = int(inner["TransfersFailed"])
-                except (TypeError, ValueError):
-                    pass
-
-            if "JobStatus" in inner:
-                job_status = inner["JobStatus"]
+        total = summary.total_transfers
+        completed = summary.transfers_completed
+        failed = summary.transfers_failed
+        job_status = summary.job_status
 
         self.logger.info(
             f"AzCopy summary: JobStatus={job_status}, "
@@ -383,12 +1121,18 @@ class AzCopyDataTransferTask(BaseDataTransferTask):
             self.logger.info(
                 "AzCopy reported TotalTransfers=0; treating as successful no-op and returning []."
             )
+            self.record_successful_attempt("azcopy_transfer", data_source_location, summary)
             return []
 
         # 5.2 If AzCopy reports failures → raise so @retry can re-attempt
         if failed is not None and failed > 0:
-            raise RuntimeError(
-                f"AzCopy reported failed transfers: TransfersFailed={failed} / TotalTransfers={total}"
+            failure_class = self.record_failed_attempt(
+                "azcopy_transfer", data_source_location, summary, command_result
+            )
+            raise AzCopyTransferError(
+                f"AzCopy reported failed transfers: TransfersFailed={failed} / TotalTransfers={total}",
+                failure_class=failure_class,
+                job_id=summary.job_id,
             )
 
         # 5.3 If counts are slightly odd, warn but still return planned list
@@ -398,14 +1142,149 @@ class AzCopyDataTransferTask(BaseDataTransferTask):
                 "Returning planned source_files; check logs if this is unexpected."
             )
 
+        self.record_successful_attempt("azcopy_transfer", data_source_location, summary)
+        self.record_transfer(planned_bytes, summary, elapsed_sec, settings)
+
         # If we reach here, we treat all planned files as successfully transferred
         return source_files
 
+    @retry(
+        wait=wait_for_failure_class,
+        stop=stop_any(stop_after_attempt(MAX_AZCOPY_RETRY), stop_on_non_retryable_failure),
+        before=record_retry_attempt("azcopy_batch_transfer"),
+        reraise=True,
+    )
+    @traced_operation("azcopy_batch_transfer")
+    def azcopy_transfer_file_list(
+        self,
+        source_directory: str,
+        file_names: List[str],
+        data_target_location: str,
+        azcopy_command: str = "cp",
+        azcopy_options: str = "",
+        allow_empty_file: str = "False",
+        allow_zero_file: str = "True",
+        cap_mbps: int = AZCOPY_CAP_MBPS,
+    ) -> List[str]:
+        """Transfer a set of files of one directory with a single AzCopy invocation and
+        return the files that were transferred.
+
+        The file names are written to a '--list-of-files' manifest, so AzCopy plans,
+        authenticates and scans once for the whole set instead of once per file. The
+        per-file outcome is mapped back from the 'FailedTransfers' and 'SkippedTransfers'
+        lists of the JSON job summary.
+
+        Args:
+            source_directory (str): The local directory holding the files.
+            file_names (List[str]): The names of the files to transfer, relative to
+                `source_directory`.
+            data_target_location (str): The ADLS location the files are transferred to.
+            azcopy_command (str, optional): The AzCopy command, 'cp' or 'copy'. Defaults to "cp".
+            azcopy_options (str, optional): Additional command-line options to pass to AzCopy.
+            allow_empty_file (str, optional): Flag passed through to `validate_transfer_file`.
+                Defaults to "False".
+            allow_zero_file (str, optional): Flag passed through to `validate_transfer_file`.
+                Defaults to "True".
+            cap_mbps (int, optional): The bandwidth cap passed to AzCopy as '--cap-mbps'.
+                Defaults to AZCOPY_CAP_MBPS.
+
+        Returns:
+            List[str]: The paths of the transferred files, skipped files are left out.
+
+        Raises:
+            FileNotFoundError: Raised when planned local source files do not exist.
+            RuntimeError: Raised when AzCopy reports one or more failed transfers.
+        """
+        retry_count = self.count_copy_attempt()
+        self.logger.info(
+            f"Start AzCopy batch transfer of {len(file_names)} files. Retry count: {retry_count}"
+        )
+
+        source_files = [str(Path(source_directory, file_name)) for file_name in file_names]
+        missing = [file_path for file_path in source_files if not Path(file_path).exists()]
+        if missing:
+            raise FileNotFoundError(f"Planned source files not found: {missing}")
+
+        planned_bytes = sum(os.path.getsize(file_path) for file_path in source_files)
+        settings = self.get_transfer_settings(planned_bytes, cap_mbps)
+        with tempfile.NamedTemporaryFile(
+            mode="w", prefix="azcopy_list_of_files_", suffix=".txt", delete=False
+        ) as manifest_file:
+            manifest_file.write("\n".join(file_names) + "\n")
+        try:
+            cmd = (
+                f"azcopy {azcopy_command} '{source_directory}' '{data_target_location}' "
+                f"--list-of-files '{manifest_file.name}' --as-subdir=false --recursive=true "
+                f"{azcopy_options} {settings.to_azcopy_options()} --output-type=json"
+            )
+            start_time = time.perf_counter()
+            command_result = self.run_transfer_attempt(
+                cmd, settings, source_directory, data_target_location
+            )
+            elapsed_sec = time.perf_counter() - start_time
+        finally:
+            os.remove(manifest_file.name)
+        summary = parse_azcopy_summary(command_result.output)
+
+        try:
+            validate_transfer_file(
+                azcopy_output=command_result,
+                retry_count=retry_count,
+                allow_empty_file=allow_empty_file,
+                allow_zero_file=allow_zero_file,
+                file_exists=True,
+            )
+        except ValueError:
+            self.record_failed_attempt(
+                "azcopy_batch_transfer", source_directory, summary, command_result
+            )
+            raise
+        self.logger.debug(f"AzCopy stdout:\n{command_result.output}")
+
+        self.logger.info(
+            f"AzCopy summary: JobStatus={summary.job_status}, "
+            f"TotalTransfers={summary.total_transfers}, "
+            f"TransfersCompleted={summary.transfers_completed}, "
+            f"TransfersFailed={summary.transfers_failed}"
+        )
+
+        if summary.total_transfers == 0:
+            self.logger.info(
+                "AzCopy reported TotalTransfers=0; treating as successful no-op and returning []."
+            )
+            self.record_successful_attempt("azcopy_batch_transfer", source_directory, summary)
+            return []
+
+        if summary.transfers_failed:
+            failure_class = self.record_failed_attempt(
+                "azcopy_batch_transfer", source_directory, summary, command_result
+            )
+            raise AzCopyTransferError(
+                f"AzCopy reported failed transfers: TransfersFailed={summary.transfers_failed} "
+                f"/ TotalTransfers={summary.total_transfers}, files: {summary.failed_sources}",
+                failure_class=failure_class,
+                job_id=summary.job_id,
+            )
+
+        self.record_successful_attempt("azcopy_batch_transfer", source_directory, summary)
+        self.record_transfer(planned_bytes, summary, elapsed_sec, settings)
+
+        skipped_names = {os.path.basename(source) for source in summary.skipped_sources}
+        if skipped_names:
+            self.logger.warning(f"AzCopy skipped files: {sorted(skipped_names)}")
+        return [
+            file_path
+            for file_path in source_files
+            if os.path.basename(file_path) not in skipped_names
+        ]
+
     @retry(
         wait=wait_exponential(multiplier=1.5, min=20, max=300),
         stop=stop_after_attempt(MAX_AZCOPY_RETRY),
+        before=record_retry_attempt("azcopy_cleanup"),
         reraise=True,
     )
+    @traced_operation("azcopy_cleanup")
     def azcopy_cleanup_file(
         self,
         cleanup_filepath: str,
@@ -425,8 +1304,8 @@ class AzCopyDataTransferTask(BaseDataTransferTask):
             azcopy_command (str): A command listed in AzCopy's available commands, default as "cp" for copy
         """
         # Log the retry count of file cleanup
-        self.logger.info(f"Start Azcopy file cleanup. Retry count: {self.cleanup_retry_count}")
-        self.cleanup_retry_count += 1
+        retry_count = self.count_cleanup_attempt()
+        self.logger.info(f"Start Azcopy file cleanup. Retry count: {retry_count}")
 
         cleanup_file_pattern = os.path.basename(cleanup_file_pattern)
         # Run azcopy command to cleanup existing files
@@ -451,6 +1330,11 @@ class AzCopyDataTransferTask(BaseDataTransferTask):
             str: target file location
         """
         self.logger.info(f"Starting execution of {self.__class__.__name__}.")
+        self.setup_upload_manifest()
+        if self.module_config.archive_flag == "True":
+            validate_archive_path(self.module_config.archive_path)
+        if self.use_batch_cleanup():
+            self.cleanup_plan = self.cleanup_destination(self.files_to_transfer)
 
         if self.module_config.source:
             # Validate source config using the class from the source's type
@@ -459,6 +1343,17 @@ class AzCopyDataTransferTask(BaseDataTransferTask):
             if self.module_config.source["type"] == "ADLSLocation":
                 source_config = source_config.update_adls_filepath_url()
             source_configs = [source_config]
+        elif self.files_to_transfer and self.module_config.batch_transfer_flag == "True":
+            if self.module_config.azcopy_command in AZCOPY_LIST_OF_FILES_COMMANDS:
+                return self.execute_batch_transfer()
+            self.logger.warning(
+                f"AzCopy command '{self.module_config.azcopy_command}' does not support "
+                "'--list-of-files', transferring files one by one."
+            )
+            source_configs = [
+                LocalLocation(filepath=file, type="LocalLocation")
+                for file in self.files_to_transfer
+            ]
         elif self.files_to_transfer:
             source_configs = [
                 LocalLocation(filepath=file, type="LocalLocation")
@@ -469,46 +1364,195 @@ class AzCopyDataTransferTask(BaseDataTransferTask):
             self.logger.error(err_msg)
             raise ValueError(err_msg)
 
+        if (
+            not self.module_config.source
+            and (self.module_config.max_concurrent_transfers or 1) > 1
+            and len(source_configs) > 1
+        ):
+            return self.execute_concurrent_transfer()
+
         for source_config in source_configs:
-            self.logger.info(f"Peforming transfer on source config file: {source_config.filepath}")
-            # Validate target config using the class from the source's type
-            target_validate_class = get_class_object(__name__, self.module_config.target["type"])
+            filepath_without_token = self.transfer_source(source_config)
+        self.upload_manifest_to_target()
+        self.archive_source_files()
+
+        self.logger.info(f"Execution of {self.__class__.__name__} completed.")
+
+        return filepath_without_token
+
+    def transfer_source(self, source_config: BaseModel, cap_mbps: Optional[int] = None) -> str:
+        """Cleanup the destination and transfer one source location.
+
+        Args:
+            source_config (BaseModel): The validated source location.
+            cap_mbps (Optional[int], optional): The AzCopy bandwidth cap already leased by
+                the caller. Defaults to None, to lease one from the host ledger.
+
+        Returns:
+            str: target file location
+        """
+        self.logger.info(f"Peforming transfer on source config file: {source_config.filepath}")
+        # Validate target config using the class from the source's type
+        target_validate_class = get_class_object(__name__, self.module_config.target["type"])
+        target_configs = target_validate_class(
+            **self.module_config.target,
+            cleanup_file_pattern=os.path.basename(source_config.filepath),
+        )
+        if self.module_config.target["type"] == "ADLSLocation":
+            target_configs = target_configs.update_adls_filepath_url()
+
+        if self.upload_manifest is not None and self.is_unchanged_on_target(
+            source_config.filepath, target_configs
+        ):
+            self.logger.info(f"Skipping unchanged file: {source_config.filepath}")
+            self.release_source_files([source_config.filepath])
+            return str(target_configs.filepath_without_token)
+
+        # Cleanup existing files with the same pattern on the destination
+        if self.module_config.cleanup_dest_flag == "True" and self.cleanup_plan is None:
+            self.azcopy_cleanup_file(
+                cleanup_filepath=str(target_configs.filepath_without_token),
+                cleanup_file_pattern=str(source_config.filepath),
+                cleanup_options=self.module_config.cleanup_options,
+                azcopy_command="rm",
+                sas_token=str(target_configs.sas_token),
+            )
+
+            self.logger.info(
+                f"Cleaned up file with pattern: {target_configs.cleanup_file_pattern} completed."
+            )
+
+        # Execute data transfer
+        with self.bandwidth_lease(cap_mbps) as lease_mbps:
+            success_file = self.azcopy_transfer_file(
+                data_source_location=str(source_config.filepath),
+                data_target_location=str(target_configs.filepath),
+                azcopy_command=self.module_config.azcopy_command,
+                azcopy_options=self.get_azcopy_options(),
+                allow_empty_file=self.module_config.allow_empty_file,
+                allow_zero_file=self.module_config.allow_zero_file,
+                cap_mbps=lease_mbps,
+            )
+        self.record_upload(success_file, target_configs)
+        self.release_source_files(success_file)
+
+        return str(getattr(target_configs, "filepath_without_token", None) or "")
+
+    def execute_concurrent_transfer(self) -> str:
+        """Transfer the files of the previous task concurrently, largest first, with up
+        to 'max_concurrent_transfers' AzCopy processes sharing the host bandwidth budget.
+
+        Returns:
+            str: target file location
+
+        Raises:
+            RuntimeError: If any file failed to transfer, raised once every transfer ended.
+        """
+        scheduler = TransferScheduler(
+            transfer_function=lambda file_path, cap_mbps: self.transfer_source(
+                LocalLocation(filepath=file_path, type="LocalLocation"), cap_mbps=cap_mbps
+            ),
+            max_concurrency=self.module_config.max_concurrent_transfers,
+            ledger=self.bandwidth_ledger,
+            max_lease_mbps=self.module_config.azcopy_cap_mbps,
+        )
+        self.transfer_results = scheduler.run(self.files_to_transfer)
+
+        failed_results = [
+            result for result in self.transfer_results if result.status == JobStatus.FAILED.value
+        ]
+        if failed_results:
+            raise RuntimeError(
+                f"{len(failed_results)} of {len(self.transfer_results)} transfers failed: "
+                + "; ".join(f"{result.file_path}: {result.error}" for result in failed_results)
+            ) from failed_results[0].error
+
+        self.upload_manifest_to_target()
+        self.archive_source_files()
+        self.logger.info(f"Execution of {self.__class__.__name__} completed.")
+
+        return self.transfer_results[0].output
+
+    def execute_batch_transfer(self) -> str:
+        """Transfer the files of the previous task with one cleanup and one copy per
+        source directory, instead of one of each per file.
+
+        The destination cleanup removes every file name of the set with a single
+        semicolon-separated include pattern, and only the files reported as transferred
+        are removed from the source when 'cleanup_source_flag' is set.
+
+        Returns:
+            str: target file location
+        """
+        target_validate_class = get_class_object(__name__, self.module_config.target["type"])
+        transferred_files = []
+        for source_directory, file_names in group_files_by_directory(
+            self.files_to_transfer
+        ).items():
+            self.logger.info(
+                f"Performing batch transfer of {len(file_names)} files from: {source_directory}"
+            )
             target_configs = target_validate_class(
                 **self.module_config.target,
-                cleanup_file_pattern=os.path.basename(source_config.filepath),
+                cleanup_file_pattern=";".join(file_names),
             )
             if self.module_config.target["type"] == "ADLSLocation":
                 target_configs = target_configs.update_adls_filepath_url()
 
-            # Cleanup existing files with the same pattern on the destination
-            if self.module_config.cleanup_dest_flag == "True":
-                filepath_without_token = str(target_configs.filepath_without_token)
+            if self.upload_manifest is not None:
+                unchanged_files = [
+                    str(Path(source_directory, file_name))
+                    for file_name in file_names
+                    if self.is_unchanged_on_target(
+                        str(Path(source_directory, file_name)), target_configs
+                    )
+                ]
+                if unchanged_files:
+                    self.logger.info(f"Skipping unchanged files: {unchanged_files}")
+                    self.release_source_files(unchanged_files)
+                file_names = [
+                    file_name
+                    for file_name in file_names
+                    if str(Path(source_directory, file_name)) not in unchanged_files
+                ]
+                if not file_names:
+                    continue
+                target_configs = target_configs.model_copy(
+                    update={"cleanup_file_pattern": ";".join(file_names)}
+                )
+
+            if self.module_config.cleanup_dest_flag == "True" and self.cleanup_plan is None:
                 self.azcopy_cleanup_file(
                     cleanup_filepath=str(target_configs.filepath_without_token),
-                    cleanup_file_pattern=str(source_config.filepath),
+                    cleanup_file_pattern=target_configs.cleanup_file_pattern,
                     cleanup_options=self.module_config.cleanup_options,
                     azcopy_command="rm",
                     sas_token=str(target_configs.sas_token),
                 )
-
-                self.logger.info(
-                    f"Cleaned up file with pattern: {target_configs.cleanup_file_pattern} completed."
+                self.logger.info(f"Cleaned up {len(file_names)} files on the destination.")
+
+            with self.bandwidth_lease() as lease_mbps:
+                success_files = self.azcopy_transfer_file_list(
+                    source_directory=source_directory,
+                    file_names=file_names,
+                    data_target_location=str(target_configs.filepath),
+                    azcopy_command=self.module_config.azcopy_command,
+                    azcopy_options=self.get_azcopy_options(),
+                    allow_empty_file=self.module_config.allow_empty_file,
+                    allow_zero_file=self.module_config.allow_zero_file,
+                    cap_mbps=lease_mbps,
                 )
+            transferred_files.extend(success_files)
+            self.record_upload(success_files, target_configs)
+            self.release_source_files(success_files)
 
-            # Execute data transfer
-            success_file = self.azcopy_transfer_file(
-                data_source_location=str(source_config.filepath),
-                data_target_location=str(target_configs.filepath),
-                azcopy_command=self.module_config.azcopy_command,
-                azcopy_options=self.module_config.azcopy_options,
-                allow_empty_file=self.module_config.allow_empty_file,
-                allow_zero_file=self.module_config.allow_zero_file,
-            )
-
-            if self.module_config.cleanup_source_flag == "True":
-                self.logger.info(f"Cleaning up source file: {source_config.filepath}")
-                cleanup_files(success_file)
-
-        self.logger.info(f"Execution of {self.__class__.__name__} completed.")
+        self.upload_manifest_to_target()
+        self.archive_source_files()
+        self.logger.info(
+            f"Execution of {self.__class__.__name__} completed, "
+            f"{len(transferred_files)} of {len(self.files_to_transfer)} files transferred."
+        )
 
-        return filepath_without_token
+        return str(
+            getattr(target_configs, "filepath_without_token", None) or target_configs.filepath
+        )
@@ -0,0 +1,210 @@
+"""AzCopy Progress Module.
+
+Follows the `--output-type=json` stdout of a running AzCopy job line by line, logs the
+percent done, throughput and ETA at a fixed interval, and optionally publishes them as
+an OpenMetrics textfile while the job runs.
+"""
+
+# import: standard
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    METRICS_TEXTFILE_DIR_ENV,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import OpenMetricsWriter
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    write_metrics_textfile,
+)
+
+BYTES_PER_MB = 1024 * 1024
+DEFAULT_PROGRESS_LOG_INTERVAL_SEC = 60
+
+
+@dataclass
+class AzCopyProgress:
+    """Dataclass to store the latest progress of an AzCopy job.
+
+    Attributes:
+        percent_complete (Optional[float]): Percent of the job done.
+        bytes_transferred (int): Bytes transferred so far.
+        bytes_expected (Optional[int]): Bytes planned for the job.
+        transfers_completed (int): Completed transfers so far.
+        total_transfers (Optional[int]): Planned transfers.
+        mb_per_sec (Optional[float]): Throughput since the previous log, in MB/s.
+        eta_sec (Optional[float]): Estimated seconds to completion.
+    """
+
+    percent_complete: Optional[float] = None
+    bytes_transferred: int = 0
+    bytes_expected: Optional[int] = None
+    transfers_completed: int = 0
+    total_transfers: Optional[int] = None
+    mb_per_sec: Optional[float] = None
+    eta_sec: Optional[float] = None
+
+
+def to_number(value, number_type=int):
+    """Convert an AzCopy JSON value, which may be a string, to a number.
+
+    Args:
+        value: The value.
+        number_type: int or float.
+
+    Returns:
+        The number, None if the value is missing or not numeric.
+    """
+    try:
+        return number_type(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class AzCopyProgressMonitor:
+    """Handle the JSON lines of a running AzCopy job.
+
+    `handle_line` is meant as the `on_line` callback of `stream_command`: it returns
+    True when a line shows the job moving forward, so a job whose progress messages keep
+    reporting the same counts is detected as stalled. The Init message is kept in
+    `init_line`, as the bounded output of a long job drops it with the job id it carries.
+    """
+
+    def __init__(
+        self,
+        log_interval_sec: float = DEFAULT_PROGRESS_LOG_INTERVAL_SEC,
+        metrics_name: str = "",
+        metrics_textfile_dir: Optional[str] = None,
+    ) -> None:
+        """Initialize the AzCopyProgressMonitor.
+
+        Args:
+            log_interval_sec (float): Seconds between two progress logs.
+            metrics_name (str): Name of the progress metrics textfile, e.g. the job name.
+            metrics_textfile_dir (Optional[str]): The textfile collector directory.
+                Defaults to the METRICS_TEXTFILE_DIR environment variable, no textfile
+                is written if unset.
+        """
+        self.log_interval_sec = log_interval_sec
+        self.metrics_name = metrics_name
+        self.metrics_textfile_dir = metrics_textfile_dir or os.getenv(METRICS_TEXTFILE_DIR_ENV)
+        self.progress = AzCopyProgress()
+        self.init_line: Optional[str] = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._last_log_time = time.monotonic()
+        self._last_log_bytes = 0
+
+    def handle_line(self, line: str) -> bool:
+        """Update the progress from one stdout line and log it when the interval elapsed.
+
+        Args:
+            line (str): An AzCopy stdout line.
+
+        Returns:
+            bool: True if the line is an Init or EndOfJob message, or a Progress message
+                with more bytes or transfers done than the previous one.
+        """
+        try:
+            event = json.loads(line)
+            message_type = event.get("MessageType")
+            content = json.loads(event.get("MessageContent") or "{}")
+        except (json.JSONDecodeError, AttributeError, TypeError):
+            return False
+        if message_type == "Init":
+            self.init_line = line
+            return True
+        if message_type == "EndOfJob":
+            return True
+        if message_type != "Progress" or not isinstance(content, dict):
+            return False
+
+        bytes_transferred = to_number(content.get("TotalBytesTransferred")) or 0
+        transfers_completed = to_number(content.get("TransfersCompleted")) or 0
+        moved_forward = (
+            bytes_transferred > self.progress.bytes_transferred
+            or transfers_completed > self.progress.transfers_completed
+        )
+        self.progress.bytes_transferred = max(bytes_transferred, self.progress.bytes_transferred)
+        self.progress.transfers_completed = max(
+            transfers_completed, self.progress.transfers_completed
+        )
+        self.progress.percent_complete = to_number(content.get("PercentComplete"), float)
+        self.progress.bytes_expected = to_number(
+            content.get("TotalBytesExpected") or content.get("TotalBytesEnumerated")
+        )
+        self.progress.total_transfers = to_number(content.get("TotalTransfers"))
+
+        if time.monotonic() - self._last_log_time >= self.log_interval_sec:
+            self.report()
+        return moved_forward
+
+    def report(self) -> None:
+        """Compute the throughput and ETA since the previous report, log them, and write
+        the progress metrics textfile."""
+        now = time.monotonic()
+        elapsed_sec = now - self._last_log_time
+        if elapsed_sec > 0:
+            bytes_per_sec = (self.progress.bytes_transferred - self._last_log_bytes) / elapsed_sec
+            self.progress.mb_per_sec = round(bytes_per_sec / BYTES_PER_MB, 3)
+            remaining_bytes = (self.progress.bytes_expected or 0) - self.progress.bytes_transferred
+            self.progress.eta_sec = (
+                round(remaining_bytes / bytes_per_sec, 1)
+                if bytes_per_sec > 0 and remaining_bytes >= 0
+                else None
+            )
+        self._last_log_time = now
+        self._last_log_bytes = self.progress.bytes_transferred
+
+        self.logger.info(
+            f"AzCopy progress: {self.progress.percent_complete}% done, "
+            f"{self.progress.transfers_completed}/{self.progress.total_transfers} transfers, "
+            f"{self.progress.bytes_transferred}/{self.progress.bytes_expected} bytes, "
+            f"{self.progress.mb_per_sec} MB/s, ETA: {self.progress.eta_sec}s"
+        )
+        if self.metrics_textfile_dir:
+            try:
+                self.write_metrics_textfile()
+            except Exception as e:
+                self.logger.warning(f"Failed to write the progress metrics textfile: {e}")
+
+    def write_metrics_textfile(self) -> None:
+        """Write the latest progress as an OpenMetrics textfile."""
+        labels = {"job_name": self.metrics_name}
+        writer = OpenMetricsWriter()
+        writer.add(
+            "transfer_progress_percent",
+            "Percent done of the running AzCopy job.",
+            labels,
+            self.progress.percent_complete,
+        )
+        writer.add(
+            "transfer_progress_bytes",
+            "Bytes transferred by the running AzCopy job.",
+            labels,
+            self.progress.bytes_transferred,
+        )
+        writer.add(
+            "transfer_progress_mb_per_second",
+            "Recent throughput of the running AzCopy job in MB/s.",
+            labels,
+            self.progress.mb_per_sec,
+        )
+        writer.add(
+            "transfer_progress_eta_seconds",
+            "Estimated seconds to completion of the running AzCopy job.",
+            labels,
+            self.progress.eta_sec,
+        )
+        writer.add(
+            "transfer_progress_timestamp_seconds",
+            "Time of the last progress update as a Unix timestamp.",
+            labels,
+            round(time.time(), 3),
+        )
+        write_metrics_textfile(
+            self.metrics_textfile_dir, f"{self.metrics_name}_transfer_progress", writer.render()
+        )
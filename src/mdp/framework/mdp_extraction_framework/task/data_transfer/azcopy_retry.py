@@ -0,0 +1,184 @@
+"""AzCopy Retry Module.
+
+Retry policy of the AzCopy transfers: failures are classified from the AzCopy output,
+the backoff before the next attempt depends on the failure class, and a job whose
+transfers failed is resumed with 'azcopy jobs resume' instead of being planned and
+uploaded again from scratch.
+"""
+
+# import: standard
+import time
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+
+# import: external
+from tenacity import RetryCallState
+from tenacity import wait_exponential
+
+
+class AzCopyFailureClass:
+    """AzCopy failure classes, each with its own backoff."""
+
+    AUTH = "auth"
+    THROTTLED = "throttled"
+    NETWORK = "network"
+    STALLED = "stalled"
+    TRANSFER = "transfer"
+
+
+# Markers of each failure class in the AzCopy output, checked in this order
+FAILURE_CLASS_MARKERS = {
+    AzCopyFailureClass.STALLED: ["no progress"],
+    AzCopyFailureClass.AUTH: [
+        "AuthenticationFailed",
+        "AuthorizationFailure",
+        "AuthorizationPermissionMismatch",
+        "Server failed to authenticate",
+        "Status: 403",
+    ],
+    AzCopyFailureClass.THROTTLED: ["ServerBusy", "OperationTimedOut", "Status: 503", "Status: 429"],
+    AzCopyFailureClass.NETWORK: [
+        "connection reset",
+        "connection refused",
+        "no such host",
+        "i/o timeout",
+        "TLS handshake",
+        "dial tcp",
+        "unexpected EOF",
+    ],
+}
+
+# Backoff of each failure class: a stalled job is killed early and retried at once, a
+# throttled account gets time to recover
+FAILURE_CLASS_WAITS = {
+    AzCopyFailureClass.STALLED: wait_exponential(multiplier=1, min=1, max=30),
+    AzCopyFailureClass.NETWORK: wait_exponential(multiplier=1.5, min=5, max=120),
+    AzCopyFailureClass.THROTTLED: wait_exponential(multiplier=2, min=60, max=600),
+    AzCopyFailureClass.AUTH: wait_exponential(multiplier=1.5, min=20, max=300),
+    AzCopyFailureClass.TRANSFER: wait_exponential(multiplier=1.5, min=20, max=300),
+}
+
+# Failure classes a new attempt cannot fix, e.g. an expired SAS token
+NON_RETRYABLE_FAILURE_CLASSES = {AzCopyFailureClass.AUTH}
+
+
+def classify_azcopy_failure(text: Optional[str]) -> str:
+    """Classify an AzCopy failure from its output or error message.
+
+    Args:
+        text (Optional[str]): The AzCopy output, error, or exception message.
+
+    Returns:
+        str: One of AzCopyFailureClass values, TRANSFER if no marker matches.
+    """
+    lowered_text = (text or "").lower()
+    for failure_class, markers in FAILURE_CLASS_MARKERS.items():
+        if any(marker.lower() in lowered_text for marker in markers):
+            return failure_class
+    return AzCopyFailureClass.TRANSFER
+
+
+class AzCopyTransferError(RuntimeError):
+    """Raised when AzCopy reports failed transfers."""
+
+    def __init__(self, message: str, failure_class: str, job_id: Optional[str] = None) -> None:
+        """Initialize the AzCopyTransferError.
+
+        Args:
+            message (str): The error message.
+            failure_class (str): One of AzCopyFailureClass values.
+            job_id (Optional[str]): The AzCopy job id, used to resume the job.
+        """
+        super().__init__(message)
+        self.failure_class = failure_class
+        self.job_id = job_id
+
+
+def get_failure_class(retry_state: RetryCallState) -> str:
+    """Get the failure class of the last attempt of a retried call.
+
+    Args:
+        retry_state (RetryCallState): The tenacity retry state.
+
+    Returns:
+        str: One of AzCopyFailureClass values.
+    """
+    exception = retry_state.outcome.exception() if retry_state.outcome else None
+    return getattr(exception, "failure_class", None) or classify_azcopy_failure(str(exception))
+
+
+def wait_for_failure_class(retry_state: RetryCallState) -> float:
+    """Tenacity `wait` picking the backoff of the failure class of the last attempt.
+
+    Args:
+        retry_state (RetryCallState): The tenacity retry state.
+
+    Returns:
+        float: Seconds to wait before the next attempt.
+    """
+    return FAILURE_CLASS_WAITS[get_failure_class(retry_state)](retry_state)
+
+
+def stop_on_non_retryable_failure(retry_state: RetryCallState) -> bool:
+    """Tenacity `stop` giving up at once on failures a new attempt cannot fix.
+
+    Args:
+        retry_state (RetryCallState): The tenacity retry state.
+
+    Returns:
+        bool: True if the last attempt failed with a non-retryable failure class.
+    """
+    return get_failure_class(retry_state) in NON_RETRYABLE_FAILURE_CLASSES
+
+
+@dataclass
+class AzCopyFailedJob:
+    """Dataclass to store a failed AzCopy job waiting for its next attempt.
+
+    Attributes:
+        job_id (Optional[str]): The AzCopy job id, None if AzCopy did not report it.
+        failure_class (str): One of AzCopyFailureClass values.
+        first_failure_time (float): `time.monotonic()` of the first failed attempt.
+        last_failure_time (float): `time.monotonic()` of the last failed attempt.
+    """
+
+    job_id: Optional[str]
+    failure_class: str
+    first_failure_time: float = 0.0
+    last_failure_time: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Set the failure times to now if not given."""
+        self.first_failure_time = self.first_failure_time or time.monotonic()
+        self.last_failure_time = self.last_failure_time or self.first_failure_time
+
+
+def build_azcopy_resume_command(
+    job_id: str,
+    data_source_location: str,
+    data_target_location: str,
+    cap_mbps: Optional[int] = None,
+) -> str:
+    """Build the 'azcopy jobs resume' command of a job, passing the SAS tokens of the
+    remote locations as AzCopy does not store them in the job plan, nor the bandwidth cap.
+
+    Args:
+        job_id (str): The AzCopy job id.
+        data_source_location (str): The source location of the job.
+        data_target_location (str): The target location of the job.
+        cap_mbps (Optional[int]): The bandwidth cap of the resumed job, uncapped if None.
+
+    Returns:
+        str: The resume command.
+    """
+    command = f"azcopy jobs resume {job_id}"
+    source_sas = urlsplit(data_source_location).query
+    if data_source_location.startswith("http") and source_sas:
+        command = f"{command} --source-sas='{source_sas}'"
+    target_sas = urlsplit(data_target_location).query
+    if data_target_location.startswith("http") and target_sas:
+        command = f"{command} --destination-sas='{target_sas}'"
+    if cap_mbps:
+        command = f"{command} --cap-mbps={cap_mbps}"
+    return f"{command} --output-type=json"
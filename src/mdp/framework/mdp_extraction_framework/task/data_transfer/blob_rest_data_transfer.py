@@ -0,0 +1,400 @@
+"""Blob REST Data Transfer Module.
+
+A data transfer task uploading to ADLS in-process through the Blob REST API instead of
+running AzCopy. It keeps the orchestration of `AzCopyDataTransferTask` (cleanup, batch,
+concurrent, skip unchanged and tuning options) and replaces the AzCopy calls.
+"""
+
+# import: standard
+import glob
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Optional
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.config_validator.job_parameters import JobParameters
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    DataFileInformation,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
+    AZCOPY_CAP_MBPS,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
+    MAX_AZCOPY_RETRY,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
+    ADLSLocation,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
+    AzCopyDataTransferTask,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
+    AzCopyJobSummary,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
+    DataTransferTaskConfigModel,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import (
+    DEFAULT_BLOCK_SIZE,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import (
+    DEFAULT_MAX_WORKERS,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import BlobRestClient
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import BlobUploader
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import (
+    matches_any_pattern,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import (
+    split_container_path,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import split_url
+from mdp.framework.mdp_extraction_framework.task.data_transfer.cleanup_planner import CleanupPlan
+from mdp.framework.mdp_extraction_framework.task.data_transfer.cleanup_planner import (
+    delete_planned_blobs,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import BYTES_PER_MB
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import (
+    UPLOAD_MANIFEST_FILE_NAME,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    record_retry_attempt,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import traced_operation
+
+# import: external
+from pydantic import BaseModel
+from tenacity import retry
+from tenacity import stop_after_attempt
+from tenacity import wait_exponential
+
+
+class BlobRestDataTransferTaskConfigModel(DataTransferTaskConfigModel):
+    """Pydantic class to validate the BlobRestDataTransferTask, the AzCopy command is
+    not used and optional.
+
+    Args:
+        DataTransferTaskConfigModel: The AzCopy data transfer config model
+    """
+
+    azcopy_command: Optional[str] | None = "cp"
+
+
+class BlobRestDataTransferTask(AzCopyDataTransferTask):
+    """Class for transfer local files to ADLS with the Blob REST API.
+
+    'azcopy_concurrency' sets the number of blocks uploaded in parallel per file and
+    'azcopy_block_size_mb' the block size, both picked from the target's throughput
+    history when adaptive tuning is enabled.
+    """
+
+    parameter_config_model = BlobRestDataTransferTaskConfigModel
+
+    def __init__(
+        self,
+        module_config: dict,
+        job_parameters: JobParameters,
+        file_infos: List[DataFileInformation] = None,
+    ):
+        """Initializes a BlobRestDataTransferTask instance.
+
+        Args:
+            module_config (dict): A dictionary containing module configuration settings.
+            job_parameters (JobParameters): An object containing job parameters.
+            file_infos (List[DataFileInformation]): A list containing paths of files to transfer.
+
+        Raises:
+            ValueError: If the target is not an ADLS location.
+        """
+        super().__init__(module_config, job_parameters, file_infos)
+        if self.module_config.target["type"] != "ADLSLocation":
+            raise ValueError(f"{self.__class__.__name__} only supports an ADLSLocation target.")
+        self.clients: Dict[str, BlobRestClient] = {}
+        self._clients_lock = threading.Lock()
+
+    def get_client(self, url: str) -> BlobRestClient:
+        """Get the client of the endpoint of a URL, shared by every upload of the task.
+
+        Args:
+            url (str): A blob or directory URL with its SAS token.
+
+        Returns:
+            BlobRestClient: The client.
+        """
+        scheme, host, _, sas_token = split_url(url)
+        with self._clients_lock:
+            client_key = f"{scheme}://{host}?{sas_token}"
+            if client_key not in self.clients:
+                self.clients[client_key] = BlobRestClient.from_url(url)
+            return self.clients[client_key]
+
+    def upload_files(
+        self,
+        source_files: List[str],
+        data_target_location: str,
+        allow_empty_file: str = "False",
+        cap_mbps: int = AZCOPY_CAP_MBPS,
+    ) -> List[str]:
+        """Upload local files to a target directory, one file at a time with its blocks
+        uploaded in parallel.
+
+        Args:
+            source_files (List[str]): The local files.
+            data_target_location (str): The target directory URL with its SAS token.
+            allow_empty_file (str, optional): "False" to fail when every file is empty.
+                Defaults to "False".
+            cap_mbps (int, optional): The bandwidth cap. Defaults to AZCOPY_CAP_MBPS.
+
+        Returns:
+            List[str]: The uploaded files.
+
+        Raises:
+            FileNotFoundError: Raised when planned local source files do not exist.
+            ValueError: Raised when only empty files were planned and they are not allowed.
+        """
+        missing = [file_path for file_path in source_files if not Path(file_path).is_file()]
+        if missing:
+            raise FileNotFoundError(f"Planned source files not found: {missing}")
+
+        planned_bytes = sum(os.path.getsize(file_path) for file_path in source_files)
+        if planned_bytes == 0 and allow_empty_file == "False":
+            raise ValueError(f"Only empty files planned to transfer: {source_files}")
+
+        settings = self.get_transfer_settings(planned_bytes, cap_mbps)
+        uploader = BlobUploader(
+            client=self.get_client(data_target_location),
+            block_size=(settings.block_size_mb * BYTES_PER_MB)
+            if settings.block_size_mb
+            else DEFAULT_BLOCK_SIZE,
+            max_workers=settings.concurrency or DEFAULT_MAX_WORKERS,
+            cap_mbps=settings.cap_mbps,
+        )
+        directory_path = split_url(data_target_location)[2].rstrip("/")
+
+        start_time = time.perf_counter()
+        for file_path in source_files:
+            result = uploader.upload_file(
+                file_path, f"{directory_path}/{os.path.basename(file_path)}"
+            )
+            self.file_md5s[str(Path(file_path).resolve())] = result.content_md5
+            self.logger.info(
+                f"Uploaded {file_path}: {result.bytes_uploaded} bytes in "
+                f"{result.block_count} blocks, {result.elapsed_sec}s"
+            )
+        elapsed_sec = time.perf_counter() - start_time
+
+        self.record_transfer(
+            planned_bytes,
+            AzCopyJobSummary(
+                total_transfers=len(source_files),
+                transfers_completed=len(source_files),
+                transfers_failed=0,
+                bytes_transferred=planned_bytes,
+            ),
+            elapsed_sec,
+            settings,
+        )
+        return source_files
+
+    @retry(
+        wait=wait_exponential(multiplier=1.5, min=20, max=300),
+        stop=stop_after_attempt(MAX_AZCOPY_RETRY),
+        before=record_retry_attempt("blob_transfer"),
+        reraise=True,
+    )
+    @traced_operation("blob_transfer")
+    def azcopy_transfer_file(
+        self,
+        data_source_location: str,
+        data_target_location: str,
+        azcopy_command: str = "cp",
+        azcopy_options: str = "",
+        allow_empty_file: str = "False",
+        allow_zero_file: str = "True",
+        cap_mbps: int = AZCOPY_CAP_MBPS,
+    ) -> List[str]:
+        """Upload a local file, directory or glob pattern to a target directory.
+
+        Args:
+            data_source_location (str): The local file, directory or glob pattern.
+            data_target_location (str): The target directory URL with its SAS token.
+            azcopy_command (str, optional): Not used.
+            azcopy_options (str, optional): Not used.
+            allow_empty_file (str, optional): "False" to fail when every file is empty.
+                Defaults to "False".
+            allow_zero_file (str, optional): "True" to return an empty list when no file
+                matches the source. Defaults to "True".
+            cap_mbps (int, optional): The bandwidth cap. Defaults to AZCOPY_CAP_MBPS.
+
+        Returns:
+            List[str]: The uploaded files.
+
+        Raises:
+            ValueError: Raised when no file matches the source and it is not allowed.
+        """
+        retry_count = self.count_copy_attempt()
+        self.logger.info(f"Start Blob REST file transfer. Retry count: {retry_count}")
+
+        source_path = Path(data_source_location)
+        if any(ch in data_source_location for ch in ["*", "?", "[", "]"]):
+            source_files = sorted(
+                str(Path(p).resolve()) for p in glob.glob(data_source_location) if Path(p).is_file()
+            )
+        elif source_path.is_dir():
+            source_files = sorted(str(p.resolve()) for p in source_path.iterdir() if p.is_file())
+        else:
+            source_files = [str(source_path.resolve())]
+
+        if not source_files:
+            if allow_zero_file == "True":
+                self.logger.info(f"No file matched '{data_source_location}', returning [].")
+                return []
+            raise ValueError(f"No file matched the source: {data_source_location}")
+
+        return self.upload_files(source_files, data_target_location, allow_empty_file, cap_mbps)
+
+    @retry(
+        wait=wait_exponential(multiplier=1.5, min=20, max=300),
+        stop=stop_after_attempt(MAX_AZCOPY_RETRY),
+        before=record_retry_attempt("blob_batch_transfer"),
+        reraise=True,
+    )
+    @traced_operation("blob_batch_transfer")
+    def azcopy_transfer_file_list(
+        self,
+        source_directory: str,
+        file_names: List[str],
+        data_target_location: str,
+        azcopy_command: str = "cp",
+        azcopy_options: str = "",
+        allow_empty_file: str = "False",
+        allow_zero_file: str = "True",
+        cap_mbps: int = AZCOPY_CAP_MBPS,
+    ) -> List[str]:
+        """Upload a set of files of one directory to a target directory.
+
+        Args:
+            source_directory (str): The local directory holding the files.
+            file_names (List[str]): The names of the files to transfer, relative to
+                `source_directory`.
+            data_target_location (str): The target directory URL with its SAS token.
+            azcopy_command (str, optional): Not used.
+            azcopy_options (str, optional): Not used.
+            allow_empty_file (str, optional): "False" to fail when every file is empty.
+                Defaults to "False".
+            allow_zero_file (str, optional): Not used, the set is never empty.
+            cap_mbps (int, optional): The bandwidth cap. Defaults to AZCOPY_CAP_MBPS.
+
+        Returns:
+            List[str]: The uploaded files.
+        """
+        retry_count = self.count_copy_attempt()
+        self.logger.info(
+            f"Start Blob REST batch transfer of {len(file_names)} files. Retry count: {retry_count}"
+        )
+        source_files = [str(Path(source_directory, file_name)) for file_name in file_names]
+        return self.upload_files(source_files, data_target_location, allow_empty_file, cap_mbps)
+
+    @retry(
+        wait=wait_exponential(multiplier=1.5, min=20, max=300),
+        stop=stop_after_attempt(MAX_AZCOPY_RETRY),
+        before=record_retry_attempt("blob_cleanup"),
+        reraise=True,
+    )
+    @traced_operation("blob_cleanup")
+    def azcopy_cleanup_file(
+        self,
+        cleanup_filepath: str,
+        cleanup_file_pattern: str,
+        cleanup_options: str,
+        sas_token: str = None,
+        azcopy_command: str = "rm",
+    ) -> None:
+        """Delete the blobs of the target directory matching the cleanup pattern.
+
+        Args:
+            cleanup_filepath (str): The target directory URL without token.
+            cleanup_file_pattern (str): Semicolon-separated file name patterns.
+            cleanup_options (str): Blobs of sub-directories are also deleted if it holds
+                '--recursive'.
+            sas_token (str): The SAS Token of the target ADLS.
+            azcopy_command (str): Not used.
+        """
+        retry_count = self.count_cleanup_attempt()
+        self.logger.info(f"Start Blob REST file cleanup. Retry count: {retry_count}")
+
+        cleanup_file_pattern = os.path.basename(cleanup_file_pattern)
+        client = self.get_client(f"{cleanup_filepath}?{sas_token}")
+        container_path, prefix = split_container_path(
+            split_url(cleanup_filepath)[2], self.module_config.target["container_name"]
+        )
+        recursive = "--recursive" in (cleanup_options or "")
+
+        deleted_blobs = []
+        for blob_name in client.list_blobs(
+            container_path, prefix, delimiter="" if recursive else "/"
+        ):
+            if matches_any_pattern(os.path.basename(blob_name), cleanup_file_pattern):
+                client.delete_blob(f"{container_path}/{blob_name}")
+                deleted_blobs.append(blob_name)
+        self.logger.info(f"Deleted {len(deleted_blobs)} blobs: {deleted_blobs}")
+
+    @retry(
+        wait=wait_exponential(multiplier=1.5, min=20, max=300),
+        stop=stop_after_attempt(MAX_AZCOPY_RETRY),
+        before=record_retry_attempt("blob_batch_cleanup"),
+        reraise=True,
+    )
+    @traced_operation("blob_batch_cleanup")
+    def delete_cleanup_plan(self, plan: CleanupPlan, target_configs: BaseModel) -> None:
+        """Delete the blobs of a cleanup plan in parallel with the client of the target, a
+        blob already deleted by a previous attempt is ignored.
+
+        Args:
+            plan (CleanupPlan): The cleanup plan.
+            target_configs (BaseModel): The ADLS target location.
+        """
+        delete_planned_blobs(
+            self.get_client(str(target_configs.filepath)),
+            plan,
+            max_workers=self.module_config.azcopy_concurrency or DEFAULT_MAX_WORKERS,
+        )
+
+    def upload_manifest_to_target(self) -> None:
+        """Upload the upload manifest next to the target files, failures are only logged."""
+        if (
+            self.upload_manifest is None
+            or self.module_config.upload_manifest_to_target_flag != "True"
+            or not self.upload_manifest.manifest_path.exists()
+        ):
+            return
+        target_configs = ADLSLocation(
+            **self.module_config.target, cleanup_file_pattern=UPLOAD_MANIFEST_FILE_NAME
+        ).update_adls_filepath_url()
+        try:
+            client = self.get_client(str(target_configs.filepath))
+            directory_path = split_url(str(target_configs.filepath_without_token))[2]
+            BlobUploader(client).upload_file(
+                str(self.upload_manifest.manifest_path),
+                f"{directory_path.rstrip('/')}/{UPLOAD_MANIFEST_FILE_NAME}",
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to upload the upload manifest: {e}")
+        else:
+            self.logger.info("Uploaded the upload manifest next to the target files.")
+
+    def execute(self) -> str:
+        """Transfer the files, then close the connections to the target.
+
+        Returns:
+            str: target file location
+        """
+        try:
+            return super().execute()
+        finally:
+            for client in self.clients.values():
+                client.close()
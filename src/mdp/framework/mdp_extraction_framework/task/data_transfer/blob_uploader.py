@@ -0,0 +1,602 @@
+"""Blob REST Uploader Module.
+
+An in-process client of the Azure Blob REST API authenticated with a SAS token. Files
+and file-like objects are streamed as blocks uploaded in parallel over a pool of
+keep-alive HTTP connections with Put Block, then committed with Put Block List. The MD5
+of the whole stream is computed while reading and stored as the blob's Content-MD5.
+"""
+
+# import: standard
+import base64
+import fnmatch
+import hashlib
+import http.client
+import logging
+import queue
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import wait
+from dataclasses import dataclass
+from typing import BinaryIO
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from urllib.parse import quote
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    record_retry_attempt,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import TracedThreadPoolExecutor
+
+# import: external
+from tenacity import retry
+from tenacity import retry_if_exception_type
+from tenacity import stop_after_attempt
+from tenacity import wait_exponential
+
+BLOB_API_VERSION = "2021-08-06"
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_WORKERS = 8
+MAX_REQUEST_RETRY = 5
+REQUEST_TIMEOUT_SEC = 300
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class BlobRequestError(Exception):
+    """Raised when the Blob service answers with an error status."""
+
+    def __init__(self, method: str, path: str, status: int, body: bytes) -> None:
+        """Initialize the BlobRequestError.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The request path, without query string.
+            status (int): The HTTP status.
+            body (bytes): The response body.
+        """
+        super().__init__(f"{method} {path} returned {status}: {body[:500]!r}")
+        self.status = status
+
+
+class RetryableBlobRequestError(BlobRequestError):
+    """Raised when the Blob service answers with a transient error status."""
+
+
+@dataclass
+class BlobUploadResult:
+    """Dataclass to store the outcome of a blob upload.
+
+    Attributes:
+        blob_path (str): The blob path, starting with the container.
+        bytes_uploaded (int): Number of bytes uploaded.
+        content_md5 (str): The base64 encoded MD5 of the uploaded bytes.
+        block_count (int): Number of blocks, 0 for a single Put Blob.
+        elapsed_sec (float): Wall time of the upload.
+    """
+
+    blob_path: str
+    bytes_uploaded: int
+    content_md5: str
+    block_count: int
+    elapsed_sec: float
+
+
+@dataclass
+class BlobProperties:
+    """Dataclass to store the listed properties of a blob.
+
+    Attributes:
+        name (str): The blob name, relative to the container.
+        size (int): The blob size in bytes.
+        content_md5 (Optional[str]): The base64 encoded Content-MD5, None if not set.
+    """
+
+    name: str
+    size: int
+    content_md5: Optional[str] = None
+
+
+class BandwidthLimiter:
+    """Keep the average upload rate of the threads sharing the limiter under a cap."""
+
+    def __init__(self, cap_mbps: Optional[int]) -> None:
+        """Initialize the BandwidthLimiter.
+
+        Args:
+            cap_mbps (Optional[int]): The cap in Mbps, no limit if None or 0.
+        """
+        self.bytes_per_sec = cap_mbps * 1000 * 1000 / 8 if cap_mbps else None
+        self._lock = threading.Lock()
+        self._start_time = time.monotonic()
+        self._bytes_sent = 0
+
+    def consume(self, byte_count: int) -> None:
+        """Account for bytes about to be sent, sleeping while the rate is above the cap.
+
+        Args:
+            byte_count (int): Bytes about to be sent.
+        """
+        if self.bytes_per_sec is None:
+            return
+        with self._lock:
+            self._bytes_sent += byte_count
+            ready_time = self._start_time + self._bytes_sent / self.bytes_per_sec
+        delay = ready_time - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def make_block_id(index: int) -> str:
+    """Build the base64 block id of a block index, ids of a blob must have equal length.
+
+    Args:
+        index (int): The block index.
+
+    Returns:
+        str: The block id.
+    """
+    return base64.b64encode(f"{index:08d}".encode("ascii")).decode("ascii")
+
+
+def read_block(stream: BinaryIO, size: int) -> bytes:
+    """Read a block of `size` bytes from a stream returning fewer bytes than asked at a
+    time, only the last block of the stream being shorter.
+
+    Args:
+        stream (BinaryIO): The stream.
+        size (int): Bytes to read.
+
+    Returns:
+        bytes: The bytes read, empty at the end of the stream.
+    """
+    chunks: List[bytes] = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def build_block_list_xml(block_ids: List[str]) -> bytes:
+    """Build the Put Block List request body committing the latest version of blocks.
+
+    Args:
+        block_ids (List[str]): The block ids in blob order.
+
+    Returns:
+        bytes: The XML body.
+    """
+    latest_blocks = "".join(f"<Latest>{block_id}</Latest>" for block_id in block_ids)
+    return f'<?xml version="1.0" encoding="utf-8"?><BlockList>{latest_blocks}</BlockList>'.encode(
+        "utf-8"
+    )
+
+
+def split_url(url: str) -> tuple[str, str, str, str]:
+    """Split a blob or directory URL into its parts.
+
+    Args:
+        url (str): The URL, e.g. 'https://account.blob.core.windows.net/container/dir/?sas'.
+
+    Returns:
+        tuple[str, str, str, str]: The scheme, host, unquoted path and SAS token.
+    """
+    parts = urlsplit(url)
+    return parts.scheme, parts.netloc, unquote(parts.path), parts.query
+
+
+def split_container_path(directory_path: str, container_name: str) -> tuple[str, str]:
+    """Split the path of a directory URL into the container path and the blob prefix.
+
+    Args:
+        directory_path (str): The URL path, e.g. '/container/dir' or, for an emulator,
+            '/account/container/dir'.
+        container_name (str): The container name.
+
+    Returns:
+        tuple[str, str]: The container path and the prefix of the directory's blobs,
+            ending with '/' unless it is the container root.
+
+    Raises:
+        ValueError: If the container is not part of the path.
+    """
+    segments = [segment for segment in directory_path.split("/") if segment]
+    if container_name not in segments:
+        raise ValueError(f"Container '{container_name}' not found in path: {directory_path}")
+    container_index = segments.index(container_name)
+    container_path = "/" + "/".join(segments[: container_index + 1])
+    prefix = "/".join(segments[container_index + 1 :])
+    return container_path, f"{prefix}/" if prefix else ""
+
+
+def matches_any_pattern(blob_name: str, patterns: str) -> bool:
+    """Check if a blob name matches one of semicolon-separated wildcard patterns, as
+    AzCopy's '--include-pattern'.
+
+    Args:
+        blob_name (str): The blob base name.
+        patterns (str): Semicolon-separated patterns.
+
+    Returns:
+        bool: True if the name matches one of the patterns.
+    """
+    return any(
+        fnmatch.fnmatchcase(blob_name, pattern) for pattern in patterns.split(";") if pattern
+    )
+
+
+class BlobRestClient:
+    """Client of the Blob REST API for one storage endpoint, authenticated with a SAS
+    token and sharing a pool of keep-alive connections between threads."""
+
+    def __init__(
+        self,
+        scheme: str,
+        host: str,
+        sas_token: str,
+        max_connections: int = DEFAULT_MAX_WORKERS,
+        timeout: float = REQUEST_TIMEOUT_SEC,
+    ) -> None:
+        """Initialize the BlobRestClient.
+
+        Args:
+            scheme (str): 'https', or 'http' for a local emulator.
+            host (str): The endpoint host, with port if any.
+            sas_token (str): The SAS token, without leading '?'.
+            max_connections (int): Connections kept in the pool.
+            timeout (float): Socket timeout of a request in seconds.
+        """
+        self.scheme = scheme
+        self.host = host
+        self.sas_token = sas_token.lstrip("?")
+        self.timeout = timeout
+        self._connections: queue.LifoQueue = queue.LifoQueue(maxsize=max_connections)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "BlobRestClient":
+        """Create a client for the endpoint and SAS token of a URL.
+
+        Args:
+            url (str): A blob, directory or container URL with its SAS token.
+            **kwargs: Other arguments of the client.
+
+        Returns:
+            BlobRestClient: The client.
+        """
+        scheme, host, _, sas_token = split_url(url)
+        return cls(scheme=scheme, host=host, sas_token=sas_token, **kwargs)
+
+    def _get_connection(self) -> http.client.HTTPConnection:
+        """Take a pooled connection or open a new one."""
+        try:
+            return self._connections.get_nowait()
+        except queue.Empty:
+            connection_class = (
+                http.client.HTTPSConnection
+                if self.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            return connection_class(self.host, timeout=self.timeout)
+
+    def _release_connection(self, connection: http.client.HTTPConnection) -> None:
+        """Return a connection to the pool, closing it if the pool is full."""
+        try:
+            self._connections.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                return
+
+    @retry(
+        wait=wait_exponential(multiplier=1, min=1, max=30),
+        stop=stop_after_attempt(MAX_REQUEST_RETRY),
+        retry=retry_if_exception_type(
+            (RetryableBlobRequestError, ConnectionError, TimeoutError, http.client.HTTPException)
+        ),
+        before=record_retry_attempt("blob_request"),
+        reraise=True,
+    )
+    def request(
+        self,
+        method: str,
+        path: str,
+        query: Optional[Dict[str, str]] = None,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        """Send a request to the Blob service, retrying transient failures.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The unquoted path, starting with the container.
+            query (Optional[Dict[str, str]]): Query parameters added before the SAS token.
+            body (bytes): The request body.
+            headers (Optional[Dict[str, str]]): Request headers.
+
+        Returns:
+            tuple[int, http.client.HTTPMessage, bytes]: The status, headers and body.
+
+        Raises:
+            BlobRequestError: If the service answers with an error status.
+        """
+        query_string = "&".join(
+            [f"{key}={quote(str(value), safe='')}" for key, value in (query or {}).items()]
+            + ([self.sas_token] if self.sas_token else [])
+        )
+        url = f"{quote(path)}?{query_string}" if query_string else quote(path)
+        request_headers = {
+            "x-ms-version": BLOB_API_VERSION,
+            "Content-Length": str(len(body)),
+            **(headers or {}),
+        }
+        connection = self._get_connection()
+        try:
+            connection.request(method, url, body=body, headers=request_headers)
+            response = connection.getresponse()
+            response_body = response.read()
+        except Exception:
+            connection.close()
+            raise
+        self._release_connection(connection)
+
+        if response.status >= 400:
+            error_class = (
+                RetryableBlobRequestError
+                if response.status in RETRYABLE_STATUS_CODES
+                else BlobRequestError
+            )
+            raise error_class(method, path, response.status, response_body)
+        return response.status, response.headers, response_body
+
+    def put_blob(self, blob_path: str, data: bytes, content_md5: str) -> None:
+        """Upload a whole block blob with a single request.
+
+        Args:
+            blob_path (str): The blob path, starting with the container.
+            data (bytes): The blob content.
+            content_md5 (str): The base64 encoded MD5 of the content.
+        """
+        self.request(
+            "PUT",
+            blob_path,
+            body=data,
+            headers={
+                "x-ms-blob-type": "BlockBlob",
+                "Content-MD5": content_md5,
+                "x-ms-blob-content-md5": content_md5,
+            },
+        )
+
+    def put_block(self, blob_path: str, block_id: str, data: bytes) -> None:
+        """Stage a block of a block blob, the service checks the block's MD5.
+
+        Args:
+            blob_path (str): The blob path, starting with the container.
+            block_id (str): The base64 block id.
+            data (bytes): The block content.
+        """
+        block_md5 = base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+        self.request(
+            "PUT",
+            blob_path,
+            query={"comp": "block", "blockid": block_id},
+            body=data,
+            headers={"Content-MD5": block_md5},
+        )
+
+    def put_block_list(self, blob_path: str, block_ids: List[str], content_md5: str) -> None:
+        """Commit the staged blocks of a block blob.
+
+        Args:
+            blob_path (str): The blob path, starting with the container.
+            block_ids (List[str]): The block ids in blob order.
+            content_md5 (str): The base64 encoded MD5 of the whole blob.
+        """
+        self.request(
+            "PUT",
+            blob_path,
+            query={"comp": "blocklist"},
+            body=build_block_list_xml(block_ids),
+            headers={"Content-Type": "application/xml", "x-ms-blob-content-md5": content_md5},
+        )
+
+    def list_blob_properties(
+        self, container_path: str, prefix: str = "", delimiter: str = ""
+    ) -> List[BlobProperties]:
+        """List the blobs of a container under a prefix with their size and MD5, following
+        the continuation marker of each page.
+
+        Args:
+            container_path (str): The container path, e.g. '/container'.
+            prefix (str): The blob name prefix.
+            delimiter (str): If set, e.g. '/', blobs of sub-directories of the prefix are
+                not listed.
+
+        Returns:
+            List[BlobProperties]: The blobs, names relative to the container.
+        """
+        blobs = []
+        marker = ""
+        while True:
+            query = {"restype": "container", "comp": "list", "prefix": prefix}
+            if delimiter:
+                query["delimiter"] = delimiter
+            if marker:
+                query["marker"] = marker
+            _, _, body = self.request("GET", container_path, query=query)
+            root = ET.fromstring(body)
+            for blob in root.iter("Blob"):
+                properties = blob.find("Properties")
+                blobs.append(
+                    BlobProperties(
+                        name=blob.findtext("Name") or "",
+                        size=int(properties.findtext("Content-Length") or 0)
+                        if properties is not None
+                        else 0,
+                        content_md5=(properties.findtext("Content-MD5") or None)
+                        if properties is not None
+                        else None,
+                    )
+                )
+            marker = root.findtext("NextMarker") or ""
+            if not marker:
+                return blobs
+
+    def list_blobs(self, container_path: str, prefix: str = "", delimiter: str = "") -> List[str]:
+        """List the names of the blobs of a container under a prefix.
+
+        Args:
+            container_path (str): The container path, e.g. '/container'.
+            prefix (str): The blob name prefix.
+            delimiter (str): If set, e.g. '/', blobs of sub-directories of the prefix are
+                not listed.
+
+        Returns:
+            List[str]: The blob names, relative to the container.
+        """
+        return [blob.name for blob in self.list_blob_properties(container_path, prefix, delimiter)]
+
+    def delete_blob(self, blob_path: str) -> None:
+        """Delete a blob, a missing blob is ignored.
+
+        Args:
+            blob_path (str): The blob path, starting with the container.
+        """
+        try:
+            self.request("DELETE", blob_path)
+        except BlobRequestError as e:
+            if e.status != 404:
+                raise
+
+
+class BlobUploader:
+    """Stream files and file-like objects to block blobs with parallel block uploads."""
+
+    def __init__(
+        self,
+        client: BlobRestClient,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        cap_mbps: Optional[int] = None,
+    ) -> None:
+        """Initialize the BlobUploader.
+
+        Args:
+            client (BlobRestClient): The Blob REST client.
+            block_size (int): Bytes per block. Defaults to DEFAULT_BLOCK_SIZE.
+            max_workers (int): Blocks uploaded in parallel. Defaults to DEFAULT_MAX_WORKERS.
+            cap_mbps (Optional[int]): Bandwidth cap of the uploads in Mbps, no cap if None.
+        """
+        self.client = client
+        self.block_size = block_size
+        self.max_workers = max_workers
+        self.limiter = BandwidthLimiter(cap_mbps)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def _put_block(self, blob_path: str, block_id: str, data: bytes) -> None:
+        """Stage one block within the bandwidth cap."""
+        self.limiter.consume(len(data))
+        self.client.put_block(blob_path, block_id, data)
+
+    def upload_stream(self, blob_path: str, stream: BinaryIO) -> BlobUploadResult:
+        """Upload a readable binary stream to a block blob.
+
+        A stream fitting in one block is uploaded with a single Put Blob. Otherwise blocks
+        are read sequentially, hashed, and uploaded by a pool of workers, at most twice
+        `max_workers` blocks are held in memory at a time. Each block is filled by as many
+        reads as the stream needs, so short reads neither end nor split the upload.
+
+        Args:
+            blob_path (str): The blob path, starting with the container.
+            stream (BinaryIO): The stream to upload.
+
+        Returns:
+            BlobUploadResult: The outcome of the upload.
+        """
+        start_time = time.perf_counter()
+        md5 = hashlib.md5()
+        first_block = read_block(stream, self.block_size)
+        md5.update(first_block)
+        second_block = (
+            read_block(stream, self.block_size) if len(first_block) == self.block_size else b""
+        )
+
+        if not second_block:
+            content_md5 = base64.b64encode(md5.digest()).decode("ascii")
+            self.limiter.consume(len(first_block))
+            self.client.put_blob(blob_path, first_block, content_md5)
+            return BlobUploadResult(
+                blob_path=blob_path,
+                bytes_uploaded=len(first_block),
+                content_md5=content_md5,
+                block_count=0,
+                elapsed_sec=round(time.perf_counter() - start_time, 3),
+            )
+
+        block_ids: List[str] = []
+        bytes_uploaded = 0
+        pending: Set[Future] = set()
+        with TracedThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="blob_block"
+        ) as executor:
+            block = first_block
+            while block:
+                if len(pending) >= self.max_workers * 2:
+                    # Read the next block as soon as any block is staged
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future.exception() is not None:
+                            for queued_future in pending:
+                                queued_future.cancel()
+                            future.result()
+                block_id = make_block_id(len(block_ids))
+                block_ids.append(block_id)
+                bytes_uploaded += len(block)
+                pending.add(executor.submit(self._put_block, blob_path, block_id, block))
+                if second_block:
+                    block, second_block = second_block, b""
+                else:
+                    block = read_block(stream, self.block_size)
+                md5.update(block)
+            for future in pending:
+                future.result()
+
+        content_md5 = base64.b64encode(md5.digest()).decode("ascii")
+        self.client.put_block_list(blob_path, block_ids, content_md5)
+        return BlobUploadResult(
+            blob_path=blob_path,
+            bytes_uploaded=bytes_uploaded,
+            content_md5=content_md5,
+            block_count=len(block_ids),
+            elapsed_sec=round(time.perf_counter() - start_time, 3),
+        )
+
+    def upload_file(self, file_path: str, blob_path: str) -> BlobUploadResult:
+        """Upload a local file to a block blob.
+
+        Args:
+            file_path (str): The local file.
+            blob_path (str): The blob path, starting with the container.
+
+        Returns:
+            BlobUploadResult: The outcome of the upload.
+        """
+        with open(file_path, "rb") as file:
+            return self.upload_stream(blob_path, file)
@@ -0,0 +1,150 @@
+"""Cleanup Planner Module.
+
+Plans the destination cleanup of a whole batch of files before it is transferred. The
+target directory is listed once and the exact blobs to delete are selected from the
+listing, instead of letting one 'azcopy rm' per file enumerate the directory again. The
+selection covers the file names of the batch and, given the extractor's file name with
+its 'part_number' variable, every part file of a previous run, including parts the new
+run no longer produces.
+"""
+
+# import: standard
+import os
+import re
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import List
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import (
+    DEFAULT_MAX_WORKERS,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import BlobRestClient
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import (
+    matches_any_pattern,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import TracedThreadPoolExecutor
+
+PART_NUMBER_VARIABLE_PATTERN = re.compile(r"\{\{\s*part_number\s*\}\}")
+
+
+@dataclass
+class CleanupPlan:
+    """Dataclass to store the blobs to delete from a target directory.
+
+    Attributes:
+        container_path (str): The container path, e.g. '/container'.
+        prefix (str): The prefix of the target directory.
+        patterns (List[str]): The file name patterns the blobs were selected with.
+        blob_names (List[str]): The blobs to delete, names relative to the container.
+        listed_blob_count (int): Blobs listed under the target directory.
+        elapsed_sec (float): Wall time of the listing and, once run, of the deletion.
+    """
+
+    container_path: str
+    prefix: str
+    patterns: List[str]
+    blob_names: List[str] = field(default_factory=list)
+    listed_blob_count: int = 0
+    elapsed_sec: float = 0.0
+
+    @property
+    def relative_blob_names(self) -> List[str]:
+        """List[str]: The blobs to delete, names relative to the target directory."""
+        return [blob_name[len(self.prefix) :] for blob_name in self.blob_names]
+
+
+def build_part_file_pattern(part_file_name: str) -> str:
+    """Build the wildcard pattern matching every part file of an extractor's file name,
+    replacing the 'part_number' variable with '*' as the extractors'
+    `search_existing_file`, without rendering the other variables.
+
+    Args:
+        part_file_name (str): The file name with the 'part_number' variable, e.g.
+            'table_20231031_{{ part_number }}'.
+
+    Returns:
+        str: The pattern, e.g. 'table_20231031_*.*'.
+    """
+    file_pattern = PART_NUMBER_VARIABLE_PATTERN.sub("*", part_file_name)
+    return f"{os.path.basename(file_pattern)}.*"
+
+
+def select_blobs_to_delete(
+    blob_names: List[str], prefix: str, patterns: List[str], recursive: bool = False
+) -> List[str]:
+    """Select the listed blobs whose base name matches one of the patterns.
+
+    Args:
+        blob_names (List[str]): The listed blobs, names relative to the container.
+        prefix (str): The prefix of the target directory.
+        patterns (List[str]): The file name wildcard patterns.
+        recursive (bool): Also select blobs of sub-directories. Defaults to False.
+
+    Returns:
+        List[str]: The selected blobs.
+    """
+    include_pattern = ";".join(patterns)
+    return [
+        blob_name
+        for blob_name in blob_names
+        if blob_name.startswith(prefix)
+        and (recursive or "/" not in blob_name[len(prefix) :])
+        and matches_any_pattern(os.path.basename(blob_name), include_pattern)
+    ]
+
+
+def plan_cleanup(
+    client: BlobRestClient,
+    container_path: str,
+    prefix: str,
+    patterns: List[str],
+    recursive: bool = False,
+) -> CleanupPlan:
+    """List a target directory once and plan the blobs to delete.
+
+    Args:
+        client (BlobRestClient): The Blob REST client of the target.
+        container_path (str): The container path, e.g. '/container'.
+        prefix (str): The prefix of the target directory.
+        patterns (List[str]): The file name wildcard patterns.
+        recursive (bool): Also delete blobs of sub-directories. Defaults to False.
+
+    Returns:
+        CleanupPlan: The cleanup plan.
+    """
+    start_time = time.perf_counter()
+    listed_blobs = client.list_blob_properties(
+        container_path, prefix, delimiter="" if recursive else "/"
+    )
+    listed_blob_names = [blob.name for blob in listed_blobs]
+    return CleanupPlan(
+        container_path=container_path,
+        prefix=prefix,
+        patterns=patterns,
+        blob_names=select_blobs_to_delete(listed_blob_names, prefix, patterns, recursive),
+        listed_blob_count=len(listed_blob_names),
+        elapsed_sec=round(time.perf_counter() - start_time, 3),
+    )
+
+
+def delete_planned_blobs(
+    client: BlobRestClient, plan: CleanupPlan, max_workers: int = DEFAULT_MAX_WORKERS
+) -> None:
+    """Delete the blobs of a cleanup plan in parallel.
+
+    Args:
+        client (BlobRestClient): The Blob REST client of the target.
+        plan (CleanupPlan): The cleanup plan.
+        max_workers (int): Blobs deleted in parallel. Defaults to DEFAULT_MAX_WORKERS.
+    """
+    with TracedThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="blob_delete"
+    ) as executor:
+        list(
+            executor.map(
+                lambda blob_name: client.delete_blob(f"{plan.container_path}/{blob_name}"),
+                plan.blob_names,
+            )
+        )
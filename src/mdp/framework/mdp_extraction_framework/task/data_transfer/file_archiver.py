@@ -0,0 +1,210 @@
+"""File Archiver Module.
+
+Moves transferred source files into a dated archive directory, optionally compressed,
+with a pool of workers. A file is written under a temporary name and renamed once
+complete, and the source is only removed after the rename, so an archive never holds a
+partial file. Files sharing a name are rejected before any is archived, as they would
+overwrite each other in the dated directory. A retention sweep evicts the oldest dated directories when the archive
+exceeds its size budget.
+"""
+
+# import: standard
+import gzip
+import logging
+import os
+import shutil
+from collections import Counter
+from pathlib import Path
+from typing import List
+from typing import Optional
+from typing import Union
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import TracedThreadPoolExecutor
+
+ARCHIVE_COMPRESSION_EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+ARCHIVE_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_ARCHIVE_WORKERS = 4
+BYTES_PER_MB = 1024 * 1024
+
+
+def open_compressed_writer(file_path: Union[str, Path], compression: str):
+    """Open a binary writer compressing into a file.
+
+    Args:
+        file_path (Union[str, Path]): The output file.
+        compression (str): 'gzip' or 'zstd'.
+
+    Returns:
+        A writable binary file object.
+
+    Raises:
+        ValueError: If zstd is requested and the zstandard package is not installed.
+    """
+    if compression == "gzip":
+        return gzip.open(file_path, "wb")
+    try:
+        # import: external
+        import zstandard
+    except ImportError as e:
+        raise ValueError("The zstandard package is required for zstd archive compression.") from e
+    return zstandard.ZstdCompressor(threads=-1).stream_writer(open(file_path, "wb"))
+
+
+def archive_file(
+    file_path: Union[str, Path], archive_directory: Union[str, Path], compression: str = "none"
+) -> Path:
+    """Move a file into an archive directory, compressing it if requested.
+
+    Args:
+        file_path (Union[str, Path]): The file to archive.
+        archive_directory (Union[str, Path]): The directory the file is archived to.
+        compression (str): One of ARCHIVE_COMPRESSION_EXTENSIONS keys. Defaults to 'none'.
+
+    Returns:
+        Path: The archived file.
+    """
+    file_path = Path(file_path)
+    archive_file_path = Path(
+        archive_directory, f"{file_path.name}{ARCHIVE_COMPRESSION_EXTENSIONS[compression]}"
+    )
+    if compression == "none":
+        try:
+            os.replace(file_path, archive_file_path)
+            return archive_file_path
+        except OSError:
+            # The archive is on another file system, copy under a temporary name
+            pass
+
+    tmp_file_path = archive_file_path.with_name(f".{archive_file_path.name}.tmp")
+    try:
+        if compression == "none":
+            shutil.copy2(file_path, tmp_file_path)
+        else:
+            with open(file_path, "rb") as source, open_compressed_writer(
+                tmp_file_path, compression
+            ) as target:
+                shutil.copyfileobj(source, target, ARCHIVE_CHUNK_SIZE)
+        os.replace(tmp_file_path, archive_file_path)
+    except BaseException:
+        tmp_file_path.unlink(missing_ok=True)
+        raise
+    os.remove(file_path)
+    return archive_file_path
+
+
+def get_directory_size(directory: Union[str, Path]) -> int:
+    """Get the total size of the files under a directory.
+
+    Args:
+        directory (Union[str, Path]): The directory.
+
+    Returns:
+        int: Size in bytes.
+    """
+    return sum(path.stat().st_size for path in Path(directory).rglob("*") if path.is_file())
+
+
+class FileArchiver:
+    """Archive files into dated directories of an archive path and keep the archive
+    within a size budget."""
+
+    def __init__(
+        self,
+        archive_path: Union[str, Path],
+        compression: str = "none",
+        max_workers: int = DEFAULT_ARCHIVE_WORKERS,
+        retention_budget_mb: Optional[int] = None,
+    ) -> None:
+        """Initialize the FileArchiver.
+
+        Args:
+            archive_path (Union[str, Path]): The archive root directory.
+            compression (str): One of ARCHIVE_COMPRESSION_EXTENSIONS keys. Defaults to 'none'.
+            max_workers (int): Files archived in parallel. Defaults to DEFAULT_ARCHIVE_WORKERS.
+            retention_budget_mb (Optional[int]): Size budget of the archive in MB, no
+                eviction if None.
+
+        Raises:
+            ValueError: If the compression is not supported.
+        """
+        if compression not in ARCHIVE_COMPRESSION_EXTENSIONS:
+            raise ValueError(
+                f"Unsupported archive compression: {compression}, expected one of "
+                f"{list(ARCHIVE_COMPRESSION_EXTENSIONS)}"
+            )
+        self.archive_path = Path(archive_path)
+        self.compression = compression
+        self.max_workers = max(1, max_workers)
+        self.retention_budget_mb = retention_budget_mb
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def archive(self, file_paths: List[Union[str, Path]], directory_name: str) -> List[Path]:
+        """Archive files into a directory of the archive path.
+
+        Args:
+            file_paths (List[Union[str, Path]]): The files to archive.
+            directory_name (str): The archive directory name, e.g. the position date.
+
+        Returns:
+            List[Path]: The archived files, in the order of `file_paths`.
+
+        Raises:
+            ValueError: If files share a name.
+        """
+        file_name_counts = Counter(Path(file_path).name for file_path in file_paths)
+        duplicate_names = sorted(name for name, count in file_name_counts.items() if count > 1)
+        if duplicate_names:
+            raise ValueError(
+                f"Cannot archive files sharing a name into {directory_name}: {duplicate_names}"
+            )
+        archive_directory = self.archive_path / directory_name
+        os.makedirs(archive_directory, exist_ok=True)
+        with TracedThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="archive"
+        ) as executor:
+            archived_files = list(
+                executor.map(
+                    lambda file_path: archive_file(file_path, archive_directory, self.compression),
+                    file_paths,
+                )
+            )
+        self.logger.info(f"Archived {len(archived_files)} files to {archive_directory}")
+        return archived_files
+
+    def sweep(self, keep_directory_name: Optional[str] = None) -> List[Path]:
+        """Delete the oldest archive directories until the archive fits its budget.
+
+        Directories are evicted by name order, the oldest date first.
+
+        Args:
+            keep_directory_name (Optional[str]): A directory never evicted, e.g. the one
+                just archived to.
+
+        Returns:
+            List[Path]: The evicted directories.
+        """
+        if self.retention_budget_mb is None:
+            return []
+        directory_sizes = {
+            directory: get_directory_size(directory)
+            for directory in sorted(self.archive_path.iterdir())
+            if directory.is_dir()
+        }
+        total_size = sum(directory_sizes.values())
+        budget_bytes = self.retention_budget_mb * BYTES_PER_MB
+        evicted_directories = []
+        for directory, size in directory_sizes.items():
+            if total_size <= budget_bytes:
+                break
+            if directory.name == keep_directory_name:
+                continue
+            shutil.rmtree(directory)
+            total_size -= size
+            evicted_directories.append(directory)
+        if evicted_directories:
+            self.logger.info(
+                f"Evicted archive directories {[str(d) for d in evicted_directories]}, "
+                f"archive size: {total_size} bytes, budget: {budget_bytes} bytes"
+            )
+        return evicted_directories
@@ -0,0 +1,157 @@
+"""GPG Archive Stream Transfer Module.
+
+A data transfer task fusing the GPG decrypt, archive extract and transfer stages of an
+inbound flow. The output of `gpg --decrypt` is read through a bounded read-ahead buffer
+into a streaming decompressor, whose members are uploaded as they are decompressed, so
+neither the decrypted archive nor its extracted members are ever written to disk.
+"""
+
+# import: standard
+import os
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.config_validator.job_parameters import JobParameters
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    DataFileInformation,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.archive_stream_transfer import (
+    ArchiveStreamTransferTask,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.archive_stream_transfer import (
+    ArchiveStreamTransferTaskConfigModel,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import BYTES_PER_MB
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.gpg_file_decryptor import (
+    get_decrypt_file_path,
+)
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.gpg_file_decryptor import (
+    load_gpg_key_setting,
+)
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.gpg_stream_decryptor import (
+    GpgStreamDecryptor,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.archive_extractor import (
+    ArchiveExtractor,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.archive_extractor import (
+    ArchiveMember,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.read_ahead_reader import (
+    DEFAULT_READ_AHEAD_CHUNK_SIZE,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.read_ahead_reader import ReadAheadReader
+
+DEFAULT_READ_AHEAD_BUFFER_MB = 16
+
+
+class GpgArchiveStreamTransferTaskConfigModel(ArchiveStreamTransferTaskConfigModel):
+    """Pydantic class to validate the GpgArchiveStreamTransferTask.
+
+    Args:
+        ArchiveStreamTransferTaskConfigModel: The archive stream transfer config model
+    """
+
+    source_system_name: str
+    file_name_suffix: Optional[str] = "_decrypted"
+    read_ahead_buffer_mb: Optional[int] = DEFAULT_READ_AHEAD_BUFFER_MB
+
+
+class GpgArchiveStreamTransferTask(ArchiveStreamTransferTask):
+    """Class for transfer the members of GPG encrypted archives to ADLS, decrypted,
+    decompressed and uploaded as streams.
+
+    The key of 'source_system_name' is loaded as in `GpgFileDecryptorTask`, imported
+    into a temporary keyring when its key file is set, otherwise the default keyring is
+    used. Up to 'read_ahead_buffer_mb' MB of plaintext is buffered between gpg and the
+    decompressor, and the uploader holds at most twice its concurrency in blocks. The
+    transferred file information are the same the decrypt, extract and transfer tasks
+    would have reported for the members.
+    """
+
+    parameter_config_model = GpgArchiveStreamTransferTaskConfigModel
+
+    def __init__(
+        self,
+        module_config: dict,
+        job_parameters: JobParameters,
+        file_infos: List[DataFileInformation] = None,
+    ):
+        """Initializes a GpgArchiveStreamTransferTask instance.
+
+        Args:
+            module_config (dict): A dictionary containing module configuration settings.
+            job_parameters (JobParameters): An object containing job parameters.
+            file_infos (List[DataFileInformation]): A list containing paths of encrypted
+                archives to transfer.
+        """
+        super().__init__(module_config, job_parameters, file_infos)
+        self.decryptor: Optional[GpgStreamDecryptor] = None
+
+    def generate_decrypt_file_path(self, encrypted_file_path: str) -> str:
+        """Generate the path `GpgFileDecryptorTask` would decrypt a file to.
+
+        Args:
+            encrypted_file_path (str): The path to the original encrypted file.
+
+        Returns:
+            str: The path of the decrypted file.
+        """
+        return get_decrypt_file_path(encrypted_file_path, self.module_config.file_name_suffix)
+
+    def iter_source_members(
+        self, file_path: str, archive_extractor: ArchiveExtractor
+    ) -> Iterator[ArchiveMember]:
+        """Iterate the members of an encrypted archive, decrypted by gpg and decompressed
+        as streams.
+
+        Args:
+            file_path (str): The encrypted archive.
+            archive_extractor (ArchiveExtractor): The archive extractor.
+
+        Yields:
+            ArchiveMember: The members, in archive order.
+
+        Raises:
+            GpgStreamDecryptorError: If gpg fails to decrypt the archive.
+        """
+        decrypted_file_name = os.path.basename(self.generate_decrypt_file_path(file_path))
+        max_chunks = (
+            (self.module_config.read_ahead_buffer_mb or DEFAULT_READ_AHEAD_BUFFER_MB)
+            * BYTES_PER_MB
+            // DEFAULT_READ_AHEAD_CHUNK_SIZE
+        )
+        with self.decryptor.open_decrypted_stream(file_path) as plaintext, ReadAheadReader(
+            plaintext, max_chunks=max_chunks
+        ) as reader:
+            yield from archive_extractor.iter_stream_members(reader, decrypted_file_name)
+            # Read the end of the archive, e.g. the zip member table, for gpg to complete
+            while reader.read(DEFAULT_READ_AHEAD_CHUNK_SIZE):
+                pass
+
+    def get_extract_directory(self, archive_path: str) -> str:
+        """Get the `_tmp_<name>` directory `ArchiveFileExtractorTask` would extract the
+        decrypted archive to.
+
+        Args:
+            archive_path (str): The encrypted archive.
+
+        Returns:
+            str: The extraction directory.
+        """
+        return super().get_extract_directory(self.generate_decrypt_file_path(archive_path))
+
+    def execute(self) -> str:
+        """Transfer the members of the encrypted archives with the key of the source
+        system, then remove the temporary keyring.
+
+        Returns:
+            str: target file location
+        """
+        key_setting = load_gpg_key_setting(self.module_config.source_system_name)
+        self.logger.info(f"Loaded GPG Key ENV of {self.module_config.source_system_name}")
+        with GpgStreamDecryptor(key_setting.key_file_path, key_setting.passphrase) as decryptor:
+            self.decryptor = decryptor
+            return super().execute()
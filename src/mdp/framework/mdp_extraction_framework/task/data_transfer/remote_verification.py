@@ -0,0 +1,152 @@
+"""Remote Verification Module.
+
+A pipeline task checking that the files of the previous task are on the ADLS target
+with the same size and MD5, replacing the shell-level 'azcopy list' validation.
+"""
+
+# import: standard
+from pathlib import Path
+from typing import List
+from typing import Optional
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.config_validator.job_parameters import JobParameters
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    DataFileInformation,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
+    ADLSLocation,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.base_data_transfer import (
+    BaseDataTransferTask,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import BlobRestClient
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import (
+    split_container_path,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import split_url
+from mdp.framework.mdp_extraction_framework.task.data_transfer.remote_verifier import (
+    RemoteVerificationResult,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.remote_verifier import RemoteVerifier
+from mdp.framework.mdp_extraction_framework.task.data_transfer.remote_verifier import (
+    build_expected_blob,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import (
+    UPLOAD_MANIFEST_FILE_NAME,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import UploadManifest
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import traced_operation
+
+# import: external
+from pydantic import BaseModel
+
+
+class RemoteVerificationTaskConfigModel(BaseModel):
+    """Pydantic class to validate the RemoteVerificationTask.
+
+    Args:
+        BaseModel: pydantic base model
+    """
+
+    target: dict
+    upload_manifest_path: Optional[str] | None = ""
+    verify_md5_flag: Optional[str] | None = "True"
+    require_md5_flag: Optional[str] | None = "False"
+
+
+class RemoteVerificationTask(BaseDataTransferTask):
+    """Class for verifying the files transferred to ADLS.
+
+    The blobs of the target directory are compared with the files of the previous task.
+    Files archived or removed by the transfer are compared with their upload manifest
+    entry, which 'upload_manifest_path' points to, defaulting to the directory of the
+    first file, or else with the size and MD5 of their file information.
+    """
+
+    parameter_config_model = RemoteVerificationTaskConfigModel
+
+    def __init__(
+        self,
+        module_config: dict,
+        job_parameters: JobParameters,
+        file_infos: List[DataFileInformation] = None,
+    ):
+        """Initializes a RemoteVerificationTask instance.
+
+        Args:
+            module_config (dict): A dictionary containing module configuration settings.
+            job_parameters (JobParameters): An object containing job parameters.
+            file_infos (List[DataFileInformation]): A list containing paths of transferred files.
+
+        Raises:
+            ValueError: If the target is not an ADLS location.
+        """
+        super().__init__(module_config, job_parameters)
+        if self.module_config.target["type"] != "ADLSLocation":
+            raise ValueError(f"{self.__class__.__name__} only supports an ADLSLocation target.")
+        self.files_to_verify = file_infos or []
+
+    def load_upload_manifest(self) -> Optional[UploadManifest]:
+        """Load the upload manifest of the transferred files if it exists.
+
+        Returns:
+            Optional[UploadManifest]: The upload manifest, None if there is none.
+        """
+        manifest_path = self.module_config.upload_manifest_path or (
+            Path(self.files_to_verify[0].file_location)
+            .resolve()
+            .with_name(UPLOAD_MANIFEST_FILE_NAME)
+        )
+        if not Path(manifest_path).is_file():
+            return None
+        return UploadManifest(manifest_path)
+
+    @traced_operation("remote_verification")
+    def verify(self) -> RemoteVerificationResult:
+        """List the target directory and compare its blobs with the transferred files.
+
+        Returns:
+            RemoteVerificationResult: The outcome of the verification.
+        """
+        target_configs = ADLSLocation(
+            **{"cleanup_file_pattern": "", **self.module_config.target}
+        ).update_adls_filepath_url()
+        upload_manifest = self.load_upload_manifest()
+        expected_blobs = [
+            build_expected_blob(file_info, upload_manifest) for file_info in self.files_to_verify
+        ]
+        container_path, prefix = split_container_path(
+            split_url(str(target_configs.filepath_without_token))[2],
+            target_configs.container_name,
+        )
+        client = BlobRestClient.from_url(str(target_configs.filepath))
+        try:
+            return RemoteVerifier(
+                client,
+                verify_md5=self.module_config.verify_md5_flag == "True",
+                require_md5=self.module_config.require_md5_flag == "True",
+            ).verify_directory(container_path, prefix, expected_blobs)
+        finally:
+            client.close()
+
+    def execute(self) -> RemoteVerificationResult:
+        """Verify the transferred files on the target.
+
+        Returns:
+            RemoteVerificationResult: The outcome of the verification.
+
+        Raises:
+            ValueError: If a file is missing on the target or does not match.
+        """
+        if not self.files_to_verify:
+            self.logger.info("No transferred file to verify.")
+            return RemoteVerificationResult()
+        result = self.verify()
+        if not result.passed:
+            raise ValueError(
+                f"Remote verification failed. Missing blobs: {result.missing}, "
+                f"size mismatches: {result.size_mismatches}, "
+                f"MD5 mismatches: {result.md5_mismatches}"
+            )
+        return result
@@ -0,0 +1,208 @@
+"""Remote Verifier Module.
+
+Checks uploaded blobs against the local files they were uploaded from. Only the target
+directory is listed, page by page through the Blob REST API, and the name, size and
+Content-MD5 of each blob are compared with the local file, or with its upload manifest
+entry or its file information once the local file was archived or removed. A local file
+is only hashed when its blob has a Content-MD5 to compare with.
+"""
+
+# import: standard
+import logging
+import os
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import List
+from typing import Optional
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    DataFileInformation,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import BlobRestClient
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import UploadManifest
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import (
+    compute_file_md5,
+)
+
+
+@dataclass
+class ExpectedBlob:
+    """Dataclass to store what an uploaded blob is expected to be.
+
+    Attributes:
+        name (str): The blob name in the target directory.
+        size (int): The size of the local file in bytes.
+        content_md5 (Optional[str]): The base64 encoded MD5 of the local file, None to
+            compare the size only unless `local_path` is set.
+        local_path (Optional[str]): The local file, hashed when its MD5 is needed and not
+            known yet.
+    """
+
+    name: str
+    size: int
+    content_md5: Optional[str] = None
+    local_path: Optional[str] = None
+
+    def has_md5(self) -> bool:
+        """Check if the MD5 of the local file is known or can be computed.
+
+        Returns:
+            bool: True if the MD5 can be compared.
+        """
+        return self.content_md5 is not None or self.local_path is not None
+
+    def get_content_md5(self) -> Optional[str]:
+        """Get the MD5 of the local file, hashing the file the first time if needed.
+
+        Returns:
+            Optional[str]: The base64 encoded MD5, None if unknown.
+        """
+        if self.content_md5 is None and self.local_path is not None:
+            self.content_md5 = compute_file_md5(self.local_path)
+        return self.content_md5
+
+
+@dataclass
+class RemoteVerificationResult:
+    """Dataclass to store the outcome of a remote verification.
+
+    Attributes:
+        verified (List[str]): Blobs matching their local file.
+        missing (List[str]): Blobs not found on the target.
+        size_mismatches (List[str]): Blobs whose size differs, with both sizes.
+        md5_mismatches (List[str]): Blobs whose Content-MD5 differs or, when it is
+            required, is not set.
+        md5_unavailable (List[str]): Blobs verified by size only as they have no
+            Content-MD5.
+        listed_blob_count (int): Blobs listed under the target directory.
+        elapsed_sec (float): Wall time of the verification.
+    """
+
+    verified: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    size_mismatches: List[str] = field(default_factory=list)
+    md5_mismatches: List[str] = field(default_factory=list)
+    md5_unavailable: List[str] = field(default_factory=list)
+    listed_blob_count: int = 0
+    elapsed_sec: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        """bool: True if every expected blob was found and matches its local file."""
+        return not (self.missing or self.size_mismatches or self.md5_mismatches)
+
+
+def build_expected_blob(
+    file_info: DataFileInformation, upload_manifest: Optional[UploadManifest] = None
+) -> ExpectedBlob:
+    """Build the expected blob of an uploaded file, from the file if it still exists, else
+    from its upload manifest entry, else from its file information.
+
+    Args:
+        file_info (DataFileInformation): The uploaded file, its size and MD5 are used once
+            the file is archived or removed.
+        upload_manifest (Optional[UploadManifest]): The upload manifest, which also
+            saves hashing an unchanged file again.
+
+    Returns:
+        ExpectedBlob: The expected blob, without MD5 when it is not known and the file
+            is removed.
+    """
+    file_path = file_info.file_location
+    file_name = os.path.basename(file_path)
+    if Path(file_path).is_file():
+        recorded_md5 = (
+            upload_manifest.get_recorded_md5(file_path) if upload_manifest is not None else None
+        )
+        return ExpectedBlob(
+            name=file_name,
+            size=os.path.getsize(file_path),
+            content_md5=file_info.content_md5 or recorded_md5,
+            local_path=str(file_path),
+        )
+    entry = (
+        upload_manifest.entries.get(str(Path(file_path).resolve()))
+        if upload_manifest is not None
+        else None
+    )
+    if entry is not None:
+        return ExpectedBlob(name=file_name, size=entry["size"], content_md5=entry["md5"])
+    return ExpectedBlob(name=file_name, size=file_info.file_size, content_md5=file_info.content_md5)
+
+
+class RemoteVerifier:
+    """Verify the blobs of a target directory against the expected blobs."""
+
+    def __init__(
+        self, client: BlobRestClient, verify_md5: bool = True, require_md5: bool = False
+    ) -> None:
+        """Initialize the RemoteVerifier.
+
+        Args:
+            client (BlobRestClient): The Blob REST client of the target.
+            verify_md5 (bool): Compare the Content-MD5 of the blobs. Defaults to True.
+            require_md5 (bool): Fail blobs without Content-MD5 instead of verifying them
+                by size only. Defaults to False.
+        """
+        self.client = client
+        self.verify_md5 = verify_md5
+        self.require_md5 = require_md5
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def verify_directory(
+        self, container_path: str, prefix: str, expected_blobs: List[ExpectedBlob]
+    ) -> RemoteVerificationResult:
+        """List the blobs directly under a prefix and compare them with the expected blobs.
+
+        Args:
+            container_path (str): The container path, e.g. '/container'.
+            prefix (str): The prefix of the target directory, ending with '/'.
+            expected_blobs (List[ExpectedBlob]): The blobs expected in the directory.
+
+        Returns:
+            RemoteVerificationResult: The outcome of the verification.
+        """
+        start_time = time.perf_counter()
+        listed_blobs = {
+            blob.name[len(prefix) :]: blob
+            for blob in self.client.list_blob_properties(container_path, prefix, delimiter="/")
+        }
+        result = RemoteVerificationResult(listed_blob_count=len(listed_blobs))
+        for expected in expected_blobs:
+            blob = listed_blobs.get(expected.name)
+            if blob is None:
+                result.missing.append(expected.name)
+            elif blob.size != expected.size:
+                result.size_mismatches.append(
+                    f"{expected.name}: expected {expected.size} bytes, found {blob.size}"
+                )
+            elif not self.verify_md5 or not expected.has_md5():
+                result.verified.append(expected.name)
+            elif blob.content_md5 is None:
+                if self.require_md5:
+                    result.md5_mismatches.append(f"{expected.name}: no Content-MD5 on the blob")
+                else:
+                    result.md5_unavailable.append(expected.name)
+                    result.verified.append(expected.name)
+            elif blob.content_md5 != expected.get_content_md5():
+                result.md5_mismatches.append(
+                    f"{expected.name}: expected MD5 {expected.content_md5}, "
+                    f"found {blob.content_md5}"
+                )
+            else:
+                result.verified.append(expected.name)
+        result.elapsed_sec = round(time.perf_counter() - start_time, 3)
+
+        self.logger.info(
+            f"Verified {len(result.verified)}/{len(expected_blobs)} blobs under "
+            f"{container_path}/{prefix} against {result.listed_blob_count} listed blobs "
+            f"in {result.elapsed_sec}s"
+        )
+        if result.md5_unavailable:
+            self.logger.warning(
+                f"Blobs without Content-MD5, verified by size only: {result.md5_unavailable}"
+            )
+        return result
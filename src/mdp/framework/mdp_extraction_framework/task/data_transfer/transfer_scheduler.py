@@ -0,0 +1,322 @@
+"""Transfer Scheduler Module.
+
+Runs file uploads concurrently while keeping the combined bandwidth of every
+extraction process on the host within a budget. The budget is shared through a
+file-lock protected JSON ledger of active leases, each upload gets a share of the
+budget as its bandwidth cap when it starts.
+"""
+
+# import: standard
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Union
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.utility.common.job_log import JobStatus
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import TracedThreadPoolExecutor
+
+BYTES_PER_MB = 1024 * 1024
+HOST_BANDWIDTH_MBPS_ENV = "AZCOPY_HOST_BANDWIDTH_MBPS"
+BANDWIDTH_LEDGER_PATH_ENV = "AZCOPY_BANDWIDTH_LEDGER"
+DEFAULT_HOST_BANDWIDTH_MBPS = 600
+DEFAULT_BANDWIDTH_LEDGER_PATH = "/tmp/mdp_azcopy_bandwidth_ledger.json"
+MIN_LEASE_MBPS = 10
+LEASE_POLL_INTERVAL_SEC = 1.0
+LEASE_TIMEOUT_SEC = 3600
+
+
+def is_process_alive(pid: int) -> bool:
+    """Check if a process is running on this host.
+
+    Args:
+        pid (int): The process id.
+
+    Returns:
+        bool: True if the process exists.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@dataclass
+class BandwidthLease:
+    """Dataclass to store a share of the host bandwidth budget held by one upload.
+
+    Attributes:
+        lease_id (str): Identifier of the lease in the ledger.
+        mbps (int): The bandwidth cap granted to the upload, in Mbps.
+    """
+
+    lease_id: str
+    mbps: int
+
+
+class BandwidthLedger:
+    """Host-wide ledger of the bandwidth leases of every running upload.
+
+    The ledger is a JSON file of active leases guarded by an exclusive `flock` on a
+    sibling lock file, so processes of different jobs see each other's leases. Leases
+    of processes that are no longer running are dropped on each access.
+    """
+
+    def __init__(
+        self,
+        ledger_path: Union[str, Path, None] = None,
+        total_mbps: Optional[int] = None,
+        min_lease_mbps: int = MIN_LEASE_MBPS,
+    ) -> None:
+        """Initialize the BandwidthLedger.
+
+        Args:
+            ledger_path (Union[str, Path, None]): The ledger file path. Defaults to the
+                AZCOPY_BANDWIDTH_LEDGER environment variable or DEFAULT_BANDWIDTH_LEDGER_PATH.
+            total_mbps (Optional[int]): The host bandwidth budget in Mbps. Defaults to the
+                AZCOPY_HOST_BANDWIDTH_MBPS environment variable or DEFAULT_HOST_BANDWIDTH_MBPS.
+            min_lease_mbps (int): The smallest share granted to an upload, an upload
+                waits for the budget to free up rather than run below it.
+        """
+        self.ledger_path = Path(
+            ledger_path or os.getenv(BANDWIDTH_LEDGER_PATH_ENV, DEFAULT_BANDWIDTH_LEDGER_PATH)
+        )
+        self.total_mbps = int(
+            total_mbps or os.getenv(HOST_BANDWIDTH_MBPS_ENV, DEFAULT_HOST_BANDWIDTH_MBPS)
+        )
+        self.min_lease_mbps = min(min_lease_mbps, self.total_mbps)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @contextmanager
+    def locked_leases(self) -> Iterator[dict]:
+        """Context manager holding the ledger lock and yielding the active leases.
+
+        Changes made to the yielded dictionary are written back when the block exits.
+
+        Yields:
+            dict: The active leases keyed by lease id.
+        """
+        os.makedirs(self.ledger_path.parent, exist_ok=True)
+        with open(f"{self.ledger_path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    leases = json.loads(self.ledger_path.read_text())
+                except (FileNotFoundError, json.JSONDecodeError):
+                    leases = {}
+                leases = {
+                    lease_id: lease
+                    for lease_id, lease in leases.items()
+                    if is_process_alive(lease["pid"])
+                }
+                yield leases
+                self.ledger_path.write_text(json.dumps(leases))
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def try_acquire(self, max_mbps: Optional[int] = None) -> Optional[BandwidthLease]:
+        """Take a fair share of the budget if enough of it is free.
+
+        The share is the budget divided by the number of active uploads including the new
+        one, limited to what the other leases leave free. A running upload keeps its cap,
+        so a share freed by an upload only goes to the uploads started after it.
+
+        Args:
+            max_mbps (Optional[int]): The largest share wanted by the caller.
+
+        Returns:
+            Optional[BandwidthLease]: The lease, None if less than the minimum share is free.
+        """
+        with self.locked_leases() as leases:
+            used_mbps = sum(lease["mbps"] for lease in leases.values())
+            fair_share_mbps = self.total_mbps // (len(leases) + 1)
+            mbps = min(fair_share_mbps, self.total_mbps - used_mbps, max_mbps or self.total_mbps)
+            if mbps < self.min_lease_mbps:
+                return None
+            lease_id = uuid.uuid4().hex
+            leases[lease_id] = {"pid": os.getpid(), "mbps": mbps, "acquired_at": time.time()}
+        return BandwidthLease(lease_id=lease_id, mbps=mbps)
+
+    def acquire(
+        self,
+        max_mbps: Optional[int] = None,
+        timeout: float = LEASE_TIMEOUT_SEC,
+        poll_interval: float = LEASE_POLL_INTERVAL_SEC,
+    ) -> BandwidthLease:
+        """Wait for a share of the budget.
+
+        Args:
+            max_mbps (Optional[int]): The largest share wanted by the caller.
+            timeout (float): Seconds to wait before giving up. Defaults to LEASE_TIMEOUT_SEC.
+            poll_interval (float): Seconds between two attempts. Defaults to LEASE_POLL_INTERVAL_SEC.
+
+        Returns:
+            BandwidthLease: The granted lease.
+
+        Raises:
+            TimeoutError: If no share frees up within the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            lease = self.try_acquire(max_mbps)
+            if lease is not None:
+                return lease
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"No bandwidth share of {self.min_lease_mbps} Mbps freed up in the "
+                    f"ledger {self.ledger_path} within {timeout} seconds."
+                )
+            time.sleep(poll_interval)
+
+    def release(self, lease: BandwidthLease) -> None:
+        """Return a lease to the budget.
+
+        Args:
+            lease (BandwidthLease): The lease to release.
+        """
+        with self.locked_leases() as leases:
+            leases.pop(lease.lease_id, None)
+
+    @contextmanager
+    def lease(self, max_mbps: Optional[int] = None) -> Iterator[BandwidthLease]:
+        """Context manager holding a share of the budget for the wrapped block.
+
+        Args:
+            max_mbps (Optional[int]): The largest share wanted by the caller.
+
+        Yields:
+            BandwidthLease: The granted lease.
+        """
+        lease = self.acquire(max_mbps)
+        try:
+            yield lease
+        finally:
+            self.release(lease)
+
+
+@dataclass
+class FileTransferResult:
+    """Dataclass to store the outcome of one scheduled upload.
+
+    Attributes:
+        file_path (str): The uploaded file.
+        file_size (int): The file size in bytes.
+        status (str): SUCCESS or FAILED.
+        cap_mbps (int): The bandwidth cap the upload ran with.
+        elapsed_sec (float): Wall time of the upload.
+        mb_per_sec (Optional[float]): Achieved throughput in MB/s.
+        output (object): The value returned by the transfer function.
+        error (Optional[BaseException]): The exception raised by a failed upload.
+    """
+
+    file_path: str
+    file_size: int
+    status: str
+    cap_mbps: int = 0
+    elapsed_sec: float = 0.0
+    mb_per_sec: Optional[float] = None
+    output: object = None
+    error: Optional[BaseException] = None
+
+
+class TransferScheduler:
+    """Run uploads concurrently within a host-wide bandwidth budget.
+
+    Files are started largest first, so the long uploads do not end up last and the run
+    finishes as early as the concurrency allows. Each upload asks for at most the budget
+    divided by the concurrency, so the uploads of one job can run side by side.
+    """
+
+    def __init__(
+        self,
+        transfer_function: Callable[[str, int], object],
+        max_concurrency: int,
+        ledger: Optional[BandwidthLedger] = None,
+        max_lease_mbps: Optional[int] = None,
+    ) -> None:
+        """Initialize the TransferScheduler.
+
+        Args:
+            transfer_function (Callable[[str, int], object]): Uploads one file, called with
+                the file path and the bandwidth cap in Mbps.
+            max_concurrency (int): Maximum number of concurrent uploads.
+            ledger (Optional[BandwidthLedger]): The bandwidth ledger. Defaults to a ledger
+                configured from the environment.
+            max_lease_mbps (Optional[int]): The largest share an upload asks for, below the
+                budget divided by the concurrency. Defaults to None.
+        """
+        self.transfer_function = transfer_function
+        self.max_concurrency = max(1, max_concurrency)
+        self.ledger = ledger or BandwidthLedger()
+        self.lease_mbps = self.ledger.total_mbps // self.max_concurrency
+        if max_lease_mbps:
+            self.lease_mbps = min(self.lease_mbps, max_lease_mbps)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._log_lock = threading.Lock()
+
+    def transfer(self, file_path: str) -> FileTransferResult:
+        """Upload one file under a bandwidth lease and measure its throughput.
+
+        Args:
+            file_path (str): The file to upload.
+
+        Returns:
+            FileTransferResult: The outcome of the upload, exceptions are captured.
+        """
+        result = FileTransferResult(
+            file_path=file_path, file_size=os.path.getsize(file_path), status=""
+        )
+        try:
+            with self.ledger.lease(self.lease_mbps) as lease:
+                result.cap_mbps = lease.mbps
+                start_time = time.perf_counter()
+                try:
+                    result.output = self.transfer_function(file_path, lease.mbps)
+                finally:
+                    result.elapsed_sec = round(time.perf_counter() - start_time, 3)
+            result.status = JobStatus.SUCCESS.value
+        except Exception as e:
+            result.status = JobStatus.FAILED.value
+            result.error = e
+        if result.elapsed_sec > 0:
+            result.mb_per_sec = round(result.file_size / BYTES_PER_MB / result.elapsed_sec, 3)
+        with self._log_lock:
+            self.logger.info(
+                f"Transfer {result.status}: {file_path}, size: {result.file_size} bytes, "
+                f"cap: {result.cap_mbps} Mbps, elapsed: {result.elapsed_sec}s, "
+                f"MB/s: {result.mb_per_sec}"
+            )
+        return result
+
+    def run(self, file_paths: List[str]) -> List[FileTransferResult]:
+        """Upload the files largest first with up to `max_concurrency` uploads at a time.
+
+        Args:
+            file_paths (List[str]): The files to upload.
+
+        Returns:
+            List[FileTransferResult]: The outcome of each upload, in scheduling order.
+        """
+        ordered_file_paths = sorted(file_paths, key=os.path.getsize, reverse=True)
+        self.logger.info(
+            f"Scheduling {len(ordered_file_paths)} transfers with concurrency "
+            f"{self.max_concurrency} within {self.ledger.total_mbps} Mbps host budget."
+        )
+        with TracedThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="transfer"
+        ) as executor:
+            return list(executor.map(self.transfer, ordered_file_paths))
@@ -0,0 +1,328 @@
+"""Transfer Tuning Module.
+
+Keeps a local per-target history of the throughput achieved by AzCopy transfers and
+uses it to pick the AzCopy concurrency and block size of the next transfer of a similar
+size.
+"""
+
+# import: standard
+import fcntl
+import json
+import math
+import os
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+from typing import Optional
+from typing import Union
+
+BYTES_PER_MB = 1024 * 1024
+TRANSFER_HISTORY_PATH_ENV = "AZCOPY_TRANSFER_HISTORY"
+DEFAULT_TRANSFER_HISTORY_PATH = "/tmp/mdp_azcopy_transfer_history.json"
+MAX_HISTORY_OBSERVATIONS = 50
+# Block blobs are limited to 50,000 blocks
+MAX_BLOB_BLOCKS = 50000
+MAX_CONCURRENCY = 128
+# A change in throughput smaller than this ratio is treated as noise
+THROUGHPUT_TOLERANCE = 0.05
+
+# Size classes: upper bound in bytes, default concurrency and block size in MB
+SIZE_CLASSES = {
+    "small": (64 * BYTES_PER_MB, 4, None),
+    "medium": (1024 * BYTES_PER_MB, 16, 8),
+    "large": (math.inf, 32, 16),
+}
+
+
+def get_size_class(file_size: int) -> str:
+    """Get the size class of a transfer.
+
+    Args:
+        file_size (int): Total bytes of the transfer.
+
+    Returns:
+        str: One of SIZE_CLASSES keys.
+    """
+    for size_class, (upper_bound, _, _) in SIZE_CLASSES.items():
+        if file_size < upper_bound:
+            return size_class
+    return "large"
+
+
+def get_transfer_target_key(target: dict) -> str:
+    """Get the history key of a transfer target, the storage account and container for
+    ADLS targets, the file path otherwise.
+
+    Args:
+        target (dict): The target location config.
+
+    Returns:
+        str: The history key.
+    """
+    if target.get("account_name"):
+        return f"{target['account_name']}/{target.get('container_name', '')}"
+    return str(target.get("filepath", ""))
+
+
+@dataclass
+class TransferSettings:
+    """Dataclass to store the AzCopy settings of a transfer.
+
+    Attributes:
+        cap_mbps (int): The bandwidth cap passed as '--cap-mbps'.
+        concurrency (Optional[int]): AZCOPY_CONCURRENCY_VALUE, AzCopy's default if None.
+        block_size_mb (Optional[int]): '--block-size-mb', AzCopy's default if None.
+    """
+
+    cap_mbps: int
+    concurrency: Optional[int] = None
+    block_size_mb: Optional[int] = None
+
+    def to_azcopy_options(self) -> str:
+        """Format the settings passed as AzCopy options.
+
+        Returns:
+            str: The AzCopy options.
+        """
+        options = f"--cap-mbps={self.cap_mbps}"
+        if self.block_size_mb:
+            options = f"{options} --block-size-mb={self.block_size_mb}"
+        return options
+
+    def to_env(self) -> Optional[dict]:
+        """Get the environment variables passed to the AzCopy process.
+
+        Returns:
+            Optional[dict]: The environment variables, None if there is none to set.
+        """
+        if self.concurrency:
+            return {"AZCOPY_CONCURRENCY_VALUE": str(self.concurrency)}
+        return None
+
+
+@dataclass
+class TransferObservation:
+    """Dataclass to store the outcome of one AzCopy transfer.
+
+    Attributes:
+        size_class (str): The size class of the transfer.
+        bytes_transferred (int): Bytes transferred.
+        elapsed_sec (float): Wall time of the AzCopy run.
+        mb_per_sec (float): Effective throughput in MB/s.
+        concurrency (Optional[int]): The concurrency the transfer ran with.
+        block_size_mb (Optional[int]): The block size the transfer ran with.
+        cap_mbps (int): The bandwidth cap the transfer ran with.
+        timestamp (float): End time of the transfer as a Unix timestamp.
+    """
+
+    size_class: str
+    bytes_transferred: int
+    elapsed_sec: float
+    mb_per_sec: float
+    concurrency: Optional[int]
+    block_size_mb: Optional[int]
+    cap_mbps: int
+    timestamp: float = 0.0
+
+
+class TransferHistoryStore:
+    """Local JSON store of the recent transfer observations of each target.
+
+    The store is guarded by an exclusive `flock`, so concurrent jobs on the host can
+    share it. Only the last `max_observations` observations of a target are kept.
+    """
+
+    def __init__(
+        self,
+        history_path: Union[str, Path, None] = None,
+        max_observations: int = MAX_HISTORY_OBSERVATIONS,
+    ) -> None:
+        """Initialize the TransferHistoryStore.
+
+        Args:
+            history_path (Union[str, Path, None]): The store file path. Defaults to the
+                AZCOPY_TRANSFER_HISTORY environment variable or DEFAULT_TRANSFER_HISTORY_PATH.
+            max_observations (int): Observations kept per target.
+        """
+        self.history_path = Path(
+            history_path or os.getenv(TRANSFER_HISTORY_PATH_ENV, DEFAULT_TRANSFER_HISTORY_PATH)
+        )
+        self.max_observations = max_observations
+
+    def read(self) -> dict:
+        """Read the whole store.
+
+        Returns:
+            dict: Observations keyed by target, an empty dictionary if there is no store.
+        """
+        try:
+            return json.loads(self.history_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def get(self, target_key: str, size_class: Optional[str] = None) -> List[TransferObservation]:
+        """Get the observations of a target, oldest first.
+
+        Args:
+            target_key (str): The target history key.
+            size_class (Optional[str]): Only return observations of this size class.
+
+        Returns:
+            List[TransferObservation]: The observations.
+        """
+        observations = [
+            TransferObservation(**observation) for observation in self.read().get(target_key, [])
+        ]
+        if size_class:
+            observations = [
+                observation for observation in observations if observation.size_class == size_class
+            ]
+        return observations
+
+    def add(self, target_key: str, observation: TransferObservation) -> None:
+        """Add an observation to a target.
+
+        Args:
+            target_key (str): The target history key.
+            observation (TransferObservation): The observation to add.
+        """
+        os.makedirs(self.history_path.parent, exist_ok=True)
+        with open(f"{self.history_path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                history = self.read()
+                observations = history.get(target_key, []) + [asdict(observation)]
+                history[target_key] = observations[-self.max_observations :]
+                tmp_path = f"{self.history_path}.tmp"
+                with open(tmp_path, "w") as file:
+                    json.dump(history, file)
+                os.replace(tmp_path, self.history_path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def get_block_size_mb(file_size: int, default_block_size_mb: Optional[int]) -> Optional[int]:
+    """Get a block size keeping the blob within the block count limit.
+
+    Args:
+        file_size (int): Size of the largest file of the transfer in bytes.
+        default_block_size_mb (Optional[int]): The block size of the size class.
+
+    Returns:
+        Optional[int]: The block size in MB, None to keep AzCopy's default.
+    """
+    if default_block_size_mb is None:
+        return None
+    minimum_block_size_mb = math.ceil(file_size / BYTES_PER_MB / MAX_BLOB_BLOCKS)
+    return max(default_block_size_mb, minimum_block_size_mb)
+
+
+def recommend_concurrency(observations: List[TransferObservation], default_concurrency: int) -> int:
+    """Pick the concurrency of the next transfer by hill climbing on the history.
+
+    The concurrency with the best mean throughput is kept, a lower concurrency within
+    the tolerance of the best one is preferred. While the highest concurrency tried so
+    far is the best one, the next transfer tries twice as much. A transfer bound by its
+    cap says nothing about the concurrency, which is then kept.
+
+    Args:
+        observations (List[TransferObservation]): Observations of the size class, oldest first.
+        default_concurrency (int): The concurrency to start from without history.
+
+    Returns:
+        int: The concurrency.
+    """
+    observations = [observation for observation in observations if observation.concurrency]
+    if not observations:
+        return default_concurrency
+
+    latest = observations[-1]
+    # The cap is in Mbps and the throughput in MB/s
+    if latest.mb_per_sec * 8 >= latest.cap_mbps * (1 - THROUGHPUT_TOLERANCE):
+        return latest.concurrency
+
+    throughputs: dict[int, List[float]] = {}
+    for observation in observations:
+        throughputs.setdefault(observation.concurrency, []).append(observation.mb_per_sec)
+    mean_throughputs = {
+        concurrency: sum(values) / len(values) for concurrency, values in throughputs.items()
+    }
+    best_throughput = max(mean_throughputs.values())
+    best_concurrency = min(
+        concurrency
+        for concurrency, throughput in mean_throughputs.items()
+        if throughput >= best_throughput * (1 - THROUGHPUT_TOLERANCE)
+    )
+    if best_concurrency == max(mean_throughputs):
+        return min(best_concurrency * 2, MAX_CONCURRENCY)
+    return best_concurrency
+
+
+def recommend_transfer_settings(
+    file_size: int,
+    observations: List[TransferObservation],
+    cap_mbps: int,
+    concurrency: Optional[int] = None,
+    block_size_mb: Optional[int] = None,
+) -> TransferSettings:
+    """Pick the AzCopy settings of a transfer from the history of its target.
+
+    The cap is left to the bandwidth policy of the caller, it is the share of the host
+    budget the transfer may use and not a tuning knob.
+
+    Args:
+        file_size (int): Size of the transfer in bytes.
+        observations (List[TransferObservation]): Observations of the target.
+        cap_mbps (int): The bandwidth cap of the transfer.
+        concurrency (Optional[int]): Config override of the concurrency.
+        block_size_mb (Optional[int]): Config override of the block size.
+
+    Returns:
+        TransferSettings: The settings of the transfer.
+    """
+    size_class = get_size_class(file_size)
+    _, default_concurrency, default_block_size_mb = SIZE_CLASSES[size_class]
+    size_class_observations = [
+        observation for observation in observations if observation.size_class == size_class
+    ]
+    return TransferSettings(
+        cap_mbps=cap_mbps,
+        concurrency=concurrency
+        or recommend_concurrency(size_class_observations, default_concurrency),
+        block_size_mb=block_size_mb or get_block_size_mb(file_size, default_block_size_mb),
+    )
+
+
+def build_transfer_observation(
+    file_size: int,
+    bytes_transferred: Optional[int],
+    elapsed_sec: float,
+    settings: TransferSettings,
+) -> TransferObservation:
+    """Build the observation of a finished transfer.
+
+    Args:
+        file_size (int): The planned size of the transfer in bytes.
+        bytes_transferred (Optional[int]): Bytes reported by AzCopy, the planned size is
+            used if AzCopy did not report it.
+        elapsed_sec (float): Wall time of the AzCopy run.
+        settings (TransferSettings): The settings the transfer ran with.
+
+    Returns:
+        TransferObservation: The observation.
+    """
+    bytes_transferred = file_size if bytes_transferred is None else bytes_transferred
+    return TransferObservation(
+        size_class=get_size_class(file_size),
+        bytes_transferred=bytes_transferred,
+        elapsed_sec=round(elapsed_sec, 3),
+        mb_per_sec=round(bytes_transferred / BYTES_PER_MB / elapsed_sec, 3)
+        if elapsed_sec > 0
+        else 0.0,
+        concurrency=settings.concurrency,
+        block_size_mb=settings.block_size_mb,
+        cap_mbps=settings.cap_mbps,
+        timestamp=time.time(),
+    )
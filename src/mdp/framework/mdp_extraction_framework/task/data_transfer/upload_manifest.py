@@ -0,0 +1,152 @@
+"""Upload Manifest Module.
+
+Content hashes used to skip the upload of files whose bytes are already on the target.
+The MD5 of a file is compared with the 'Content-MD5' property of the remote blob, which
+AzCopy sets when uploading with '--put-md5'. A local manifest of path, size, mtime and
+MD5 of every uploaded file avoids hashing an unchanged file again on rerun.
+"""
+
+# import: standard
+import base64
+import hashlib
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from typing import Union
+
+MD5_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_MANIFEST_FILE_NAME = "_upload_manifest.json"
+REMOTE_REQUEST_TIMEOUT_SEC = 30
+
+
+def compute_file_md5(file_path: Union[str, Path], chunk_size: int = MD5_CHUNK_SIZE) -> str:
+    """Compute the MD5 of a file by streaming it in chunks.
+
+    Args:
+        file_path (Union[str, Path]): The file to hash.
+        chunk_size (int): Bytes read at a time. Defaults to MD5_CHUNK_SIZE.
+
+    Returns:
+        str: The base64 encoded digest, the format of the 'Content-MD5' blob property.
+    """
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            md5.update(chunk)
+    return base64.b64encode(md5.digest()).decode("ascii")
+
+
+def get_remote_content_md5(blob_url: str) -> Optional[str]:
+    """Read the 'Content-MD5' property of a blob with a HEAD request.
+
+    Args:
+        blob_url (str): The blob URL including its SAS token.
+
+    Returns:
+        Optional[str]: The base64 encoded MD5, None if the blob does not exist or has no MD5.
+
+    Raises:
+        urllib.error.HTTPError: If the request fails for another reason than a missing blob.
+    """
+    request = urllib.request.Request(blob_url, method="HEAD")
+    try:
+        with urllib.request.urlopen(request, timeout=REMOTE_REQUEST_TIMEOUT_SEC) as response:
+            return response.headers.get("Content-MD5")
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+
+
+def build_blob_url(directory_url: str, file_name: str, sas_token: Optional[str] = None) -> str:
+    """Build the URL of a blob in a target directory.
+
+    Args:
+        directory_url (str): The target directory URL without token.
+        file_name (str): The blob name in the directory.
+        sas_token (Optional[str]): The SAS token appended to the URL.
+
+    Returns:
+        str: The blob URL.
+    """
+    blob_url = f"{directory_url.rstrip('/')}/{file_name}"
+    return f"{blob_url}?{sas_token}" if sas_token else blob_url
+
+
+class UploadManifest:
+    """Local JSON manifest of the files uploaded to a target.
+
+    Each entry holds the size, mtime and MD5 of the file when it was uploaded, so the
+    MD5 of a file that did not change since is reused instead of hashing it again.
+    """
+
+    def __init__(self, manifest_path: Union[str, Path]) -> None:
+        """Initialize the UploadManifest, loading the existing manifest if any.
+
+        Args:
+            manifest_path (Union[str, Path]): The manifest file path.
+        """
+        self.manifest_path = Path(manifest_path)
+        self._lock = threading.Lock()
+        try:
+            self.entries = json.loads(self.manifest_path.read_text())["files"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            self.entries = {}
+
+    def get_recorded_md5(self, file_path: Union[str, Path]) -> Optional[str]:
+        """Get the MD5 recorded for a file if the file is unchanged since.
+
+        Args:
+            file_path (Union[str, Path]): The local file.
+
+        Returns:
+            Optional[str]: The base64 encoded MD5, None if not recorded or changed.
+        """
+        file_stat = os.stat(file_path)
+        entry = self.entries.get(str(Path(file_path).resolve()))
+        if entry and entry["size"] == file_stat.st_size and entry["mtime"] == file_stat.st_mtime:
+            return entry["md5"]
+        return None
+
+    def get_md5(self, file_path: Union[str, Path]) -> str:
+        """Get the MD5 of a file, reusing the manifest entry if the file is unchanged.
+
+        Args:
+            file_path (Union[str, Path]): The local file.
+
+        Returns:
+            str: The base64 encoded MD5.
+        """
+        return self.get_recorded_md5(file_path) or compute_file_md5(file_path)
+
+    def record(self, file_path: Union[str, Path], md5: str, target: str) -> None:
+        """Record an uploaded file and save the manifest.
+
+        Args:
+            file_path (Union[str, Path]): The uploaded local file.
+            md5 (str): The base64 encoded MD5 of the file.
+            target (str): The target location without token.
+        """
+        file_stat = os.stat(file_path)
+        with self._lock:
+            self.entries[str(Path(file_path).resolve())] = {
+                "size": file_stat.st_size,
+                "mtime": file_stat.st_mtime,
+                "md5": md5,
+                "target": target,
+                "uploaded_at": datetime.now().isoformat(),
+            }
+            self.save()
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        os.makedirs(self.manifest_path.parent, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump({"files": self.entries}, file, indent=4)
+        os.replace(tmp_path, self.manifest_path)
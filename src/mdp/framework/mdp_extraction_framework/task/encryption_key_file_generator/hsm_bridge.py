@@ -0,0 +1,338 @@
+"""HSM Bridge Module.
+
+Decrypts encrypted keys through one long-lived `HSMService --serve` JVM instead of a JVM
+per key. Requests and replies are tab separated lines on the stdin and stdout of the
+JVM, tagged with a request id, and up to `max_in_flight` requests are written ahead of
+their replies. A reply not received within the request timeout, or the JVM exiting,
+restarts the JVM and resends the requests in flight, up to `max_restarts` times.
+"""
+
+# import: standard
+import logging
+import os
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+
+HSM_BRIDGE_MODES = ("persistent", "one_shot")
+BRIDGE_READY_LINE = "READY"
+BRIDGE_STDERR_LINES = 20
+DEFAULT_HSM_REQUEST_TIMEOUT_SEC = 30.0
+DEFAULT_HSM_BRIDGE_MAX_RESTARTS = 2
+DEFAULT_HSM_MAX_IN_FLIGHT = 32
+DEFAULT_HSM_MAX_SESSIONS = 1
+
+
+class HSMBridgeError(RuntimeError):
+    """Raised when the HSM bridge JVM cannot be started or keeps failing."""
+
+
+class HSMKeyError(RuntimeError):
+    """Raised when HSM server fails to decrypt a key."""
+
+
+@dataclass
+class HSMSettings:
+    """Settings of the HSM service, from the HSM_* environment variables."""
+
+    java_class_path: Optional[str]
+    java_class_name: Optional[str]
+    host: Optional[str]
+    port: Optional[str]
+    dpk: Optional[str]
+
+
+@dataclass
+class HSMKeyResult:
+    """The decrypted key of an encrypted key, with the time taken to get it.
+
+    Attributes:
+        encrypted_key (str): The encrypted key.
+        clear_key (str): The decrypted key in hexadecimal format.
+        latency_ms (float): The time from writing the request to reading its reply.
+        hsm_latency_ms (float): The time taken by HSM server, as reported by the JVM.
+    """
+
+    encrypted_key: str
+    clear_key: str
+    latency_ms: float
+    hsm_latency_ms: float
+
+
+def load_hsm_settings() -> HSMSettings:
+    """Load the HSM settings from the environment.
+
+    Returns:
+        HSMSettings: The HSM settings.
+    """
+    return HSMSettings(
+        java_class_path=os.getenv("HSM_JAVA_CLASS_PATH"),
+        java_class_name=os.getenv("HSM_JAVA_CLASS_NAME"),
+        host=os.getenv("HSM_HOST"),
+        port=os.getenv("HSM_PORT"),
+        dpk=os.getenv("HSM_DPK"),
+    )
+
+
+def build_one_shot_command(settings: HSMSettings, encrypted_key: str) -> List[str]:
+    """Build the command starting a JVM decrypting one key.
+
+    Args:
+        settings (HSMSettings): The HSM settings.
+        encrypted_key (str): The encrypted key.
+
+    Returns:
+        List[str]: The command.
+    """
+    return [
+        "java",
+        "-cp",
+        settings.java_class_path,
+        settings.java_class_name,
+        encrypted_key,
+        settings.host,
+        str(settings.port),
+        settings.dpk,
+    ]
+
+
+def build_bridge_command(settings: HSMSettings) -> List[str]:
+    """Build the command starting a JVM decrypting the keys read from its stdin.
+
+    Args:
+        settings (HSMSettings): The HSM settings.
+
+    Returns:
+        List[str]: The command.
+    """
+    return [
+        "java",
+        "-cp",
+        settings.java_class_path,
+        settings.java_class_name,
+        "--serve",
+        settings.host,
+        str(settings.port),
+        settings.dpk,
+    ]
+
+
+class HSMBridge:
+    """Decrypt keys through a long-lived JVM, to be used as a context manager."""
+
+    def __init__(
+        self,
+        command: List[str],
+        request_timeout_sec: float = DEFAULT_HSM_REQUEST_TIMEOUT_SEC,
+        max_restarts: int = DEFAULT_HSM_BRIDGE_MAX_RESTARTS,
+        max_in_flight: int = DEFAULT_HSM_MAX_IN_FLIGHT,
+    ) -> None:
+        """Initialize the HSMBridge.
+
+        Args:
+            command (List[str]): The command starting the JVM.
+            request_timeout_sec (float): Seconds to wait for the JVM to start or for the
+                next reply. Defaults to DEFAULT_HSM_REQUEST_TIMEOUT_SEC.
+            max_restarts (int): Times the JVM is restarted after a timeout or an exit.
+                Defaults to DEFAULT_HSM_BRIDGE_MAX_RESTARTS.
+            max_in_flight (int): Requests written ahead of their replies. Defaults to
+                DEFAULT_HSM_MAX_IN_FLIGHT.
+        """
+        self.command = command
+        self.request_timeout_sec = request_timeout_sec
+        self.max_restarts = max_restarts
+        self.max_in_flight = max(1, max_in_flight)
+        self.restarts = 0
+        self.results: Dict[str, HSMKeyResult] = {}
+        self.process: Optional[subprocess.Popen] = None
+        self.lines: queue.Queue = queue.Queue()
+        self.stderr_lines: Deque[str] = deque(maxlen=BRIDGE_STDERR_LINES)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def __enter__(self) -> "HSMBridge":
+        """Start the JVM."""
+        try:
+            self.start()
+        except HSMBridgeError:
+            self.kill()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Stop the JVM."""
+        self.stop()
+
+    def start(self) -> None:
+        """Start the JVM and wait until it is ready.
+
+        Raises:
+            HSMBridgeError: If the JVM cannot be started or is not ready in time.
+        """
+        try:
+            self.process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+                shell=False,
+            )
+        except OSError as e:
+            raise HSMBridgeError(f"Failed to start HSM bridge: {e}") from e
+        # Each process gets its own queue, lines of a killed process are never read
+        self.lines = queue.Queue()
+        for stream, target in ((self.process.stdout, self.lines), (self.process.stderr, None)):
+            threading.Thread(
+                target=self.read_lines, args=(stream, target), name="hsm_bridge", daemon=True
+            ).start()
+        ready_line = self.next_line()
+        if ready_line != BRIDGE_READY_LINE:
+            raise HSMBridgeError(f"Unexpected HSM bridge start line: {ready_line!r}")
+        self.logger.info(f"HSM bridge started, pid: {self.process.pid}")
+
+    def read_lines(self, stream, target: Optional[queue.Queue]) -> None:
+        """Read the lines of a JVM output, into a queue followed by None at its end, or
+        into the kept stderr lines.
+
+        Args:
+            stream: The stdout or stderr of the JVM.
+            target (Optional[queue.Queue]): The queue of stdout lines, None for stderr.
+        """
+        with suppress(ValueError, OSError):
+            for line in stream:
+                if target is None:
+                    self.stderr_lines.append(line.rstrip("\n"))
+                else:
+                    target.put(line.rstrip("\n"))
+        if target is not None:
+            target.put(None)
+
+    def next_line(self) -> str:
+        """Get the next line written by the JVM.
+
+        Returns:
+            str: The line.
+
+        Raises:
+            HSMBridgeError: If the JVM exits or writes nothing within the request timeout.
+        """
+        try:
+            line = self.lines.get(timeout=self.request_timeout_sec)
+        except queue.Empty:
+            raise HSMBridgeError(
+                f"No reply from HSM bridge within {self.request_timeout_sec} seconds"
+            )
+        if line is None:
+            self.process.wait()
+            raise HSMBridgeError(
+                f"HSM bridge exited with code {self.process.returncode}, "
+                f"error: {' '.join(self.stderr_lines)}"
+            )
+        return line
+
+    def stop(self) -> None:
+        """Stop the JVM, by closing its stdin then killing it if it does not exit."""
+        if self.process is None:
+            return
+        with suppress(OSError):
+            self.process.stdin.close()
+        try:
+            self.process.wait(timeout=self.request_timeout_sec)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+    def kill(self) -> None:
+        """Kill the JVM, e.g. when it does not reply."""
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+
+    def restart(self, error: HSMBridgeError) -> None:
+        """Kill the JVM and start a new one.
+
+        Args:
+            error (HSMBridgeError): The failure of the JVM.
+
+        Raises:
+            HSMBridgeError: If the JVM was restarted `max_restarts` times already.
+        """
+        if self.restarts >= self.max_restarts:
+            raise HSMBridgeError(f"HSM bridge failed after {self.restarts} restarts: {error}")
+        self.restarts += 1
+        self.logger.warning(f"Restarting HSM bridge ({self.restarts}/{self.max_restarts}): {error}")
+        self.kill()
+        self.start()
+
+    def resolve(self, encrypted_keys: List[str]) -> Dict[str, HSMKeyResult]:
+        """Decrypt keys, with up to `max_in_flight` requests written ahead of their
+        replies. The decrypted keys are kept in `results`, also when it raises.
+
+        Args:
+            encrypted_keys (List[str]): The encrypted keys.
+
+        Returns:
+            Dict[str, HSMKeyResult]: The results by encrypted key.
+
+        Raises:
+            HSMBridgeError: If the JVM keeps failing after `max_restarts` restarts.
+            HSMKeyError: If HSM server fails to decrypt a key.
+        """
+        pending = deque(
+            (request_id, encrypted_key)
+            for request_id, encrypted_key in enumerate(encrypted_keys)
+            if encrypted_key not in self.results
+        )
+        in_flight: Dict[str, tuple] = {}
+        while pending or in_flight:
+            try:
+                while pending and len(in_flight) < self.max_in_flight:
+                    request_id, encrypted_key = pending.popleft()
+                    in_flight[str(request_id)] = (request_id, encrypted_key, time.monotonic())
+                    self.process.stdin.write(f"{request_id}\t{encrypted_key}\n")
+                self.process.stdin.flush()
+                reply = self.next_line()
+            except (HSMBridgeError, OSError) as e:
+                error = e if isinstance(e, HSMBridgeError) else HSMBridgeError(str(e))
+                self.restart(error)
+                # Resend the requests in flight first, in their order
+                pending.extendleft(
+                    (request_id, encrypted_key)
+                    for request_id, encrypted_key, _ in reversed(list(in_flight.values()))
+                )
+                in_flight.clear()
+                continue
+
+            reply_fields = reply.split("\t", 3)
+            if len(reply_fields) != 4:
+                raise HSMBridgeError(f"Malformed HSM bridge reply: {reply!r}")
+            reply_id, status, value, hsm_micros = reply_fields
+            if reply_id not in in_flight:
+                self.logger.warning(f"Ignored HSM bridge reply to unknown request {reply_id}")
+                continue
+            _, encrypted_key, sent_at = in_flight.pop(reply_id)
+            if status != "OK":
+                raise HSMKeyError(f"HSM service error for key #{reply_id}: {value}")
+            result = HSMKeyResult(
+                encrypted_key=encrypted_key,
+                clear_key=value,
+                latency_ms=round((time.monotonic() - sent_at) * 1000, 3),
+                hsm_latency_ms=int(hsm_micros) / 1000,
+            )
+            self.results[encrypted_key] = result
+            self.logger.debug(
+                f"HSM key #{reply_id} decrypted in {result.latency_ms} ms, "
+                f"HSM: {result.hsm_latency_ms} ms"
+            )
+        return self.results
@@ -6,9 +6,11 @@ import datetime
 import hashlib
 import logging
 import os
+import re
 import subprocess
 from copy import deepcopy
 from glob import glob
+from typing import Dict
 from typing import List
 from typing import Optional
 
@@ -29,6 +31,49 @@ from mdp.framework.mdp_extraction_framework.task.data_extractor.odbc_data_extrac
 from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.base_encryption_key_file_generator import (
     BaseEncryptionKeyFileGeneratorTask,
 )
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_bridge import (
+    DEFAULT_HSM_BRIDGE_MAX_RESTARTS,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_bridge import (
+    DEFAULT_HSM_MAX_IN_FLIGHT,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_bridge import (
+    DEFAULT_HSM_MAX_SESSIONS,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_bridge import (
+    DEFAULT_HSM_REQUEST_TIMEOUT_SEC,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_bridge import (
+    HSM_BRIDGE_MODES,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_bridge import (
+    HSMBridge,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_bridge import (
+    HSMBridgeError,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_bridge import (
+    HSMSettings,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_bridge import (
+    build_bridge_command,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_bridge import (
+    build_one_shot_command,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_bridge import (
+    load_hsm_settings,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_key_cache import (
+    DEFAULT_HSM_KEY_CACHE_TTL_HOURS,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_key_cache import (
+    HSM_KEY_CACHE_SECRET_ENV,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_key_cache import (
+    HSMKeyCache,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import TracedThreadPoolExecutor
 from mdp.framework.mdp_extraction_framework.utility.file_reader.config_reader import render_template
 
 # import: external
@@ -182,6 +227,16 @@ class HSMEncryptionKeyFileGeneratorTaskConfigModel(BaseModel):
         number_of_row_header (int, optional): number of header line to skip. Defaults to None to not skip row.
                                 For more details: https://pandas.pydata.org/pandas-docs/stable/user_guide/io.html
         number_of_row_footer (int, optional): number of footer line to skip. Defaults to 0 to not skip row.
+        hsm_bridge_mode (str, optional): 'persistent' to decrypt all keys through one
+                                long-lived JVM, 'one_shot' to start a JVM per key. Defaults to 'persistent'.
+        hsm_request_timeout_sec (float, optional): seconds to wait for each reply of the persistent JVM.
+        hsm_bridge_max_restarts (int, optional): restarts of the persistent JVM before falling back
+                                to 'one_shot' for the remaining keys.
+        hsm_max_in_flight (int, optional): keys sent to the persistent JVM ahead of their replies.
+        hsm_max_sessions (int, optional): concurrent HSM sessions, persistent JVMs or one-shot JVMs.
+        hsm_key_cache_path (str, optional): encrypted file caching the clear keys across runs,
+                                its secret read from ENV 'HSM_KEY_CACHE_SECRET'. Defaults to None to not cache.
+        hsm_key_cache_ttl_hours (float, optional): hours a cached key is kept.
     """
 
     source_file_location: Optional[str] | None = ""
@@ -195,6 +250,20 @@ class HSMEncryptionKeyFileGeneratorTaskConfigModel(BaseModel):
     file_extension: Optional[str] = "key"
     file_option: Optional[FileOptionConfigModel] = FileOptionConfigModel()
     write_property: WritePropertyConfigModel
+    hsm_bridge_mode: Optional[str] = "persistent"
+    hsm_request_timeout_sec: Optional[float] = DEFAULT_HSM_REQUEST_TIMEOUT_SEC
+    hsm_bridge_max_restarts: Optional[int] = DEFAULT_HSM_BRIDGE_MAX_RESTARTS
+    hsm_max_in_flight: Optional[int] = DEFAULT_HSM_MAX_IN_FLIGHT
+    hsm_max_sessions: Optional[int] = DEFAULT_HSM_MAX_SESSIONS
+    hsm_key_cache_path: Optional[str] = None
+    hsm_key_cache_ttl_hours: Optional[float] = DEFAULT_HSM_KEY_CACHE_TTL_HOURS
+
+    # Validator for the 'hsm_bridge_mode' field
+    @validator("hsm_bridge_mode")
+    def check_hsm_bridge_mode(cls, v):
+        if v not in HSM_BRIDGE_MODES:
+            raise ValueError(f"hsm_bridge_mode must be one of {HSM_BRIDGE_MODES}, got '{v}'")
+        return v
 
     # Validator for the 'number_of_row_header' field
     @validator("number_of_row_header", pre=True, always=True)
@@ -273,25 +342,9 @@ class HSMEncryptionKeyFileGeneratorTask(BaseEncryptionKeyFileGeneratorTask):
 
     def get_key_by_hsm(self, encrypted_message):
         try:
-            java_class_path = os.getenv("HSM_JAVA_CLASS_PATH")
-            java_class_name = os.getenv("HSM_JAVA_CLASS_NAME")
-
-            host = os.getenv("HSM_HOST")
-            port = os.getenv("HSM_PORT")
-            dpk = os.getenv("HSM_DPK")
-
             # Run the Java class and capture the output
             result = subprocess.run(
-                [
-                    "java",
-                    "-cp",
-                    java_class_path,
-                    java_class_name,
-                    encrypted_message,
-                    host,
-                    str(port),
-                    dpk,
-                ],
+                build_one_shot_command(load_hsm_settings(), encrypted_message),
                 stdout=subprocess.PIPE,  # Capture the output
                 stderr=subprocess.PIPE,  # Capture errors
                 text=True,  # Get output as a string
@@ -310,6 +363,123 @@ class HSMEncryptionKeyFileGeneratorTask(BaseEncryptionKeyFileGeneratorTask):
             self.logger.error(f"HSM sevice error: {e}")
             # return None
 
+    def load_key_cache(self) -> Optional[HSMKeyCache]:
+        """Load the HSM key cache, if configured.
+
+        Returns:
+            Optional[HSMKeyCache]: The cache, None if 'hsm_key_cache_path' is not set.
+        """
+        if not self.module_config.hsm_key_cache_path:
+            return None
+        return HSMKeyCache(
+            self.module_config.hsm_key_cache_path,
+            secret=os.getenv(HSM_KEY_CACHE_SECRET_ENV),
+            ttl_hours=self.module_config.hsm_key_cache_ttl_hours,
+        )
+
+    def get_keys_by_hsm_bridges(
+        self, encrypted_key_list: list, settings: HSMSettings, max_sessions: int
+    ) -> Dict[str, str]:
+        """Get the clear keys of encrypted keys through up to `max_sessions` persistent
+        JVMs at a time, each decrypting its share of the keys on its own HSM session.
+
+        Args:
+            encrypted_key_list (list): The encrypted keys, without duplicates.
+            settings (HSMSettings): The HSM settings.
+            max_sessions (int): The number of JVMs.
+
+        Returns:
+            Dict[str, str]: The clear keys decrypted, without the keys of the JVMs which
+                could not be started or kept failing.
+        """
+        bridges = [
+            HSMBridge(
+                build_bridge_command(settings),
+                request_timeout_sec=self.module_config.hsm_request_timeout_sec,
+                max_restarts=self.module_config.hsm_bridge_max_restarts,
+                max_in_flight=self.module_config.hsm_max_in_flight,
+            )
+            for _ in range(min(max_sessions, len(encrypted_key_list)))
+        ]
+
+        def resolve(bridge: HSMBridge, bridge_key_list: list) -> None:
+            try:
+                with bridge:
+                    bridge.resolve(bridge_key_list)
+            except HSMBridgeError as e:
+                self.logger.warning(f"HSM bridge failed, falling back to one-shot mode: {e}")
+
+        with TracedThreadPoolExecutor(
+            max_workers=len(bridges), thread_name_prefix="hsm"
+        ) as executor:
+            futures = [
+                executor.submit(resolve, bridge, encrypted_key_list[index :: len(bridges)])
+                for index, bridge in enumerate(bridges)
+            ]
+            for future in futures:
+                future.result()
+
+        results = [result for bridge in bridges for result in bridge.results.values()]
+        latencies_ms = sorted(result.latency_ms for result in results)
+        if latencies_ms:
+            self.logger.info(
+                f"HSM bridges decrypted {len(latencies_ms)} keys, latency ms "
+                f"p50: {latencies_ms[len(latencies_ms) // 2]}, max: {latencies_ms[-1]}, "
+                f"restarts: {sum(bridge.restarts for bridge in bridges)}"
+            )
+        return {result.encrypted_key: result.clear_key for result in results}
+
+    def get_keys_by_hsm(self, encrypted_key_list: list) -> Dict[str, str]:
+        """Get the clear keys of encrypted keys from HSM service.
+
+        Identical keys across files are decrypted once, and keys found in the HSM key
+        cache are not decrypted again. In 'persistent' mode, the keys are decrypted
+        through 'hsm_max_sessions' long-lived JVMs. The keys a JVM which cannot be
+        started or keeps failing did not decrypt fall back to a JVM per key, as in
+        'one_shot' mode, with up to 'hsm_max_sessions' JVMs at a time.
+
+        Args:
+            encrypted_key_list (list): The encrypted keys.
+
+        Returns:
+            Dict[str, str]: The clear keys by encrypted key.
+        """
+        unique_key_list = list(dict.fromkeys(encrypted_key_list))
+        settings = load_hsm_settings()
+        max_sessions = max(1, self.module_config.hsm_max_sessions or DEFAULT_HSM_MAX_SESSIONS)
+        key_cache = self.load_key_cache()
+        clear_keys = {}
+        if key_cache:
+            for encrypted_key in unique_key_list:
+                clear_key = key_cache.get(encrypted_key, settings.dpk)
+                if clear_key is not None:
+                    clear_keys[encrypted_key] = clear_key
+            self.logger.info(f"HSM key cache hits: {len(clear_keys)}/{len(unique_key_list)}")
+
+        missing_key_list = [key for key in unique_key_list if key not in clear_keys]
+        if missing_key_list and self.module_config.hsm_bridge_mode == "persistent":
+            clear_keys.update(
+                self.get_keys_by_hsm_bridges(missing_key_list, settings, max_sessions)
+            )
+
+        one_shot_key_list = [key for key in unique_key_list if key not in clear_keys]
+        if one_shot_key_list:
+            with TracedThreadPoolExecutor(
+                max_workers=max_sessions, thread_name_prefix="hsm"
+            ) as executor:
+                clear_keys.update(
+                    zip(one_shot_key_list, executor.map(self.get_key_by_hsm, one_shot_key_list))
+                )
+
+        if key_cache and missing_key_list:
+            for encrypted_key in missing_key_list:
+                clear_key = clear_keys[encrypted_key]
+                # One-shot mode returns an empty or 'null' key when HSM fails
+                if clear_key and re.fullmatch("[0-9A-Fa-f]+", clear_key):
+                    key_cache.put(encrypted_key, settings.dpk, clear_key)
+            key_cache.save()
+        return clear_keys
+
     def hash_sha256(self, data: str) -> str:
         """Method to hash string with sha256.
 
@@ -460,13 +630,13 @@ class HSMEncryptionKeyFileGeneratorTask(BaseEncryptionKeyFileGeneratorTask):
         hash_key = self.hash_sha256(pos_dt)
 
         self.logger.info("Get clear key from HSM service")
+        # get clear keys using hsm service
+        clear_keys = self.get_keys_by_hsm(encrypted_key_list)
         mdp_key_list = []
         for k in encrypted_key_list:
-            # get clear key using hsm service
-            clear_key = self.get_key_by_hsm(k)
             # MDP encryption
             mdp_encrypted_key = self.ccms_encryption(
-                plaintext=clear_key, key=hash_key, key_type="hex_string"
+                plaintext=clear_keys[k], key=hash_key, key_type="hex_string"
             )
 
             key_tuple = (k, mdp_encrypted_key)
@@ -485,5 +655,7 @@ class HSMEncryptionKeyFileGeneratorTask(BaseEncryptionKeyFileGeneratorTask):
         )
         self.logger.info("Key file is generated.")
 
-        self.encrypted_file_infos.append(generate_data_file_info(self.full_file_location))
+        self.encrypted_file_infos.append(
+            generate_data_file_info(self.full_file_location, row_count=len(data))
+        )
         return self.encrypted_file_infos
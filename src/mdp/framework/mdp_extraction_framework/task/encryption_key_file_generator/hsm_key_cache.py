@@ -0,0 +1,211 @@
+"""HSM Key Cache Module.
+
+Keeps the clear keys decrypted by HSM on disk, so a re-run for the same data files skips
+the HSM round-trips. An entry is keyed by a keyed digest of the DPK and the encrypted
+key, so neither appears in the file, and its clear key is encrypted with AES-256-GCM
+under a key derived from a secret kept outside the cache file. Entries older than the
+TTL are dropped when the cache is loaded or saved. Saving merges the entries with those
+another job saved meanwhile under a file lock, and the file is replaced atomically and
+only readable by its owner.
+"""
+
+# import: standard
+import base64
+import fcntl
+import hashlib
+import hmac
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Dict
+from typing import Optional
+
+# import: external
+from Crypto.Cipher import AES
+
+DEFAULT_HSM_KEY_CACHE_TTL_HOURS = 24.0
+HSM_KEY_CACHE_SECRET_ENV = "HSM_KEY_CACHE_SECRET"
+SECONDS_PER_HOUR = 3600
+
+
+@dataclass
+class CachedHSMKey:
+    """Dataclass to store an encrypted cache entry.
+
+    Attributes:
+        created_at (float): The epoch seconds the entry was added.
+        nonce (str): The base64 AES-GCM nonce.
+        ciphertext (str): The base64 encrypted clear key.
+        tag (str): The base64 AES-GCM authentication tag.
+    """
+
+    created_at: float
+    nonce: str
+    ciphertext: str
+    tag: str
+
+
+class HSMKeyCache:
+    """Thread-safe on-disk cache of clear keys, by DPK and encrypted key."""
+
+    def __init__(
+        self,
+        cache_path: str,
+        secret: str,
+        ttl_hours: Optional[float] = DEFAULT_HSM_KEY_CACHE_TTL_HOURS,
+    ) -> None:
+        """Initialize the HSMKeyCache and load the cache file if it exists.
+
+        Args:
+            cache_path (str): The cache file.
+            secret (str): The secret the encryption and digest keys are derived from.
+            ttl_hours (Optional[float]): Hours an entry is kept, DEFAULT_HSM_KEY_CACHE_TTL_HOURS
+                when None. Defaults to DEFAULT_HSM_KEY_CACHE_TTL_HOURS.
+
+        Raises:
+            ValueError: If the secret is empty.
+        """
+        if not secret:
+            raise ValueError(f"Missing ENV '{HSM_KEY_CACHE_SECRET_ENV}' for the HSM key cache")
+        self.cache_path = cache_path
+        if ttl_hours is None:
+            ttl_hours = DEFAULT_HSM_KEY_CACHE_TTL_HOURS
+        self.ttl_sec = ttl_hours * SECONDS_PER_HOUR
+        self.encryption_key = hashlib.sha256(b"encryption:" + secret.encode()).digest()
+        self.digest_key = hashlib.sha256(b"digest:" + secret.encode()).digest()
+        self.entries: Dict[str, CachedHSMKey] = {}
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.load()
+
+    def get_entry_id(self, encrypted_key: str, dpk: str) -> str:
+        """Get the keyed digest identifying the entry of an encrypted key.
+
+        Args:
+            encrypted_key (str): The encrypted key.
+            dpk (str): The DPK the key is encrypted with.
+
+        Returns:
+            str: The entry id.
+        """
+        message = f"{dpk}\0{encrypted_key}".encode()
+        return hmac.new(self.digest_key, message, hashlib.sha256).hexdigest()
+
+    def is_expired(self, entry: CachedHSMKey) -> bool:
+        """Check whether an entry is older than the TTL.
+
+        Args:
+            entry (CachedHSMKey): The entry.
+
+        Returns:
+            bool: True if the entry expired.
+        """
+        return time.time() - entry.created_at > self.ttl_sec
+
+    def read_entries(self) -> Dict[str, CachedHSMKey]:
+        """Read the unexpired entries of the cache file. An unreadable cache file is
+        ignored, its keys are then decrypted by HSM again.
+
+        Returns:
+            Dict[str, CachedHSMKey]: The entries by entry id, empty if there is no file.
+        """
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                entries = {
+                    entry_id: CachedHSMKey(**entry)
+                    for entry_id, entry in json.load(cache_file).items()
+                }
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(f"Ignored unreadable HSM key cache {self.cache_path}: {e}")
+            return {}
+        return {
+            entry_id: entry for entry_id, entry in entries.items() if not self.is_expired(entry)
+        }
+
+    def load(self) -> None:
+        """Load the unexpired entries of the cache file."""
+        self.entries = self.read_entries()
+        self.logger.info(f"Loaded {len(self.entries)} keys from HSM key cache")
+
+    def get(self, encrypted_key: str, dpk: str) -> Optional[str]:
+        """Get the cached clear key of an encrypted key.
+
+        Args:
+            encrypted_key (str): The encrypted key.
+            dpk (str): The DPK the key is encrypted with.
+
+        Returns:
+            Optional[str]: The clear key, None if not cached, expired, or not decryptable
+                with the secret.
+        """
+        with self.lock:
+            entry = self.entries.get(self.get_entry_id(encrypted_key, dpk))
+        if entry is None or self.is_expired(entry):
+            return None
+        cipher = AES.new(self.encryption_key, AES.MODE_GCM, nonce=base64.b64decode(entry.nonce))
+        try:
+            clear_key = cipher.decrypt_and_verify(
+                base64.b64decode(entry.ciphertext), base64.b64decode(entry.tag)
+            ).decode()
+        except ValueError:
+            self.logger.warning("Ignored HSM key cache entry failing authentication")
+            return None
+        return clear_key
+
+    def put(self, encrypted_key: str, dpk: str, clear_key: str) -> None:
+        """Add the clear key of an encrypted key.
+
+        Args:
+            encrypted_key (str): The encrypted key.
+            dpk (str): The DPK the key is encrypted with.
+            clear_key (str): The clear key.
+        """
+        cipher = AES.new(self.encryption_key, AES.MODE_GCM)
+        ciphertext, tag = cipher.encrypt_and_digest(clear_key.encode())
+        entry = CachedHSMKey(
+            created_at=time.time(),
+            nonce=base64.b64encode(cipher.nonce).decode(),
+            ciphertext=base64.b64encode(ciphertext).decode(),
+            tag=base64.b64encode(tag).decode(),
+        )
+        with self.lock:
+            self.entries[self.get_entry_id(encrypted_key, dpk)] = entry
+
+    def save(self) -> None:
+        """Write the unexpired entries to the cache file, replacing it atomically. The
+        entries saved by other jobs since the cache was loaded are kept, the file being
+        locked from reading it to replacing it."""
+        cache_directory = os.path.dirname(os.path.abspath(self.cache_path))
+        os.makedirs(cache_directory, exist_ok=True)
+        with open(f"{self.cache_path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                entries = self.read_entries()
+                with self.lock:
+                    entries.update(
+                        (entry_id, entry)
+                        for entry_id, entry in self.entries.items()
+                        if not self.is_expired(entry)
+                    )
+                # mkstemp creates the file readable by its owner only
+                file_descriptor, temp_path = tempfile.mkstemp(dir=cache_directory, suffix=".tmp")
+                try:
+                    with os.fdopen(file_descriptor, "w", encoding="utf-8") as cache_file:
+                        json.dump(
+                            {entry_id: asdict(entry) for entry_id, entry in entries.items()},
+                            cache_file,
+                        )
+                    os.replace(temp_path, self.cache_path)
+                except BaseException:
+                    os.remove(temp_path)
+                    raise
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        self.logger.info(f"Saved {len(entries)} keys to HSM key cache")
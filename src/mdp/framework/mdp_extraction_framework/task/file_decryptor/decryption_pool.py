@@ -0,0 +1,168 @@
+"""Decryption Pool Module.
+
+Decrypts a batch of files concurrently with a bounded pool of threads, for decryptions
+running in a gpg process, or of processes, for decryptions running in Python. The
+results keep the order of the input files. The first failure stops the batch: files not
+started yet are cancelled, the running ones are awaited, and the output of every file
+that did not decrypt is removed so no partial output is left behind.
+"""
+
+# import: standard
+import logging
+import os
+from concurrent.futures import FIRST_EXCEPTION
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import TypeVar
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import TracedThreadPoolExecutor
+
+DEFAULT_DECRYPTION_WORKERS = 1
+
+T = TypeVar("T")
+
+
+def resolve_max_workers(max_workers: Optional[int]) -> int:
+    """Bound the number of concurrent decryptions to the CPUs of the host.
+
+    Args:
+        max_workers (Optional[int]): The configured concurrency, DEFAULT_DECRYPTION_WORKERS
+            if None.
+
+    Returns:
+        int: The concurrency, between 1 and the CPU count.
+    """
+    return max(1, min(max_workers or DEFAULT_DECRYPTION_WORKERS, os.cpu_count() or 1))
+
+
+def remove_output(file_path: str) -> None:
+    """Remove an output file if it exists.
+
+    Args:
+        file_path (str): The output file.
+    """
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+
+class DecryptionPool:
+    """Decrypt files with up to `max_workers` decryptions at a time."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = DEFAULT_DECRYPTION_WORKERS,
+        use_processes: bool = False,
+        initializer: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Initialize the DecryptionPool.
+
+        Args:
+            max_workers (Optional[int]): Files decrypted concurrently, bounded to the CPU
+                count. Defaults to DEFAULT_DECRYPTION_WORKERS.
+            use_processes (bool): Decrypt in worker processes instead of threads, the
+                decryption function and its arguments must then be picklable. Defaults
+                to False.
+            initializer (Optional[Callable[[], None]]): Called in each worker process when
+                it starts. Defaults to None.
+        """
+        self.max_workers = resolve_max_workers(max_workers)
+        self.use_processes = use_processes
+        self.initializer = initializer
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def create_executor(self) -> Executor:
+        """Create the thread or process pool.
+
+        Returns:
+            Executor: The pool.
+        """
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=self.max_workers, initializer=self.initializer)
+        return TracedThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="decrypt")
+
+    def run(
+        self,
+        decrypt_file: Callable[[str], T],
+        file_paths: List[str],
+        output_path: Callable[[str], str],
+    ) -> List[T]:
+        """Decrypt the files, stopping on the first failure.
+
+        Args:
+            decrypt_file (Callable[[str], T]): Decrypts an encrypted file.
+            file_paths (List[str]): The encrypted files.
+            output_path (Callable[[str], str]): Gives the output file of an encrypted file,
+                removed if its decryption fails or is cancelled.
+
+        Returns:
+            List[T]: The result of each decryption, in the order of `file_paths`.
+
+        Raises:
+            Exception: The error of the first failed decryption.
+        """
+        if self.max_workers == 1 or len(file_paths) <= 1:
+            return self.run_sequentially(decrypt_file, file_paths, output_path)
+
+        self.logger.info(
+            f"Decrypting {len(file_paths)} files with {self.max_workers} concurrent "
+            f"{'processes' if self.use_processes else 'threads'}"
+        )
+        with self.create_executor() as executor:
+            futures = [executor.submit(decrypt_file, file_path) for file_path in file_paths]
+            done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in not_done:
+                future.cancel()
+        # The executor awaited the running decryptions, only the failed and cancelled
+        # ones have no result
+        failed = [
+            (file_path, future)
+            for file_path, future in zip(file_paths, futures)
+            if future.cancelled() or future.exception() is not None
+        ]
+        if not failed:
+            return [future.result() for future in futures]
+
+        for file_path, _ in failed:
+            remove_output(output_path(file_path))
+        first_error = next(
+            future.exception()
+            for _, future in failed
+            if future in done and future.exception() is not None
+        )
+        self.logger.error(
+            f"Decryption failed, {len(failed)} of {len(file_paths)} files not decrypted: "
+            f"{first_error}"
+        )
+        raise first_error
+
+    def run_sequentially(
+        self,
+        decrypt_file: Callable[[str], T],
+        file_paths: List[str],
+        output_path: Callable[[str], str],
+    ) -> List[T]:
+        """Decrypt the files one after another in the calling thread, stopping on the
+        first failure.
+
+        Args:
+            decrypt_file (Callable[[str], T]): Decrypts an encrypted file.
+            file_paths (List[str]): The encrypted files.
+            output_path (Callable[[str], str]): Gives the output file of an encrypted file,
+                removed if its decryption fails.
+
+        Returns:
+            List[T]: The result of each decryption, in the order of `file_paths`.
+        """
+        results = []
+        for file_path in file_paths:
+            try:
+                results.append(decrypt_file(file_path))
+            except Exception:
+                remove_output(output_path(file_path))
+                raise
+        return results
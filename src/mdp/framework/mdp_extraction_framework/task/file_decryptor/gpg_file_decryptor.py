@@ -4,7 +4,6 @@
 import os
 import shlex
 import subprocess
-import time
 from glob import glob
 from typing import List
 from typing import Optional
@@ -24,9 +23,18 @@ from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor i
 from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
     generate_data_file_info,
 )
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.decryption_pool import (
+    DEFAULT_DECRYPTION_WORKERS,
+)
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.decryption_pool import (
+    DecryptionPool,
+)
 from mdp.framework.mdp_extraction_framework.task.file_extractor.base_file_extractor import (
     BaseFileExtractorTask,
 )
+from mdp.framework.mdp_extraction_framework.utility.common.file_completeness import (
+    FileCompletenessWatcher,
+)
 from mdp.framework.mdp_extraction_framework.utility.test_utils.common.validate_file import (
     validate_local_file_exists,
 )
@@ -49,6 +57,52 @@ class GpgFileDecryptorFileError(TypeError):
     pass
 
 
+def load_gpg_key_setting(source_system_name: str) -> GpgDecryptorSetting:
+    """Load ENV settings of the GpgPrivateKey of a source system.
+
+    Args:
+        source_system_name (str): source system name
+
+    Raises:
+        GpgFileDecryptorValueError: when no source system key is in ENV
+
+    Returns:
+        GpgDecryptorSetting: private key setting of source system
+    """
+    env_file = EnvSettings()
+    gpg_key_setting = env_file.gpg_private_key.get(source_system_name.lower())
+
+    settings_class = DECRYPTOR_TYPE_MAPPING.get("gpg")
+    if not settings_class:
+        raise ValueError("Unsupported decryptor gpg for decrypted data source")
+
+    key_setting = settings_class(**gpg_key_setting)
+
+    if not key_setting.passphrase:
+        raise GpgFileDecryptorValueError(
+            f"Missing ENV 'GPG_PRIVATE_KEY__{source_system_name}__PASSPHRASE'"
+        )
+    return key_setting
+
+
+def get_decrypt_file_path(encrypted_file_path: str, file_name_suffix: str) -> str:
+    """Get the path a GPG encrypted file is decrypted to, next to the encrypted file.
+
+    Args:
+        encrypted_file_path (str): The path to the original encrypted file.
+        file_name_suffix (str): The suffix added to the file name, before its extension.
+
+    Returns:
+        str: The path of the decrypted file.
+    """
+    base_file_name, extension = os.path.splitext(os.path.basename(encrypted_file_path))
+    base_file_name, extension = os.path.splitext(
+        os.path.basename(encrypted_file_path.removesuffix(extension))
+    )
+    decrypted_file_name = f"{base_file_name}{file_name_suffix}{extension}"
+    return os.path.join(os.path.dirname(encrypted_file_path), decrypted_file_name)
+
+
 class GpgFileDecryptorTaskConfigModel(BaseModel):
     """Pydantic class to validate the DataTransferTask.
 
@@ -67,10 +121,16 @@ class GpgFileDecryptorTaskConfigModel(BaseModel):
     file_complete_check_flag: Optional[
         str
     ] | None = "False"  # NEW: flag to control whether to check file compleness
+    file_complete_timeout_sec: Optional[float] | None = None
+    max_concurrent_decryptions: Optional[int] | None = DEFAULT_DECRYPTION_WORKERS
 
 
 class GpgFileDecryptorTask(BaseFileExtractorTask):
-    """Class for decrypting GPG encrypted files."""
+    """Class for decrypting GPG encrypted files.
+
+    Up to 'max_concurrent_decryptions' files, bounded to the CPU count, are decrypted at
+    a time, each in its own gpg process.
+    """
 
     parameter_config_model = GpgFileDecryptorTaskConfigModel
 
@@ -104,19 +164,7 @@ class GpgFileDecryptorTask(BaseFileExtractorTask):
         Returns:
             GpgDecryptorSetting: private key setting of source system
         """
-        env_file = EnvSettings()
-        gpg_key_setting = env_file.gpg_private_key.get(source_system_name.lower())
-
-        settings_class = DECRYPTOR_TYPE_MAPPING.get("gpg")
-        if not settings_class:
-            raise ValueError("Unsupported decryptor gpg for decrypted data source")
-
-        key_setting = settings_class(**gpg_key_setting)
-
-        if not key_setting.passphrase:
-            err_msg = f"Missing ENV 'GPG_PRIVATE_KEY__{source_system_name}__PASSPHRASE'"
-            self.logger.error(err_msg)
-            raise GpgFileDecryptorValueError(err_msg)
+        key_setting = load_gpg_key_setting(source_system_name)
         self.logger.info(f"Loaded GPG Key ENV of {source_system_name}")
 
         return key_setting
@@ -130,16 +178,7 @@ class GpgFileDecryptorTask(BaseFileExtractorTask):
         Returns:
             str: The path to the newly created decrypted file.
         """
-        base_file_name, extension = os.path.splitext(os.path.basename(encrypted_file_path))
-        base_file_name, extension = os.path.splitext(
-            os.path.basename(encrypted_file_path.removesuffix(extension))
-        )
-        decrypted_file_name = f"{base_file_name}{self.module_config.file_name_suffix}{extension}"
-        decrypted_file_path = os.path.join(
-            os.path.dirname(encrypted_file_path), decrypted_file_name
-        )
-
-        return decrypted_file_path
+        return get_decrypt_file_path(encrypted_file_path, self.module_config.file_name_suffix)
 
     def decrypt_gpg_file(
         self, passphrase: str, encrypted_file_path: str, decrypted_file_path: str
@@ -170,6 +209,21 @@ class GpgFileDecryptorTask(BaseFileExtractorTask):
 
         return decrypted_file_path
 
+    def decrypt_encrypted_file(self, passphrase: str, encrypted_file_path: str) -> str:
+        """Decrypt a file next to the encrypted file.
+
+        Args:
+            passphrase (str): Passphrase of the GPG private key.
+            encrypted_file_path (str): The path to the original encrypted file.
+
+        Returns:
+            str: The path to the newly created decrypted file.
+        """
+        self.logger.info(f"Reading gpg encrypted file: {encrypted_file_path}")
+        return self.decrypt_gpg_file(
+            passphrase, encrypted_file_path, self.generate_decrypt_file_path(encrypted_file_path)
+        )
+
     def cleanup_encrypted_file(self, encrypted_file_path: str) -> None:
         """Remove the original encrypted file after successful decryption."""
         try:
@@ -182,31 +236,21 @@ class GpgFileDecryptorTask(BaseFileExtractorTask):
                 f"Failed to clean up encrypted file: {encrypted_file_path}. Error: {exc}"
             )
 
-    def is_busy(self, path):
-        """Command to check if file is in other processes (busy)"""
-        return (
-            subprocess.run(
-                ["fuser", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-            ).returncode
-            == 0
-        )
-
-    def wait_until_all_files_complete(self, file_list, interval=3):
-        """Iterate file list to check if all files are available to process other
-        tasks."""
-        self.logger.info(f"Checking file completeness: {len(file_list)}")
-        remaining = list(file_list)
+    def wait_until_all_files_complete(self, file_list: List[str]) -> None:
+        """Wait until no other process is writing the files, up to the configured timeout.
 
-        round_no = 1
-        while remaining:
-            busy = [file for file in remaining if self.is_busy(file)]
-            self.logger.info(f"Round {round_no}: processing remains - {len(busy)} files")
-            remaining = busy  # update remaining to use for next rounds
-            if remaining:
-                time.sleep(interval)
-            round_no += 1
+        Args:
+            file_list (List[str]): The files to check.
 
-        self.logger.info("All files are available to process other tasks")
+        Raises:
+            FileCompletenessTimeoutError: If some files are not complete within the timeout.
+        """
+        FileCompletenessWatcher(
+            timeout_sec=self.module_config.file_complete_timeout_sec,
+            on_file_ready=lambda event: self.logger.info(
+                f"File ready after {event.elapsed_sec}s ({event.reason}): {event.file_path}"
+            ),
+        ).wait(file_list)
 
     def execute(self) -> List[DataFileInformation]:
         """Executes the file decryptor process.
@@ -215,7 +259,6 @@ class GpgFileDecryptorTask(BaseFileExtractorTask):
             List[DataFileInformation]: A list of paths to the decrypted files.
         """
         self.logger.info(f"Starting execution of {self.__class__.__name__}.")
-        decrypted_file_infos = []
         key_setting = self.load_env_setting(self.module_config.source_system_name)
 
         # Set encoded file list based on input types, from config or from previous task
@@ -232,20 +275,21 @@ class GpgFileDecryptorTask(BaseFileExtractorTask):
                 self.wait_until_all_files_complete(encrypted_file_list)
 
         # Perform Decryption
-        for encrypted_file_path in encrypted_file_list:
-            self.logger.info(f"Reading gpg encrypted file: {encrypted_file_path}")
-            decrypted_file_path = self.generate_decrypt_file_path(encrypted_file_path)
-            decrypted_file_path = self.decrypt_gpg_file(
-                key_setting.passphrase,
-                encrypted_file_path,
-                decrypted_file_path,
-            )
-
-            decrypted_file_info = generate_data_file_info(decrypted_file_path)
-            decrypted_file_infos.append(decrypted_file_info)
-
-            # NEW: optional cleanup of encrypted file
-            if self.module_config.cleanup_flag == "True":
+        decrypted_file_paths = DecryptionPool(self.module_config.max_concurrent_decryptions).run(
+            lambda encrypted_file_path: self.decrypt_encrypted_file(
+                key_setting.passphrase, encrypted_file_path
+            ),
+            encrypted_file_list,
+            self.generate_decrypt_file_path,
+        )
+        decrypted_file_infos = [
+            generate_data_file_info(decrypted_file_path)
+            for decrypted_file_path in decrypted_file_paths
+        ]
+
+        # NEW: optional cleanup of encrypted files, once the whole batch is decrypted
+        if self.module_config.cleanup_flag == "True":
+            for encrypted_file_path in encrypted_file_list:
                 self.cleanup_encrypted_file(encrypted_file_path)
 
         return decrypted_file_infos
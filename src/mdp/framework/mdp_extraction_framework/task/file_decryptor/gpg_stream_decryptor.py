@@ -0,0 +1,236 @@
+"""GPG Stream Decryptor Module.
+
+Decrypts OpenPGP files by streaming them through the gpg binary, so memory use stays
+constant whatever the file size and the plaintext bytes are written as they are, or
+read from the gpg output without being written at all. The private key is imported into
+a temporary keyring removed when the decryptor is closed, or the default keyring is used
+without key file, and the passphrase is passed on stdin instead of the command line.
+"""
+
+# import: standard
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import BinaryIO
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+BYTES_PER_MB = 1024 * 1024
+
+
+class GpgStreamDecryptorError(RuntimeError):
+    """Raised when gpg fails to import the key or to decrypt a file."""
+
+
+@dataclass
+class DecryptionResult:
+    """Dataclass to store the outcome of a file decryption.
+
+    Attributes:
+        decrypted_file_path (str): The decrypted file.
+        bytes_written (int): Size of the decrypted file.
+        elapsed_sec (float): Wall time of the decryption.
+        mb_per_sec (Optional[float]): Decrypted MB per second.
+    """
+
+    decrypted_file_path: str
+    bytes_written: int
+    elapsed_sec: float
+    mb_per_sec: Optional[float]
+
+
+class GpgStreamDecryptor:
+    """Decrypt files with the gpg binary and a private key imported into a temporary
+    keyring, to be used as a context manager."""
+
+    def __init__(
+        self, key_file_path: Optional[str], passphrase: str, gpg_binary: str = "gpg"
+    ) -> None:
+        """Initialize the GpgStreamDecryptor.
+
+        Args:
+            key_file_path (Optional[str]): The private key file, armored or binary, the
+                default keyring is used if None.
+            passphrase (str): The passphrase of the private key.
+            gpg_binary (str): The gpg executable. Defaults to 'gpg'.
+        """
+        self.key_file_path = key_file_path
+        self.passphrase = passphrase
+        self.gpg_binary = gpg_binary
+        self.home_directory: Optional[str] = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def __enter__(self) -> "GpgStreamDecryptor":
+        """Create the temporary keyring and import the private key."""
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Stop the keyring's agent and remove the keyring."""
+        self.close()
+
+    def get_gpg_command(self, *arguments: str) -> List[str]:
+        """Get a gpg command on the keyring in batch mode, reading the passphrase on stdin.
+
+        Args:
+            *arguments (str): The gpg arguments.
+
+        Returns:
+            List[str]: The command.
+        """
+        home_arguments = ["--homedir", self.home_directory] if self.home_directory else []
+        return [
+            self.gpg_binary,
+            *home_arguments,
+            "--batch",
+            "--yes",
+            "--pinentry-mode",
+            "loopback",
+            "--passphrase-fd",
+            "0",
+            *arguments,
+        ]
+
+    def run_gpg(self, *arguments: str) -> subprocess.CompletedProcess:
+        """Run gpg on the keyring in batch mode, passing the passphrase on stdin.
+
+        Args:
+            *arguments (str): The gpg arguments.
+
+        Returns:
+            subprocess.CompletedProcess: The completed process, stderr captured as text.
+        """
+        return subprocess.run(
+            self.get_gpg_command(*arguments),
+            input=self.passphrase,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            shell=False,
+        )
+
+    def open(self) -> None:
+        """Create the temporary keyring and import the private key.
+
+        Raises:
+            GpgStreamDecryptorError: If the key import fails.
+        """
+        if self.key_file_path is None:
+            return
+        self.home_directory = tempfile.mkdtemp(prefix="gnupg_")
+        result = self.run_gpg("--import", self.key_file_path)
+        if result.returncode != 0:
+            self.close()
+            raise GpgStreamDecryptorError(
+                f"Failed to import the private key {self.key_file_path}: {result.stderr}"
+            )
+
+    def close(self) -> None:
+        """Stop the gpg agent of the temporary keyring and remove the keyring."""
+        if self.home_directory is None:
+            return
+        subprocess.run(
+            ["gpgconf", "--homedir", self.home_directory, "--kill", "gpg-agent"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            shell=False,
+        )
+        shutil.rmtree(self.home_directory, ignore_errors=True)
+        self.home_directory = None
+
+    def decrypt_file(self, encrypted_file_path: str, decrypted_file_path: str) -> DecryptionResult:
+        """Decrypt a file, streaming it from disk to disk. Signatures are not verified,
+        as with PGPy. A partially written output is removed if the decryption fails.
+
+        Args:
+            encrypted_file_path (str): The encrypted file.
+            decrypted_file_path (str): The decrypted file to write.
+
+        Returns:
+            DecryptionResult: The outcome of the decryption.
+
+        Raises:
+            GpgStreamDecryptorError: If gpg fails to decrypt the file.
+        """
+        start_time = time.perf_counter()
+        result = self.run_gpg(
+            "--skip-verify", "--decrypt", "--output", decrypted_file_path, encrypted_file_path
+        )
+        if result.returncode != 0:
+            if os.path.exists(decrypted_file_path):
+                os.remove(decrypted_file_path)
+            raise GpgStreamDecryptorError(
+                f"Failed to decrypt {encrypted_file_path}, gpg exit code: {result.returncode}, "
+                f"error: {result.stderr}"
+            )
+        elapsed_sec = time.perf_counter() - start_time
+        bytes_written = os.path.getsize(decrypted_file_path)
+        decryption_result = DecryptionResult(
+            decrypted_file_path=decrypted_file_path,
+            bytes_written=bytes_written,
+            elapsed_sec=round(elapsed_sec, 3),
+            mb_per_sec=round(bytes_written / BYTES_PER_MB / elapsed_sec, 3)
+            if elapsed_sec > 0
+            else None,
+        )
+        self.logger.info(
+            f"Decrypted {encrypted_file_path}: {bytes_written} bytes in "
+            f"{decryption_result.elapsed_sec}s, {decryption_result.mb_per_sec} MB/s"
+        )
+        return decryption_result
+
+    @contextmanager
+    def open_decrypted_stream(self, encrypted_file_path: str) -> Iterator[BinaryIO]:
+        """Decrypt a file to the stdout of a gpg process, read as a stream. Signatures are
+        not verified, as with PGPy. The stream must be read to its end, gpg is killed if
+        the block raises.
+
+        Args:
+            encrypted_file_path (str): The encrypted file.
+
+        Yields:
+            BinaryIO: The plaintext stream.
+
+        Raises:
+            GpgStreamDecryptorError: If gpg fails to decrypt the file.
+        """
+        process = subprocess.Popen(
+            self.get_gpg_command(
+                "--skip-verify", "--decrypt", "--output", "-", encrypted_file_path
+            ),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            shell=False,
+        )
+        stderr_chunks: List[bytes] = []
+        stderr_reader = threading.Thread(
+            target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True
+        )
+        stderr_reader.start()
+        try:
+            with suppress(BrokenPipeError):
+                process.stdin.write(f"{self.passphrase}\n".encode())
+                process.stdin.close()
+            yield process.stdout
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            process.stdout.close()
+        process.wait()
+        stderr_reader.join(timeout=5)
+        if process.returncode != 0:
+            raise GpgStreamDecryptorError(
+                f"Failed to decrypt {encrypted_file_path}, gpg exit code: {process.returncode}, "
+                f"error: {b''.join(stderr_chunks).decode(errors='replace')}"
+            )
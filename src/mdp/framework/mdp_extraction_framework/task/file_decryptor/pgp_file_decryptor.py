@@ -3,6 +3,7 @@
 # import: standard
 import os
 from base64 import b64decode
+from functools import partial
 from glob import glob
 from typing import List
 from typing import Optional
@@ -22,6 +23,19 @@ from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor i
 from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
     generate_data_file_info,
 )
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.decryption_pool import (
+    DEFAULT_DECRYPTION_WORKERS,
+)
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.decryption_pool import (
+    DecryptionPool,
+)
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.gpg_stream_decryptor import (
+    GpgStreamDecryptor,
+)
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.pgp_key_cache import PGP_KEY_CACHE
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.pgp_key_cache import (
+    register_worker_cleanup,
+)
 from mdp.framework.mdp_extraction_framework.task.file_extractor.base_file_extractor import (
     BaseFileExtractorTask,
 )
@@ -54,10 +68,25 @@ class PgpFileDecryptorTaskConfigModel(BaseModel):
     source_system_name: str
     source_file_location: Optional[str] | None = ""
     file_name_suffix: Optional[str] = "_decrypted"
+    decrypt_backend: Optional[str] | None = "pgpy"
+    max_concurrent_decryptions: Optional[int] | None = DEFAULT_DECRYPTION_WORKERS
+    key_cache_flag: Optional[str] | None = "True"
 
 
 class PgpFileDecryptorTask(BaseFileExtractorTask):
-    """Class for decrypting PGP encrypted files."""
+    """Class for decrypting PGP encrypted files.
+
+    The 'pgpy' backend decrypts each file in memory and writes it as UTF-8 text. The
+    'gpg' backend streams each file through the gpg binary with constant memory and
+    writes the decrypted bytes as they are.
+
+    Up to 'max_concurrent_decryptions' files, bounded to the CPU count, are decrypted at
+    a time: in worker processes with the 'pgpy' backend, as PGPy decrypts in Python, and
+    in threads each driving a gpg process with the 'gpg' backend.
+
+    With 'key_cache_flag', the 'pgpy' backend loads and unlocks the private key once per
+    process from the process-level key cache instead of once per file.
+    """
 
     parameter_config_model = PgpFileDecryptorTaskConfigModel
 
@@ -160,12 +189,29 @@ class PgpFileDecryptorTask(BaseFileExtractorTask):
         Returns:
             str: The decrypted message as a UTF-8 string.
         """
+        if self.module_config.key_cache_flag == "True":
+            unlock_key = PGP_KEY_CACHE.get_unlocked_key(private_key_path, passphrase)
+            return unlock_key.decrypt(encoded_message).message.decode("utf-8")
+
         private_key = self.read_pgp_key(private_key_path)
 
         with private_key[0].unlock(passphrase) as unlock_key:
             decrypted_message = unlock_key.decrypt(encoded_message).message
         return decrypted_message.decode("utf-8")
 
+    def generate_decrypt_file_path(self, encoded_file_path: str) -> str:
+        """Generate the path of the decrypted file next to the encrypted file.
+
+        Args:
+            encoded_file_path (str): The path to the original encoded file.
+
+        Returns:
+            str: The path of the decrypted file.
+        """
+        base_file_name, extension = os.path.splitext(os.path.basename(encoded_file_path))
+        decrypted_file_name = f"{base_file_name}{self.module_config.file_name_suffix}{extension}"
+        return os.path.join(os.path.dirname(encoded_file_path), decrypted_file_name)
+
     def write_to_txt(self, decrypted_message: str, encoded_file_path: str) -> str:
         """Writes the decrypted message to a text file.
 
@@ -180,13 +226,7 @@ class PgpFileDecryptorTask(BaseFileExtractorTask):
             Exception: If an error occurs during the file writing process.
         """
         try:
-            base_file_name, extension = os.path.splitext(os.path.basename(encoded_file_path))
-            decrypted_file_name = (
-                f"{base_file_name}{self.module_config.file_name_suffix}{extension}"
-            )
-            decrypted_file_path = os.path.join(
-                os.path.dirname(encoded_file_path), decrypted_file_name
-            )
+            decrypted_file_path = self.generate_decrypt_file_path(encoded_file_path)
 
             with open(decrypted_file_path, "w") as file:
                 file.write(decrypted_message)
@@ -203,7 +243,6 @@ class PgpFileDecryptorTask(BaseFileExtractorTask):
             List[DataFileInformation]: A list of paths to the decrypted files.
         """
         self.logger.info(f"Starting execution of {self.__class__.__name__}.")
-        decrypted_file_infos = []
         key_setting = self.load_env_setting(self.module_config.source_system_name)
         private_key_passpharse_decrypted = self.decrypt_base64(key_setting.pass_enc)
 
@@ -213,17 +252,73 @@ class PgpFileDecryptorTask(BaseFileExtractorTask):
         else:
             encoded_file_list = self.files_list
 
-        # Perform Decryption
-        for encoded_file in encoded_file_list:
-            self.logger.info(f"Reading pgp encrypted file: {encoded_file}")
-            encoded_message = self.read_pgp_encrypted_message(encoded_file)
-            decrypted_message = self.decrypt_pgp_message(
-                encoded_message,
-                key_setting.key_file_path,
-                private_key_passpharse_decrypted,
+        if self.module_config.decrypt_backend == "gpg":
+            return self.execute_gpg_stream(
+                encoded_file_list, key_setting.key_file_path, private_key_passpharse_decrypted
+            )
+        if self.module_config.decrypt_backend != "pgpy":
+            raise PgpFileDecryptorValueError(
+                f"Unsupported decrypt_backend: {self.module_config.decrypt_backend}, "
+                "expected 'pgpy' or 'gpg'"
+            )
+
+        # Perform Decryption, the unlocked keys are released once the files are decrypted
+        try:
+            decrypted_file_paths = DecryptionPool(
+                self.module_config.max_concurrent_decryptions,
+                use_processes=True,
+                initializer=register_worker_cleanup,
+            ).run(
+                partial(
+                    self.decrypt_pgpy_file,
+                    private_key_path=key_setting.key_file_path,
+                    passphrase=private_key_passpharse_decrypted,
+                ),
+                encoded_file_list,
+                self.generate_decrypt_file_path,
             )
-            decrypted_file_path = self.write_to_txt(decrypted_message, encoded_file)
-            decrypted_file_info = generate_data_file_info(decrypted_file_path)
-            decrypted_file_infos.append(decrypted_file_info)
+        finally:
+            PGP_KEY_CACHE.clear()
+        return [
+            generate_data_file_info(decrypted_file_path)
+            for decrypted_file_path in decrypted_file_paths
+        ]
+
+    def decrypt_pgpy_file(self, encoded_file: str, private_key_path: str, passphrase: str) -> str:
+        """Decrypt a file in memory with PGPy and write it next to the encrypted file.
+
+        Args:
+            encoded_file (str): The encrypted file.
+            private_key_path (str): Path to the PGP private key file.
+            passphrase (str): Passphrase to unlock the private key.
+
+        Returns:
+            str: The path to the newly created decrypted file.
+        """
+        self.logger.info(f"Reading pgp encrypted file: {encoded_file}")
+        encoded_message = self.read_pgp_encrypted_message(encoded_file)
+        decrypted_message = self.decrypt_pgp_message(encoded_message, private_key_path, passphrase)
+        return self.write_to_txt(decrypted_message, encoded_file)
+
+    def execute_gpg_stream(
+        self, encoded_file_list: List[str], private_key_path: str, passphrase: str
+    ) -> List[DataFileInformation]:
+        """Decrypt the files by streaming them through the gpg binary.
+
+        Args:
+            encoded_file_list (List[str]): The encrypted files.
+            private_key_path (str): Path to the PGP private key file.
+            passphrase (str): Passphrase to unlock the private key.
 
-        return decrypted_file_infos
+        Returns:
+            List[DataFileInformation]: A list of paths to the decrypted files.
+        """
+        with GpgStreamDecryptor(private_key_path, passphrase) as decryptor:
+            results = DecryptionPool(self.module_config.max_concurrent_decryptions).run(
+                lambda encoded_file: decryptor.decrypt_file(
+                    encoded_file, self.generate_decrypt_file_path(encoded_file)
+                ),
+                encoded_file_list,
+                self.generate_decrypt_file_path,
+            )
+        return [generate_data_file_info(result.decrypted_file_path) for result in results]
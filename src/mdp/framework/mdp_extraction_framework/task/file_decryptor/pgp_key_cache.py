@@ -0,0 +1,131 @@
+"""PGP Key Cache Module.
+
+Parsing a private key and deriving its passphrase key (S2K) are deliberately expensive,
+so the key of a many-file drop is loaded and unlocked once per process instead of once
+per file. A key is cached by its path, its modification time and its passphrase, a key
+file replaced on disk is loaded again. The unlocked keys are released, their secret key
+material cleared as PGPy does at the end of an unlock scope, by `clear`, called for the
+process-level cache at the end of a decryption task, at interpreter shutdown, and when a
+pool worker process exits.
+"""
+
+# import: standard
+import atexit
+import hashlib
+import logging
+import os
+import secrets
+import threading
+from contextlib import ExitStack
+from dataclasses import dataclass
+from multiprocessing.util import Finalize
+from typing import Dict
+from typing import Tuple
+
+# import: external
+from pgpy import PGPKey
+
+
+@dataclass
+class CachedPgpKey:
+    """Dataclass to store a private key held unlocked.
+
+    Attributes:
+        key_path (str): The resolved path of the key file.
+        mtime_ns (int): The modification time of the key file when it was loaded.
+        key (PGPKey): The unlocked private key.
+        unlock_scope (ExitStack): The open unlock scope of the key, closing it clears the
+            secret key material.
+    """
+
+    key_path: str
+    mtime_ns: int
+    key: PGPKey
+    unlock_scope: ExitStack
+
+
+class PgpKeyCache:
+    """Thread-safe cache of parsed and unlocked PGP private keys."""
+
+    def __init__(self) -> None:
+        """Initialize the PgpKeyCache."""
+        self.entries: Dict[Tuple[str, int, str], CachedPgpKey] = {}
+        self.lock = threading.Lock()
+        # Passphrases are only kept as keyed digests, the digest key never leaves the process
+        self.digest_key = secrets.token_bytes(32)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def __enter__(self) -> "PgpKeyCache":
+        """Return the cache, to scope the unlocked keys to a block."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Release the unlocked keys."""
+        self.clear()
+
+    def get_passphrase_digest(self, passphrase: str) -> str:
+        """Get the keyed digest identifying a passphrase in the cache.
+
+        Args:
+            passphrase (str): The passphrase.
+
+        Returns:
+            str: The hex digest.
+        """
+        return hashlib.blake2b(passphrase.encode("utf-8"), key=self.digest_key).hexdigest()
+
+    def get_unlocked_key(self, key_path: str, passphrase: str) -> PGPKey:
+        """Get a private key unlocked with its passphrase, loading and unlocking it on the
+        first call for the key file version.
+
+        Args:
+            key_path (str): Path to the PGP private key file.
+            passphrase (str): Passphrase to unlock the private key.
+
+        Returns:
+            PGPKey: The unlocked private key.
+
+        Raises:
+            pgpy.errors.PGPDecryptionError: If the passphrase is incorrect.
+        """
+        resolved_key_path = os.path.realpath(key_path)
+        mtime_ns = os.stat(resolved_key_path).st_mtime_ns
+        cache_key = (resolved_key_path, mtime_ns, self.get_passphrase_digest(passphrase))
+        with self.lock:
+            cached_key = self.entries.get(cache_key)
+            if cached_key is not None:
+                return cached_key.key
+
+            # A key file replaced on disk evicts the keys of its previous versions
+            for stale_cache_key in [
+                entry_key
+                for entry_key, entry in self.entries.items()
+                if entry.key_path == resolved_key_path and entry.mtime_ns != mtime_ns
+            ]:
+                self.entries.pop(stale_cache_key).unlock_scope.close()
+
+            key = PGPKey.from_file(resolved_key_path)[0]
+            unlock_scope = ExitStack()
+            unlock_scope.enter_context(key.unlock(passphrase))
+            self.entries[cache_key] = CachedPgpKey(resolved_key_path, mtime_ns, key, unlock_scope)
+            self.logger.info(f"Loaded and unlocked PGP key {resolved_key_path}")
+            return key
+
+    def clear(self) -> None:
+        """Close the unlock scope of every cached key, clearing its secret key material,
+        and empty the cache."""
+        with self.lock:
+            for cached_key in self.entries.values():
+                cached_key.unlock_scope.close()
+            self.entries.clear()
+
+
+PGP_KEY_CACHE = PgpKeyCache()
+atexit.register(PGP_KEY_CACHE.clear)
+
+
+def register_worker_cleanup() -> None:
+    """Clear the process-level cache when the pool worker process running it exits, to
+    be used as the initializer of the pool. Worker processes leave through `os._exit`,
+    which skips the atexit handlers but not the multiprocessing finalizers."""
+    Finalize(PGP_KEY_CACHE, PGP_KEY_CACHE.clear, exitpriority=0)
@@ -0,0 +1,450 @@
+"""Archive Extractor Module.
+
+Extracts zip, tar, gzip, zstd, tar.gz and tar.zst archives, the format detected from the
+magic bytes of the file instead of its extension. Zip members are extracted in parallel
+by the zip member extractor. The other formats are streams read once from start to end,
+their members are stream-decompressed one after another, either written to disk or
+yielded as file-like objects for a consumer reading them without touching disk. Archives
+of any format can also be read from a forward-only stream such as the output of a
+process. Member paths escaping the destination are rejected, and only regular tar
+members are extracted. An extraction failing midway removes the files it wrote.
+"""
+
+# import: standard
+import gzip
+import logging
+import os
+import shutil
+import tarfile
+import time
+import zipfile
+from contextlib import ExitStack
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import BinaryIO
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Union
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    DataFileInformation,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    DEFAULT_EXTRACT_WORKERS,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    EXTRACT_CHUNK_SIZE,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    ZipMemberExtractor,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    get_member_relative_path,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_stream_reader import (
+    PushbackStream,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_stream_reader import (
+    iter_zip_stream_members,
+)
+
+TAR_MAGIC_OFFSET = 257
+TAR_HEADER_SIZE = 512
+SINGLE_FILE_SUFFIXES = {".gz", ".gzip", ".zst", ".zstd"}
+
+
+class ArchiveFormat(Enum):
+    """This class is enumerator for archive format which can be only as following:
+
+    - ZIP: Zip archive, members extracted in parallel.
+    - TAR: Uncompressed tar archive.
+    - TAR_GZIP: Gzip compressed tar archive.
+    - TAR_ZSTD: Zstandard compressed tar archive.
+    - GZIP: Single gzip compressed file.
+    - ZSTD: Single zstandard compressed file.
+
+    Args:
+        Enum: Enum based class
+    """
+
+    ZIP = "zip"
+    TAR = "tar"
+    TAR_GZIP = "tar.gz"
+    TAR_ZSTD = "tar.zst"
+    GZIP = "gz"
+    ZSTD = "zst"
+
+
+ZIP_MAGIC_BYTES = (b"PK\003\004", b"PK\005\006")
+GZIP_MAGIC_BYTES = b"\037\213"
+ZSTD_MAGIC_BYTES = b"\050\265\057\375"
+TAR_MAGIC_BYTES = b"ustar"
+
+
+class UnsupportedArchiveFormatError(ValueError):
+    """Raised when the format of a file is not a supported archive format."""
+
+
+@dataclass
+class ArchiveMember:
+    """Dataclass to store a member of an archive being read.
+
+    Attributes:
+        name (str): The member path, relative to the extraction directory.
+        size (Optional[int]): The member size, None if only known once read.
+        stream (BinaryIO): The decompressed content, valid until the next member.
+    """
+
+    name: str
+    size: Optional[int]
+    stream: BinaryIO
+
+
+def open_zstd_reader(file_object: BinaryIO) -> BinaryIO:
+    """Open a reader decompressing a zstandard stream, across all its frames.
+
+    Args:
+        file_object (BinaryIO): The compressed stream.
+
+    Returns:
+        BinaryIO: The decompressed stream.
+
+    Raises:
+        ValueError: If the zstandard package is not installed.
+    """
+    try:
+        # import: external
+        import zstandard
+    except ImportError as e:
+        raise ValueError("The zstandard package is required for zstd archives.") from e
+    return zstandard.ZstdDecompressor().stream_reader(file_object, read_across_frames=True)
+
+
+def is_tar_header(header: bytes) -> bool:
+    """Whether a block is the header of a POSIX or GNU tar archive.
+
+    Args:
+        header (bytes): The first bytes of the decompressed content.
+
+    Returns:
+        bool: True if the tar magic is found.
+    """
+    return header[TAR_MAGIC_OFFSET : TAR_MAGIC_OFFSET + len(TAR_MAGIC_BYTES)] == TAR_MAGIC_BYTES
+
+
+def decompress_stream(file_object: BinaryIO, archive_format: ArchiveFormat) -> BinaryIO:
+    """Open the decompressed content of a gzip or zstandard stream, or the stream itself.
+
+    Args:
+        file_object (BinaryIO): The stream, only read from start to end.
+        archive_format (ArchiveFormat): The format of the stream.
+
+    Returns:
+        BinaryIO: The decompressed stream.
+    """
+    if archive_format in (ArchiveFormat.GZIP, ArchiveFormat.TAR_GZIP):
+        return gzip.GzipFile(fileobj=file_object, mode="rb")
+    if archive_format in (ArchiveFormat.ZSTD, ArchiveFormat.TAR_ZSTD):
+        return open_zstd_reader(file_object)
+    return file_object
+
+
+def open_decompressed(archive_path: Union[str, Path], archive_format: ArchiveFormat) -> BinaryIO:
+    """Open the decompressed content of a gzip or zstandard file, or the file itself.
+
+    Args:
+        archive_path (Union[str, Path]): The file.
+        archive_format (ArchiveFormat): The format of the file.
+
+    Returns:
+        BinaryIO: The decompressed stream, closing the file when closed.
+    """
+    if archive_format in (ArchiveFormat.GZIP, ArchiveFormat.TAR_GZIP):
+        return gzip.open(archive_path, "rb")
+    if archive_format in (ArchiveFormat.ZSTD, ArchiveFormat.TAR_ZSTD):
+        return open_zstd_reader(open(archive_path, "rb"))
+    return open(archive_path, "rb")
+
+
+def get_header_format(header: bytes, archive_name: str) -> ArchiveFormat:
+    """Get the format of an archive from its first bytes, a gzip or zstandard stream
+    possibly holding a tar archive.
+
+    Args:
+        header (bytes): The first bytes of the archive.
+        archive_name (str): The archive name, for error messages.
+
+    Returns:
+        ArchiveFormat: ZIP, TAR, GZIP or ZSTD.
+
+    Raises:
+        UnsupportedArchiveFormatError: If the archive is not of a supported format.
+    """
+    if header.startswith(ZIP_MAGIC_BYTES):
+        return ArchiveFormat.ZIP
+    if is_tar_header(header):
+        return ArchiveFormat.TAR
+    if header.startswith(GZIP_MAGIC_BYTES):
+        return ArchiveFormat.GZIP
+    if header.startswith(ZSTD_MAGIC_BYTES):
+        return ArchiveFormat.ZSTD
+    raise UnsupportedArchiveFormatError(
+        f"{archive_name} is not a zip, tar, gzip or zstd archive, header: {header[:4]!r}"
+    )
+
+
+def detect_archive_format(archive_path: Union[str, Path]) -> ArchiveFormat:
+    """Detect the format of an archive from its magic bytes, decompressing the first
+    block of gzip and zstandard files to tell a compressed tar from a compressed file.
+
+    Args:
+        archive_path (Union[str, Path]): The archive.
+
+    Returns:
+        ArchiveFormat: The format.
+
+    Raises:
+        UnsupportedArchiveFormatError: If the file is not a supported archive.
+    """
+    with open(archive_path, "rb") as file:
+        header = file.read(TAR_HEADER_SIZE)
+    archive_format = get_header_format(header, str(archive_path))
+    if archive_format not in (ArchiveFormat.GZIP, ArchiveFormat.ZSTD):
+        return archive_format
+    with open_decompressed(archive_path, archive_format) as stream:
+        if is_tar_header(stream.read(TAR_HEADER_SIZE)):
+            return ArchiveFormat(f"tar.{archive_format.value}")
+    return archive_format
+
+
+def get_single_file_name(archive_path: Union[str, Path]) -> str:
+    """Get the name of the file compressed in a single file gzip or zstandard archive,
+    the archive name without its compression suffix.
+
+    Args:
+        archive_path (Union[str, Path]): The archive.
+
+    Returns:
+        str: The file name.
+    """
+    archive_path = Path(archive_path)
+    if archive_path.suffix.lower() in SINGLE_FILE_SUFFIXES:
+        return archive_path.stem
+    return f"{archive_path.name}.out"
+
+
+def make_parent_directories(file_path: str) -> List[str]:
+    """Create the missing parent directories of a file.
+
+    Args:
+        file_path (str): The file.
+
+    Returns:
+        List[str]: The created directories, outermost first.
+    """
+    missing_directories = []
+    directory = os.path.dirname(file_path)
+    while directory and not os.path.isdir(directory):
+        missing_directories.append(directory)
+        directory = os.path.dirname(directory)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    return missing_directories[::-1]
+
+
+def remove_partial_output(file_paths: List[str], directories: List[str]) -> None:
+    """Remove the files and directories written by a failed extraction.
+
+    Args:
+        file_paths (List[str]): The written files.
+        directories (List[str]): The created directories, outermost first.
+    """
+    for file_path in file_paths:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+    for directory in reversed(directories):
+        # A directory holding files not written by the extraction is kept
+        with suppress(OSError):
+            os.rmdir(directory)
+
+
+class ArchiveExtractor:
+    """Extract archives of any supported format."""
+
+    def __init__(
+        self, max_workers: int = DEFAULT_EXTRACT_WORKERS, chunk_size: int = EXTRACT_CHUNK_SIZE
+    ) -> None:
+        """Initialize the ArchiveExtractor.
+
+        Args:
+            max_workers (int): Zip members extracted in parallel. Defaults to
+                DEFAULT_EXTRACT_WORKERS.
+            chunk_size (int): Bytes decompressed and written at a time. Defaults to
+                EXTRACT_CHUNK_SIZE.
+        """
+        self.max_workers = max(1, max_workers)
+        self.chunk_size = chunk_size
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def iter_members(self, archive_path: Union[str, Path]) -> Iterator[ArchiveMember]:
+        """Iterate the file members of an archive as decompressed streams, each stream
+        only readable until the next member is requested.
+
+        Args:
+            archive_path (Union[str, Path]): The archive.
+
+        Yields:
+            ArchiveMember: The members, in archive order.
+
+        Raises:
+            ZipSlipError: If a member path escapes the extraction directory.
+        """
+        archive_format = detect_archive_format(archive_path)
+        with ExitStack() as stack:
+            if archive_format == ArchiveFormat.ZIP:
+                yield from self.iter_zip_members(archive_path, stack)
+                return
+            stream = stack.enter_context(open_decompressed(archive_path, archive_format))
+            if archive_format in (ArchiveFormat.GZIP, ArchiveFormat.ZSTD):
+                yield ArchiveMember(get_single_file_name(archive_path), None, stream)
+                return
+            yield from self.iter_tar_members(stream)
+
+    def iter_tar_members(self, stream: BinaryIO) -> Iterator[ArchiveMember]:
+        """Iterate the regular file members of an uncompressed tar stream.
+
+        Args:
+            stream (BinaryIO): The tar stream, only read from start to end.
+
+        Yields:
+            ArchiveMember: The members, in archive order.
+        """
+        with tarfile.open(fileobj=stream, mode="r|") as tar_file:
+            for member in tar_file:
+                relative_path = get_member_relative_path(member.name)
+                if member.isdir():
+                    continue
+                if not member.isfile():
+                    self.logger.warning(
+                        f"Skipped tar member {member.name!r}, not a regular file: {member.type!r}"
+                    )
+                    continue
+                yield ArchiveMember(relative_path, member.size, tar_file.extractfile(member))
+
+    def iter_stream_members(self, stream: BinaryIO, archive_name: str) -> Iterator[ArchiveMember]:
+        """Iterate the file members of an archive read from a forward-only stream, each
+        stream only readable until the next member is requested. The format is detected
+        from the first bytes of the stream, zip members read from their local headers.
+
+        Args:
+            stream (BinaryIO): The archive stream, only read from start to end.
+            archive_name (str): The archive file name, naming the member of a single file
+                gzip or zstandard archive.
+
+        Yields:
+            ArchiveMember: The members, in archive order.
+
+        Raises:
+            UnsupportedArchiveFormatError: If the stream is not a supported archive.
+            ZipSlipError: If a member path escapes the extraction directory.
+        """
+        stream = PushbackStream(stream)
+        archive_format = get_header_format(stream.peek(TAR_HEADER_SIZE), archive_name)
+        if archive_format == ArchiveFormat.ZIP:
+            for relative_path, file_size, member_stream in iter_zip_stream_members(
+                stream, self.chunk_size
+            ):
+                yield ArchiveMember(relative_path, file_size, member_stream)
+            return
+        if archive_format == ArchiveFormat.TAR:
+            yield from self.iter_tar_members(stream)
+            return
+        with ExitStack() as stack:
+            decompressed = PushbackStream(
+                stack.enter_context(decompress_stream(stream, archive_format))
+            )
+            if is_tar_header(decompressed.peek(TAR_HEADER_SIZE)):
+                yield from self.iter_tar_members(decompressed)
+            else:
+                yield ArchiveMember(get_single_file_name(archive_name), None, decompressed)
+
+    def iter_zip_members(
+        self, archive_path: Union[str, Path], stack: ExitStack
+    ) -> Iterator[ArchiveMember]:
+        """Iterate the file members of a zip archive as decompressed streams.
+
+        Args:
+            archive_path (Union[str, Path]): The zip archive.
+            stack (ExitStack): Closes the archive once iterated.
+
+        Yields:
+            ArchiveMember: The members, in member table order.
+        """
+        zip_file = stack.enter_context(zipfile.ZipFile(archive_path))
+        zip_extractor = ZipMemberExtractor(self.max_workers, self.chunk_size)
+        for relative_path, member in zip_extractor.plan_members(zip_file).items():
+            with zip_file.open(member) as stream:
+                yield ArchiveMember(relative_path, member.file_size, stream)
+
+    def extract(
+        self, archive_path: Union[str, Path], destination: Union[str, Path]
+    ) -> List[DataFileInformation]:
+        """Extract the file members of an archive into a directory, zip members in
+        parallel and the members of stream formats one after another.
+
+        Args:
+            archive_path (Union[str, Path]): The archive.
+            destination (Union[str, Path]): The existing destination directory.
+
+        Returns:
+            List[DataFileInformation]: The extracted files, in archive order.
+
+        Raises:
+            ZipSlipError: If a member path escapes the extraction directory, the members
+                extracted before it are removed.
+        """
+        if detect_archive_format(archive_path) == ArchiveFormat.ZIP:
+            return ZipMemberExtractor(self.max_workers, self.chunk_size).extract(
+                archive_path, destination
+            )
+
+        start_time = time.perf_counter()
+        destination = str(destination)
+        file_sizes: Dict[str, int] = {}
+        created_directories: List[str] = []
+        output_paths: List[str] = []
+        try:
+            for member in self.iter_members(archive_path):
+                output_path = os.path.join(destination, member.name)
+                created_directories.extend(make_parent_directories(output_path))
+                output_paths.append(output_path)
+                with open(output_path, "wb") as target:
+                    shutil.copyfileobj(member.stream, target, self.chunk_size)
+                    # A later member of the same name overwrites the earlier one
+                    file_sizes.pop(output_path, None)
+                    file_sizes[output_path] = target.tell()
+        except BaseException:
+            # Members are only validated when reached, e.g. a later member escaping the
+            # destination, so the members written before it are removed
+            remove_partial_output(output_paths, created_directories)
+            raise
+
+        extracted_datetime = datetime.now()
+        file_infos = [
+            DataFileInformation(
+                file_location=output_path,
+                file_size=file_size,
+                file_created_datetime=extracted_datetime,
+            )
+            for output_path, file_size in file_sizes.items()
+        ]
+        self.logger.info(
+            f"Extracted {len(file_infos)} files, {sum(file_sizes.values())} bytes, from "
+            f"{archive_path} to {destination} in {round(time.perf_counter() - start_time, 3)}s"
+        )
+        return file_infos
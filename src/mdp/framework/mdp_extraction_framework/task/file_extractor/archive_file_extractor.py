@@ -0,0 +1,63 @@
+"""Archive File Extractor Module."""
+
+# import: standard
+from typing import List
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    DataFileInformation,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.archive_extractor import (
+    ArchiveExtractor,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_file_extractor import (
+    ZipFileExtractorTask,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_file_extractor import (
+    ZipFileExtractorTaskConfigModel,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    DEFAULT_EXTRACT_WORKERS,
+)
+
+
+class ArchiveFileExtractorTaskConfigModel(ZipFileExtractorTaskConfigModel):
+    """Pydantic class to validate the ArchiveFileExtractorTask.
+
+    Args:
+        ZipFileExtractorTaskConfigModel: zip file extractor config model
+    """
+
+
+class ArchiveFileExtractorTask(ZipFileExtractorTask):
+    """Class for extracting files from a zip, tar, gzip, zstd, tar.gz or tar.zst archive,
+    the format detected from the magic bytes of the file.
+
+    Zip members are extracted by up to 'max_extract_workers' threads, the members of the
+    other formats are stream-decompressed one after another.
+    """
+
+    parameter_config_model = ArchiveFileExtractorTaskConfigModel
+
+    def unzip_file(
+        self,
+        source_file_location: str,
+        tmp_folder_location: str,
+    ) -> List[DataFileInformation]:
+        """Extracts an archive to the specified temporary directory.
+
+        Args:
+            source_file_location (str): The path of the source archive.
+            tmp_folder_location (str): The path of the temporary directory.
+
+        Returns:
+            List[DataFileInformation]: The extracted files, in archive order.
+
+        Raises:
+            UnsupportedArchiveFormatError: If the source is not a supported archive.
+            ZipSlipError: If an archive member would be extracted outside the directory.
+        """
+        self.logger.info(f"Extract {source_file_location} to {tmp_folder_location}")
+        return ArchiveExtractor(
+            max_workers=self.module_config.max_extract_workers or DEFAULT_EXTRACT_WORKERS
+        ).extract(source_file_location, tmp_folder_location)
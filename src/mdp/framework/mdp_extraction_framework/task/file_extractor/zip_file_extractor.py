@@ -1,6 +1,8 @@
 """Zip File Extractor Module."""
 
 # import: standard
+import os
+import shutil
 from pathlib import Path
 from typing import List
 from typing import Optional
@@ -10,13 +12,15 @@ from mdp.framework.mdp_extraction_framework.config_validator.job_parameters impo
 from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
     DataFileInformation,
 )
-from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
-    generate_data_file_info,
-)
 from mdp.framework.mdp_extraction_framework.task.file_extractor.base_file_extractor import (
     BaseFileExtractorTask,
 )
-from mdp.framework.mdp_extraction_framework.utility.shell_script.common import run_command
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    DEFAULT_EXTRACT_WORKERS,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    ZipMemberExtractor,
+)
 
 # import: external
 from pydantic import BaseModel
@@ -31,10 +35,15 @@ class ZipFileExtractorTaskConfigModel(BaseModel):
 
     source_file_location: str
     unzip_location: Optional[str] = ""
+    max_extract_workers: Optional[int] | None = DEFAULT_EXTRACT_WORKERS
 
 
 class ZipFileExtractorTask(BaseFileExtractorTask):
-    """Class for extracting files from a zip archive."""
+    """Class for extracting files from a zip archive.
+
+    The archive is extracted in process by up to 'max_extract_workers' threads, members
+    whose path escapes the extraction directory rejecting the whole archive.
+    """
 
     parameter_config_model = ZipFileExtractorTaskConfigModel
 
@@ -66,9 +75,6 @@ class ZipFileExtractorTask(BaseFileExtractorTask):
 
         Returns:
             str: The path of the newly created temporary directory.
-
-        Raises:
-            RuntimeError: If the command to create the directory fails.
         """
         if self.module_config.unzip_location.strip() == "":
             folder_location = Path(source_file_location).parent
@@ -78,93 +84,42 @@ class ZipFileExtractorTask(BaseFileExtractorTask):
             tmp_folder_location = self.module_config.unzip_location
 
         # remove existing dir
-        rm_dir_command = f"rm -rf {tmp_folder_location}"
-        self.logger.info(f"Remove existing directory command: {rm_dir_command}")
-        run_command(command=rm_dir_command)
+        self.logger.info(f"Remove existing directory: {tmp_folder_location}")
+        shutil.rmtree(tmp_folder_location, ignore_errors=True)
 
         # create dir
-        mk_tmp_dir_command = f"mkdir -p {tmp_folder_location}"
-        self.logger.info(f"Make directory command: {mk_tmp_dir_command}")
-        command_result = run_command(command=mk_tmp_dir_command)
-
-        if command_result.exit_code != 0:
-            raise RuntimeError(
-                f"Make directory failed with exit code: {command_result.exit_code}, "
-                f"output: \n{command_result.output}, \nerror_message: \n{command_result.error}"
-            )
-
-        self.logger.info(f"Output from the make directory command: \n{command_result.output}")
+        self.logger.info(f"Make directory: {tmp_folder_location}")
+        os.makedirs(tmp_folder_location, exist_ok=True)
         return tmp_folder_location
 
     def unzip_file(
         self,
         source_file_location: str,
         tmp_folder_location: str,
-    ) -> None:
+    ) -> List[DataFileInformation]:
         """Unzips a file to the specified temporary directory.
 
         Args:
             source_file_location (str): The path of the source zip file.
             tmp_folder_location (str): The path of the temporary directory.
 
-        Raises:
-            RuntimeError: If the unzip command fails.
-        """
-        unzip_command = f"unzip {source_file_location} -d {tmp_folder_location}"
-        self.logger.info(f"Unzip command: {unzip_command}")
-        command_result = run_command(command=unzip_command)
-        # Check if the command was successful
-        if command_result.exit_code != 0:
-            raise RuntimeError(
-                f"Unzip command failed with exit code: {command_result.exit_code}, output: \n{command_result.output}, \nerror_message: \n{command_result.error}"
-            )
-
-        self.logger.info(f"Output from the unzip command: \n{command_result.output}")
-
-    def list_files_in_folder(
-        self,
-        tmp_folder_location: str,
-    ) -> List[str]:
-        """Lists all files in the specified directory.
-
-        Executes a shell command to find and list all files in the temporary folder.
-
-        Args:
-            tmp_folder_location (str): The path of the temporary directory.
-
         Returns:
-            List[str]: A list of file paths within the directory.
+            List[DataFileInformation]: The unzipped files, built from the zip member table.
 
         Raises:
-            RuntimeError: If the list files command fails.
-            Exception: If an error occurs while processing the command output.
+            ZipSlipError: If a zip member would be extracted outside the directory.
         """
-        list_files_command = f"find {tmp_folder_location} -type f"
-        self.logger.info(f"List files command: {list_files_command}")
-        command_result = run_command(command=list_files_command)
-        # Check if the command was successful
-        if command_result.exit_code != 0:
-            raise RuntimeError(
-                f"List files command failed with exit code: {command_result.exit_code}, output: \n{command_result.output}, \nerror_message: \n{command_result.error}"
-            )
-
-        self.logger.info(f"Output from the list files command: \n{command_result.output}")
-
-        try:
-            output_list = command_result.output.split("\n")
-            # remove any empty strings from the list (in case of trailing newlines)
-            output_list = [item for item in output_list if item]
-            return output_list
-        except Exception as e:
-            self.logger.error(f"Error processing List files command output. {e}")
-            raise e
+        self.logger.info(f"Unzip {source_file_location} to {tmp_folder_location}")
+        return ZipMemberExtractor(
+            max_workers=self.module_config.max_extract_workers or DEFAULT_EXTRACT_WORKERS
+        ).extract(source_file_location, tmp_folder_location)
 
     def execute(self) -> List[DataFileInformation]:
         """Executes the file extraction process.
 
         1. Creates a temporary directory.
-        2. Unzips the source file into the temporary directory.
-        3. Lists all the files in the temporary directory.
+        2. Unzips the source file into the temporary directory, listing the unzipped files
+           from the zip member table.
 
         Returns:
             List[DataFileInformation]: A list of paths to the unzipped files.
@@ -176,8 +131,4 @@ class ZipFileExtractorTask(BaseFileExtractorTask):
         else:
             upzip_location = self.make_tmp_dir(self.module_config.unzip_location)
 
-        self.unzip_file(self.module_config.source_file_location, upzip_location)
-        unzipped_files_path = self.list_files_in_folder(upzip_location)
-        file_infos = [generate_data_file_info(file) for file in unzipped_files_path]
-
-        return file_infos
+        return self.unzip_file(self.module_config.source_file_location, upzip_location)
@@ -0,0 +1,252 @@
+"""Zip Member Extractor Module.
+
+Extracts a zip archive in process by a pool of threads, decompression releasing the
+GIL. Small members are grouped in batches and each read with positional reads of the
+archive, large members are streamed to disk in buffered chunks. Every member path is
+checked to stay within the destination before anything is written, so an archive with
+absolute or '..' member names (zip slip) is rejected as a whole. The information of the
+extracted files is built from the member table, without listing the destination.
+"""
+
+# import: standard
+import logging
+import os
+import shutil
+import struct
+import time
+import zipfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    DataFileInformation,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import TracedThreadPoolExecutor
+
+DEFAULT_EXTRACT_WORKERS = 4
+EXTRACT_CHUNK_SIZE = 1024 * 1024
+EXTRACT_BATCH_SIZE = 8 * 1024 * 1024
+EXTRACT_BATCH_MAX_MEMBERS = 256
+LOCAL_FILE_HEADER = struct.Struct("<4s2B4HL2L2H")
+LOCAL_FILE_HEADER_SIGNATURE = b"PK\003\004"
+ZIP_FLAG_ENCRYPTED = 0x1
+
+
+class ZipSlipError(ValueError):
+    """Raised when a zip member would be extracted outside the destination."""
+
+
+def read_small_member(zip_fd: int, member: zipfile.ZipInfo) -> bytes:
+    """Read and inflate a small stored or deflated member with positional reads of the
+    archive, safe to call from several threads on the same file descriptor.
+
+    Args:
+        zip_fd (int): A file descriptor of the archive.
+        member (zipfile.ZipInfo): The member.
+
+    Returns:
+        bytes: The member content.
+
+    Raises:
+        zipfile.BadZipFile: If the local header is invalid or the CRC does not match.
+    """
+    header = LOCAL_FILE_HEADER.unpack(
+        os.pread(zip_fd, LOCAL_FILE_HEADER.size, member.header_offset)
+    )
+    if header[0] != LOCAL_FILE_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad local file header for {member.filename!r}")
+    data_offset = member.header_offset + LOCAL_FILE_HEADER.size + header[10] + header[11]
+    data = os.pread(zip_fd, member.compress_size, data_offset)
+    if member.compress_type == zipfile.ZIP_DEFLATED:
+        data = zlib.decompress(data, -zlib.MAX_WBITS)
+    if len(data) != member.file_size or zlib.crc32(data) != member.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for file {member.filename!r}")
+    return data
+
+
+def get_member_relative_path(member_name: str) -> str:
+    """Get the path of a zip member relative to the extraction directory, rejecting paths
+    that would escape it.
+
+    Members are always written as regular files into a fresh directory, so the check is
+    lexical, without resolving the path on disk.
+
+    Args:
+        member_name (str): The member name from the zip member table.
+
+    Returns:
+        str: The normalized relative path of the member.
+
+    Raises:
+        ZipSlipError: If the member name is absolute, has a drive, or escapes the
+            directory with '..'.
+    """
+    member_parts = member_name.replace("\\", "/").split("/")
+    if member_parts[0] == "" or ":" in member_parts[0] or ".." in member_parts:
+        raise ZipSlipError(f"Zip member {member_name!r} escapes the extraction directory")
+    return "/".join(part for part in member_parts if part not in ("", "."))
+
+
+class ZipMemberExtractor:
+    """Extract the members of a zip archive in parallel."""
+
+    def __init__(
+        self, max_workers: int = DEFAULT_EXTRACT_WORKERS, chunk_size: int = EXTRACT_CHUNK_SIZE
+    ) -> None:
+        """Initialize the ZipMemberExtractor.
+
+        Args:
+            max_workers (int): Members extracted in parallel. Defaults to
+                DEFAULT_EXTRACT_WORKERS.
+            chunk_size (int): Bytes copied at a time from a member to its file. Defaults to
+                EXTRACT_CHUNK_SIZE.
+        """
+        self.max_workers = max(1, max_workers)
+        self.chunk_size = chunk_size
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def plan_members(self, zip_file: zipfile.ZipFile) -> Dict[str, zipfile.ZipInfo]:
+        """Map the relative path of each file member, checking all of them first.
+
+        Directory entries are skipped, and of members sharing a name the last one wins,
+        as when extracting them one after another.
+
+        Args:
+            zip_file (zipfile.ZipFile): The open archive.
+
+        Returns:
+            Dict[str, zipfile.ZipInfo]: The member of each relative path, in member table
+                order.
+        """
+        planned_members = {}
+        for member in zip_file.infolist():
+            relative_path = get_member_relative_path(member.filename)
+            if not member.is_dir():
+                planned_members.pop(relative_path, None)
+                planned_members[relative_path] = member
+        return planned_members
+
+    def batch_members(
+        self, planned_members: Dict[str, zipfile.ZipInfo], output_paths: Dict[str, str]
+    ) -> List[List[Tuple[zipfile.ZipInfo, str]]]:
+        """Group consecutive small members into batches extracted by one worker, so
+        thousands of small members do not cost a task each, a large member alone.
+
+        Args:
+            planned_members (Dict[str, zipfile.ZipInfo]): The member of each relative path.
+            output_paths (Dict[str, str]): The output file of each relative path.
+
+        Returns:
+            List[List[Tuple[zipfile.ZipInfo, str]]]: The batches of members and output files.
+        """
+        batches = []
+        batch = []
+        batch_size = 0
+        for relative_path, member in planned_members.items():
+            if batch and (
+                batch_size + member.file_size > EXTRACT_BATCH_SIZE
+                or len(batch) >= EXTRACT_BATCH_MAX_MEMBERS
+            ):
+                batches.append(batch)
+                batch = []
+                batch_size = 0
+            batch.append((member, output_paths[relative_path]))
+            batch_size += member.file_size
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def is_small_member(self, member: zipfile.ZipInfo) -> bool:
+        """Whether a member is read in one positional read instead of streamed.
+
+        Args:
+            member (zipfile.ZipInfo): The member.
+
+        Returns:
+            bool: True for an unencrypted stored or deflated member up to `chunk_size`.
+        """
+        return (
+            member.file_size <= self.chunk_size
+            and member.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+            and not member.flag_bits & ZIP_FLAG_ENCRYPTED
+        )
+
+    def extract_members(
+        self, zip_file: zipfile.ZipFile, zip_fd: int, batch: List[Tuple[zipfile.ZipInfo, str]]
+    ) -> None:
+        """Write members to their output files, the CRC of each checked. Small members
+        are read whole, large members streamed in `chunk_size` chunks.
+
+        Args:
+            zip_file (zipfile.ZipFile): The open archive.
+            zip_fd (int): A file descriptor of the archive, for positional reads.
+            batch (List[Tuple[zipfile.ZipInfo, str]]): The members and their output files.
+        """
+        for member, output_path in batch:
+            if self.is_small_member(member):
+                with open(output_path, "wb", buffering=0) as target:
+                    target.write(read_small_member(zip_fd, member))
+                continue
+            with zip_file.open(member) as source, open(output_path, "wb") as target:
+                shutil.copyfileobj(source, target, self.chunk_size)
+
+    def extract(
+        self, zip_file_path: Union[str, Path], destination: Union[str, Path]
+    ) -> List[DataFileInformation]:
+        """Extract the file members of an archive into a directory.
+
+        Args:
+            zip_file_path (Union[str, Path]): The zip archive.
+            destination (Union[str, Path]): The existing destination directory.
+
+        Returns:
+            List[DataFileInformation]: The extracted files, in member table order.
+
+        Raises:
+            ZipSlipError: If a member would be extracted outside the destination, before
+                any member is extracted.
+        """
+        start_time = time.perf_counter()
+        destination = str(destination)
+        with zipfile.ZipFile(zip_file_path) as zip_file:
+            zip_fd = zip_file.fp.fileno()
+            planned_members = self.plan_members(zip_file)
+            output_paths = {
+                relative_path: os.path.join(destination, relative_path)
+                for relative_path in planned_members
+            }
+            for directory in {
+                os.path.dirname(output_path) for output_path in output_paths.values()
+            }:
+                os.makedirs(directory, exist_ok=True)
+            with TracedThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="unzip"
+            ) as executor:
+                list(
+                    executor.map(
+                        lambda batch: self.extract_members(zip_file, zip_fd, batch),
+                        self.batch_members(planned_members, output_paths),
+                    )
+                )
+
+        extracted_datetime = datetime.now()
+        file_infos = [
+            DataFileInformation(
+                file_location=output_paths[relative_path],
+                file_size=member.file_size,
+                file_created_datetime=extracted_datetime,
+            )
+            for relative_path, member in planned_members.items()
+        ]
+        self.logger.info(
+            f"Extracted {len(file_infos)} files, "
+            f"{sum(file_info.file_size for file_info in file_infos)} bytes, from "
+            f"{zip_file_path} to {destination} in {round(time.perf_counter() - start_time, 3)}s"
+        )
+        return file_infos
@@ -0,0 +1,386 @@
+"""Zip Stream Reader Module.
+
+Reads the members of a zip archive from a forward-only stream such as a pipe, where
+`zipfile` needs to seek to the member table at the end of the archive. Members are read
+in archive order from their local headers. A deflated member whose sizes are only
+written after its data, in a data descriptor, is read until the end of its deflate
+stream, a stored one until a data descriptor signature followed by its size and CRC.
+Stored and deflated members are supported, each checked against its CRC once read.
+"""
+
+# import: standard
+import struct
+import zipfile
+import zlib
+from typing import BinaryIO
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    EXTRACT_CHUNK_SIZE,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    LOCAL_FILE_HEADER,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    LOCAL_FILE_HEADER_SIGNATURE,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    ZIP_FLAG_ENCRYPTED,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    get_member_relative_path,
+)
+
+CENTRAL_DIRECTORY_SIGNATURES = (b"PK\001\002", b"PK\005\006", b"PK\006\006")
+DATA_DESCRIPTOR_SIGNATURE = b"PK\007\010"
+ZIP_FLAG_DATA_DESCRIPTOR = 0x8
+ZIP_FLAG_UTF8 = 0x800
+ZIP64_EXTRA_ID = 0x0001
+ZIP64_LIMIT = 0xFFFFFFFF
+EXTRA_FIELD_HEADER = struct.Struct("<2H")
+
+
+class PushbackStream:
+    """Read a binary stream, with bytes read ahead pushed back to be read again."""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """Initialize the PushbackStream.
+
+        Args:
+            stream (BinaryIO): The stream to read.
+        """
+        self.stream = stream
+        self.pushed_back = b""
+
+    def read(self, size: int = -1) -> bytes:
+        """Read bytes, the pushed back bytes first.
+
+        Args:
+            size (int): Bytes to read, all remaining bytes if negative.
+
+        Returns:
+            bytes: The bytes read, empty at the end of the stream.
+        """
+        if not self.pushed_back:
+            return self.stream.read(size)
+        if size < 0:
+            data, self.pushed_back = self.pushed_back + self.stream.read(), b""
+            return data
+        data, self.pushed_back = self.pushed_back[:size], self.pushed_back[size:]
+        return data
+
+    def unread(self, data: bytes) -> None:
+        """Push bytes back, to be read before the rest of the stream.
+
+        Args:
+            data (bytes): The bytes to read again.
+        """
+        self.pushed_back = data + self.pushed_back
+
+    def peek(self, size: int) -> bytes:
+        """Read up to `size` bytes without consuming them.
+
+        Args:
+            size (int): Bytes to read.
+
+        Returns:
+            bytes: The bytes, fewer than `size` only at the end of the stream.
+        """
+        data = read_exactly(self, size, allow_eof=True)
+        self.unread(data)
+        return data
+
+
+def read_exactly(stream: BinaryIO, size: int, allow_eof: bool = False) -> bytes:
+    """Read `size` bytes from a stream returning fewer bytes than asked at a time.
+
+    Args:
+        stream (BinaryIO): The stream.
+        size (int): Bytes to read.
+        allow_eof (bool): Return the bytes read when the stream ends first instead of
+            raising.
+
+    Returns:
+        bytes: The bytes read.
+
+    Raises:
+        zipfile.BadZipFile: If the stream ends first and it is not allowed.
+    """
+    chunks: List[bytes] = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            if allow_eof:
+                break
+            raise zipfile.BadZipFile(f"Truncated zip stream, {remaining} bytes missing")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def get_zip64_sizes(extra: bytes) -> Optional[Tuple[int, int]]:
+    """Get the uncompressed and compressed sizes from the zip64 extra field of a local
+    header.
+
+    Args:
+        extra (bytes): The extra field of the local header.
+
+    Returns:
+        Optional[Tuple[int, int]]: The uncompressed and compressed sizes, None without a
+            zip64 extra field.
+    """
+    offset = 0
+    while offset + EXTRA_FIELD_HEADER.size <= len(extra):
+        field_id, field_size = EXTRA_FIELD_HEADER.unpack_from(extra, offset)
+        offset += EXTRA_FIELD_HEADER.size
+        if field_id == ZIP64_EXTRA_ID and field_size >= 16:
+            return struct.unpack_from("<2Q", extra, offset)
+        offset += field_size
+    return None
+
+
+class ZipStreamMember:
+    """Read the decompressed content of a zip member from the archive stream."""
+
+    def __init__(
+        self,
+        stream: PushbackStream,
+        member_name: str,
+        compress_type: int,
+        compress_size: Optional[int],
+        file_size: Optional[int],
+        crc: Optional[int],
+        zip64: bool = False,
+        chunk_size: int = EXTRACT_CHUNK_SIZE,
+    ) -> None:
+        """Initialize the ZipStreamMember.
+
+        Args:
+            stream (PushbackStream): The archive stream, at the start of the member data.
+            member_name (str): The member name, for error messages.
+            compress_type (int): zipfile.ZIP_STORED or zipfile.ZIP_DEFLATED.
+            compress_size (Optional[int]): The compressed size, None if only written in
+                the data descriptor.
+            file_size (Optional[int]): The uncompressed size, None if only written in the
+                data descriptor.
+            crc (Optional[int]): The CRC-32, None if only written in the data descriptor.
+            zip64 (bool): Whether the data descriptor holds 8 byte sizes. Defaults to False.
+            chunk_size (int): Compressed bytes read and decompressed at a time. Defaults to
+                EXTRACT_CHUNK_SIZE.
+        """
+        self.stream = stream
+        self.member_name = member_name
+        self.decompressor = (
+            zlib.decompressobj(-zlib.MAX_WBITS) if compress_type == zipfile.ZIP_DEFLATED else None
+        )
+        self.remaining = compress_size
+        self.file_size = file_size
+        self.crc = crc
+        self.descriptor_format = struct.Struct("<L2Q" if zip64 else "<3L")
+        self.chunk_size = chunk_size
+        self.buffer = b""
+        self.pending = b""
+        self.eof = False
+        self.bytes_read = 0
+        self.running_crc = 0
+
+    def read_stored_chunk(self) -> bytes:
+        """Read the next chunk of a stored member of unknown size, up to its data
+        descriptor: the signature followed by a CRC and sizes matching the bytes before
+        it. The data descriptor is left in the archive stream.
+
+        Returns:
+            bytes: Member bytes, possibly empty before the end of the member.
+
+        Raises:
+            zipfile.BadZipFile: If the archive stream ends within the member.
+        """
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated zip member {self.member_name!r}")
+        data = self.pending + chunk
+        descriptor_size = len(DATA_DESCRIPTOR_SIGNATURE) + self.descriptor_format.size
+        position = data.find(DATA_DESCRIPTOR_SIGNATURE)
+        while position >= 0:
+            if len(data) < position + descriptor_size:
+                # Not enough bytes yet to check the candidate descriptor
+                self.pending = data[position:]
+                return data[:position]
+            crc, compress_size, file_size = self.descriptor_format.unpack_from(
+                data, position + len(DATA_DESCRIPTOR_SIGNATURE)
+            )
+            member_size = self.bytes_read + position
+            if compress_size == file_size == member_size and crc == zlib.crc32(
+                data[:position], self.running_crc
+            ):
+                self.stream.unread(data[position:])
+                self.pending = b""
+                self.eof = True
+                return data[:position]
+            position = data.find(DATA_DESCRIPTOR_SIGNATURE, position + 1)
+        # Keep the bytes that may start a signature split across chunks
+        kept_size = len(DATA_DESCRIPTOR_SIGNATURE) - 1
+        self.pending = data[-kept_size:]
+        return data[:-kept_size]
+
+    def decompress_chunk(self) -> bytes:
+        """Read and decompress the next chunk of a deflated member, up to the end of its
+        deflate stream, the bytes read past it pushed back to the archive stream.
+
+        Returns:
+            bytes: Decompressed bytes, possibly empty before the end of the member.
+
+        Raises:
+            zipfile.BadZipFile: If the archive stream ends within the member.
+        """
+        if self.decompressor.unconsumed_tail:
+            compressed = self.decompressor.unconsumed_tail
+        else:
+            read_size = (
+                self.chunk_size if self.remaining is None else min(self.chunk_size, self.remaining)
+            )
+            compressed = self.stream.read(read_size) if read_size else b""
+            if not compressed:
+                raise zipfile.BadZipFile(f"Truncated zip member {self.member_name!r}")
+            if self.remaining is not None:
+                self.remaining -= len(compressed)
+        data = self.decompressor.decompress(compressed, self.chunk_size)
+        if self.decompressor.eof:
+            self.stream.unread(self.decompressor.unused_data)
+            self.eof = True
+        return data
+
+    def read_chunk(self) -> bytes:
+        """Read and decompress the next chunk of the member.
+
+        Returns:
+            bytes: Decompressed bytes, possibly empty before the end of the member.
+
+        Raises:
+            zipfile.BadZipFile: If the archive stream ends within the member.
+        """
+        if self.decompressor is None and self.remaining is None:
+            data = self.read_stored_chunk()
+        elif self.decompressor is None:
+            data = self.stream.read(min(self.chunk_size, self.remaining)) if self.remaining else b""
+            if not data and self.remaining:
+                raise zipfile.BadZipFile(f"Truncated zip member {self.member_name!r}")
+            self.remaining -= len(data)
+            self.eof = self.remaining == 0
+        else:
+            data = self.decompress_chunk()
+        self.running_crc = zlib.crc32(data, self.running_crc)
+        self.bytes_read += len(data)
+        return data
+
+    def read(self, size: int = -1) -> bytes:
+        """Read decompressed bytes of the member.
+
+        Args:
+            size (int): Bytes to read, all remaining bytes if negative.
+
+        Returns:
+            bytes: The bytes read, empty at the end of the member.
+        """
+        chunks = [self.buffer]
+        buffered_size = len(self.buffer)
+        while not self.eof and (size < 0 or buffered_size < size):
+            chunk = self.read_chunk()
+            chunks.append(chunk)
+            buffered_size += len(chunk)
+        data = b"".join(chunks)
+        if size < 0:
+            self.buffer = b""
+            return data
+        self.buffer = data[size:]
+        return data[:size]
+
+    def finish(self) -> None:
+        """Skip the unread bytes of the member, read its data descriptor if any, and check
+        its size and CRC.
+
+        Raises:
+            zipfile.BadZipFile: If the size or the CRC does not match.
+        """
+        while not self.eof:
+            self.read_chunk()
+        self.buffer = b""
+        if self.crc is None:
+            descriptor = read_exactly(self.stream, 4)
+            if descriptor == DATA_DESCRIPTOR_SIGNATURE:
+                descriptor = read_exactly(self.stream, 4)
+            self.crc, _, self.file_size = self.descriptor_format.unpack(
+                descriptor + read_exactly(self.stream, self.descriptor_format.size - 4)
+            )
+        if self.bytes_read != self.file_size or self.running_crc != self.crc:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for file {self.member_name!r}")
+
+
+def iter_zip_stream_members(
+    stream: BinaryIO, chunk_size: int = EXTRACT_CHUNK_SIZE
+) -> Iterator[Tuple[str, Optional[int], ZipStreamMember]]:
+    """Iterate the file members of a zip archive read from a forward-only stream, each
+    only readable until the next member is requested.
+
+    Args:
+        stream (BinaryIO): The archive stream.
+        chunk_size (int): Compressed bytes read and decompressed at a time. Defaults to
+            EXTRACT_CHUNK_SIZE.
+
+    Yields:
+        Tuple[str, Optional[int], ZipStreamMember]: The relative path, the size if
+            written in the local header, and the content of each member, in archive
+            order.
+
+    Raises:
+        zipfile.BadZipFile: If the archive is invalid or a member encrypted.
+        ZipSlipError: If a member path escapes the extraction directory.
+    """
+    stream = stream if isinstance(stream, PushbackStream) else PushbackStream(stream)
+    while True:
+        signature = read_exactly(stream, 4, allow_eof=True)
+        if not signature or signature in CENTRAL_DIRECTORY_SIGNATURES:
+            return
+        if signature != LOCAL_FILE_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f"Bad local file header signature: {signature!r}")
+        header = LOCAL_FILE_HEADER.unpack(
+            signature + read_exactly(stream, LOCAL_FILE_HEADER.size - 4)
+        )
+        flag_bits, compress_type = header[3], header[4]
+        crc, compress_size, file_size = header[7], header[8], header[9]
+        raw_name = read_exactly(stream, header[10])
+        extra = read_exactly(stream, header[11])
+        member_name = raw_name.decode("utf-8" if flag_bits & ZIP_FLAG_UTF8 else "cp437")
+
+        if flag_bits & ZIP_FLAG_ENCRYPTED:
+            raise zipfile.BadZipFile(f"Encrypted zip member {member_name!r} is not supported")
+        if compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            raise zipfile.BadZipFile(
+                f"Compression method {compress_type} of zip member {member_name!r} "
+                "is not supported"
+            )
+        zip64_sizes = get_zip64_sizes(extra)
+        if flag_bits & ZIP_FLAG_DATA_DESCRIPTOR:
+            crc = compress_size = file_size = None
+        elif ZIP64_LIMIT in (compress_size, file_size) and zip64_sizes:
+            file_size, compress_size = zip64_sizes
+
+        relative_path = get_member_relative_path(member_name)
+        member = ZipStreamMember(
+            stream,
+            member_name,
+            compress_type,
+            compress_size,
+            file_size,
+            crc,
+            zip64=zip64_sizes is not None,
+            chunk_size=chunk_size,
+        )
+        if not member_name.endswith("/"):
+            yield relative_path, file_size, member
+        member.finish()
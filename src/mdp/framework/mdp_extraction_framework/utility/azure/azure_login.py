@@ -7,6 +7,10 @@ from typing import Optional
 from typing import Sequence
 
 # import: internal
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    record_retry_attempt,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import traced_operation
 from mdp.framework.mdp_extraction_framework.utility.shell_script.common import CommandResult
 from mdp.framework.mdp_extraction_framework.utility.shell_script.common import run_command
 
@@ -39,8 +43,10 @@ class AzCopyServicePrincipal:
     @retry(
         wait=wait_exponential(multiplier=1.5, min=10, max=120),
         stop=stop_after_attempt(3),
+        before=record_retry_attempt("azure_login"),
         reraise=True,
     )
+    @traced_operation("azure_login")
     def login(self) -> CommandResult:
         """Perform Azure CLI login using a Service Principal.
 
@@ -67,8 +73,10 @@ class AzCopyServicePrincipal:
     @retry(
         wait=wait_exponential(multiplier=1.5, min=10, max=120),
         stop=stop_after_attempt(3),
+        before=record_retry_attempt("azcopy_copy"),
         reraise=True,
     )
+    @traced_operation("azcopy_copy")
     def copy(
         self,
         source_url: str,
@@ -0,0 +1,372 @@
+"""File Completeness Module.
+
+Waits until files dropped by another process are completely written, so a task does not
+read a file still being written. On Linux the files open for writing are found with one
+scan of /proc, and each is declared ready as soon as its last writer closes it, from the
+inotify IN_CLOSE_WRITE events of its directory. Elsewhere, or when inotify is not
+available, a file is declared ready once its size and modification time have been stable
+for an interval. Each file emits a readiness event as soon as it is ready.
+"""
+
+# import: standard
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+
+IN_CLOSE_WRITE = 0x00000008
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+INOTIFY_READ_SIZE = 64 * 1024
+O_ACCMODE = 0o3
+DEFAULT_STABLE_INTERVAL_SEC = 3.0
+DEFAULT_POLL_INTERVAL_SEC = 0.5
+
+
+class FileCompletenessTimeoutError(TimeoutError):
+    """Raised when files are not complete within the timeout."""
+
+
+@dataclass
+class FileReadyEvent:
+    """Dataclass to store the readiness of a watched file.
+
+    Attributes:
+        file_path (str): The watched file.
+        ready (bool): Whether the file is complete, False if the wait timed out.
+        reason (str): 'not_open' if no process had it open for writing, 'close_write' if
+            its last writer closed it, 'stable_size' if its size was stable for the
+            interval, or 'timeout'.
+        elapsed_sec (float): Seconds from the start of the wait to the event.
+    """
+
+    file_path: str
+    ready: bool
+    reason: str
+    elapsed_sec: float
+
+
+def find_files_open_for_writing(file_paths: List[str]) -> Set[str]:
+    """Find the files some process has open for writing, with one scan of the file
+    descriptors in /proc. Only the processes readable by the current user are seen, as
+    with fuser.
+
+    Args:
+        file_paths (List[str]): The files to look for, as absolute paths.
+
+    Returns:
+        Set[str]: The files open for writing.
+    """
+    targets = set(file_paths)
+    open_for_writing = set()
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        fd_directory = f"/proc/{pid}/fd"
+        try:
+            fds = os.listdir(fd_directory)
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                target = os.readlink(f"{fd_directory}/{fd}")
+                if target not in targets or target in open_for_writing:
+                    continue
+                with open(f"/proc/{pid}/fdinfo/{fd}") as fdinfo:
+                    flags = next(line for line in fdinfo if line.startswith("flags:"))
+            except (OSError, StopIteration):
+                continue
+            if int(flags.split()[1], 8) & O_ACCMODE:
+                open_for_writing.add(target)
+    return open_for_writing
+
+
+class InotifyWatch:
+    """Watch directories for files closed after writing, with Linux inotify."""
+
+    def __init__(self, directories: List[str]) -> None:
+        """Initialize the InotifyWatch and add a watch on each directory.
+
+        Args:
+            directories (List[str]): The directories to watch.
+
+        Raises:
+            OSError: If inotify is not available or a watch cannot be added.
+        """
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories: Dict[int, str] = {}
+        for directory in directories:
+            watch_descriptor = self.libc.inotify_add_watch(
+                self.fd, os.fsencode(directory), IN_CLOSE_WRITE
+            )
+            if watch_descriptor < 0:
+                self.close()
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed on {directory}")
+            self.directories[watch_descriptor] = directory
+
+    def __enter__(self) -> "InotifyWatch":
+        """Return the watch."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the watch."""
+        self.close()
+
+    def read_closed_files(self, timeout_sec: float) -> List[str]:
+        """Wait up to a timeout for files closed after writing.
+
+        Args:
+            timeout_sec (float): Seconds to wait for events.
+
+        Returns:
+            List[str]: The files closed after writing, empty if none within the timeout.
+        """
+        readable, _, _ = select.select([self.fd], [], [], max(0.0, timeout_sec))
+        if not readable:
+            return []
+        buffer = os.read(self.fd, INOTIFY_READ_SIZE)
+        closed_files = []
+        offset = 0
+        while offset < len(buffer):
+            watch_descriptor, mask, _, name_length = INOTIFY_EVENT_HEADER.unpack_from(
+                buffer, offset
+            )
+            offset += INOTIFY_EVENT_HEADER.size
+            name = buffer[offset : offset + name_length].rstrip(b"\0")
+            offset += name_length
+            if mask & IN_CLOSE_WRITE and watch_descriptor in self.directories:
+                closed_files.append(
+                    os.path.join(self.directories[watch_descriptor], os.fsdecode(name))
+                )
+        return closed_files
+
+    def close(self) -> None:
+        """Close the inotify file descriptor, removing its watches."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class FileCompletenessWatcher:
+    """Wait until files are completely written, using inotify with a stable size
+    fallback."""
+
+    def __init__(
+        self,
+        timeout_sec: Optional[float] = None,
+        stable_interval_sec: float = DEFAULT_STABLE_INTERVAL_SEC,
+        poll_interval_sec: float = DEFAULT_POLL_INTERVAL_SEC,
+        on_file_ready: Optional[Callable[[FileReadyEvent], None]] = None,
+        use_inotify: bool = True,
+    ) -> None:
+        """Initialize the FileCompletenessWatcher.
+
+        Args:
+            timeout_sec (Optional[float]): Seconds to wait for all files, no limit if None.
+            stable_interval_sec (float): Seconds a file size must be stable to be declared
+                ready by the fallback. Defaults to DEFAULT_STABLE_INTERVAL_SEC.
+            poll_interval_sec (float): Seconds between two stats of the fallback. Defaults
+                to DEFAULT_POLL_INTERVAL_SEC.
+            on_file_ready (Optional[Callable[[FileReadyEvent], None]]): Called with the
+                event of each file as soon as it is ready or timed out.
+            use_inotify (bool): Use inotify when available. Defaults to True.
+        """
+        self.timeout_sec = timeout_sec
+        self.stable_interval_sec = stable_interval_sec
+        self.poll_interval_sec = poll_interval_sec
+        self.on_file_ready = on_file_ready
+        self.use_inotify = use_inotify
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def emit(
+        self,
+        events: Dict[str, FileReadyEvent],
+        file_path: str,
+        ready: bool,
+        reason: str,
+        start_time: float,
+    ) -> None:
+        """Record the readiness event of a file and pass it to the callback.
+
+        Args:
+            events (Dict[str, FileReadyEvent]): The events recorded so far, by file.
+            file_path (str): The file.
+            ready (bool): Whether the file is complete.
+            reason (str): The reason of the event.
+            start_time (float): The start time of the wait.
+        """
+        event = FileReadyEvent(file_path, ready, reason, round(time.monotonic() - start_time, 3))
+        events[file_path] = event
+        if self.on_file_ready:
+            self.on_file_ready(event)
+
+    def open_inotify_watch(self, file_paths: List[str]) -> Optional[InotifyWatch]:
+        """Open an inotify watch on the directories of the files, if available.
+
+        Args:
+            file_paths (List[str]): The files, as absolute paths.
+
+        Returns:
+            Optional[InotifyWatch]: The watch, None to fall back to the stable size check.
+        """
+        if not self.use_inotify or not sys.platform.startswith("linux"):
+            return None
+        try:
+            return InotifyWatch(sorted({os.path.dirname(file_path) for file_path in file_paths}))
+        except (OSError, AttributeError) as e:
+            self.logger.warning(f"inotify is not available, checking stable file sizes: {e}")
+            return None
+
+    def wait(self, file_paths: List[str]) -> List[FileReadyEvent]:
+        """Wait until every file is completely written.
+
+        Args:
+            file_paths (List[str]): The files to wait for.
+
+        Returns:
+            List[FileReadyEvent]: The readiness event of each file, in the order of
+                `file_paths`.
+
+        Raises:
+            FileCompletenessTimeoutError: If some files are not complete within the timeout.
+        """
+        start_time = time.monotonic()
+        absolute_paths = {file_path: os.path.realpath(file_path) for file_path in file_paths}
+        events: Dict[str, FileReadyEvent] = {}
+        self.logger.info(f"Checking file completeness: {len(file_paths)}")
+
+        watch = self.open_inotify_watch(list(absolute_paths.values()))
+        if watch is not None:
+            with watch:
+                self.wait_for_close_write(watch, absolute_paths, events, start_time)
+        else:
+            self.wait_for_stable_size(absolute_paths, events, start_time)
+
+        pending = [file_path for file_path in file_paths if file_path not in events]
+        for file_path in pending:
+            self.emit(events, file_path, False, "timeout", start_time)
+        if pending:
+            raise FileCompletenessTimeoutError(
+                f"{len(pending)} files not complete within {self.timeout_sec}s: {pending}"
+            )
+        self.logger.info(
+            f"All files are available to process other tasks after "
+            f"{round(time.monotonic() - start_time, 3)}s"
+        )
+        return [events[file_path] for file_path in file_paths]
+
+    def get_remaining_sec(self, start_time: float) -> Optional[float]:
+        """Get the seconds left before the timeout.
+
+        Args:
+            start_time (float): The start time of the wait.
+
+        Returns:
+            Optional[float]: The seconds left, None if there is no timeout.
+        """
+        if self.timeout_sec is None:
+            return None
+        return self.timeout_sec - (time.monotonic() - start_time)
+
+    def wait_for_close_write(
+        self,
+        watch: InotifyWatch,
+        absolute_paths: Dict[str, str],
+        events: Dict[str, FileReadyEvent],
+        start_time: float,
+    ) -> None:
+        """Declare ready the files not open for writing, then each remaining file once its
+        last writer closes it.
+
+        Args:
+            watch (InotifyWatch): The watch on the directories of the files, opened before
+                the scan so no close is missed.
+            absolute_paths (Dict[str, str]): The absolute path of each file.
+            events (Dict[str, FileReadyEvent]): The events recorded so far, by file.
+            start_time (float): The start time of the wait.
+        """
+        file_paths_by_absolute_path = {
+            absolute_path: file_path for file_path, absolute_path in absolute_paths.items()
+        }
+        pending = set(file_paths_by_absolute_path)
+        open_for_writing = find_files_open_for_writing(sorted(pending))
+        for absolute_path in sorted(pending - open_for_writing):
+            self.emit(
+                events, file_paths_by_absolute_path[absolute_path], True, "not_open", start_time
+            )
+        pending = open_for_writing
+        if pending:
+            self.logger.info(f"Waiting for {len(pending)} files still open for writing")
+
+        while pending:
+            remaining_sec = self.get_remaining_sec(start_time)
+            if remaining_sec is not None and remaining_sec <= 0:
+                return
+            closed_files = pending.intersection(
+                watch.read_closed_files(
+                    self.poll_interval_sec if remaining_sec is None else remaining_sec
+                )
+            )
+            if not closed_files:
+                continue
+            # Another writer may still hold the file open
+            still_open = find_files_open_for_writing(sorted(closed_files))
+            for absolute_path in sorted(closed_files - still_open):
+                self.emit(
+                    events,
+                    file_paths_by_absolute_path[absolute_path],
+                    True,
+                    "close_write",
+                    start_time,
+                )
+                pending.discard(absolute_path)
+
+    def wait_for_stable_size(
+        self,
+        absolute_paths: Dict[str, str],
+        events: Dict[str, FileReadyEvent],
+        start_time: float,
+    ) -> None:
+        """Declare ready each file once its size and modification time have not changed
+        for the stable interval.
+
+        Args:
+            absolute_paths (Dict[str, str]): The absolute path of each file.
+            events (Dict[str, FileReadyEvent]): The events recorded so far, by file.
+            start_time (float): The start time of the wait.
+        """
+        last_changes = {}
+        while len(events) < len(absolute_paths):
+            now = time.monotonic()
+            for file_path, absolute_path in absolute_paths.items():
+                if file_path in events:
+                    continue
+                stat_result = os.stat(absolute_path)
+                signature = (stat_result.st_size, stat_result.st_mtime_ns)
+                if file_path not in last_changes or last_changes[file_path][0] != signature:
+                    last_changes[file_path] = (signature, now)
+                elif now - last_changes[file_path][1] >= self.stable_interval_sec:
+                    self.emit(events, file_path, True, "stable_size", start_time)
+
+            remaining_sec = self.get_remaining_sec(start_time)
+            if len(events) == len(absolute_paths) or (
+                remaining_sec is not None and remaining_sec <= 0
+            ):
+                return
+            time.sleep(
+                self.poll_interval_sec
+                if remaining_sec is None
+                else min(self.poll_interval_sec, remaining_sec)
+            )
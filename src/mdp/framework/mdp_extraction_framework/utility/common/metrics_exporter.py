@@ -0,0 +1,344 @@
+"""OpenMetrics Exporter Module.
+
+Renders the job and task metrics of a run in the OpenMetrics text format and writes them
+as a textfile for the node_exporter textfile collector, or serves the textfiles of a
+directory through a local HTTP endpoint.
+"""
+
+# import: standard
+import logging
+import os
+import tempfile
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Union
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.utility.common.job_log import JobStatus
+from mdp.framework.mdp_extraction_framework.utility.common.task_metrics import TaskMetrics
+
+METRIC_PREFIX = "mdp_extraction"
+METRICS_TEXTFILE_DIR_ENV = "METRICS_TEXTFILE_DIR"
+METRICS_TEXTFILE_EXTENSION = ".prom"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Process-wide attempt and retry counters of the tenacity-decorated operations
+OPERATION_ATTEMPTS: Counter = Counter()
+OPERATION_RETRIES: Counter = Counter()
+# Process-wide wall time and bytes spent by the retries of an operation
+OPERATION_RETRY_SECONDS: Counter = Counter()
+OPERATION_RETRY_BYTES: Counter = Counter()
+
+
+def record_retry_attempt(operation: str) -> Callable:
+    """Build a tenacity `before` callback counting the attempts of an operation.
+
+    Args:
+        operation (str): The operation name used as metric label, e.g. 'azcopy_transfer'.
+
+    Returns:
+        Callable: The callback to pass as `before` to `tenacity.retry`.
+    """
+
+    def before(retry_state) -> None:
+        OPERATION_ATTEMPTS[operation] += 1
+        if retry_state.attempt_number > 1:
+            OPERATION_RETRIES[operation] += 1
+
+    return before
+
+
+def record_retry_cost(operation: str, seconds: float, byte_count: int = 0) -> None:
+    """Add the wall time and bytes spent by a retry of an operation to its counters.
+
+    Args:
+        operation (str): The operation name used as metric label, e.g. 'azcopy_transfer'.
+        seconds (float): Wall time of the retry, including the backoff before it.
+        byte_count (int): Bytes sent again by the retry.
+    """
+    OPERATION_RETRY_SECONDS[operation] += seconds
+    OPERATION_RETRY_BYTES[operation] += byte_count
+
+
+def get_connection_name(config: dict) -> str:
+    """Get the first 'connection_name' parameter from the tasks of a job config.
+
+    Args:
+        config (dict): The rendered job config.
+
+    Returns:
+        str: The connection name, empty string if no task has one.
+    """
+    for task_config in (config.get("tasks") or {}).values():
+        connection_name = (task_config.get("parameters") or {}).get("connection_name")
+        if connection_name:
+            return connection_name
+    return ""
+
+
+def escape_label_value(value: Optional[str]) -> str:
+    """Escape a label value following the OpenMetrics text format.
+
+    Args:
+        value (Optional[str]): The label value.
+
+    Returns:
+        str: The escaped label value.
+    """
+    return (
+        str(value if value is not None else "")
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def format_labels(labels: dict) -> str:
+    """Format a label dictionary as '{name="value",...}'.
+
+    Args:
+        labels (dict): The labels of a sample.
+
+    Returns:
+        str: The formatted labels.
+    """
+    label_pairs = ",".join(
+        f'{name}="{escape_label_value(value)}"' for name, value in labels.items()
+    )
+    return f"{{{label_pairs}}}"
+
+
+class OpenMetricsWriter:
+    """Collect gauge samples grouped by metric family and render them as text."""
+
+    def __init__(self) -> None:
+        """Initialize an empty OpenMetricsWriter."""
+        self.families: dict[str, dict] = {}
+
+    def add(self, name: str, help_text: str, labels: dict, value: Optional[float]) -> None:
+        """Add a gauge sample, samples with a None value are skipped.
+
+        Args:
+            name (str): The metric name without prefix.
+            help_text (str): The HELP text of the metric family.
+            labels (dict): The sample labels.
+            value (Optional[float]): The sample value.
+        """
+        if value is None:
+            return
+        family = self.families.setdefault(
+            f"{METRIC_PREFIX}_{name}", {"help": help_text, "samples": []}
+        )
+        family["samples"].append((labels, value))
+
+    def render(self) -> str:
+        """Render all metric families in the OpenMetrics text format.
+
+        Returns:
+            str: The OpenMetrics text, terminated by '# EOF'.
+        """
+        lines = []
+        for name, family in self.families.items():
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in family["samples"]:
+                lines.append(f"{name}{format_labels(labels)} {value}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def render_run_metrics(
+    job_name: str,
+    area_name: str,
+    connection_name: str,
+    job_status: str,
+    job_start_datetime: datetime,
+    job_end_datetime: datetime,
+    task_metrics: List[TaskMetrics],
+) -> str:
+    """Render the job, task and retry metrics of a run in the OpenMetrics text format.
+
+    Args:
+        job_name (str): The name of the job.
+        area_name (str): The area name of the job.
+        connection_name (str): The source connection name of the job.
+        job_status (str): The status of the job, SUCCESS or FAILED.
+        job_start_datetime (datetime): The datetime the job started.
+        job_end_datetime (datetime): The datetime the job finished.
+        task_metrics (List[TaskMetrics]): Metrics of each executed task.
+
+    Returns:
+        str: The OpenMetrics text.
+    """
+    labels = {"job_name": job_name, "area_name": area_name, "connection_name": connection_name}
+    writer = OpenMetricsWriter()
+    writer.add(
+        "job_duration_seconds",
+        "Wall time of the last job run.",
+        labels,
+        round((job_end_datetime - job_start_datetime).total_seconds(), 3),
+    )
+    writer.add(
+        "job_success",
+        "1 if the last job run succeeded, 0 if it failed.",
+        labels,
+        int(job_status == JobStatus.SUCCESS.value),
+    )
+    writer.add(
+        "job_last_run_timestamp_seconds",
+        "End time of the last job run as a Unix timestamp.",
+        labels,
+        round(job_end_datetime.timestamp(), 3),
+    )
+    for metrics in task_metrics:
+        task_labels = {**labels, "task_name": metrics.task_name}
+        writer.add(
+            "task_duration_seconds", "Wall time of the task.", task_labels, metrics.wall_time_sec
+        )
+        writer.add(
+            "task_cpu_seconds",
+            "CPU time of the task, including child processes.",
+            task_labels,
+            round(metrics.cpu_time_sec + metrics.child_cpu_time_sec, 3),
+        )
+        writer.add("task_rows", "Rows processed by the task.", task_labels, metrics.rows_processed)
+        writer.add("task_read_bytes", "Bytes read by the task.", task_labels, metrics.bytes_read)
+        writer.add(
+            "task_written_bytes", "Bytes written by the task.", task_labels, metrics.bytes_written
+        )
+        writer.add(
+            "task_success",
+            "1 if the task succeeded, 0 if it failed.",
+            task_labels,
+            int(metrics.task_status == JobStatus.SUCCESS.value),
+        )
+    for operation, attempts in sorted(OPERATION_ATTEMPTS.items()):
+        operation_labels = {**labels, "operation": operation}
+        writer.add(
+            "operation_attempts", "Attempts of a retried operation.", operation_labels, attempts
+        )
+        writer.add(
+            "operation_retries",
+            "Retries of a retried operation after a failed attempt.",
+            operation_labels,
+            OPERATION_RETRIES[operation],
+        )
+        if operation in OPERATION_RETRY_SECONDS:
+            writer.add(
+                "operation_retry_seconds",
+                "Wall time spent retrying an operation, backoff included.",
+                operation_labels,
+                round(OPERATION_RETRY_SECONDS[operation], 3),
+            )
+            writer.add(
+                "operation_retry_bytes",
+                "Bytes sent again by the retries of an operation.",
+                operation_labels,
+                OPERATION_RETRY_BYTES[operation],
+            )
+    return writer.render()
+
+
+def write_metrics_textfile(
+    directory: Union[str, Path], job_name: str, content: str
+) -> Optional[Path]:
+    """Atomically write an OpenMetrics textfile for the node_exporter textfile
+    collector.
+
+    The content is written to a temporary file in the same directory and renamed, so
+    the collector never reads a partial file.
+
+    Args:
+        directory (Union[str, Path]): The textfile collector directory.
+        job_name (str): The job name, used as file name.
+        content (str): The OpenMetrics text.
+
+    Returns:
+        Optional[Path]: The written file path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    file_path = Path(directory, f"{METRIC_PREFIX}_{job_name}{METRICS_TEXTFILE_EXTENSION}")
+    file_descriptor, tmp_file_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w") as file:
+            file.write(content)
+        os.chmod(tmp_file_path, 0o644)
+        os.replace(tmp_file_path, file_path)
+    except Exception:
+        os.remove(tmp_file_path)
+        raise
+    return file_path
+
+
+def read_metrics_textfiles(directory: Union[str, Path]) -> str:
+    """Concatenate the metrics textfiles of a directory into a single exposition.
+
+    Args:
+        directory (Union[str, Path]): The textfile collector directory.
+
+    Returns:
+        str: The OpenMetrics text of every job, terminated by a single '# EOF'.
+    """
+    families: dict[str, list] = {}
+    for file_path in sorted(Path(directory).glob(f"*{METRICS_TEXTFILE_EXTENSION}")):
+        current_family = None
+        for line in file_path.read_text().splitlines():
+            if not line or line == "# EOF":
+                continue
+            if line.startswith("# HELP "):
+                current_family = line.split(" ")[2]
+                families.setdefault(current_family, [line, None])
+            elif current_family is None:
+                # Skip files not written by render_run_metrics
+                break
+            elif line.startswith("# TYPE "):
+                families[current_family][1] = line
+            else:
+                families[current_family].append(line)
+    lines = [line for family in families.values() for line in family if line is not None]
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler serving the metrics textfiles of the server's directory on /metrics."""
+
+    def do_GET(self) -> None:
+        """Serve the metrics exposition on /metrics and 404 otherwise."""
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = read_metrics_textfiles(self.server.metrics_directory).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        """Route the access log to the module logger at debug level."""
+        logging.getLogger(__name__).debug(format % args)
+
+
+def create_metrics_server(
+    directory: Union[str, Path], port: int, host: str = "127.0.0.1"
+) -> ThreadingHTTPServer:
+    """Create a local HTTP server exposing the metrics textfiles of a directory.
+
+    Args:
+        directory (Union[str, Path]): The textfile collector directory.
+        port (int): The port to listen on.
+        host (str): The address to bind. Defaults to localhost.
+
+    Returns:
+        ThreadingHTTPServer: The server, call `serve_forever` to start serving.
+    """
+    server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    server.metrics_directory = directory
+    return server
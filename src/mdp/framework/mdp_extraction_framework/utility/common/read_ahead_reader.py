@@ -0,0 +1,132 @@
+"""Read Ahead Reader Module.
+
+Decouples the producer of a stream from its consumer: a thread reads the source stream
+in chunks into a bounded queue while the consumer reads from the queue, so the producer,
+e.g. a process writing to a pipe, keeps running while the consumer is busy. At most
+`max_chunks` chunks are held in memory, the thread waiting while the queue is full.
+"""
+
+# import: standard
+import queue
+import threading
+from typing import BinaryIO
+from typing import List
+from typing import Optional
+from typing import Union
+
+DEFAULT_READ_AHEAD_CHUNK_SIZE = 1024 * 1024
+DEFAULT_READ_AHEAD_CHUNKS = 16
+QUEUE_POLL_INTERVAL_SEC = 0.1
+
+
+class ReadAheadReader:
+    """Read a binary stream ahead of its consumer through a bounded queue of chunks, to be
+    used as a context manager."""
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        chunk_size: int = DEFAULT_READ_AHEAD_CHUNK_SIZE,
+        max_chunks: int = DEFAULT_READ_AHEAD_CHUNKS,
+    ) -> None:
+        """Initialize the ReadAheadReader and start reading the stream.
+
+        Args:
+            stream (BinaryIO): The source stream.
+            chunk_size (int): Bytes read from the source at a time. Defaults to
+                DEFAULT_READ_AHEAD_CHUNK_SIZE.
+            max_chunks (int): Chunks held in the queue at most. Defaults to
+                DEFAULT_READ_AHEAD_CHUNKS.
+        """
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.chunks: queue.Queue = queue.Queue(maxsize=max(1, max_chunks))
+        self.buffer = b""
+        self.eof = False
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._read_source, name="read_ahead", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "ReadAheadReader":
+        """Return the reader."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Stop reading the source stream."""
+        self.close()
+
+    def _put(self, item: Union[bytes, BaseException, None]) -> bool:
+        """Put an item in the queue, waiting while it is full until the reader is closed.
+
+        Returns:
+            bool: False if the reader was closed first.
+        """
+        while not self._stopped.is_set():
+            try:
+                self.chunks.put(item, timeout=QUEUE_POLL_INTERVAL_SEC)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read_source(self) -> None:
+        """Read the source stream into the queue until its end, an error or the reader is
+        closed. The end is marked by None, an error by the exception."""
+        try:
+            while True:
+                chunk = self.stream.read(self.chunk_size)
+                if not chunk:
+                    break
+                if not self._put(chunk):
+                    return
+        except BaseException as e:
+            self._put(e)
+            return
+        self._put(None)
+
+    def _next_chunk(self) -> bytes:
+        """Get the next chunk read from the source, empty at its end.
+
+        Raises:
+            BaseException: The error raised reading the source.
+        """
+        item: Optional[Union[bytes, BaseException]] = self.chunks.get()
+        if isinstance(item, BaseException):
+            self.eof = True
+            raise item
+        if item is None:
+            self.eof = True
+            return b""
+        return item
+
+    def read(self, size: int = -1) -> bytes:
+        """Read bytes of the source stream, `size` bytes unless the stream ends first.
+
+        Args:
+            size (int): Bytes to read, all remaining bytes if negative.
+
+        Returns:
+            bytes: The bytes read, empty at the end of the stream.
+        """
+        chunks: List[bytes] = [self.buffer]
+        buffered_size = len(self.buffer)
+        while not self.eof and (size < 0 or buffered_size < size):
+            chunk = self._next_chunk()
+            chunks.append(chunk)
+            buffered_size += len(chunk)
+        data = b"".join(chunks)
+        if size < 0:
+            self.buffer = b""
+            return data
+        self.buffer = data[size:]
+        return data[:size]
+
+    def close(self) -> None:
+        """Stop reading the source stream and drop the chunks read ahead. The thread is
+        not waited for, it ends once its pending read of the source returns."""
+        self._stopped.set()
+        while True:
+            try:
+                self.chunks.get_nowait()
+            except queue.Empty:
+                break
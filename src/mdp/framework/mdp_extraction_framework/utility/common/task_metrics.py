@@ -0,0 +1,196 @@
+"""Task Metrics Module."""
+
+# import: standard
+import json
+import os
+import resource
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Union
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    DataFileInformation,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.job_log import JobStatus
+
+BYTES_PER_MB = 1024 * 1024
+TASK_METRICS_HEADER = (
+    "task_nm|task_status|start_datetime|end_datetime|wall_time_sec|cpu_time_sec|"
+    "child_cpu_time_sec|peak_rss_delta_kb|rows_processed|bytes_read|bytes_written|"
+    "rows_per_sec|mb_per_sec"
+)
+
+
+@dataclass
+class TaskMetrics:
+    """Dataclass to store timing, throughput and resource metrics of a task run.
+
+    Attributes:
+        task_name (str): The pipeline task name, e.g. 'source_data_extractor_task'.
+        task_status (Optional[str]): SUCCESS or FAILED once the task has finished.
+        start_datetime (Optional[datetime]): The datetime the task started.
+        end_datetime (Optional[datetime]): The datetime the task finished.
+        wall_time_sec (float): Elapsed wall-clock time in seconds.
+        cpu_time_sec (float): CPU time of this process in seconds.
+        child_cpu_time_sec (float): CPU time of finished child processes (azcopy, gpg, ...).
+        peak_rss_delta_kb (int): Growth of this process's peak resident set size in KB.
+        rows_processed (Optional[int]): Rows written by the task, if the task reports them.
+        bytes_read (int): Total size of the input files.
+        bytes_written (int): Total size of the output files.
+        rows_per_sec (Optional[float]): Rows processed per second of wall time.
+        mb_per_sec (Optional[float]): MB (read or written, whichever is larger) per second.
+    """
+
+    task_name: str
+    task_status: Optional[str] = None
+    start_datetime: Optional[datetime] = None
+    end_datetime: Optional[datetime] = None
+    wall_time_sec: float = 0.0
+    cpu_time_sec: float = 0.0
+    child_cpu_time_sec: float = 0.0
+    peak_rss_delta_kb: int = 0
+    rows_processed: Optional[int] = None
+    bytes_read: int = 0
+    bytes_written: int = 0
+    rows_per_sec: Optional[float] = None
+    mb_per_sec: Optional[float] = None
+
+    def record_output(self, output: Any) -> None:
+        """Record rows and bytes written from a task's output.
+
+        Only a list of DataFileInformation is understood, other outputs are ignored.
+
+        Args:
+            output (Any): The value returned by the task's execute method.
+        """
+        if isinstance(output, list) and all(
+            isinstance(file_info, DataFileInformation) for file_info in output
+        ):
+            self.bytes_written = sum_file_sizes(output)
+            self.rows_processed = sum_row_counts(output)
+
+    def compute_throughput(self) -> None:
+        """Compute rows/sec and MB/sec from the recorded values and wall time."""
+        if self.wall_time_sec <= 0:
+            return
+        if self.rows_processed is not None:
+            self.rows_per_sec = round(self.rows_processed / self.wall_time_sec, 2)
+        bytes_processed = max(self.bytes_read, self.bytes_written)
+        self.mb_per_sec = round(bytes_processed / BYTES_PER_MB / self.wall_time_sec, 3)
+
+    def to_dict(self) -> dict:
+        """Convert the metrics to a JSON serialisable dictionary.
+
+        Returns:
+            dict: The metrics with datetimes in ISO format.
+        """
+        metrics = asdict(self)
+        for key in ("start_datetime", "end_datetime"):
+            if metrics[key] is not None:
+                metrics[key] = metrics[key].isoformat()
+        return metrics
+
+    def to_summary_line(self) -> str:
+        """Format the metrics as a pipe-delimited line matching TASK_METRICS_HEADER.
+
+        Returns:
+            str: pipe-delimited metrics values
+        """
+        return "|".join(str(value) for value in asdict(self).values())
+
+
+def sum_file_sizes(file_infos: Optional[List[DataFileInformation]]) -> int:
+    """Sum the file size of a list of DataFileInformation.
+
+    Args:
+        file_infos (Optional[List[DataFileInformation]]): list of file information
+
+    Returns:
+        int: Total size in bytes, 0 if there is no file.
+    """
+    return sum(file_info.file_size for file_info in file_infos or [])
+
+
+def sum_row_counts(file_infos: Optional[List[DataFileInformation]]) -> Optional[int]:
+    """Sum the row count of a list of DataFileInformation.
+
+    Args:
+        file_infos (Optional[List[DataFileInformation]]): list of file information
+
+    Returns:
+        Optional[int]: Total rows, None if no file reports a row count.
+    """
+    row_counts = [
+        file_info.row_count for file_info in file_infos or [] if file_info.row_count is not None
+    ]
+    return sum(row_counts) if row_counts else None
+
+
+@contextmanager
+def measure_task(
+    task_name: str, file_infos: Optional[List[DataFileInformation]] = None
+) -> Iterator[TaskMetrics]:
+    """Context manager measuring wall time, CPU time and peak RSS of the wrapped block.
+
+    The status is set to FAILED and the metrics are still completed if the block raises.
+
+    Args:
+        task_name (str): The pipeline task name.
+        file_infos (Optional[List[DataFileInformation]]): Input files of the task, used for bytes_read.
+
+    Yields:
+        TaskMetrics: The metrics object, completed when the block exits.
+    """
+    task_metrics = TaskMetrics(task_name=task_name, bytes_read=sum_file_sizes(file_infos))
+    task_metrics.start_datetime = datetime.now()
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    start_self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    start_children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    try:
+        yield task_metrics
+        task_metrics.task_status = JobStatus.SUCCESS.value
+    except Exception:
+        task_metrics.task_status = JobStatus.FAILED.value
+        raise
+    finally:
+        end_self_usage = resource.getrusage(resource.RUSAGE_SELF)
+        end_children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        task_metrics.end_datetime = datetime.now()
+        task_metrics.wall_time_sec = round(time.perf_counter() - start_wall, 3)
+        task_metrics.cpu_time_sec = round(time.process_time() - start_cpu, 3)
+        task_metrics.child_cpu_time_sec = round(
+            (end_children_usage.ru_utime + end_children_usage.ru_stime)
+            - (start_children_usage.ru_utime + start_children_usage.ru_stime),
+            3,
+        )
+        task_metrics.peak_rss_delta_kb = end_self_usage.ru_maxrss - start_self_usage.ru_maxrss
+        task_metrics.compute_throughput()
+
+
+def write_task_metrics_file(
+    file_path: Union[str, Path], job_metrics: dict, task_metrics: List[TaskMetrics]
+) -> None:
+    """Write the job and task metrics of a run as a JSON file.
+
+    Args:
+        file_path (Union[str, Path]): The output JSON file path.
+        job_metrics (dict): Job level values such as job name, pos_dt and status.
+        task_metrics (List[TaskMetrics]): Metrics of each executed task.
+    """
+    os.makedirs(Path(file_path).parent, exist_ok=True)
+    content = {
+        **job_metrics,
+        "tasks": [metrics.to_dict() for metrics in task_metrics],
+    }
+    with open(file_path, "w") as file:
+        json.dump(content, file, indent=4, default=str)
@@ -0,0 +1,179 @@
+"""Task Profiler Module."""
+
+# import: standard
+import cProfile
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+from typing import Iterator
+from typing import Optional
+from typing import Union
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.utility.common_function import get_log_filename
+
+SAMPLING_INTERVAL_SEC = 0.01
+
+
+class ProfileMode(Enum):
+    """This class is enumerator for profiling mode which can be only as following:
+
+    - CPROFILE: Deterministic profiling of the task thread with cProfile, written as pstats.
+    - SAMPLING: Low-overhead stack sampling of all threads, written as collapsed stacks.
+
+    Args:
+        Enum: Enum based class
+    """
+
+    CPROFILE = "cprofile"
+    SAMPLING = "sampling"
+
+
+PROFILE_FILE_EXTENSION = {
+    ProfileMode.CPROFILE.value: "pstats",
+    ProfileMode.SAMPLING.value: "collapsed",
+}
+
+
+class SamplingProfiler:
+    """Stack sampling profiler running in a daemon thread.
+
+    Every `interval` seconds the current stack of each thread is read from
+    `sys._current_frames` and counted, the result is written in the collapsed-stack
+    format ("frame;frame;frame count") read by flame graph tools.
+    """
+
+    def __init__(self, interval: float = SAMPLING_INTERVAL_SEC) -> None:
+        """Initialize the SamplingProfiler.
+
+        Args:
+            interval (float): Seconds between two samples. Defaults to SAMPLING_INTERVAL_SEC.
+        """
+        self.interval = interval
+        self.stack_counts: Counter = Counter()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def format_frame(frame) -> str:
+        """Format a frame as 'function (file:line)'.
+
+        Args:
+            frame (FrameType): The frame to format.
+
+        Returns:
+            str: The frame label.
+        """
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def sample(self) -> None:
+        """Record the current stack of every thread except the sampler itself."""
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        sampler_ident = threading.get_ident()
+        for thread_ident, frame in sys._current_frames().items():
+            if thread_ident == sampler_ident:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self.format_frame(frame))
+                frame = frame.f_back
+            stack.append(thread_names.get(thread_ident, str(thread_ident)))
+            self.stack_counts[";".join(reversed(stack))] += 1
+
+    def _run(self) -> None:
+        """Sampling loop of the profiler thread."""
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        """Start the sampling thread."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sampling thread and wait for it to finish."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write_collapsed(self, file_path: Union[str, Path]) -> None:
+        """Write the sampled stacks in the collapsed-stack format.
+
+        Args:
+            file_path (Union[str, Path]): The output file path.
+        """
+        with open(file_path, "w") as file:
+            for stack, count in self.stack_counts.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+def get_profile_file_path(mode: str, task_name: str, job_name: str, pos_dt: str) -> Path:
+    """Build the profile artefact path of a task next to the run log.
+
+    Args:
+        mode (str): The profiling mode, one of ProfileMode values.
+        task_name (str): The pipeline task name.
+        job_name (str): The name of the job.
+        pos_dt (str): Date of the running job.
+
+    Returns:
+        Path: The profile file path.
+    """
+    directory, file_name = get_log_filename(
+        job_name,
+        pos_dt,
+        file_name=f"extraction_profile_{task_name}",
+        file_extension=PROFILE_FILE_EXTENSION[mode],
+    )
+    return Path(directory, file_name)
+
+
+@contextmanager
+def profile_task(mode: Optional[str], file_path: Union[str, Path, None]) -> Iterator[None]:
+    """Context manager profiling the wrapped block and writing one profile artefact.
+
+    cProfile mode only profiles the calling thread. Failing to write the profile is
+    logged and never fails the task.
+
+    Args:
+        mode (Optional[str]): The profiling mode, profiling is disabled if None or empty.
+        file_path (Union[str, Path, None]): The output file path of the profile.
+
+    Yields:
+        None
+    """
+    if not mode:
+        yield
+        return
+
+    logger = logging.getLogger(__name__)
+    if mode == ProfileMode.CPROFILE.value:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif mode == ProfileMode.SAMPLING.value:
+        profiler = SamplingProfiler()
+        profiler.start()
+    else:
+        raise ValueError(f"Unsupported profile mode: {mode}")
+
+    try:
+        yield
+    finally:
+        try:
+            os.makedirs(Path(file_path).parent, exist_ok=True)
+            if mode == ProfileMode.CPROFILE.value:
+                profiler.disable()
+                profiler.dump_stats(str(file_path))
+            else:
+                profiler.stop()
+                profiler.write_collapsed(file_path)
+            logger.info(f"Profile written to {file_path}")
+        except Exception as e:
+            logger.warning(f"Failed to write profile {file_path}: {e}")
@@ -0,0 +1,353 @@
+"""Tracing Module.
+
+A lightweight span API nesting job -> task -> operation -> subprocess spans of a run.
+Finished spans are kept in memory by the process-wide `TRACER` and exported as JSON
+lines or in the Chrome trace event format, which can be opened in Perfetto or
+chrome://tracing.
+"""
+
+# import: standard
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from contextvars import copy_context
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from enum import Enum
+from functools import wraps
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import ContextManager
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Union
+
+
+class SpanKind(Enum):
+    """This class is enumerator for span kind which can be only as following:
+
+    - JOB: The whole extraction run.
+    - TASK: A pipeline task, e.g. 'azcopy_data_transfer_task'.
+    - OPERATION: A unit of work inside a task, e.g. one AzCopy transfer attempt.
+    - SUBPROCESS: An external process started by `run_command`.
+
+    Args:
+        Enum: Enum based class
+    """
+
+    JOB = "job"
+    TASK = "task"
+    OPERATION = "operation"
+    SUBPROCESS = "subprocess"
+
+
+class TraceFormat(Enum):
+    """This class is enumerator for trace export format which can be only as following:
+
+    - JSONL: One JSON object per span and line.
+    - CHROME: Chrome trace event format, viewable in Perfetto.
+
+    Args:
+        Enum: Enum based class
+    """
+
+    JSONL = "jsonl"
+    CHROME = "chrome"
+
+
+TRACE_FILE_EXTENSION = {
+    TraceFormat.JSONL.value: "jsonl",
+    TraceFormat.CHROME.value: "json",
+}
+
+
+@dataclass
+class Span:
+    """Dataclass to store a timed unit of work of a run.
+
+    Attributes:
+        name (str): The span name, e.g. a job, task or operation name.
+        kind (str): One of SpanKind values.
+        trace_id (str): Identifier shared by every span of a run.
+        span_id (str): Identifier of the span.
+        parent_id (Optional[str]): Identifier of the enclosing span, None for a root span.
+        start_time_ns (int): Start time as nanoseconds since the epoch.
+        end_time_ns (Optional[int]): End time as nanoseconds since the epoch.
+        process_id (int): The process the span ran in.
+        thread_id (int): The thread the span ran in.
+        status (str): OK, or ERROR if the wrapped block raised.
+        attributes (dict): Attributes such as command, exit_code, bytes and rows.
+    """
+
+    name: str
+    kind: str = SpanKind.OPERATION.value
+    trace_id: str = ""
+    span_id: str = ""
+    parent_id: Optional[str] = None
+    start_time_ns: int = 0
+    end_time_ns: Optional[int] = None
+    process_id: int = 0
+    thread_id: int = 0
+    status: str = "OK"
+    attributes: dict = field(default_factory=dict)
+
+    @property
+    def duration_ns(self) -> int:
+        """Duration of the span, 0 while it is running.
+
+        Returns:
+            int: Duration in nanoseconds.
+        """
+        return self.end_time_ns - self.start_time_ns if self.end_time_ns else 0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute of the span.
+
+        Args:
+            key (str): The attribute name.
+            value (Any): The attribute value.
+        """
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        """Set several attributes of the span.
+
+        Args:
+            **attributes (Any): The attribute names and values.
+        """
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict:
+        """Convert the span to a JSON serialisable dictionary.
+
+        Returns:
+            dict: The span values with its duration in milliseconds.
+        """
+        span = asdict(self)
+        span["duration_ms"] = round(self.duration_ns / 1e6, 3)
+        return span
+
+    def to_chrome_event(self) -> dict:
+        """Convert the span to a Chrome trace complete ('X') event.
+
+        Returns:
+            dict: The trace event with timestamps in microseconds.
+        """
+        return {
+            "name": self.name,
+            "cat": self.kind,
+            "ph": "X",
+            "ts": self.start_time_ns / 1e3,
+            "dur": self.duration_ns / 1e3,
+            "pid": self.process_id,
+            "tid": self.thread_id,
+            "args": {
+                **self.attributes,
+                "span_id": self.span_id,
+                "parent_id": self.parent_id,
+                "status": self.status,
+            },
+        }
+
+
+class Tracer:
+    """Collect the spans of a run.
+
+    Tracing is disabled by default, spans are then still yielded to the caller but not
+    recorded. The current span is tracked with a context variable, spans opened in a new
+    thread are roots unless the thread runs in a copied context, as the work submitted to
+    a `TracedThreadPoolExecutor` does.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a disabled Tracer."""
+        self.enabled = False
+        self.trace_id = uuid.uuid4().hex
+        self.spans: List[Span] = []
+        # Span times are read from the monotonic clock and shifted to the epoch, so that
+        # nested spans never appear to end after their parent
+        self._epoch_offset_ns = time.time_ns() - time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+    def start(self) -> None:
+        """Enable tracing and start a new trace, dropping previously recorded spans."""
+        with self._lock:
+            self.trace_id = uuid.uuid4().hex
+            self.spans = []
+            self._epoch_offset_ns = time.time_ns() - time.perf_counter_ns()
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Disable tracing, recorded spans are kept for export."""
+        self.enabled = False
+
+    @property
+    def current_span(self) -> Optional[Span]:
+        """The innermost open span of the current context.
+
+        Returns:
+            Optional[Span]: The current span, None outside any span.
+        """
+        return self._current_span.get()
+
+    @contextmanager
+    def span(
+        self, name: str, kind: str = SpanKind.OPERATION.value, **attributes: Any
+    ) -> Iterator[Span]:
+        """Context manager timing the wrapped block as a child of the current span.
+
+        The status is set to ERROR and the exception type is recorded if the block raises.
+
+        Args:
+            name (str): The span name.
+            kind (str): One of SpanKind values. Defaults to operation.
+            **attributes (Any): Initial attributes of the span.
+
+        Yields:
+            Span: The span, recorded when the block exits if tracing is enabled.
+        """
+        if not self.enabled:
+            yield Span(name=name, kind=kind, attributes=attributes)
+            return
+
+        parent = self._current_span.get()
+        span = Span(
+            name=name,
+            kind=kind,
+            trace_id=self.trace_id,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            start_time_ns=time.perf_counter_ns() + self._epoch_offset_ns,
+            process_id=os.getpid(),
+            thread_id=threading.get_ident(),
+            attributes=attributes,
+        )
+        token = self._current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "ERROR"
+            span.set_attribute("error", e.__class__.__name__)
+            raise
+        finally:
+            span.end_time_ns = time.perf_counter_ns() + self._epoch_offset_ns
+            self._current_span.reset(token)
+            with self._lock:
+                self.spans.append(span)
+
+    def write_jsonl(self, file_path: Union[str, Path]) -> None:
+        """Write the recorded spans as JSON lines, ordered by start time.
+
+        Args:
+            file_path (Union[str, Path]): The output file path.
+        """
+        os.makedirs(Path(file_path).parent, exist_ok=True)
+        with open(file_path, "w") as file:
+            for span in sorted(self.spans, key=lambda span: span.start_time_ns):
+                file.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+    def write_chrome_trace(self, file_path: Union[str, Path]) -> None:
+        """Write the recorded spans in the Chrome trace event format.
+
+        Args:
+            file_path (Union[str, Path]): The output file path.
+        """
+        os.makedirs(Path(file_path).parent, exist_ok=True)
+        content = {
+            "traceEvents": [
+                span.to_chrome_event()
+                for span in sorted(self.spans, key=lambda span: span.start_time_ns)
+            ],
+            "displayTimeUnit": "ms",
+            "otherData": {"trace_id": self.trace_id},
+        }
+        with open(file_path, "w") as file:
+            json.dump(content, file, default=str)
+
+    def export(self, file_path: Union[str, Path], trace_format: str) -> None:
+        """Write the recorded spans in the given format.
+
+        Args:
+            file_path (Union[str, Path]): The output file path.
+            trace_format (str): One of TraceFormat values.
+
+        Raises:
+            ValueError: If the trace format is not supported.
+        """
+        if trace_format == TraceFormat.JSONL.value:
+            self.write_jsonl(file_path)
+        elif trace_format == TraceFormat.CHROME.value:
+            self.write_chrome_trace(file_path)
+        else:
+            raise ValueError(f"Unsupported trace format: {trace_format}")
+
+
+class TracedThreadPoolExecutor(ThreadPoolExecutor):
+    """Thread pool running each submitted call in a copy of the submitter's context, so
+    the spans opened by the call are children of the span open when it was submitted."""
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        """Submit a call to run in a copy of the current context.
+
+        Args:
+            fn (Callable): The callable.
+            *args (Any): Its positional arguments.
+            **kwargs (Any): Its keyword arguments.
+
+        Returns:
+            Future: The future of the call.
+        """
+        # A context cannot be entered by two threads at once, so each call gets its own copy
+        return super().submit(copy_context().run, fn, *args, **kwargs)
+
+
+TRACER = Tracer()
+
+
+def trace_span(
+    name: str, kind: str = SpanKind.OPERATION.value, **attributes: Any
+) -> ContextManager[Span]:
+    """Open a span on the process-wide tracer.
+
+    Args:
+        name (str): The span name.
+        kind (str): One of SpanKind values. Defaults to operation.
+        **attributes (Any): Initial attributes of the span.
+
+    Returns:
+        ContextManager[Span]: The span context manager.
+    """
+    return TRACER.span(name, kind, **attributes)
+
+
+def traced_operation(name: str) -> Callable:
+    """Decorator recording each call of a function as an operation span.
+
+    Applied below a tenacity `@retry`, every attempt is recorded as its own span.
+
+    Args:
+        name (str): The operation name, e.g. 'azcopy_transfer'.
+
+    Returns:
+        Callable: The decorator.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(name, SpanKind.OPERATION.value):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
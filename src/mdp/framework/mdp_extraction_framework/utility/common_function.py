@@ -59,6 +59,7 @@ def get_log_filename(
     pos_dt: str,
     file_name: str = "extraction_fw",
     root_log_directory: str = None,
+    file_extension: str = "log",
 ) -> tuple[Path, str]:
     """Generates a directory path and a filename with the current year-month, job name,
     and optional custom filename.
@@ -68,6 +69,7 @@ def get_log_filename(
       pos_dt (str): Date of the running job.
       file_name (str, optional): The filename for the log file. Defaults to "extraction_fw.log".
       root_log_directory (str, optional): The root directory to store log files.
+      file_extension (str, optional): The extension of the file. Defaults to "log".
 
     Returns:
       A tuple containing the directory path (Path) and the filename (str).
@@ -88,7 +90,7 @@ def get_log_filename(
         file_name = f"{file_name}_{job_name}"
     if pos_dt:
         file_name = f"{file_name}_{pos_dt_str}"
-    final_file_name = f"{file_name}_{current_timestamp}.log"
+    final_file_name = f"{file_name}_{current_timestamp}.{file_extension}"
     return directory, final_file_name
 
 
@@ -12,21 +12,15 @@ from typing import Union
 
 # import: internal
 from mdp.framework.mdp_extraction_framework.config_validator.config_mapping import ConfigMapping
-from mdp.framework.mdp_extraction_framework.config_validator.config_mapping import EnvSettings
+from mdp.framework.mdp_extraction_framework.utility.file_reader.template_service import (
+    get_compiled_template,
+)
+from mdp.framework.mdp_extraction_framework.utility.file_reader.template_service import (
+    get_env_settings_mapping,
+)
 
 # import: external
 import yaml
-from jinja2 import BaseLoader
-from jinja2 import DebugUndefined
-from jinja2 import Environment
-from jinja2 import Undefined
-
-
-def get_object_attribute_mapping(env_settings: EnvSettings) -> dict[str, str]:
-    """Create a mapping from each attribute and its value from an object."""
-    return {
-        attr: getattr(env_settings, attr) for attr in dir(env_settings) if not attr.startswith("_")
-    }
 
 
 def render_template(content: str, mapping, keep_undefined: bool = True) -> str:
@@ -36,6 +30,10 @@ def render_template(content: str, mapping, keep_undefined: bool = True) -> str:
     with an empty string in the rendered content. Otherwise, the rendered content remains
     unchanged for undefined variables.
 
+    The Jinja2 environment, the compiled template and the `EnvSettings` snapshot are
+    shared across calls through the template service; call `invalidate_env_settings`
+    after changing the environment to pick up new values.
+
     Args:
         content (str): The content of the Jinja2 template configuration.
         mapping: The mapping for key values used in the template.
@@ -44,15 +42,8 @@ def render_template(content: str, mapping, keep_undefined: bool = True) -> str:
     Returns:
         str: The rendered configuration.
     """
-
-    jinja_env = Environment(
-        loader=BaseLoader, undefined=DebugUndefined if keep_undefined else Undefined
-    )
-    template = jinja_env.from_string(content)
-
-    env_settings = EnvSettings()
-    env_settings_mapping = get_object_attribute_mapping(env_settings)
-    mappings = {**env_settings_mapping, **mapping}
+    template = get_compiled_template(content, keep_undefined)
+    mappings = {**get_env_settings_mapping(), **mapping}
 
     rendered_content = template.render(**mappings)
     return rendered_content
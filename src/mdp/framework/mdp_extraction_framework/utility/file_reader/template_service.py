@@ -0,0 +1,90 @@
+"""Template Service Module.
+
+Holds the process-wide Jinja2 environments, an LRU cache of compiled templates keyed by
+their source string, and a memoised snapshot of `EnvSettings`, so that rendering the same
+template many times (e.g. once per part file) does not rebuild any of them.
+"""
+
+# import: standard
+from functools import lru_cache
+from typing import Any
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.config_validator.config_mapping import EnvSettings
+
+# import: external
+from jinja2 import BaseLoader
+from jinja2 import DebugUndefined
+from jinja2 import Environment
+from jinja2 import Template
+from jinja2 import Undefined
+
+TEMPLATE_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=None)
+def get_jinja_environment(keep_undefined: bool = True) -> Environment:
+    """Return the process-wide Jinja2 environment for the given undefined policy.
+
+    Args:
+        keep_undefined (bool): Keep undefined variables in the rendered content if True,
+            replace them with an empty string otherwise. Defaults to True.
+
+    Returns:
+        Environment: The shared Jinja2 environment.
+    """
+    return Environment(loader=BaseLoader, undefined=DebugUndefined if keep_undefined else Undefined)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def get_compiled_template(content: str, keep_undefined: bool = True) -> Template:
+    """Compile a template source string, reusing the compiled template on later calls.
+
+    Args:
+        content (str): The content of the Jinja2 template.
+        keep_undefined (bool): Flag to keep or discard undefined variables. Defaults to True.
+
+    Returns:
+        Template: The compiled Jinja2 template.
+    """
+    return get_jinja_environment(keep_undefined).from_string(content)
+
+
+@lru_cache(maxsize=1)
+def get_env_settings() -> EnvSettings:
+    """Return a memoised `EnvSettings` snapshot.
+
+    The snapshot is taken on the first call and reused until `invalidate_env_settings`
+    is called, e.g. after loading a new `.env` file into the environment.
+
+    Returns:
+        EnvSettings: The memoised environment settings.
+    """
+    return EnvSettings()
+
+
+@lru_cache(maxsize=1)
+def get_env_settings_mapping() -> dict[str, Any]:
+    """Return the template mapping of every public attribute of the memoised
+    `EnvSettings` snapshot.
+
+    Returns:
+        dict[str, Any]: A mapping of attribute names to their values.
+    """
+    env_settings = get_env_settings()
+    return {
+        attr: getattr(env_settings, attr) for attr in dir(env_settings) if not attr.startswith("_")
+    }
+
+
+def invalidate_env_settings() -> None:
+    """Drop the memoised `EnvSettings` snapshot so the next render re-reads the
+    environment."""
+    get_env_settings.cache_clear()
+    get_env_settings_mapping.cache_clear()
+
+
+def clear_template_cache() -> None:
+    """Drop every compiled template and the memoised `EnvSettings` snapshot."""
+    get_compiled_template.cache_clear()
+    invalidate_env_settings()
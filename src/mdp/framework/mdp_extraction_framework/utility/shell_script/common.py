@@ -1,9 +1,29 @@
 """Common Function Module for shell script."""
 
 # import: standard
+import os
+import queue
 import shlex
 import subprocess
+import threading
+import time
+from collections import deque
+from contextlib import suppress
 from dataclasses import dataclass
+from typing import BinaryIO
+from typing import Callable
+from typing import Optional
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import SpanKind
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import trace_span
+
+# Lines of stdout and stderr kept by `stream_command`, older lines are dropped
+DEFAULT_MAX_OUTPUT_LINES = 1000
+# Exit code of a command killed by `stream_command` for making no progress, as timeout(1)
+STALLED_EXIT_CODE = 124
+# Bytes written at a time to the stdin of a command by `pipe_to_command`
+PIPE_CHUNK_SIZE = 1024 * 1024
 
 
 @dataclass
@@ -15,28 +35,277 @@ class CommandResult:
     exit_code: int
 
 
-def run_command(command) -> CommandResult:
+def get_command_label(command: str) -> str:
+    """Get a label of a shell command safe to record, the executable name followed by
+    its sub-command if any, e.g. 'azcopy cp'. Arguments are left out as they may carry
+    credentials such as SAS tokens or passwords.
+
+    Args:
+        command (str): a string of shell command
+
+    Returns:
+        str: the command label
+    """
+    command_tokens = str(command).split(maxsplit=2)
+    if not command_tokens:
+        return ""
+    label = os.path.basename(command_tokens[0])
+    if len(command_tokens) > 1 and command_tokens[1].isidentifier():
+        label = f"{label} {command_tokens[1]}"
+    return label
+
+
+def run_command(command, env: Optional[dict] = None) -> CommandResult:
     """Execute a shell command and return output, error, and exit_code from the
-    command's result.
+    command's result. The run is recorded as a subprocess span when tracing is enabled.
 
     Args:
         command (str): a string of shell command
+        env (Optional[dict]): environment variables added to the current environment of
+            the command
 
     Returns:
         CommandResult: shell command's output, error, and exit_code
     """
-    try:
-        command_list = shlex.split(command)
-        result = subprocess.run(command_list, capture_output=True, text=True, shell=False)
-        # Get the command's output, error and exit_code
-        output = result.stdout.strip()
-        error = result.stderr.strip()
-        exit_code = result.returncode
-
-        # Create a return dictionary from the command's results
-        # command_result = {"output": output, "error": error, "exit_code": exit_code}
-        command_result = CommandResult(output=output, error=error, exit_code=exit_code)
-    except Exception as e:
-        command_result = CommandResult(output="", error=str(e), exit_code=1)
+    command_label = get_command_label(command)
+    with trace_span(command_label, SpanKind.SUBPROCESS.value, command=command_label) as span:
+        try:
+            command_list = shlex.split(command)
+            result = subprocess.run(
+                command_list,
+                capture_output=True,
+                text=True,
+                shell=False,
+                env={**os.environ, **env} if env else None,
+            )
+            # Get the command's output, error and exit_code
+            output = result.stdout.strip()
+            error = result.stderr.strip()
+            exit_code = result.returncode
+
+            # Create a return dictionary from the command's results
+            # command_result = {"output": output, "error": error, "exit_code": exit_code}
+            command_result = CommandResult(output=output, error=error, exit_code=exit_code)
+        except Exception as e:
+            command_result = CommandResult(output="", error=str(e), exit_code=1)
+
+        span.set_attributes(
+            exit_code=command_result.exit_code,
+            stdout_bytes=len(command_result.output),
+            stderr_bytes=len(command_result.error),
+        )
+        if command_result.exit_code != 0:
+            span.status = "ERROR"
+
+    return command_result
+
+
+def stream_command(
+    command,
+    env: Optional[dict] = None,
+    on_line: Optional[Callable[[str], bool]] = None,
+    stall_timeout_sec: Optional[float] = None,
+    max_output_lines: int = DEFAULT_MAX_OUTPUT_LINES,
+) -> CommandResult:
+    """Execute a shell command, handing each stdout line to a callback as it arrives.
+
+    Only the last `max_output_lines` lines of stdout and stderr are kept, so memory
+    stays bounded whatever the size of the output. The command is killed when it makes
+    no progress for `stall_timeout_sec`, progress being a stdout line for which
+    `on_line` returns True, or any stdout line without callback. The run is recorded as
+    a subprocess span when tracing is enabled.
+
+    Args:
+        command (str): a string of shell command
+        env (Optional[dict]): environment variables added to the current environment of
+            the command
+        on_line (Optional[Callable[[str], bool]]): called with each stdout line, returns
+            True if the line shows progress
+        stall_timeout_sec (Optional[float]): seconds without progress before the command
+            is killed, no limit if None
+        max_output_lines (int): lines of stdout and stderr kept in the result
+
+    Returns:
+        CommandResult: the last lines of the command's output and error, and its exit
+            code, STALLED_EXIT_CODE if it was killed for making no progress
+    """
+    command_label = get_command_label(command)
+    with trace_span(command_label, SpanKind.SUBPROCESS.value, command=command_label) as span:
+        stdout_lines: deque = deque(maxlen=max_output_lines)
+        stderr_lines: deque = deque(maxlen=max_output_lines)
+        stdout_byte_count = 0
+        stalled = False
+        try:
+            process = subprocess.Popen(
+                shlex.split(command),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+                shell=False,
+                env={**os.environ, **env} if env else None,
+            )
+        except Exception as e:
+            command_result = CommandResult(output="", error=str(e), exit_code=1)
+        else:
+            stdout_queue: queue.Queue = queue.Queue()
+
+            def read_stdout() -> None:
+                for line in process.stdout:
+                    stdout_queue.put(line)
+                stdout_queue.put(None)
+
+            def read_stderr() -> None:
+                for line in process.stderr:
+                    stderr_lines.append(line.rstrip("\n"))
+
+            readers = [
+                threading.Thread(target=read_stdout, daemon=True),
+                threading.Thread(target=read_stderr, daemon=True),
+            ]
+            for reader in readers:
+                reader.start()
+
+            last_progress_time = time.monotonic()
+            while True:
+                try:
+                    line = stdout_queue.get(timeout=1.0)
+                except queue.Empty:
+                    line = ""
+                if line is None:
+                    break
+                if line:
+                    stdout_byte_count += len(line)
+                    line = line.rstrip("\n")
+                    stdout_lines.append(line)
+                    if on_line is None or on_line(line):
+                        last_progress_time = time.monotonic()
+                if (
+                    stall_timeout_sec is not None
+                    and time.monotonic() - last_progress_time > stall_timeout_sec
+                ):
+                    stalled = True
+                    process.kill()
+                    break
+
+            process.wait()
+            for reader in readers:
+                reader.join(timeout=5)
+            error = "\n".join(stderr_lines).strip()
+            if stalled:
+                error = (
+                    f"{error}\nKilled after no progress for {stall_timeout_sec} seconds.".strip()
+                )
+            command_result = CommandResult(
+                output="\n".join(stdout_lines).strip(),
+                error=error,
+                exit_code=STALLED_EXIT_CODE if stalled else process.returncode,
+            )
+
+        span.set_attributes(
+            exit_code=command_result.exit_code,
+            stdout_bytes=stdout_byte_count,
+            stderr_bytes=len(command_result.error),
+            stalled=stalled,
+        )
+        if command_result.exit_code != 0:
+            span.status = "ERROR"
+
+    return command_result
+
+
+def pipe_to_command(
+    command,
+    stream: BinaryIO,
+    env: Optional[dict] = None,
+    chunk_size: int = PIPE_CHUNK_SIZE,
+    max_output_lines: int = DEFAULT_MAX_OUTPUT_LINES,
+) -> CommandResult:
+    """Execute a shell command, writing a binary stream to its stdin in chunks.
+
+    Stdout and stderr are drained by threads while the stream is written, so a command
+    writing a lot of output cannot block on a full pipe, and only their last
+    `max_output_lines` lines are kept. Writing stops when the command exits early, its
+    exit code telling the failure. The run is recorded as a subprocess span when tracing
+    is enabled.
+
+    Args:
+        command (str): a string of shell command
+        stream (BinaryIO): the stream written to the command's stdin, read until its end
+        env (Optional[dict]): environment variables added to the current environment of
+            the command
+        chunk_size (int): bytes read from the stream and written at a time
+        max_output_lines (int): lines of stdout and stderr kept in the result
+
+    Returns:
+        CommandResult: the last lines of the command's output and error, and its exit
+            code
+    """
+    command_label = get_command_label(command)
+    with trace_span(command_label, SpanKind.SUBPROCESS.value, command=command_label) as span:
+        stdout_lines: deque = deque(maxlen=max_output_lines)
+        stderr_lines: deque = deque(maxlen=max_output_lines)
+        stdin_byte_count = 0
+        try:
+            process = subprocess.Popen(
+                shlex.split(command),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                shell=False,
+                env={**os.environ, **env} if env else None,
+            )
+        except Exception as e:
+            command_result = CommandResult(output="", error=str(e), exit_code=1)
+        else:
+
+            def read_lines(pipe: BinaryIO, lines: deque) -> None:
+                for line in pipe:
+                    lines.append(line.decode(errors="replace").rstrip("\n"))
+
+            readers = [
+                threading.Thread(
+                    target=read_lines, args=(process.stdout, stdout_lines), daemon=True
+                ),
+                threading.Thread(
+                    target=read_lines, args=(process.stderr, stderr_lines), daemon=True
+                ),
+            ]
+            for reader in readers:
+                reader.start()
+
+            try:
+                while True:
+                    chunk = stream.read(chunk_size)
+                    if not chunk:
+                        break
+                    process.stdin.write(chunk)
+                    stdin_byte_count += len(chunk)
+                process.stdin.close()
+            except BrokenPipeError:
+                # The command exited before reading the whole stream
+                with suppress(BrokenPipeError):
+                    process.stdin.close()
+            except BaseException:
+                process.kill()
+                process.wait()
+                raise
+
+            process.wait()
+            for reader in readers:
+                reader.join(timeout=5)
+            command_result = CommandResult(
+                output="\n".join(stdout_lines).strip(),
+                error="\n".join(stderr_lines).strip(),
+                exit_code=process.returncode,
+            )
+
+        span.set_attributes(
+            exit_code=command_result.exit_code,
+            stdin_bytes=stdin_byte_count,
+            stderr_bytes=len(command_result.error),
+        )
+        if command_result.exit_code != 0:
+            span.status = "ERROR"
 
     return command_result
@@ -3,9 +3,19 @@
 # import: standard
 import argparse
 import logging
+import os
 import sys
 
 # import: internal
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    METRICS_TEXTFILE_DIR_ENV,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    create_metrics_server,
+)
+from mdp.framework.mdp_extraction_framework.utility.file_reader.template_service import (
+    invalidate_env_settings,
+)
 from mdp.framework.mdp_extraction_framework.utility.test_utils.connection.connectivity import (
     ConnectivityTest,
 )
@@ -52,6 +62,13 @@ def validate_args(parser, args):
     if not args.connectivity_test and args.query:
         parser.error("--query is only valid when --connectivity_test is provided.")
 
+    if args.serve_metrics and not (
+        args.metrics_textfile_dir or os.getenv(METRICS_TEXTFILE_DIR_ENV)
+    ):
+        parser.error(
+            f"--metrics_textfile_dir or the {METRICS_TEXTFILE_DIR_ENV} environment variable is required when --serve_metrics is provided."
+        )
+
 
 def entrypoint(argv: list = sys.argv[1:]):
     """Entrypoint for pipeline.
@@ -86,6 +103,26 @@ def entrypoint(argv: list = sys.argv[1:]):
         required=False,
     )
 
+    metrics_parser_group = parser.add_argument_group("Metrics Server Options")
+    metrics_parser_group.add_argument(
+        "--serve_metrics",
+        action="store_true",
+        help="Serve the OpenMetrics textfiles of the extraction runs on a local HTTP endpoint (/metrics).",
+        required=False,
+    )
+    metrics_parser_group.add_argument(
+        "--metrics_textfile_dir",
+        help=f"Directory of the OpenMetrics textfiles. Defaults to the {METRICS_TEXTFILE_DIR_ENV} environment variable.",
+        required=False,
+    )
+    metrics_parser_group.add_argument(
+        "--metrics_port",
+        help="Port of the local metrics HTTP endpoint.",
+        type=int,
+        required=False,
+        default=9464,
+    )
+
     system_arguments = parser.parse_args(argv)
 
     # Load environment variables dynamically based on project
@@ -103,6 +140,7 @@ def entrypoint(argv: list = sys.argv[1:]):
 
     load_dotenv(f"/{root_path}/{project}/script/extraction/.env", override=True)
     load_dotenv(f"/{root_path}/{project}/script/extraction/.env.secret", override=True)
+    invalidate_env_settings()
 
     validate_args(parser=parser, args=system_arguments)
 
@@ -127,6 +165,18 @@ def entrypoint(argv: list = sys.argv[1:]):
                 else:
                     logger.info("Query Test Result: FAILED")
 
+        elif system_arguments.serve_metrics is True:
+            metrics_textfile_dir = system_arguments.metrics_textfile_dir or os.getenv(
+                METRICS_TEXTFILE_DIR_ENV
+            )
+            server = create_metrics_server(
+                directory=metrics_textfile_dir, port=system_arguments.metrics_port
+            )
+            logger.info(
+                f"Serving metrics of {metrics_textfile_dir} on http://127.0.0.1:{system_arguments.metrics_port}/metrics"
+            )
+            server.serve_forever()
+
         else:
             logger.info("No valid arguments provided, exiting script.")
 
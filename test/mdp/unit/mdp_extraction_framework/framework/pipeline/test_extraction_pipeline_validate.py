@@ -67,3 +67,23 @@ def test_extraction_pipeline_validate_pipeline_config_fail():
     config.pop("pipeline_name")
     with pytest.raises(Exception):
         ExtractionPipeline(config=config, job_parameters=JOB_PARAMETER_MOCK)
+
+
+def test_extraction_pipeline_instrument_task():
+    """Unit test to validate task metrics are added to the executed values."""
+    config = CONFIG.copy()
+    pipeline = ExtractionPipeline(config=config, job_parameters=JOB_PARAMETER_MOCK)
+
+    with pipeline.instrument_task("azcopy_data_transfer_task"):
+        pass
+
+    with pytest.raises(ValueError):
+        with pipeline.instrument_task("file_decryptor_task"):
+            raise ValueError("mock error")
+
+    task_metrics = pipeline.executed_values.task_metrics
+    assert [metrics.task_name for metrics in task_metrics] == [
+        "azcopy_data_transfer_task",
+        "file_decryptor_task",
+    ]
+    assert [metrics.task_status for metrics in task_metrics] == ["SUCCESS", "FAILED"]
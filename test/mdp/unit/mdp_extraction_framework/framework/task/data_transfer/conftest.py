@@ -0,0 +1,153 @@
+"""Fixtures of the data transfer tests."""
+# import: standard
+import base64
+import hashlib
+import threading
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+
+# import: external
+import pytest
+
+LIST_PAGE_SIZE = 2
+
+
+def get_md5(data: bytes) -> str:
+    """Get the base64 encoded MD5 of bytes."""
+    return base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+
+
+class MockBlobService(BaseHTTPRequestHandler):
+    """Azurite-style Blob endpoint keeping blobs in memory."""
+
+    protocol_version = "HTTP/1.1"
+    blobs: dict = {}
+    blob_md5s: dict = {}
+    staged_blocks: dict = {}
+    requests: list = []
+    failures_left = 0
+
+    def respond(self, status: int, body: bytes = b"", headers: dict = None) -> None:
+        """Send a response with a body."""
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def parse_request_url(self) -> tuple:
+        """Get the unquoted path and the query parameters of the request."""
+        parts = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        return unquote(parts.path), query
+
+    def read_body(self) -> bytes:
+        """Read the request body."""
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_PUT(self):
+        """Put Blob, Put Block and Put Block List."""
+        path, query = self.parse_request_url()
+        body = self.read_body()
+        self.requests.append(("PUT", path, query.get("comp")))
+        if query.get("sig") != "test":
+            return self.respond(403)
+        if MockBlobService.failures_left > 0:
+            MockBlobService.failures_left -= 1
+            return self.respond(503)
+        if query.get("comp") == "block":
+            if self.headers["Content-MD5"] != get_md5(body):
+                return self.respond(400, b"Md5Mismatch")
+            self.staged_blocks.setdefault(path, {})[query["blockid"]] = body
+        elif query.get("comp") == "blocklist":
+            block_ids = [element.text for element in ET.fromstring(body).iter("Latest")]
+            staged = self.staged_blocks.pop(path, {})
+            self.blobs[path] = b"".join(staged[block_id] for block_id in block_ids)
+            self.blob_md5s[path] = self.headers["x-ms-blob-content-md5"]
+        else:
+            if self.headers["Content-MD5"] != get_md5(body):
+                return self.respond(400, b"Md5Mismatch")
+            self.blobs[path] = body
+            self.blob_md5s[path] = self.headers["x-ms-blob-content-md5"]
+        self.respond(201)
+
+    def do_HEAD(self):
+        """Get Blob Properties."""
+        path, _ = self.parse_request_url()
+        if path not in self.blobs:
+            return self.respond(404)
+        self.respond(200, headers={"Content-MD5": self.blob_md5s[path]})
+
+    def do_DELETE(self):
+        """Delete Blob."""
+        path, _ = self.parse_request_url()
+        self.requests.append(("DELETE", path, None))
+        if self.blobs.pop(path, None) is None:
+            return self.respond(404)
+        self.respond(202)
+
+    def do_GET(self):
+        """List Blobs, paged by LIST_PAGE_SIZE."""
+        path, query = self.parse_request_url()
+        names = sorted(
+            blob_path[len(path) + 1 :]
+            for blob_path in self.blobs
+            if blob_path.startswith(f"{path}/")
+            and blob_path[len(path) + 1 :].startswith(query.get("prefix", ""))
+        )
+        if query.get("delimiter"):
+            names = [name for name in names if "/" not in name[len(query.get("prefix", "")) :]]
+        names = [name for name in names if name > query.get("marker", "")]
+        page, rest = names[:LIST_PAGE_SIZE], names[LIST_PAGE_SIZE:]
+        blobs_xml = "".join(
+            f"<Blob><Name>{name}</Name><Properties>"
+            f"<Content-Length>{len(self.blobs[f'{path}/{name}'])}</Content-Length>"
+            f"<Content-MD5>{self.blob_md5s.get(f'{path}/{name}', '')}</Content-MD5>"
+            "</Properties></Blob>"
+            for name in page
+        )
+        next_marker = page[-1] if rest else ""
+        body = (
+            f"<?xml version='1.0'?><EnumerationResults><Blobs>{blobs_xml}</Blobs>"
+            f"<NextMarker>{next_marker}</NextMarker></EnumerationResults>"
+        ).encode("utf-8")
+        self.respond(200, body, {"Content-Type": "application/xml"})
+
+    def log_message(self, format, *args):
+        """Silence the access log."""
+
+
+@pytest.fixture(autouse=True)
+def bandwidth_ledger_path(tmp_path_factory, monkeypatch):
+    """Keep the bandwidth leases of the transfers in a temporary ledger."""
+    ledger_path = tmp_path_factory.mktemp("ledger") / "ledger.json"
+    monkeypatch.setenv("AZCOPY_BANDWIDTH_LEDGER", str(ledger_path))
+    return ledger_path
+
+
+@pytest.fixture
+def blob_service():
+    """Serve the mock Blob endpoint on a free local port, with an empty store."""
+    MockBlobService.blobs = {}
+    MockBlobService.blob_md5s = {}
+    MockBlobService.staged_blocks = {}
+    MockBlobService.requests = []
+    MockBlobService.failures_left = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockBlobService)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/devstoreaccount1"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def blob_store():
+    """The blobs, Content-MD5s and requests of the mock Blob endpoint."""
+    return MockBlobService
@@ -0,0 +1,146 @@
+"""Test archive_stream_transfer."""
+# import: standard
+import base64
+import hashlib
+import io
+import tarfile
+import zipfile
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.config_validator.job_parameters import JobParameters
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    generate_data_file_info,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer import archive_stream_transfer
+from mdp.framework.mdp_extraction_framework.task.data_transfer.archive_stream_transfer import (
+    ArchiveStreamTransferTask,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.archive_stream_transfer import (
+    ArchiveStreamTransferTaskConfigModel,
+)
+from mdp.framework.mdp_extraction_framework.utility.shell_script.common import CommandResult
+
+# import: external
+import pytest
+from pydantic import BaseModel
+
+JOB_PARAMS = JobParameters(
+    pos_dt="2023-10-31",
+    config_file_path="",
+)
+SAS_TOKEN = "sv=2021&sig=test"
+
+
+class mock_model(BaseModel, extra="allow"):
+    """A mock pydantic model."""
+
+    pass
+
+
+def get_md5(data: bytes) -> str:
+    """Get the base64 encoded MD5 of bytes."""
+    return base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+
+
+def build_archive_stream_task(blob_service, archive_paths, **param):
+    """Build an ArchiveStreamTransferTask uploading archives to the 'landing' directory."""
+    param = {
+        "target": {
+            "type": "ADLSLocation",
+            "account_name": "devstoreaccount1",
+            "container_name": "inbnd",
+            "sas_token": SAS_TOKEN,
+            "filepath": "landing/",
+            "blob_endpoint": blob_service,
+        },
+        "azcopy_block_size_mb": 1,
+        **param,
+    }
+    return ArchiveStreamTransferTask(
+        module_config=mock_model(
+            module_name=ArchiveStreamTransferTask,
+            parameters=ArchiveStreamTransferTaskConfigModel(**param),
+        ),
+        job_parameters=JOB_PARAMS,
+        file_infos=[generate_data_file_info(str(archive_path)) for archive_path in archive_paths],
+    )
+
+
+def test_archive_stream_transfer_task(blob_service, tmp_path, blob_store):
+    """Test the members of a zip and a tar.gz archive are uploaded with their checksums,
+    without extracting anything next to the archives."""
+    large_data = bytes(range(256)) * 10000
+    with zipfile.ZipFile(tmp_path / "data.zip", "w", zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr("a.csv", large_data)
+        zip_file.writestr("sub/b.csv", b"b")
+    with tarfile.open(tmp_path / "data.tar.gz", "w:gz") as tar_file:
+        member = tarfile.TarInfo("c.csv")
+        member.size = 3
+        tar_file.addfile(member, io.BytesIO(b"ccc"))
+
+    task = build_archive_stream_task(
+        blob_service,
+        [tmp_path / "data.zip", tmp_path / "data.tar.gz"],
+        stream_checksum_algorithm="sha256",
+    )
+
+    assert task.execute() == f"{blob_service}/inbnd/landing/"
+    assert blob_store.blobs["/devstoreaccount1/inbnd/landing/a.csv"] == large_data
+    assert blob_store.blobs["/devstoreaccount1/inbnd/landing/sub/b.csv"] == b"b"
+    assert blob_store.blobs["/devstoreaccount1/inbnd/landing/c.csv"] == b"ccc"
+    assert blob_store.blob_md5s["/devstoreaccount1/inbnd/landing/a.csv"] == get_md5(large_data)
+    assert [
+        (streamed_member.member_name, streamed_member.size, streamed_member.checksum)
+        for streamed_member in task.streamed_members
+    ] == [
+        ("a.csv", len(large_data), hashlib.sha256(large_data).hexdigest()),
+        ("sub/b.csv", 1, hashlib.sha256(b"b").hexdigest()),
+        ("c.csv", 3, hashlib.sha256(b"ccc").hexdigest()),
+    ]
+    assert [
+        (file_info.file_location, file_info.file_size, file_info.content_md5)
+        for file_info in task.build_transferred_file_infos()
+    ] == [
+        (str(tmp_path / "_tmp_data" / "a.csv"), len(large_data), get_md5(large_data)),
+        (str(tmp_path / "_tmp_data" / "sub/b.csv"), 1, get_md5(b"b")),
+        (str(tmp_path / "_tmp_data.tar" / "c.csv"), 3, get_md5(b"ccc")),
+    ]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["data.tar.gz", "data.zip"]
+
+
+def test_archive_stream_transfer_azcopy(blob_service, tmp_path, monkeypatch, blob_store):
+    """Test the azcopy backend pipes each member to an AzCopy process reading stdin."""
+    with zipfile.ZipFile(tmp_path / "data.zip", "w") as zip_file:
+        zip_file.writestr("a.csv", b"aaa")
+        zip_file.writestr("b.csv", b"bb")
+    piped = []
+
+    def mock_pipe_to_command(command, stream, env=None):
+        piped.append((command, stream.read(1024)))
+        return CommandResult(output="", error="", exit_code=0 if len(piped) == 1 else 1)
+
+    monkeypatch.setattr(archive_stream_transfer, "pipe_to_command", mock_pipe_to_command)
+    task = build_archive_stream_task(blob_service, [tmp_path / "data.zip"], stream_backend="azcopy")
+
+    with pytest.raises(RuntimeError, match="landing/b.csv"):
+        task.upload_files(
+            [str(tmp_path / "data.zip")], f"{blob_service}/inbnd/landing/?{SAS_TOKEN}"
+        )
+
+    assert piped[0] == (
+        f"azcopy cp '{blob_service}/inbnd/landing/a.csv?{SAS_TOKEN}' --from-to=PipeBlob "
+        "--cap-mbps=150 --block-size-mb=1",
+        b"aaa",
+    )
+    assert piped[1][1] == b"bb"
+    assert blob_store.blobs == {}
+    assert task.streamed_members == []
+
+
+def test_archive_stream_transfer_cleanup_rejected(blob_service, tmp_path):
+    """Test the destination cleanup is rejected, it would not match the member blobs."""
+    with zipfile.ZipFile(tmp_path / "data.zip", "w") as zip_file:
+        zip_file.writestr("a.csv", b"a")
+
+    with pytest.raises(ValueError, match="cleanup_dest_flag"):
+        build_archive_stream_task(blob_service, [tmp_path / "data.zip"], cleanup_dest_flag="True")
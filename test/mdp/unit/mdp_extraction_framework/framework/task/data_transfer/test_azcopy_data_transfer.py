@@ -1,20 +1,59 @@
 """Test azcopy_data_transfer."""
 # import: standard
+import json
+import os
+from pathlib import Path
 
 # import: internal
+from mdp.framework.mdp_extraction_framework.config_validator.job_parameters import JobParameters
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    generate_data_file_info,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer import azcopy_data_transfer
 from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
     ADLSLocation,
 )
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
+    AzCopyDataTransferTask,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
+    AzCopyJobSummary,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
+    DataTransferTaskConfigModel,
+)
 from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
     LocalLocation,
 )
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
+    group_files_by_directory,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
+    parse_azcopy_summary,
+)
 from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_data_transfer import (
     validate_transfer_file,
 )
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import BlobProperties
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import (
+    compute_file_md5,
+)
 from mdp.framework.mdp_extraction_framework.utility.shell_script.common import CommandResult
 
 # import: external
 import pytest
+from pydantic import BaseModel
+
+JOB_PARAMS = JobParameters(
+    pos_dt="2023-10-31",
+    config_file_path="",
+)
+
+
+class mock_model(BaseModel, extra="allow"):
+    """A mock pydantic model."""
+
+    pass
 
 
 def test_LocalLocation():
@@ -166,3 +205,567 @@ def test_validate_transfer_file_failure(mock_command_result):
 
     with pytest.raises(ValueError):
         validate_transfer_file(mock_command_result)
+
+
+def mock_azcopy_json_output(total: int, completed: int, failed: int, skipped: list = None) -> str:
+    """Build a mock AzCopy JSON-line stdout ending with an EndOfJob summary."""
+    end_of_job = {
+        "JobStatus": "Completed" if not skipped else "CompletedWithSkipped",
+        "TotalTransfers": str(total),
+        "TransfersCompleted": str(completed),
+        "TransfersFailed": str(failed),
+        "FailedTransfers": None,
+        "SkippedTransfers": [{"Src": src, "TransferStatus": "Skipped"} for src in skipped or []],
+    }
+    return "\n".join(
+        [
+            json.dumps({"MessageType": "Init", "MessageContent": "{}"}),
+            "not a json line",
+            json.dumps({"MessageType": "EndOfJob", "MessageContent": json.dumps(end_of_job)}),
+        ]
+    )
+
+
+def test_parse_azcopy_summary():
+    """Test the function 'parse_azcopy_summary' reads counts and per-file results."""
+    summary = parse_azcopy_summary(
+        mock_azcopy_json_output(total=3, completed=2, failed=0, skipped=["/data/b.csv"])
+    )
+
+    assert summary == AzCopyJobSummary(
+        total_transfers=3,
+        transfers_completed=2,
+        transfers_failed=0,
+        job_status="CompletedWithSkipped",
+        failed_sources=[],
+        skipped_sources=["/data/b.csv"],
+    )
+    assert parse_azcopy_summary(None) == AzCopyJobSummary()
+    end_of_job = json.dumps({"JobID": "job-1", "TotalTransfers": "1"})
+    assert (
+        parse_azcopy_summary(
+            json.dumps({"MessageType": "EndOfJob", "MessageContent": end_of_job})
+        ).job_id
+        == "job-1"
+    )
+
+
+def test_group_files_by_directory(tmp_path):
+    """Test the function 'group_files_by_directory' groups file names by directory."""
+    file_groups = group_files_by_directory(
+        [f"{tmp_path}/a/1.csv", f"{tmp_path}/b/2.csv", f"{tmp_path}/a/3.csv"]
+    )
+
+    assert file_groups == {
+        str(tmp_path.resolve() / "a"): ["1.csv", "3.csv"],
+        str(tmp_path.resolve() / "b"): ["2.csv"],
+    }
+
+
+def test_execute_batch_transfer(tmp_path, monkeypatch):
+    """Test the batched mode runs one cleanup and one copy for the whole file set and
+    only cleans up the source files reported as transferred."""
+    file_paths = []
+    for file_name in ["a.csv", "b.csv", "c.csv"]:
+        (tmp_path / file_name).write_text("mock data")
+        file_paths.append(str(tmp_path / file_name))
+
+    commands = []
+    manifests = []
+
+    def mock_run_command(command, env=None):
+        commands.append(command)
+        if "--list-of-files" in command:
+            manifest_path = command.split("--list-of-files '")[1].split("'")[0]
+            manifests.append(Path(manifest_path).read_text().splitlines())
+            output = mock_azcopy_json_output(
+                total=3, completed=2, failed=0, skipped=[str(tmp_path.resolve() / "b.csv")]
+            )
+            return CommandResult(output=output, error="", exit_code=0)
+        return CommandResult(output="", error="", exit_code=0)
+
+    monkeypatch.setattr(azcopy_data_transfer, "run_command", mock_run_command)
+    param = {
+        "azcopy_command": "cp",
+        "target": {
+            "type": "ADLSLocation",
+            "account_name": "stmteststorage001",
+            "container_name": "inbnd",
+            "sas_token": "test_token",
+            "filepath": "test_location/",
+        },
+        "cleanup_source_flag": "True",
+        "batch_transfer_flag": "True",
+    }
+    module_config = mock_model(
+        module_name=AzCopyDataTransferTask, parameters=DataTransferTaskConfigModel(**param)
+    )
+    task = AzCopyDataTransferTask(
+        module_config=module_config,
+        job_parameters=JOB_PARAMS,
+        file_infos=[generate_data_file_info(file_path) for file_path in file_paths],
+    )
+
+    target_file_path = task.execute()
+
+    assert (
+        target_file_path == "https://stmteststorage001.blob.core.windows.net/inbnd/test_location/"
+    )
+    assert len(commands) == 2
+    assert commands[0].startswith("azcopy rm")
+    assert "--include-pattern 'a.csv;b.csv;c.csv'" in commands[0]
+    assert commands[1].startswith(f"azcopy cp '{tmp_path.resolve()}'")
+    assert manifests == [["a.csv", "b.csv", "c.csv"]]
+    assert not any(Path(command.split("--list-of-files '")[-1]).exists() for command in commands)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["b.csv"]
+
+
+def test_execute_concurrent_transfer(tmp_path, monkeypatch):
+    """Test the concurrent mode transfers each file with a share of the host bandwidth
+    budget and keeps the result of each file."""
+    file_paths = []
+    for file_name, size in [("a.csv", 10), ("b.csv", 100)]:
+        (tmp_path / file_name).write_bytes(b"x" * size)
+        file_paths.append(str(tmp_path / file_name))
+
+    commands = []
+
+    def mock_run_command(command, env=None):
+        commands.append(command)
+        output = mock_azcopy_json_output(total=1, completed=1, failed=0)
+        return CommandResult(output=output, error="", exit_code=0)
+
+    monkeypatch.setattr(azcopy_data_transfer, "run_command", mock_run_command)
+    monkeypatch.setenv("AZCOPY_HOST_BANDWIDTH_MBPS", "200")
+    param = {
+        "azcopy_command": "cp",
+        "target": {
+            "type": "ADLSLocation",
+            "account_name": "stmteststorage001",
+            "container_name": "inbnd",
+            "sas_token": "test_token",
+            "filepath": "test_location/",
+        },
+        "cleanup_dest_flag": "False",
+        "max_concurrent_transfers": 2,
+    }
+    module_config = mock_model(
+        module_name=AzCopyDataTransferTask, parameters=DataTransferTaskConfigModel(**param)
+    )
+    task = AzCopyDataTransferTask(
+        module_config=module_config,
+        job_parameters=JOB_PARAMS,
+        file_infos=[generate_data_file_info(file_path) for file_path in file_paths],
+    )
+
+    target_file_path = task.execute()
+
+    assert (
+        target_file_path == "https://stmteststorage001.blob.core.windows.net/inbnd/test_location/"
+    )
+    assert len(commands) == 2
+    assert all("--cap-mbps=100 " in command for command in commands)
+    assert [result.file_path for result in task.transfer_results] == file_paths[::-1]
+    assert [result.status for result in task.transfer_results] == ["SUCCESS", "SUCCESS"]
+
+
+def test_execute_bandwidth_lease(tmp_path, monkeypatch, bandwidth_ledger_path):
+    """Test the sequential and batched modes transfer with a share of the host bandwidth
+    budget left by the other jobs, and release it afterwards."""
+    file_paths = []
+    for file_name in ["a.csv", "b.csv"]:
+        (tmp_path / file_name).write_text("mock data")
+        file_paths.append(str(tmp_path / file_name))
+    other_job_lease = {"other": {"pid": os.getpid(), "mbps": 150, "acquired_at": 0}}
+    bandwidth_ledger_path.write_text(json.dumps(other_job_lease))
+
+    commands = []
+
+    def mock_run_command(command, env=None):
+        commands.append(command)
+        output = mock_azcopy_json_output(total=1, completed=1, failed=0)
+        return CommandResult(output=output, error="", exit_code=0)
+
+    monkeypatch.setattr(azcopy_data_transfer, "run_command", mock_run_command)
+    monkeypatch.setenv("AZCOPY_HOST_BANDWIDTH_MBPS", "200")
+    for batch_transfer_flag in ["False", "True"]:
+        param = {
+            "azcopy_command": "cp",
+            "target": {
+                "type": "ADLSLocation",
+                "account_name": "stmteststorage001",
+                "container_name": "inbnd",
+                "sas_token": "test_token",
+                "filepath": "test_location/",
+            },
+            "cleanup_dest_flag": "False",
+            "batch_transfer_flag": batch_transfer_flag,
+            "max_concurrent_transfers": None,
+        }
+        module_config = mock_model(
+            module_name=AzCopyDataTransferTask, parameters=DataTransferTaskConfigModel(**param)
+        )
+        task = AzCopyDataTransferTask(
+            module_config=module_config,
+            job_parameters=JOB_PARAMS,
+            file_infos=[generate_data_file_info(file_path) for file_path in file_paths],
+        )
+        task.execute()
+
+    assert len(commands) == 3
+    assert all("--cap-mbps=50 " in command for command in commands)
+    assert json.loads(bandwidth_ledger_path.read_text()) == other_job_lease
+
+
+def test_execute_adaptive_tuning(tmp_path, monkeypatch):
+    """Test adaptive tuning passes the picked settings to AzCopy and records the
+    throughput of each transfer in the target's history."""
+    (tmp_path / "a.csv").write_bytes(b"x" * 100)
+    calls = []
+
+    def mock_run_command(command, env=None):
+        calls.append((command, env))
+        end_of_job = {"TotalTransfers": "1", "TransfersCompleted": "1", "TransfersFailed": "0"}
+        end_of_job["TotalBytesTransferred"] = "100"
+        output = json.dumps({"MessageType": "EndOfJob", "MessageContent": json.dumps(end_of_job)})
+        return CommandResult(output=output, error="", exit_code=0)
+
+    monkeypatch.setattr(azcopy_data_transfer, "run_command", mock_run_command)
+    monkeypatch.setenv("AZCOPY_TRANSFER_HISTORY", str(tmp_path / "history.json"))
+    param = {
+        "azcopy_command": "cp",
+        "target": {
+            "type": "ADLSLocation",
+            "account_name": "stmteststorage001",
+            "container_name": "inbnd",
+            "sas_token": "test_token",
+            "filepath": "test_location/",
+        },
+        "cleanup_dest_flag": "False",
+        "adaptive_tuning_flag": "True",
+        "azcopy_cap_mbps": 300,
+    }
+    module_config = mock_model(
+        module_name=AzCopyDataTransferTask, parameters=DataTransferTaskConfigModel(**param)
+    )
+    task = AzCopyDataTransferTask(
+        module_config=module_config,
+        job_parameters=JOB_PARAMS,
+        file_infos=[generate_data_file_info(str(tmp_path / "a.csv"))],
+    )
+
+    task.execute()
+
+    command, env = calls[0]
+    assert "--cap-mbps=300 --output-type=json" in command
+    assert env == {"AZCOPY_CONCURRENCY_VALUE": "4"}
+    history = json.loads((tmp_path / "history.json").read_text())
+    assert history["stmteststorage001/inbnd"][0]["bytes_transferred"] == 100
+    assert history["stmteststorage001/inbnd"][0]["concurrency"] == 4
+
+
+def test_execute_skip_unchanged(tmp_path, monkeypatch):
+    """Test files whose MD5 matches the target blob are neither cleaned up nor uploaded,
+    and uploaded files are recorded in the manifest."""
+    (tmp_path / "same.csv").write_bytes(b"same")
+    (tmp_path / "new.csv").write_bytes(b"new")
+    commands = []
+
+    def mock_run_command(command, env=None):
+        commands.append(command)
+        output = mock_azcopy_json_output(total=1, completed=1, failed=0)
+        return CommandResult(output=output, error="", exit_code=0)
+
+    def mock_get_remote_content_md5(blob_url):
+        if "/same.csv?" in blob_url:
+            return compute_file_md5(tmp_path / "same.csv")
+        return None
+
+    monkeypatch.setattr(azcopy_data_transfer, "run_command", mock_run_command)
+    monkeypatch.setattr(azcopy_data_transfer, "get_remote_content_md5", mock_get_remote_content_md5)
+    param = {
+        "azcopy_command": "cp",
+        "target": {
+            "type": "ADLSLocation",
+            "account_name": "stmteststorage001",
+            "container_name": "inbnd",
+            "sas_token": "test_token",
+            "filepath": "test_location/",
+        },
+        "skip_unchanged_flag": "True",
+        "upload_manifest_to_target_flag": "True",
+    }
+    module_config = mock_model(
+        module_name=AzCopyDataTransferTask, parameters=DataTransferTaskConfigModel(**param)
+    )
+    task = AzCopyDataTransferTask(
+        module_config=module_config,
+        job_parameters=JOB_PARAMS,
+        file_infos=[
+            generate_data_file_info(str(tmp_path / "same.csv")),
+            generate_data_file_info(str(tmp_path / "new.csv")),
+        ],
+    )
+
+    task.execute()
+
+    assert len(commands) == 3
+    assert "--include-pattern 'new.csv'" in commands[0]
+    assert "--put-md5" in commands[1] and "new.csv" in commands[1]
+    assert "_upload_manifest.json?test_token" in commands[2]
+    manifest = json.loads((tmp_path / "_upload_manifest.json").read_text())["files"]
+    assert list(manifest) == [str(tmp_path.resolve() / "new.csv")]
+    assert manifest[str(tmp_path.resolve() / "new.csv")]["md5"] == compute_file_md5(
+        tmp_path / "new.csv"
+    )
+
+
+def test_execute_stream_progress(tmp_path, monkeypatch):
+    """Test the streaming mode hands AzCopy lines to the progress monitor and passes the
+    stall timeout, and a stalled job is retried."""
+    (tmp_path / "a.csv").write_bytes(b"x" * 100)
+    calls = []
+
+    def mock_stream_command(command, env=None, on_line=None, stall_timeout_sec=None):
+        calls.append(stall_timeout_sec)
+        if len(calls) == 1:
+            return CommandResult(output="", error="Killed after no progress", exit_code=124)
+        output = mock_azcopy_json_output(total=1, completed=1, failed=0)
+        moved_forward = [on_line(line) for line in output.splitlines()]
+        assert moved_forward == [True, False, True]
+        return CommandResult(output=output, error="", exit_code=0)
+
+    monkeypatch.setattr(azcopy_data_transfer, "stream_command", mock_stream_command)
+    monkeypatch.setattr(AzCopyDataTransferTask.azcopy_transfer_file.retry, "sleep", lambda _: None)
+    param = {
+        "azcopy_command": "cp",
+        "target": {
+            "type": "ADLSLocation",
+            "account_name": "stmteststorage001",
+            "container_name": "inbnd",
+            "sas_token": "test_token",
+            "filepath": "test_location/",
+        },
+        "cleanup_dest_flag": "False",
+        "stream_progress_flag": "True",
+        "azcopy_stall_timeout_sec": 300,
+    }
+    module_config = mock_model(
+        module_name=AzCopyDataTransferTask, parameters=DataTransferTaskConfigModel(**param)
+    )
+    task = AzCopyDataTransferTask(
+        module_config=module_config,
+        job_parameters=JOB_PARAMS,
+        file_infos=[generate_data_file_info(str(tmp_path / "a.csv"))],
+    )
+
+    task.execute()
+
+    assert calls == [300, 300]
+    assert task.copy_retry_count == 2
+
+
+def test_run_azcopy_keeps_job_id(monkeypatch):
+    """Test the job id of a streamed job is kept when its output drops the Init message."""
+    init = json.dumps({"MessageType": "Init", "MessageContent": '{"JobID": "job-1"}'})
+    output = mock_azcopy_json_output(total=1, completed=0, failed=1)
+
+    def mock_stream_command(command, env=None, on_line=None, stall_timeout_sec=None):
+        for line in [init] + output.splitlines()[1:]:
+            on_line(line)
+        return CommandResult(output=output.splitlines()[-1], error="", exit_code=1)
+
+    monkeypatch.setattr(azcopy_data_transfer, "stream_command", mock_stream_command)
+    param = {
+        "azcopy_command": "cp",
+        "target": {
+            "type": "ADLSLocation",
+            "account_name": "stmteststorage001",
+            "container_name": "inbnd",
+            "sas_token": "test_token",
+            "filepath": "test_location/",
+        },
+        "cleanup_dest_flag": "False",
+        "stream_progress_flag": "True",
+    }
+    module_config = mock_model(
+        module_name=AzCopyDataTransferTask, parameters=DataTransferTaskConfigModel(**param)
+    )
+    task = AzCopyDataTransferTask(
+        module_config=module_config, job_parameters=JOB_PARAMS, file_infos=[]
+    )
+
+    command_result = task.run_azcopy("azcopy cp 'a.csv' 'target'")
+
+    assert parse_azcopy_summary(command_result.output).job_id == "job-1"
+    assert parse_azcopy_summary(command_result.output).transfers_failed == 1
+
+
+def test_execute_resume_failed_job(tmp_path, monkeypatch):
+    """Test a job with failed transfers is resumed by its job id and the retry cost is
+    recorded."""
+    (tmp_path / "a.csv").write_bytes(b"x" * 100)
+    commands = []
+
+    def mock_run_command(command, env=None):
+        commands.append(command)
+        if len(commands) == 1:
+            init = json.dumps({"MessageType": "Init", "MessageContent": '{"JobID": "job-1"}'})
+            end_of_job = {"TotalTransfers": "1", "TransfersCompleted": "0", "TransfersFailed": "1"}
+            output = json.dumps(
+                {"MessageType": "EndOfJob", "MessageContent": json.dumps(end_of_job)}
+            )
+            return CommandResult(output=f"{init}\n{output}", error="", exit_code=1)
+        end_of_job = {"TotalTransfers": "1", "TransfersCompleted": "1", "TransfersFailed": "0"}
+        end_of_job["TotalBytesTransferred"] = "100"
+        output = json.dumps({"MessageType": "EndOfJob", "MessageContent": json.dumps(end_of_job)})
+        return CommandResult(output=output, error="", exit_code=0)
+
+    monkeypatch.setattr(azcopy_data_transfer, "run_command", mock_run_command)
+    monkeypatch.setattr(AzCopyDataTransferTask.azcopy_transfer_file.retry, "sleep", lambda _: None)
+    param = {
+        "azcopy_command": "cp",
+        "target": {
+            "type": "ADLSLocation",
+            "account_name": "stmteststorage001",
+            "container_name": "inbnd",
+            "sas_token": "test_token",
+            "filepath": "test_location/",
+        },
+        "cleanup_dest_flag": "False",
+        "resume_failed_jobs_flag": "True",
+        "azcopy_cap_mbps": 80,
+    }
+    module_config = mock_model(
+        module_name=AzCopyDataTransferTask, parameters=DataTransferTaskConfigModel(**param)
+    )
+    task = AzCopyDataTransferTask(
+        module_config=module_config,
+        job_parameters=JOB_PARAMS,
+        file_infos=[generate_data_file_info(str(tmp_path / "a.csv"))],
+    )
+
+    task.execute()
+
+    assert len(commands) == 2
+    assert commands[1] == (
+        "azcopy jobs resume job-1 --destination-sas='test_token' --cap-mbps=80 "
+        "--output-type=json"
+    )
+    assert task.retried_bytes == 100
+    assert task.retry_wall_time_sec > 0
+    assert task.failed_azcopy_jobs == {}
+
+
+def test_execute_archive(tmp_path, monkeypatch):
+    """Test transferred source files are archived into the position date directory."""
+    (tmp_path / "archive").mkdir()
+    (tmp_path / "a.csv").write_bytes(b"a")
+    (tmp_path / "b.csv").write_bytes(b"b")
+
+    def mock_run_command(command, env=None):
+        output = mock_azcopy_json_output(total=1, completed=1, failed=0)
+        return CommandResult(output=output, error="", exit_code=0)
+
+    monkeypatch.setattr(azcopy_data_transfer, "run_command", mock_run_command)
+    param = {
+        "azcopy_command": "cp",
+        "target": {
+            "type": "ADLSLocation",
+            "account_name": "stmteststorage001",
+            "container_name": "inbnd",
+            "sas_token": "test_token",
+            "filepath": "test_location/",
+        },
+        "archive_flag": "True",
+        "archive_path": str(tmp_path / "archive"),
+        "archive_compression": "gzip",
+        "cleanup_source_flag": "True",
+    }
+    module_config = mock_model(
+        module_name=AzCopyDataTransferTask, parameters=DataTransferTaskConfigModel(**param)
+    )
+    task = AzCopyDataTransferTask(
+        module_config=module_config,
+        job_parameters=JOB_PARAMS,
+        file_infos=[
+            generate_data_file_info(str(tmp_path / "a.csv")),
+            generate_data_file_info(str(tmp_path / "b.csv")),
+        ],
+    )
+
+    task.execute()
+
+    assert sorted(path.name for path in (tmp_path / "archive" / "2023-10-31").iterdir()) == [
+        "a.csv.gz",
+        "b.csv.gz",
+    ]
+    assert not (tmp_path / "a.csv").exists() and not (tmp_path / "b.csv").exists()
+
+
+def test_execute_batch_cleanup(tmp_path, monkeypatch):
+    """Test the destination is listed once and the planned blobs, stale parts included,
+    are deleted with a single 'azcopy rm' before the files are transferred."""
+    file_paths = []
+    for file_name in ["table_0.csv", "table_1.csv"]:
+        (tmp_path / file_name).write_text("mock data")
+        file_paths.append(str(tmp_path / file_name))
+
+    class MockBlobClient:
+        list_calls = []
+
+        @classmethod
+        def from_url(cls, url):
+            return cls()
+
+        def list_blob_properties(self, container_path, prefix="", delimiter=""):
+            self.list_calls.append((container_path, prefix, delimiter))
+            return [
+                BlobProperties(f"{prefix}{name}", 1)
+                for name in ["keep.csv", "table_0.csv", "table_2.csv"]
+            ]
+
+        def close(self):
+            pass
+
+    commands = []
+    deleted_blobs = []
+
+    def mock_run_command(command, env=None):
+        commands.append(command)
+        if command.startswith("azcopy rm"):
+            list_path = command.split("--list-of-files '")[1].split("'")[0]
+            deleted_blobs.extend(Path(list_path).read_text().splitlines())
+            return CommandResult(output="", error="", exit_code=0)
+        output = mock_azcopy_json_output(total=1, completed=1, failed=0)
+        return CommandResult(output=output, error="", exit_code=0)
+
+    monkeypatch.setattr(azcopy_data_transfer, "BlobRestClient", MockBlobClient)
+    monkeypatch.setattr(azcopy_data_transfer, "run_command", mock_run_command)
+    param = {
+        "azcopy_command": "cp",
+        "target": {
+            "type": "ADLSLocation",
+            "account_name": "stmteststorage001",
+            "container_name": "inbnd",
+            "sas_token": "test_token",
+            "filepath": "test_location/",
+        },
+        "batch_cleanup_flag": "True",
+        "cleanup_part_file_name": "table_{{ part_number }}",
+    }
+    module_config = mock_model(
+        module_name=AzCopyDataTransferTask, parameters=DataTransferTaskConfigModel(**param)
+    )
+    task = AzCopyDataTransferTask(
+        module_config=module_config,
+        job_parameters=JOB_PARAMS,
+        file_infos=[generate_data_file_info(file_path) for file_path in file_paths],
+    )
+
+    task.execute()
+
+    assert MockBlobClient.list_calls == [("/inbnd", "test_location/", "/")]
+    assert deleted_blobs == ["table_0.csv", "table_2.csv"]
+    assert [command.split(" ")[1] for command in commands] == ["rm", "cp", "cp"]
+    assert task.cleanup_plan.listed_blob_count == 3
@@ -0,0 +1,54 @@
+"""Test azcopy_progress."""
+# import: standard
+import json
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_progress import (
+    AzCopyProgressMonitor,
+)
+
+
+def progress_line(bytes_transferred: int, completed: int = 0) -> str:
+    """Build a mock AzCopy Progress JSON line."""
+    content = {
+        "PercentComplete": str(bytes_transferred / 10),
+        "TotalBytesTransferred": str(bytes_transferred),
+        "TotalBytesExpected": "1000",
+        "TransfersCompleted": str(completed),
+        "TotalTransfers": "2",
+    }
+    return json.dumps({"MessageType": "Progress", "MessageContent": json.dumps(content)})
+
+
+def test_handle_line_progress():
+    """Test only lines moving the job forward are reported as progress."""
+    monitor = AzCopyProgressMonitor(log_interval_sec=3600)
+
+    init_line = json.dumps({"MessageType": "Init", "MessageContent": '{"JobID": "job-1"}'})
+
+    assert monitor.handle_line(init_line)
+    assert monitor.handle_line(progress_line(100))
+    assert not monitor.handle_line(progress_line(100))
+    assert monitor.handle_line(progress_line(100, completed=1))
+    assert not monitor.handle_line("not a json line")
+    assert monitor.progress.percent_complete == 10.0
+    assert monitor.progress.bytes_expected == 1000
+    assert monitor.progress.total_transfers == 2
+    assert monitor.init_line == init_line
+
+
+def test_report_writes_metrics_textfile(tmp_path, monkeypatch):
+    """Test the report computes the throughput and ETA and writes the progress metrics."""
+    monitor = AzCopyProgressMonitor(
+        log_interval_sec=3600, metrics_name="job_a", metrics_textfile_dir=str(tmp_path)
+    )
+    monitor.handle_line(progress_line(0))
+    monitor._last_log_time -= 2
+    monitor.handle_line(progress_line(500))
+
+    monitor.report()
+
+    assert monitor.progress.eta_sec is not None and 1.9 < monitor.progress.eta_sec < 2.1
+    content = (tmp_path / "mdp_extraction_job_a_transfer_progress.prom").read_text()
+    assert 'mdp_extraction_transfer_progress_percent{job_name="job_a"} 50.0' in content
+    assert 'mdp_extraction_transfer_progress_bytes{job_name="job_a"} 500' in content
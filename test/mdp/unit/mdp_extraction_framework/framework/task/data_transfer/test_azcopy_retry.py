@@ -0,0 +1,75 @@
+"""Test azcopy_retry."""
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_retry import (
+    AzCopyFailureClass,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_retry import (
+    AzCopyTransferError,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_retry import (
+    build_azcopy_resume_command,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_retry import (
+    classify_azcopy_failure,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_retry import (
+    stop_on_non_retryable_failure,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.azcopy_retry import (
+    wait_for_failure_class,
+)
+
+# import: external
+import pytest
+from tenacity import retry
+from tenacity import stop_after_attempt
+from tenacity import stop_any
+
+
+@pytest.mark.parametrize(
+    "text, expected_failure_class",
+    [
+        ("RESPONSE Status: 403 Server failed to authenticate the request.", "auth"),
+        ("RESPONSE Status: 503 The server is busy. ErrorCode: ServerBusy", "throttled"),
+        ("dial tcp: lookup st.blob.core.windows.net: no such host", "network"),
+        ("Killed after no progress for 300 seconds.", "stalled"),
+        ('{"TotalBytesTransferred": "14031"}', "transfer"),
+        (None, "transfer"),
+    ],
+)
+def test_classify_azcopy_failure(text, expected_failure_class):
+    """Test failures are classified from the markers of the AzCopy output."""
+    assert classify_azcopy_failure(text) == expected_failure_class
+
+
+def test_retry_policy_by_failure_class():
+    """Test the backoff follows the failure class and auth failures are not retried."""
+    waits = []
+    failure_classes = [AzCopyFailureClass.STALLED, AzCopyFailureClass.THROTTLED]
+
+    @retry(
+        wait=wait_for_failure_class,
+        stop=stop_any(stop_after_attempt(5), stop_on_non_retryable_failure),
+        sleep=waits.append,
+        reraise=True,
+    )
+    def transfer():
+        failure_class = failure_classes.pop(0) if failure_classes else AzCopyFailureClass.AUTH
+        raise AzCopyTransferError("failed", failure_class=failure_class)
+
+    with pytest.raises(AzCopyTransferError):
+        transfer()
+
+    assert transfer.statistics["attempt_number"] == 3
+    assert waits[0] == 1
+    assert waits[1] == 60
+
+
+def test_build_azcopy_resume_command():
+    """Test the resume command passes the SAS token of the remote location and the cap."""
+    assert build_azcopy_resume_command(
+        "job-1", "/data/a.csv", "https://st.blob.core.windows.net/c/dir/?sv=1&sig=2"
+    ) == ("azcopy jobs resume job-1 --destination-sas='sv=1&sig=2' --output-type=json")
+    assert build_azcopy_resume_command(
+        "job-1", "/data/a.csv", "https://st.blob.core.windows.net/c/dir/", cap_mbps=80
+    ) == ("azcopy jobs resume job-1 --cap-mbps=80 --output-type=json")
@@ -0,0 +1,305 @@
+"""Test blob_uploader and blob_rest_data_transfer."""
+# import: standard
+import base64
+import hashlib
+import io
+import threading
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.config_validator.job_parameters import JobParameters
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    generate_data_file_info,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_rest_data_transfer import (
+    BlobRestDataTransferTask,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_rest_data_transfer import (
+    BlobRestDataTransferTaskConfigModel,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import BlobRestClient
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import BlobUploader
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import make_block_id
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import (
+    matches_any_pattern,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import (
+    split_container_path,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import (
+    compute_file_md5,
+)
+
+# import: external
+import pytest
+from pydantic import BaseModel
+
+JOB_PARAMS = JobParameters(
+    pos_dt="2023-10-31",
+    config_file_path="",
+)
+SAS_TOKEN = "sv=2021&sig=test"
+
+
+class mock_model(BaseModel, extra="allow"):
+    """A mock pydantic model."""
+
+    pass
+
+
+def get_md5(data: bytes) -> str:
+    """Get the base64 encoded MD5 of bytes."""
+    return base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+
+
+def test_upload_stream_parallel_blocks(blob_service, blob_store):
+    """Test a stream larger than a block is uploaded as blocks and committed in order."""
+    content = bytes(range(256)) * 41
+    client = BlobRestClient.from_url(f"{blob_service}/container?{SAS_TOKEN}")
+    uploader = BlobUploader(client, block_size=1000, max_workers=4)
+
+    result = uploader.upload_stream("/devstoreaccount1/container/dir/a.bin", io.BytesIO(content))
+
+    assert blob_store.blobs["/devstoreaccount1/container/dir/a.bin"] == content
+    assert result.block_count == 11
+    assert result.bytes_uploaded == len(content)
+    assert result.content_md5 == get_md5(content)
+    assert blob_store.blob_md5s["/devstoreaccount1/container/dir/a.bin"] == get_md5(content)
+    client.close()
+
+
+class SlowFirstBlockClient:
+    """A mock client staging its first block only once a later block is staged."""
+
+    def __init__(self) -> None:
+        """Initialize the client."""
+        self.later_block_staged = threading.Event()
+        self.staged_block_ids = []
+
+    def put_block(self, blob_path, block_id, data):
+        """Stage a block, the first one waits for the seventh."""
+        if block_id == make_block_id(0):
+            self.later_block_staged.wait(timeout=5)
+        elif block_id == make_block_id(6):
+            self.later_block_staged.set()
+        self.staged_block_ids.append(block_id)
+
+    def put_block_list(self, blob_path, block_ids, content_md5):
+        """Commit the blocks."""
+        self.committed_block_ids = block_ids
+
+
+def test_upload_stream_slow_block():
+    """Test a slow block does not stop the next blocks from being read and staged."""
+    client = SlowFirstBlockClient()
+    uploader = BlobUploader(client, block_size=1000, max_workers=2)
+
+    result = uploader.upload_stream("/container/a.bin", io.BytesIO(b"x" * 8000))
+
+    assert result.block_count == 8
+    assert client.committed_block_ids == [make_block_id(index) for index in range(8)]
+    assert client.staged_block_ids.index(make_block_id(0)) > client.staged_block_ids.index(
+        make_block_id(6)
+    )
+
+
+def test_upload_stream_single_put(blob_service, blob_store):
+    """Test a stream fitting in one block is uploaded with a single Put Blob."""
+    client = BlobRestClient.from_url(f"{blob_service}?{SAS_TOKEN}")
+
+    result = BlobUploader(client, block_size=1000).upload_stream(
+        "/devstoreaccount1/container/a b.csv", io.BytesIO(b"1000")
+    )
+
+    assert result.block_count == 0
+    assert blob_store.blobs["/devstoreaccount1/container/a b.csv"] == b"1000"
+    assert blob_store.requests == [("PUT", "/devstoreaccount1/container/a b.csv", None)]
+
+
+class ShortReadStream(io.BytesIO):
+    """A stream returning at most 300 bytes per read."""
+
+    def read(self, size: int = -1) -> bytes:
+        """Read at most 300 bytes."""
+        return super().read(min(size, 300) if size >= 0 else 300)
+
+
+def test_upload_stream_short_reads(blob_service, blob_store):
+    """Test a stream returning short reads is uploaded whole, in full blocks."""
+    content = bytes(range(256)) * 10
+    client = BlobRestClient.from_url(f"{blob_service}?{SAS_TOKEN}")
+
+    result = BlobUploader(client, block_size=1000).upload_stream(
+        "/devstoreaccount1/container/a.bin", ShortReadStream(content)
+    )
+
+    assert blob_store.blobs["/devstoreaccount1/container/a.bin"] == content
+    assert result.block_count == 3
+    assert result.content_md5 == get_md5(content)
+    client.close()
+
+
+def test_request_retry_transient_error(blob_service, monkeypatch, blob_store):
+    """Test a request answered with 503 is retried."""
+    monkeypatch.setattr(BlobRestClient.request.retry, "sleep", lambda _: None)
+    blob_store.failures_left = 2
+    client = BlobRestClient.from_url(f"{blob_service}?{SAS_TOKEN}")
+
+    BlobUploader(client).upload_stream("/devstoreaccount1/container/a.csv", io.BytesIO(b"a"))
+
+    assert blob_store.blobs["/devstoreaccount1/container/a.csv"] == b"a"
+
+
+def test_list_and_delete_blobs(blob_service, blob_store):
+    """Test listing follows the continuation marker and deleting a missing blob passes."""
+    for name in ["dir/a.csv", "dir/b.csv", "dir/c.csv", "dir/sub/e.csv", "other/d.csv"]:
+        blob_store.blobs[f"/devstoreaccount1/container/{name}"] = b""
+    client = BlobRestClient.from_url(f"{blob_service}?{SAS_TOKEN}")
+
+    assert client.list_blobs("/devstoreaccount1/container", "dir/") == [
+        "dir/a.csv",
+        "dir/b.csv",
+        "dir/c.csv",
+        "dir/sub/e.csv",
+    ]
+    assert client.list_blobs("/devstoreaccount1/container", "dir/", delimiter="/") == [
+        "dir/a.csv",
+        "dir/b.csv",
+        "dir/c.csv",
+    ]
+    client.delete_blob("/devstoreaccount1/container/dir/a.csv")
+    client.delete_blob("/devstoreaccount1/container/dir/a.csv")
+    assert "/devstoreaccount1/container/dir/a.csv" not in blob_store.blobs
+
+
+def test_list_blob_properties(blob_service, blob_store):
+    """Test listing with a delimiter skips sub-directories and reads the size and MD5."""
+    blob_store.blobs["/devstoreaccount1/container/dir/a.csv"] = b"abc"
+    blob_store.blob_md5s["/devstoreaccount1/container/dir/a.csv"] = get_md5(b"abc")
+    blob_store.blobs["/devstoreaccount1/container/dir/b.csv"] = b""
+    blob_store.blobs["/devstoreaccount1/container/dir/sub/c.csv"] = b"c"
+    client = BlobRestClient.from_url(f"{blob_service}?{SAS_TOKEN}")
+
+    blobs = client.list_blob_properties("/devstoreaccount1/container", "dir/", delimiter="/")
+
+    assert [(blob.name, blob.size, blob.content_md5) for blob in blobs] == [
+        ("dir/a.csv", 3, get_md5(b"abc")),
+        ("dir/b.csv", 0, None),
+    ]
+
+
+def test_blob_uploader_helpers():
+    """Test block ids, container path splitting and cleanup pattern matching."""
+    assert len({make_block_id(index) for index in range(100)}) == 100
+    assert len({len(make_block_id(index)) for index in [0, 99999]}) == 1
+    assert split_container_path("/account/container/dir/sub/", "container") == (
+        "/account/container",
+        "dir/sub/",
+    )
+    assert split_container_path("/container", "container") == ("/container", "")
+    with pytest.raises(ValueError):
+        split_container_path("/other/dir", "container")
+    assert matches_any_pattern("a.csv", "b.csv;a.*")
+    assert not matches_any_pattern("a.csv", "b.csv;c.csv")
+
+
+def test_blob_rest_data_transfer_task(blob_service, tmp_path, blob_store, monkeypatch):
+    """Test the task cleans up matching blobs of the target directory only, uploads the
+    files, and skips unchanged files on rerun."""
+    list_delimiters = []
+    list_blobs = BlobRestClient.list_blobs
+
+    def spy_list_blobs(self, container_path, prefix="", delimiter=""):
+        list_delimiters.append(delimiter)
+        return list_blobs(self, container_path, prefix, delimiter)
+
+    monkeypatch.setattr(BlobRestClient, "list_blobs", spy_list_blobs)
+    (tmp_path / "a.csv").write_bytes(b"a" * 2500)
+    (tmp_path / "b.csv").write_bytes(b"b")
+    blob_store.blobs["/devstoreaccount1/inbnd/landing/a.csv"] = b"old"
+    blob_store.blobs["/devstoreaccount1/inbnd/landing/keep.csv"] = b"keep"
+    blob_store.blobs["/devstoreaccount1/inbnd/landing/sub/a.csv"] = b"sub"
+    param = {
+        "target": {
+            "type": "ADLSLocation",
+            "account_name": "devstoreaccount1",
+            "container_name": "inbnd",
+            "sas_token": SAS_TOKEN,
+            "filepath": "landing/",
+            "blob_endpoint": blob_service,
+        },
+        "azcopy_block_size_mb": 1,
+        "skip_unchanged_flag": "True",
+        "upload_manifest_path": str(tmp_path / "manifest" / "_upload_manifest.json"),
+    }
+
+    def build_task():
+        module_config = mock_model(
+            module_name=BlobRestDataTransferTask,
+            parameters=BlobRestDataTransferTaskConfigModel(**param),
+        )
+        return BlobRestDataTransferTask(
+            module_config=module_config,
+            job_parameters=JOB_PARAMS,
+            file_infos=[
+                generate_data_file_info(str(tmp_path / "a.csv")),
+                generate_data_file_info(str(tmp_path / "b.csv")),
+            ],
+        )
+
+    task = build_task()
+    assert task.execute() == f"{blob_service}/inbnd/landing/"
+    assert list_delimiters == ["/", "/"]
+    assert task.cleanup_retry_count == 2
+    assert blob_store.blobs["/devstoreaccount1/inbnd/landing/a.csv"] == b"a" * 2500
+    assert blob_store.blobs["/devstoreaccount1/inbnd/landing/b.csv"] == b"b"
+    assert blob_store.blobs["/devstoreaccount1/inbnd/landing/keep.csv"] == b"keep"
+    assert blob_store.blobs["/devstoreaccount1/inbnd/landing/sub/a.csv"] == b"sub"
+    assert blob_store.blob_md5s["/devstoreaccount1/inbnd/landing/a.csv"] == (
+        compute_file_md5(tmp_path / "a.csv")
+    )
+    assert [file_info.content_md5 for file_info in task.build_transferred_file_infos()] == [
+        compute_file_md5(tmp_path / "a.csv"),
+        compute_file_md5(tmp_path / "b.csv"),
+    ]
+
+    blob_store.requests = []
+    build_task().execute()
+    assert blob_store.requests == []
+
+
+def test_blob_rest_batch_cleanup(blob_service, tmp_path, blob_store):
+    """Test the batch cleanup deletes the replaced blobs and the stale parts of a
+    previous run, and keeps other blobs."""
+    (tmp_path / "table_0.csv").write_bytes(b"new")
+    for name in ["table_0.csv", "table_1.csv", "table_2.csv", "keep.csv", "sub/table_1.csv"]:
+        blob_store.blobs[f"/devstoreaccount1/inbnd/landing/{name}"] = b"old"
+    param = {
+        "target": {
+            "type": "ADLSLocation",
+            "account_name": "devstoreaccount1",
+            "container_name": "inbnd",
+            "sas_token": SAS_TOKEN,
+            "filepath": "landing/",
+            "blob_endpoint": blob_service,
+        },
+        "batch_cleanup_flag": "True",
+        "cleanup_part_file_name": "table_{{ part_number }}",
+    }
+    task = BlobRestDataTransferTask(
+        module_config=mock_model(
+            module_name=BlobRestDataTransferTask,
+            parameters=BlobRestDataTransferTaskConfigModel(**param),
+        ),
+        job_parameters=JOB_PARAMS,
+        file_infos=[generate_data_file_info(str(tmp_path / "table_0.csv"))],
+    )
+
+    task.execute()
+
+    assert sorted(blob_store.blobs) == [
+        "/devstoreaccount1/inbnd/landing/keep.csv",
+        "/devstoreaccount1/inbnd/landing/sub/table_1.csv",
+        "/devstoreaccount1/inbnd/landing/table_0.csv",
+    ]
+    assert blob_store.blobs["/devstoreaccount1/inbnd/landing/table_0.csv"] == b"new"
+    assert len(task.cleanup_plan.blob_names) == 3
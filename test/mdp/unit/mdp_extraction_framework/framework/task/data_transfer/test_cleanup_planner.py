@@ -0,0 +1,77 @@
+"""Test cleanup_planner."""
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import BlobProperties
+from mdp.framework.mdp_extraction_framework.task.data_transfer.cleanup_planner import (
+    build_part_file_pattern,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.cleanup_planner import plan_cleanup
+from mdp.framework.mdp_extraction_framework.task.data_transfer.cleanup_planner import (
+    select_blobs_to_delete,
+)
+
+BLOB_NAMES = [
+    "landing/keep.csv",
+    "landing/table_0.csv",
+    "landing/table_1.csv",
+    "landing/table_1.ctl",
+    "landing/table_7.csv",
+    "landing/sub/table_0.csv",
+]
+
+
+class MockBlobClient:
+    """Blob client listing BLOB_NAMES."""
+
+    def __init__(self) -> None:
+        """Initialize the mock client."""
+        self.list_calls = []
+
+    def list_blob_properties(self, container_path: str, prefix: str = "", delimiter: str = ""):
+        """List BLOB_NAMES under the prefix, sub-directories only without delimiter."""
+        self.list_calls.append((container_path, prefix, delimiter))
+        return [
+            BlobProperties(name, 0)
+            for name in BLOB_NAMES
+            if name.startswith(prefix) and not (delimiter and "/" in name[len(prefix) :])
+        ]
+
+
+def test_build_part_file_pattern():
+    """Test the part number variable of a file name becomes a wildcard."""
+    assert build_part_file_pattern("/data/table_{{ part_number }}") == "table_*.*"
+    assert build_part_file_pattern("table_{{part_number}}_{{ pos_dt }}") == (
+        "table_*_{{ pos_dt }}.*"
+    )
+
+
+def test_select_blobs_to_delete():
+    """Test blobs are selected by base name, sub-directories only when recursive."""
+    assert select_blobs_to_delete(BLOB_NAMES, "landing/", ["table_0.csv", "table_1.csv"]) == [
+        "landing/table_0.csv",
+        "landing/table_1.csv",
+    ]
+    assert select_blobs_to_delete(BLOB_NAMES, "landing/", ["table_0.csv"], recursive=True) == [
+        "landing/table_0.csv",
+        "landing/sub/table_0.csv",
+    ]
+
+
+def test_plan_cleanup_stale_parts():
+    """Test the target is listed once and parts of a previous run are planned too."""
+    client = MockBlobClient()
+
+    plan = plan_cleanup(
+        client,
+        "/inbnd",
+        "landing/",
+        ["table_0.csv", "table_1.csv", build_part_file_pattern("table_{{ part_number }}")],
+    )
+
+    assert client.list_calls == [("/inbnd", "landing/", "/")]
+    assert plan.listed_blob_count == 5
+    assert plan.relative_blob_names == [
+        "table_0.csv",
+        "table_1.csv",
+        "table_1.ctl",
+        "table_7.csv",
+    ]
@@ -0,0 +1,70 @@
+"""Test file_archiver."""
+# import: standard
+import gzip
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.data_transfer.file_archiver import FileArchiver
+from mdp.framework.mdp_extraction_framework.task.data_transfer.file_archiver import archive_file
+
+# import: external
+import pytest
+
+
+@pytest.mark.parametrize(
+    "compression, archive_name", [("none", "a.csv"), ("gzip", "a.csv.gz")], ids=["move", "gzip"]
+)
+def test_archive_file(tmp_path, compression, archive_name):
+    """Test a file is moved or compressed into the archive and removed from the source."""
+    (tmp_path / "archive").mkdir()
+    (tmp_path / "a.csv").write_bytes(b"a,b\n1,2\n")
+
+    archived_file = archive_file(tmp_path / "a.csv", tmp_path / "archive", compression)
+
+    assert archived_file == tmp_path / "archive" / archive_name
+    content = archived_file.read_bytes()
+    assert (gzip.decompress(content) if compression == "gzip" else content) == b"a,b\n1,2\n"
+    assert not (tmp_path / "a.csv").exists()
+    assert list((tmp_path / "archive").iterdir()) == [archived_file]
+
+
+def test_file_archiver_archive_and_sweep(tmp_path):
+    """Test files are archived in parallel into a dated directory and the oldest dated
+    directories are evicted beyond the budget."""
+    archive_path = tmp_path / "archive"
+    for directory_name in ["2023-10-29", "2023-10-30"]:
+        (archive_path / directory_name).mkdir(parents=True)
+        (archive_path / directory_name / "old.csv").write_bytes(b"x" * 800 * 1024)
+    source_files = []
+    for index in range(5):
+        source_file = tmp_path / f"part_{index}.csv"
+        source_file.write_bytes(b"y" * 100 * 1024)
+        source_files.append(source_file)
+    archiver = FileArchiver(archive_path, max_workers=3, retention_budget_mb=2)
+
+    archived_files = archiver.archive(source_files, "2023-10-31")
+    evicted_directories = archiver.sweep(keep_directory_name="2023-10-31")
+
+    assert archived_files == [archive_path / "2023-10-31" / f"part_{i}.csv" for i in range(5)]
+    assert evicted_directories == [archive_path / "2023-10-29"]
+    assert sorted(path.name for path in archive_path.iterdir()) == ["2023-10-30", "2023-10-31"]
+
+
+def test_file_archiver_duplicate_names(tmp_path):
+    """Test files sharing a name are rejected without archiving or removing any."""
+    for directory_name in ["a", "b"]:
+        (tmp_path / directory_name).mkdir()
+        (tmp_path / directory_name / "data.csv").write_bytes(directory_name.encode())
+    archiver = FileArchiver(tmp_path / "archive")
+
+    with pytest.raises(ValueError, match="data.csv"):
+        archiver.archive([tmp_path / "a" / "data.csv", tmp_path / "b" / "data.csv"], "2023-10-31")
+
+    assert (tmp_path / "a" / "data.csv").read_bytes() == b"a"
+    assert (tmp_path / "b" / "data.csv").read_bytes() == b"b"
+    assert not (tmp_path / "archive").exists()
+
+
+def test_file_archiver_unsupported_compression(tmp_path):
+    """Test an unsupported compression is rejected."""
+    with pytest.raises(ValueError):
+        FileArchiver(tmp_path, compression="rar")
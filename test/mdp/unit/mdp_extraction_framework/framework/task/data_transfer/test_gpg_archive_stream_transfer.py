@@ -0,0 +1,97 @@
+"""Test gpg_archive_stream_transfer."""
+# import: standard
+import shutil
+import zipfile
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.config_validator.job_parameters import JobParameters
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    generate_data_file_info,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.gpg_archive_stream_transfer import (
+    GpgArchiveStreamTransferTask,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.gpg_archive_stream_transfer import (
+    GpgArchiveStreamTransferTaskConfigModel,
+)
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.gpg_stream_decryptor import (
+    GpgStreamDecryptor,
+)
+
+# import: external
+import pytest
+from pydantic import BaseModel
+
+JOB_PARAMS = JobParameters(
+    pos_dt="2023-10-31",
+    config_file_path="",
+)
+SAS_TOKEN = "sv=2021&sig=test"
+GPG_KEY_FILE = (
+    "test/mdp/unit/mdp_extraction_framework/resources/task/file_decryptor/private_key.asc"
+)
+GPG_PASSPHRASE = "ABCDTEST"
+GPG_KEY_USER_ID = "framework@accenture.com"
+
+
+class mock_model(BaseModel, extra="allow"):
+    """A mock pydantic model."""
+
+    pass
+
+
+@pytest.mark.skipif(shutil.which("gpg") is None, reason="gpg is not installed")
+def test_gpg_archive_stream_transfer_task(blob_service, tmp_path, monkeypatch, blob_store):
+    """Test the members of an encrypted zip are decrypted, decompressed and uploaded as
+    streams, reported where the decrypt and extract tasks would have written them."""
+    large_data = bytes(range(256)) * 10000
+    with zipfile.ZipFile(tmp_path / "data.zip", "w", zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr("a.csv", large_data)
+        zip_file.writestr("sub/b.csv", b"b")
+    with GpgStreamDecryptor(GPG_KEY_FILE, GPG_PASSPHRASE) as decryptor:
+        decryptor.run_gpg(
+            "--trust-model",
+            "always",
+            "--recipient",
+            GPG_KEY_USER_ID,
+            "--output",
+            str(tmp_path / "data.zip.gpg"),
+            "--encrypt",
+            str(tmp_path / "data.zip"),
+        )
+    (tmp_path / "data.zip").unlink()
+    monkeypatch.setenv("LOCAL_STORAGE__FILEPATH", str(tmp_path))
+    monkeypatch.setenv("GPG_PRIVATE_KEY__KS__PASSPHRASE", GPG_PASSPHRASE)
+    monkeypatch.setenv("GPG_PRIVATE_KEY__KS__KEY_FILE_PATH", GPG_KEY_FILE)
+    param = {
+        "target": {
+            "type": "ADLSLocation",
+            "account_name": "devstoreaccount1",
+            "container_name": "inbnd",
+            "sas_token": SAS_TOKEN,
+            "filepath": "landing/",
+            "blob_endpoint": blob_service,
+        },
+        "source_system_name": "KS",
+        "read_ahead_buffer_mb": 1,
+    }
+    task = GpgArchiveStreamTransferTask(
+        module_config=mock_model(
+            module_name=GpgArchiveStreamTransferTask,
+            parameters=GpgArchiveStreamTransferTaskConfigModel(**param),
+        ),
+        job_parameters=JOB_PARAMS,
+        file_infos=[generate_data_file_info(str(tmp_path / "data.zip.gpg"))],
+    )
+
+    assert task.execute() == f"{blob_service}/inbnd/landing/"
+    assert blob_store.blobs["/devstoreaccount1/inbnd/landing/a.csv"] == large_data
+    assert blob_store.blobs["/devstoreaccount1/inbnd/landing/sub/b.csv"] == b"b"
+    assert [
+        (file_info.file_location, file_info.file_size)
+        for file_info in task.build_transferred_file_infos()
+    ] == [
+        (str(tmp_path / "_tmp_data_decrypted" / "a.csv"), len(large_data)),
+        (str(tmp_path / "_tmp_data_decrypted" / "sub/b.csv"), 1),
+    ]
+    assert [path.name for path in tmp_path.iterdir()] == ["data.zip.gpg"]
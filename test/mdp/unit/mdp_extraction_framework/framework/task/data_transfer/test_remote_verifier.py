@@ -0,0 +1,190 @@
+"""Test remote_verifier and remote_verification."""
+# import: standard
+import base64
+import hashlib
+from pathlib import Path
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.config_validator.job_parameters import JobParameters
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    generate_data_file_info,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer import remote_verification
+from mdp.framework.mdp_extraction_framework.task.data_transfer import remote_verifier
+from mdp.framework.mdp_extraction_framework.task.data_transfer.blob_uploader import BlobProperties
+from mdp.framework.mdp_extraction_framework.task.data_transfer.remote_verification import (
+    RemoteVerificationTask,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.remote_verification import (
+    RemoteVerificationTaskConfigModel,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.remote_verifier import ExpectedBlob
+from mdp.framework.mdp_extraction_framework.task.data_transfer.remote_verifier import RemoteVerifier
+from mdp.framework.mdp_extraction_framework.task.data_transfer.remote_verifier import (
+    build_expected_blob,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import UploadManifest
+
+# import: external
+import pytest
+from pydantic import BaseModel
+
+JOB_PARAMS = JobParameters(
+    pos_dt="2023-10-31",
+    config_file_path="",
+)
+
+
+class mock_model(BaseModel, extra="allow"):
+    """A mock pydantic model."""
+
+    pass
+
+
+def get_md5(data: bytes) -> str:
+    """Get the base64 encoded MD5 of bytes."""
+    return base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+
+
+class MockBlobClient:
+    """Blob client listing a fixed set of blobs."""
+
+    blobs: list = []
+    list_calls: list = []
+
+    @classmethod
+    def from_url(cls, url: str) -> "MockBlobClient":
+        """Create the mock client."""
+        return cls()
+
+    def list_blob_properties(self, container_path: str, prefix: str = "", delimiter: str = ""):
+        """List the blobs under the prefix."""
+        self.list_calls.append((container_path, prefix, delimiter))
+        return [blob for blob in self.blobs if blob.name.startswith(prefix)]
+
+    def close(self) -> None:
+        """Close the mock client."""
+
+
+def test_verify_directory():
+    """Test each blob is classified as verified, missing, or mismatching."""
+    MockBlobClient.blobs = [
+        BlobProperties("dir/a.csv", 3, get_md5(b"abc")),
+        BlobProperties("dir/b.csv", 2, get_md5(b"bb")),
+        BlobProperties("dir/c.csv", 1, get_md5(b"x")),
+        BlobProperties("dir/d.csv", 1, None),
+    ]
+    expected_blobs = [
+        ExpectedBlob("a.csv", 3, get_md5(b"abc")),
+        ExpectedBlob("b.csv", 3, get_md5(b"bbb")),
+        ExpectedBlob("c.csv", 1, get_md5(b"c")),
+        ExpectedBlob("d.csv", 1, get_md5(b"d")),
+        ExpectedBlob("e.csv", 1, get_md5(b"e")),
+    ]
+
+    result = RemoteVerifier(MockBlobClient()).verify_directory("/container", "dir/", expected_blobs)
+
+    assert result.verified == ["a.csv", "d.csv"]
+    assert result.missing == ["e.csv"]
+    assert result.size_mismatches == ["b.csv: expected 3 bytes, found 2"]
+    assert [mismatch.split(":")[0] for mismatch in result.md5_mismatches] == ["c.csv"]
+    assert result.md5_unavailable == ["d.csv"]
+    assert result.listed_blob_count == 4
+    assert not result.passed
+
+    strict_result = RemoteVerifier(MockBlobClient(), require_md5=True).verify_directory(
+        "/container", "dir/", expected_blobs[3:4]
+    )
+    assert strict_result.md5_mismatches == ["d.csv: no Content-MD5 on the blob"]
+
+
+def test_build_expected_blob_from_manifest(tmp_path):
+    """Test a removed file is verified against its upload manifest entry, or else its file
+    information."""
+    file_path = tmp_path / "a.csv"
+    file_path.write_bytes(b"abc")
+    file_info = generate_data_file_info(str(file_path))
+    manifest = UploadManifest(tmp_path / "_upload_manifest.json")
+    manifest.record(file_path, get_md5(b"abc"), "https://account/container/dir")
+
+    expected_blob = build_expected_blob(file_info)
+    assert expected_blob == ExpectedBlob("a.csv", 3, None, str(file_path))
+    assert expected_blob.get_content_md5() == get_md5(b"abc")
+    assert build_expected_blob(file_info, manifest).content_md5 == get_md5(b"abc")
+    file_path.unlink()
+    assert build_expected_blob(file_info, manifest) == ExpectedBlob("a.csv", 3, get_md5(b"abc"))
+    assert build_expected_blob(file_info) == ExpectedBlob("a.csv", 3)
+    assert build_expected_blob(
+        file_info.model_copy(update={"content_md5": get_md5(b"abc")})
+    ) == ExpectedBlob("a.csv", 3, get_md5(b"abc"))
+
+
+def test_verify_directory_hash_on_demand(tmp_path, monkeypatch):
+    """Test a local file is only hashed when its blob has a Content-MD5."""
+    hashed_files = []
+
+    def mock_compute_file_md5(file_path):
+        hashed_files.append(file_path)
+        return get_md5(Path(file_path).read_bytes())
+
+    monkeypatch.setattr(remote_verifier, "compute_file_md5", mock_compute_file_md5)
+    for file_name in ["a.csv", "b.csv"]:
+        (tmp_path / file_name).write_bytes(b"abc")
+    MockBlobClient.blobs = [
+        BlobProperties("dir/a.csv", 3, None),
+        BlobProperties("dir/b.csv", 3, get_md5(b"abc")),
+    ]
+    expected_blobs = [
+        build_expected_blob(generate_data_file_info(str(tmp_path / file_name)))
+        for file_name in ["a.csv", "b.csv"]
+    ]
+
+    result = RemoteVerifier(MockBlobClient()).verify_directory("/container", "dir/", expected_blobs)
+
+    assert result.verified == ["a.csv", "b.csv"]
+    assert result.md5_unavailable == ["a.csv"]
+    assert hashed_files == [str(tmp_path / "b.csv")]
+
+
+def test_remote_verification_task(tmp_path, monkeypatch):
+    """Test the task lists only the target directory and fails on a mismatching blob."""
+    monkeypatch.setattr(remote_verification, "BlobRestClient", MockBlobClient)
+    MockBlobClient.list_calls = []
+    (tmp_path / "a.csv").write_bytes(b"abc")
+    (tmp_path / "b.csv").write_bytes(b"bb")
+    MockBlobClient.blobs = [
+        BlobProperties("landing/a.csv", 3, get_md5(b"abc")),
+        BlobProperties("landing/b.csv", 2, get_md5(b"bb")),
+    ]
+    param = {
+        "target": {
+            "type": "ADLSLocation",
+            "account_name": "account",
+            "container_name": "inbnd",
+            "sas_token": "sv=2021&sig=test",
+            "filepath": "landing/",
+        },
+    }
+    task = RemoteVerificationTask(
+        module_config=mock_model(
+            module_name=RemoteVerificationTask,
+            parameters=RemoteVerificationTaskConfigModel(**param),
+        ),
+        job_parameters=JOB_PARAMS,
+        file_infos=[
+            generate_data_file_info(str(tmp_path / "a.csv")),
+            generate_data_file_info(str(tmp_path / "b.csv")),
+        ],
+    )
+
+    assert task.execute().verified == ["a.csv", "b.csv"]
+    assert MockBlobClient.list_calls == [("/inbnd", "landing/", "/")]
+
+    (tmp_path / "b.csv").write_bytes(b"b")
+    with pytest.raises(ValueError, match="b.csv: expected 1 bytes, found 2"):
+        task.execute()
+
+    # Removed without an upload manifest, the size of the file information is compared
+    (tmp_path / "a.csv").unlink()
+    (tmp_path / "b.csv").unlink()
+    assert task.execute().verified == ["a.csv", "b.csv"]
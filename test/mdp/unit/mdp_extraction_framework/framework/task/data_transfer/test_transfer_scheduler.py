@@ -0,0 +1,116 @@
+"""Test transfer_scheduler."""
+# import: standard
+import json
+import threading
+import time
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_scheduler import (
+    BandwidthLedger,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_scheduler import (
+    TransferScheduler,
+)
+
+# import: external
+import pytest
+
+
+@pytest.fixture
+def ledger_path(tmp_path):
+    """Path of a temporary bandwidth ledger."""
+    return tmp_path / "ledger.json"
+
+
+def test_bandwidth_ledger_fair_share(ledger_path):
+    """Test leases split the budget and are shared between ledger instances."""
+    ledger = BandwidthLedger(ledger_path=ledger_path, total_mbps=300, min_lease_mbps=50)
+    other_process_ledger = BandwidthLedger(ledger_path=ledger_path, total_mbps=300)
+
+    first_lease = ledger.try_acquire(max_mbps=100)
+    second_lease = other_process_ledger.try_acquire()
+    third_lease = ledger.try_acquire()
+
+    assert (first_lease.mbps, second_lease.mbps, third_lease.mbps) == (100, 150, 50)
+    assert ledger.try_acquire() is None
+
+    ledger.release(first_lease)
+    assert ledger.try_acquire().mbps == 100
+
+
+def test_bandwidth_ledger_split_budget(ledger_path):
+    """Test later uploads get the budget left free, divided by the active uploads."""
+    ledger = BandwidthLedger(ledger_path=ledger_path, total_mbps=300, min_lease_mbps=50)
+    ledger_path.write_text(json.dumps({"running": {"pid": 1, "mbps": 100, "acquired_at": 0}}))
+
+    lease = ledger.try_acquire()
+
+    assert lease.mbps == 150
+    assert set(json.loads(ledger_path.read_text())) == {"running", lease.lease_id}
+
+
+def test_bandwidth_ledger_drop_stale_leases(ledger_path, monkeypatch):
+    """Test leases of processes that are no longer running are dropped."""
+    ledger = BandwidthLedger(ledger_path=ledger_path, total_mbps=300)
+    ledger_path.write_text(
+        json.dumps({"stale": {"pid": 2**22 + 1, "mbps": 300, "acquired_at": 0}})
+    )
+
+    lease = ledger.try_acquire()
+
+    assert lease.mbps == 300
+    assert list(json.loads(ledger_path.read_text())) == [lease.lease_id]
+
+
+def test_bandwidth_ledger_acquire_timeout(ledger_path):
+    """Test acquiring raises once the timeout is reached without a free share."""
+    ledger = BandwidthLedger(ledger_path=ledger_path, total_mbps=100, min_lease_mbps=100)
+    ledger.acquire()
+
+    with pytest.raises(TimeoutError):
+        ledger.acquire(timeout=0.05, poll_interval=0.01)
+
+
+def test_transfer_scheduler_run(tmp_path, ledger_path):
+    """Test files are started largest first, run concurrently, and failures are captured
+    with the throughput of each file."""
+    file_paths = []
+    for file_name, size in [("small.csv", 10), ("large.csv", 1000), ("medium.csv", 100)]:
+        (tmp_path / file_name).write_bytes(b"x" * size)
+        file_paths.append(str(tmp_path / file_name))
+
+    started = []
+    active = []
+    max_active = []
+    lock = threading.Lock()
+
+    def mock_transfer(file_path, cap_mbps):
+        with lock:
+            started.append(file_path.split("/")[-1])
+            active.append(file_path)
+            max_active.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(file_path)
+        if file_path.endswith("medium.csv"):
+            raise ValueError("mock error")
+        return cap_mbps
+
+    ledger = BandwidthLedger(ledger_path=ledger_path, total_mbps=300, min_lease_mbps=50)
+    results = TransferScheduler(mock_transfer, max_concurrency=2, ledger=ledger).run(file_paths)
+
+    # The two largest files are submitted first, either may take its lease first
+    assert sorted(started[:2]) == ["large.csv", "medium.csv"]
+    assert started[2] == "small.csv"
+    assert max(max_active) == 2
+    assert [result.file_path.split("/")[-1] for result in results] == [
+        "large.csv",
+        "medium.csv",
+        "small.csv",
+    ]
+    assert [result.status for result in results] == ["SUCCESS", "FAILED", "SUCCESS"]
+    assert isinstance(results[1].error, ValueError)
+    assert results[0].output == results[0].cap_mbps
+    assert sum(result.cap_mbps for result in results[:2]) <= 300
+    assert all(result.mb_per_sec is not None for result in results)
+    assert json.loads(ledger_path.read_text()) == {}
@@ -0,0 +1,120 @@
+"""Test transfer_tuning."""
+# import: standard
+import json
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import BYTES_PER_MB
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import (
+    TransferHistoryStore,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import (
+    TransferObservation,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import (
+    TransferSettings,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import (
+    build_transfer_observation,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import get_size_class
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import (
+    get_transfer_target_key,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import (
+    recommend_concurrency,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.transfer_tuning import (
+    recommend_transfer_settings,
+)
+
+# import: external
+import pytest
+
+GB = 1024 * BYTES_PER_MB
+
+
+def mock_observation(concurrency: int, mb_per_sec: float, cap_mbps: int = 1000):
+    """Build a mock observation of a large transfer."""
+    return TransferObservation(
+        size_class="large",
+        bytes_transferred=20 * GB,
+        elapsed_sec=100.0,
+        mb_per_sec=mb_per_sec,
+        concurrency=concurrency,
+        block_size_mb=16,
+        cap_mbps=cap_mbps,
+    )
+
+
+@pytest.mark.parametrize(
+    "file_size, expected_size_class",
+    [(1024, "small"), (100 * BYTES_PER_MB, "medium"), (20 * GB, "large")],
+)
+def test_get_size_class(file_size, expected_size_class):
+    """Test transfers are classified by size."""
+    assert get_size_class(file_size) == expected_size_class
+
+
+def test_get_transfer_target_key():
+    """Test the history key of ADLS and local targets."""
+    assert get_transfer_target_key({"account_name": "st001", "container_name": "inbnd"}) == (
+        "st001/inbnd"
+    )
+    assert get_transfer_target_key({"type": "LocalLocation", "filepath": "/data"}) == "/data"
+
+
+@pytest.mark.parametrize(
+    "observations, expected_concurrency",
+    [
+        ([], 32),
+        ([mock_observation(32, 50)], 64),
+        ([mock_observation(32, 50), mock_observation(64, 80)], 128),
+        ([mock_observation(32, 50), mock_observation(64, 40)], 32),
+        ([mock_observation(32, 50), mock_observation(64, 51)], 32),
+        ([mock_observation(32, 50), mock_observation(64, 124, cap_mbps=1000)], 64),
+    ],
+    ids=["no_history", "explore", "keep_improving", "worse", "noise", "cap_bound"],
+)
+def test_recommend_concurrency(observations, expected_concurrency):
+    """Test the concurrency is hill climbed from the throughput history."""
+    assert recommend_concurrency(observations, default_concurrency=32) == expected_concurrency
+
+
+def test_recommend_transfer_settings():
+    """Test the settings follow the size class, the history and the overrides."""
+    small_settings = recommend_transfer_settings(1024, [], cap_mbps=150)
+    assert small_settings == TransferSettings(cap_mbps=150, concurrency=4, block_size_mb=None)
+    assert small_settings.to_azcopy_options() == "--cap-mbps=150"
+    assert small_settings.to_env() == {"AZCOPY_CONCURRENCY_VALUE": "4"}
+
+    large_settings = recommend_transfer_settings(
+        1000 * GB, [mock_observation(32, 50)], cap_mbps=150
+    )
+    assert large_settings == TransferSettings(cap_mbps=150, concurrency=64, block_size_mb=21)
+    assert large_settings.to_azcopy_options() == "--cap-mbps=150 --block-size-mb=21"
+
+    override_settings = recommend_transfer_settings(
+        20 * GB, [], cap_mbps=150, concurrency=8, block_size_mb=100
+    )
+    assert override_settings == TransferSettings(cap_mbps=150, concurrency=8, block_size_mb=100)
+
+
+def test_transfer_history_store(tmp_path):
+    """Test observations are stored per target and only the latest ones are kept."""
+    store = TransferHistoryStore(history_path=tmp_path / "history.json", max_observations=2)
+    settings = TransferSettings(cap_mbps=150, concurrency=4)
+    for elapsed_sec in [1.0, 2.0, 4.0]:
+        store.add(
+            "st001/inbnd", build_transfer_observation(BYTES_PER_MB, None, elapsed_sec, settings)
+        )
+    store.add("st002/inbnd", build_transfer_observation(100 * BYTES_PER_MB, None, 1.0, settings))
+
+    observations = store.get("st001/inbnd")
+    assert [observation.mb_per_sec for observation in observations] == [0.5, 0.25]
+    assert observations[0].size_class == "small"
+    assert store.get("st002/inbnd", size_class="small") == []
+    assert set(json.loads((tmp_path / "history.json").read_text())) == {
+        "st001/inbnd",
+        "st002/inbnd",
+    }
+    assert TransferHistoryStore(history_path=tmp_path / "missing.json").get("st001/inbnd") == []
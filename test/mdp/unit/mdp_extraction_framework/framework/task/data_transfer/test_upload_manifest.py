@@ -0,0 +1,100 @@
+"""Test upload_manifest."""
+# import: standard
+import base64
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.data_transfer import upload_manifest
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import UploadManifest
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import build_blob_url
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import (
+    compute_file_md5,
+)
+from mdp.framework.mdp_extraction_framework.task.data_transfer.upload_manifest import (
+    get_remote_content_md5,
+)
+
+# import: external
+import pytest
+
+MOCK_CONTENT_MD5 = "1B2M2Y8AsgTpgAmY7PhCfg=="
+
+
+class MockBlobHandler(BaseHTTPRequestHandler):
+    """Mock Blob endpoint answering HEAD requests."""
+
+    def do_HEAD(self):
+        """Answer with a Content-MD5 header, 404 or 403 depending on the path."""
+        if self.path.startswith("/container/existing.csv"):
+            self.send_response(200)
+            self.send_header("Content-MD5", MOCK_CONTENT_MD5)
+        elif self.path.startswith("/container/forbidden.csv"):
+            self.send_response(403)
+        else:
+            self.send_response(404)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        """Silence the access log."""
+
+
+@pytest.fixture
+def blob_endpoint():
+    """Serve the mock Blob endpoint on a free local port."""
+    server = HTTPServer(("127.0.0.1", 0), MockBlobHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/container"
+    server.shutdown()
+    server.server_close()
+
+
+def test_compute_file_md5(tmp_path):
+    """Test the streamed MD5 matches the Content-MD5 format of the whole file."""
+    content = b"x" * 1000 + b"y" * 10
+    (tmp_path / "file.csv").write_bytes(content)
+
+    expected_md5 = base64.b64encode(hashlib.md5(content).digest()).decode("ascii")
+    assert compute_file_md5(tmp_path / "file.csv", chunk_size=64) == expected_md5
+
+
+def test_get_remote_content_md5(blob_endpoint):
+    """Test the Content-MD5 of a blob is read, None for a missing blob."""
+    assert get_remote_content_md5(build_blob_url(blob_endpoint, "existing.csv", "sig=token")) == (
+        MOCK_CONTENT_MD5
+    )
+    assert get_remote_content_md5(build_blob_url(blob_endpoint, "missing.csv")) is None
+    with pytest.raises(Exception):
+        get_remote_content_md5(build_blob_url(blob_endpoint, "forbidden.csv"))
+
+
+def test_build_blob_url():
+    """Test the blob URL of a file in a target directory."""
+    assert build_blob_url("https://st.blob.core.windows.net/c/dir/", "a.csv", "sig=1") == (
+        "https://st.blob.core.windows.net/c/dir/a.csv?sig=1"
+    )
+
+
+def test_upload_manifest(tmp_path, monkeypatch):
+    """Test recorded files are saved and their MD5 reused until they change."""
+    (tmp_path / "file.csv").write_bytes(b"data")
+    manifest_path = tmp_path / "manifest" / "_upload_manifest.json"
+    manifest = UploadManifest(manifest_path)
+    md5 = manifest.get_md5(tmp_path / "file.csv")
+    manifest.record(tmp_path / "file.csv", md5, "https://st/c/dir")
+
+    hashed_files = []
+    monkeypatch.setattr(
+        upload_manifest, "compute_file_md5", lambda file_path: hashed_files.append(file_path)
+    )
+    reloaded_manifest = UploadManifest(manifest_path)
+    assert reloaded_manifest.get_md5(tmp_path / "file.csv") == md5
+    assert hashed_files == []
+    assert reloaded_manifest.entries[str(tmp_path / "file.csv")]["target"] == "https://st/c/dir"
+
+    (tmp_path / "file.csv").write_bytes(b"changed data")
+    reloaded_manifest.get_md5(tmp_path / "file.csv")
+    assert hashed_files == [tmp_path / "file.csv"]
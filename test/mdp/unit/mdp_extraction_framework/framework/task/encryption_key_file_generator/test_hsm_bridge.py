@@ -0,0 +1,92 @@
+"""Test hsm_bridge."""
+# import: standard
+import sys
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_bridge import (
+    HSMBridge,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_bridge import (
+    HSMBridgeError,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_bridge import (
+    HSMKeyError,
+)
+
+# import: external
+import pytest
+
+# Speaks the `HSMService --serve` protocol, the clear key being the encrypted key
+# reversed. Its first run crashes or hangs on the third request when asked to
+FAKE_HSM_SERVICE = """
+import os
+import sys
+import time
+
+failure, marker_path = sys.argv[1], sys.argv[2]
+print("READY", flush=True)
+for count, line in enumerate(sys.stdin):
+    request_id, key = line.rstrip("\\n").split("\\t")
+    if count == 2 and failure != "none" and not os.path.exists(marker_path):
+        open(marker_path, "w").close()
+        if failure == "crash":
+            sys.exit(1)
+        time.sleep(60)
+    status, value = ("ERR", "Invalid reply from HSM server") if key == "BAD" else ("OK", key[::-1])
+    print(f"{request_id}\\t{status}\\t{value}\\t1500", flush=True)
+"""
+
+ENCRYPTED_KEYS = [f"KEY{index:03d}" for index in range(10)]
+
+
+def fake_hsm_command(tmp_path, failure="none"):
+    """Build the command running the fake HSM service."""
+    return [sys.executable, "-c", FAKE_HSM_SERVICE, failure, str(tmp_path / "failed")]
+
+
+def test_hsm_bridge_resolve(tmp_path):
+    """Test keys are decrypted by one process, with requests written ahead of replies."""
+    with HSMBridge(fake_hsm_command(tmp_path), max_in_flight=4) as bridge:
+        results = bridge.resolve(ENCRYPTED_KEYS + ENCRYPTED_KEYS[:2])
+
+    assert {key: result.clear_key for key, result in results.items()} == {
+        key: key[::-1] for key in ENCRYPTED_KEYS
+    }
+    assert all(result.hsm_latency_ms == 1.5 for result in results.values())
+    assert all(result.latency_ms >= 0 for result in results.values())
+    assert bridge.restarts == 0
+
+
+@pytest.mark.parametrize("failure", ["crash", "hang"])
+def test_hsm_bridge_restart(tmp_path, failure):
+    """Test the process is restarted when it exits or does not reply, and the requests in
+    flight are resent."""
+    with HSMBridge(
+        fake_hsm_command(tmp_path, failure), request_timeout_sec=1, max_in_flight=4
+    ) as bridge:
+        results = bridge.resolve(ENCRYPTED_KEYS)
+
+    assert {key: result.clear_key for key, result in results.items()} == {
+        key: key[::-1] for key in ENCRYPTED_KEYS
+    }
+    assert bridge.restarts == 1
+
+
+def test_hsm_bridge_max_restarts(tmp_path):
+    """Test the bridge fails once out of restarts, keeping the keys decrypted so far."""
+    with HSMBridge(fake_hsm_command(tmp_path, "crash"), max_restarts=0, max_in_flight=1) as bridge:
+        with pytest.raises(HSMBridgeError, match="after 0 restarts"):
+            bridge.resolve(ENCRYPTED_KEYS)
+
+    assert list(bridge.results) == ENCRYPTED_KEYS[:2]
+
+
+def test_hsm_bridge_errors(tmp_path):
+    """Test a key HSM fails to decrypt raises, and a command failing to start raises."""
+    with HSMBridge(fake_hsm_command(tmp_path)) as bridge:
+        with pytest.raises(HSMKeyError, match="Invalid reply"):
+            bridge.resolve(["KEY000", "BAD"])
+
+    with pytest.raises(HSMBridgeError, match="Failed to start"):
+        with HSMBridge([str(tmp_path / "missing_java")]):
+            pass
@@ -4,6 +4,8 @@
 import csv
 import logging
 import os
+import sys
+import threading
 from datetime import datetime
 
 # import: internal
@@ -413,3 +415,76 @@ def test_build_df_from_txt_file():
         reader_options=MODULE_CONFIG.parameters.reader_options,
     )
     assert df.equals(expected_df), "Expected DataFrame does not match with actual."
+
+
+def test_get_keys_by_hsm_fallback(hsm_encryption_key_file_generator, monkeypatch):
+    """Test the keys the persistent HSM bridge did not decrypt fall back to one-shot mode.
+
+    Args:
+        hsm_encryption_key_file_generator (fixture): hsm encrypted key file generator instance
+        monkeypatch (fixture): pytest monkeypatch
+    """
+    # Replies with the key reversed, then exits on the third key
+    fake_hsm_service = (
+        "import sys\n"
+        "print('READY', flush=True)\n"
+        "for count, line in enumerate(sys.stdin):\n"
+        "    request_id, key = line.rstrip().split('\\t')\n"
+        "    if count == 2:\n"
+        "        sys.exit(1)\n"
+        "    print(f'{request_id}\\tOK\\t{key[::-1]}\\t10', flush=True)\n"
+    )
+    monkeypatch.setattr(
+        "mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator."
+        "hsm_encryption_key_file_generator.build_bridge_command",
+        lambda settings: [sys.executable, "-c", fake_hsm_service],
+    )
+    task = hsm_encryption_key_file_generator
+    task.module_config.hsm_bridge_max_restarts = 0
+    task.module_config.hsm_max_in_flight = 1
+    monkeypatch.setattr(task, "get_key_by_hsm", lambda encrypted_key: f"one_shot_{encrypted_key}")
+
+    clear_keys = task.get_keys_by_hsm(["AB", "CD", "EF", "GH"])
+
+    assert clear_keys == {"AB": "BA", "CD": "DC", "EF": "one_shot_EF", "GH": "one_shot_GH"}
+
+
+def test_get_keys_by_hsm_sessions_and_cache(
+    hsm_encryption_key_file_generator, monkeypatch, tmp_path
+):
+    """Test duplicate keys are decrypted once over concurrent sessions, and a re-run gets
+    them from the HSM key cache.
+
+    Args:
+        hsm_encryption_key_file_generator (fixture): hsm encrypted key file generator instance
+        monkeypatch (fixture): pytest monkeypatch
+        tmp_path (fixture): temporary directory
+    """
+    task = hsm_encryption_key_file_generator
+    task.module_config.hsm_bridge_mode = "one_shot"
+    task.module_config.hsm_max_sessions = 3
+    task.module_config.hsm_key_cache_path = str(tmp_path / "hsm_keys.json")
+    monkeypatch.setenv("HSM_KEY_CACHE_SECRET", "cache-secret")
+    monkeypatch.setenv("HSM_DPK", "DPK1")
+    requested_keys = []
+    threads = set()
+
+    def mock_get_key_by_hsm(encrypted_key):
+        requested_keys.append(encrypted_key)
+        threads.add(threading.current_thread().name)
+        return "FAILED" if encrypted_key == "EE" else encrypted_key[::-1]
+
+    monkeypatch.setattr(task, "get_key_by_hsm", mock_get_key_by_hsm)
+    encrypted_keys = ["AB", "CD", "AB", "EE", "CD", "12"]
+
+    clear_keys = task.get_keys_by_hsm(encrypted_keys)
+    requested_on_first_run = sorted(requested_keys)
+    requested_keys.clear()
+    rerun_clear_keys = task.get_keys_by_hsm(encrypted_keys)
+
+    assert clear_keys == {"AB": "BA", "CD": "DC", "EE": "FAILED", "12": "21"}
+    assert requested_on_first_run == ["12", "AB", "CD", "EE"]
+    assert all(thread.startswith("hsm") for thread in threads)
+    # The failed key is not cached and decrypted again
+    assert rerun_clear_keys == clear_keys
+    assert requested_keys == ["EE"]
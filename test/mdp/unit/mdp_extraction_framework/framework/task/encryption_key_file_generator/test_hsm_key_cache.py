@@ -0,0 +1,85 @@
+"""Test hsm_key_cache."""
+# import: standard
+import json
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_key_cache import (
+    DEFAULT_HSM_KEY_CACHE_TTL_HOURS,
+)
+from mdp.framework.mdp_extraction_framework.task.encryption_key_file_generator.hsm_key_cache import (
+    HSMKeyCache,
+)
+
+# import: external
+import pytest
+
+ENCRYPTED_KEY = "6CC8292E42624659A51ABAF1148EDDCB"
+CLEAR_KEY = "20240207125139000000000000000000"
+SECRET = "cache-secret"
+
+
+def test_hsm_key_cache(tmp_path):
+    """Test a key is cached across instances by DPK, without the keys in the cache file."""
+    cache_path = str(tmp_path / "cache" / "hsm_keys.json")
+    key_cache = HSMKeyCache(cache_path, SECRET)
+    key_cache.put(ENCRYPTED_KEY, "DPK1", CLEAR_KEY)
+    key_cache.save()
+
+    reloaded_cache = HSMKeyCache(cache_path, SECRET)
+    content = (tmp_path / "cache" / "hsm_keys.json").read_text()
+
+    assert reloaded_cache.get(ENCRYPTED_KEY, "DPK1") == CLEAR_KEY
+    assert reloaded_cache.get(ENCRYPTED_KEY, "DPK2") is None
+    assert HSMKeyCache(cache_path, "other-secret").get(ENCRYPTED_KEY, "DPK1") is None
+    assert ENCRYPTED_KEY not in content and CLEAR_KEY not in content
+    assert (tmp_path / "cache" / "hsm_keys.json").stat().st_mode & 0o077 == 0
+
+
+def test_hsm_key_cache_expiry_and_tampering(tmp_path):
+    """Test expired and tampered entries are not returned."""
+    cache_path = str(tmp_path / "hsm_keys.json")
+    key_cache = HSMKeyCache(cache_path, SECRET)
+    key_cache.put(ENCRYPTED_KEY, "DPK1", CLEAR_KEY)
+    key_cache.put("OTHER", "DPK1", CLEAR_KEY)
+    key_cache.save()
+    entries = json.loads((tmp_path / "hsm_keys.json").read_text())
+    entry_id = key_cache.get_entry_id("OTHER", "DPK1")
+    entries[entry_id]["ciphertext"] = entries[key_cache.get_entry_id(ENCRYPTED_KEY, "DPK1")][
+        "ciphertext"
+    ][::-1]
+    (tmp_path / "hsm_keys.json").write_text(json.dumps(entries))
+
+    assert HSMKeyCache(cache_path, SECRET).get("OTHER", "DPK1") is None
+    assert HSMKeyCache(cache_path, SECRET, ttl_hours=0).get(ENCRYPTED_KEY, "DPK1") is None
+
+
+def test_hsm_key_cache_errors(tmp_path):
+    """Test a missing secret raises, and an unreadable cache file is ignored."""
+    (tmp_path / "hsm_keys.json").write_text("not json")
+
+    with pytest.raises(ValueError, match="HSM_KEY_CACHE_SECRET"):
+        HSMKeyCache(str(tmp_path / "hsm_keys.json"), None)
+    assert HSMKeyCache(str(tmp_path / "hsm_keys.json"), SECRET).entries == {}
+
+
+def test_hsm_key_cache_concurrent_save(tmp_path):
+    """Test caches loaded before each other's save keep the entries of both."""
+    cache_path = str(tmp_path / "hsm_keys.json")
+    first_cache = HSMKeyCache(cache_path, SECRET)
+    second_cache = HSMKeyCache(cache_path, SECRET)
+    first_cache.put(ENCRYPTED_KEY, "DPK1", CLEAR_KEY)
+    second_cache.put("OTHER", "DPK1", "OTHER_CLEAR_KEY")
+    first_cache.save()
+    second_cache.save()
+
+    reloaded_cache = HSMKeyCache(cache_path, SECRET)
+
+    assert reloaded_cache.get(ENCRYPTED_KEY, "DPK1") == CLEAR_KEY
+    assert reloaded_cache.get("OTHER", "DPK1") == "OTHER_CLEAR_KEY"
+
+
+def test_hsm_key_cache_default_ttl(tmp_path):
+    """Test a TTL of None falls back to the default TTL."""
+    key_cache = HSMKeyCache(str(tmp_path / "hsm_keys.json"), SECRET, ttl_hours=None)
+
+    assert key_cache.ttl_sec == DEFAULT_HSM_KEY_CACHE_TTL_HOURS * 3600
@@ -0,0 +1,99 @@
+"""Test decryption_pool."""
+# import: standard
+import os
+import threading
+import time
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.file_decryptor import decryption_pool
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.decryption_pool import (
+    DecryptionPool,
+)
+
+# import: external
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def mock_cpu_count(monkeypatch):
+    """Allow up to 4 concurrent decryptions whatever the CPUs of the test host."""
+    monkeypatch.setattr(decryption_pool.os, "cpu_count", lambda: 4)
+
+
+def get_output_path(file_path: str) -> str:
+    """Get the output file of an input file."""
+    return f"{file_path}.out"
+
+
+def copy_file(file_path: str) -> str:
+    """Write the output file of an input file, the smaller files first."""
+    time.sleep(0.01 * os.path.getsize(file_path))
+    with open(get_output_path(file_path), "wb") as file:
+        file.write(open(file_path, "rb").read())
+    return get_output_path(file_path)
+
+
+def test_max_workers_bounded_to_cpu_count():
+    """Test the concurrency is at least 1 and at most the CPU count."""
+    assert DecryptionPool(16).max_workers == 4
+    assert DecryptionPool(0).max_workers == 1
+    assert DecryptionPool(None).max_workers == 1
+
+
+@pytest.mark.parametrize("use_processes", [False, True], ids=["threads", "processes"])
+def test_run_keeps_input_order(tmp_path, use_processes):
+    """Test the results keep the order of the input files, not of completion."""
+    file_paths = []
+    for index, size in enumerate([8, 1, 4, 2]):
+        (tmp_path / f"file_{index}").write_bytes(b"x" * size)
+        file_paths.append(str(tmp_path / f"file_{index}"))
+
+    results = DecryptionPool(4, use_processes=use_processes).run(
+        copy_file, file_paths, get_output_path
+    )
+
+    assert results == [get_output_path(file_path) for file_path in file_paths]
+
+
+def test_run_concurrency_bounded(tmp_path):
+    """Test no more than `max_workers` files are decrypted at a time."""
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def decrypt_file(file_path: str) -> str:
+        with lock:
+            running.append(file_path)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(file_path)
+        return file_path
+
+    DecryptionPool(2).run(decrypt_file, [f"file_{index}" for index in range(6)], get_output_path)
+
+    assert max(peak) == 2
+
+
+@pytest.mark.parametrize("max_workers", [1, 2], ids=["sequential", "pool"])
+def test_run_stops_on_first_failure(tmp_path, max_workers):
+    """Test the first failure is raised, the remaining files are not started, and the
+    partial output of the failed file is removed."""
+    file_paths = [str(tmp_path / f"file_{index}") for index in range(8)]
+    started = []
+
+    def decrypt_file(file_path: str) -> str:
+        started.append(file_path)
+        with open(get_output_path(file_path), "w") as file:
+            file.write("partial")
+        if file_path == file_paths[1]:
+            raise ValueError(f"Cannot decrypt {file_path}")
+        time.sleep(0.05)
+        return get_output_path(file_path)
+
+    with pytest.raises(ValueError, match="file_1"):
+        DecryptionPool(max_workers).run(decrypt_file, file_paths, get_output_path)
+
+    assert not os.path.exists(get_output_path(file_paths[1]))
+    assert os.path.exists(get_output_path(file_paths[0]))
+    assert len(started) < len(file_paths)
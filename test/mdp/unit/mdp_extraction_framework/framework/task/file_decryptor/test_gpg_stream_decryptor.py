@@ -0,0 +1,144 @@
+"""Test gpg_stream_decryptor."""
+# import: standard
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.gpg_stream_decryptor import (
+    GpgStreamDecryptor,
+)
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.gpg_stream_decryptor import (
+    GpgStreamDecryptorError,
+)
+
+# import: external
+import pytest
+
+pytestmark = pytest.mark.skipif(shutil.which("gpg") is None, reason="gpg is not installed")
+
+PRIVATE_KEY_FILE = (
+    "test/mdp/unit/mdp_extraction_framework/resources/task/file_decryptor/private_key.asc"
+)
+ENCRYPTED_FILE = (
+    "test/mdp/unit/mdp_extraction_framework/resources/task/file_decryptor/encrypted_file.txt"
+)
+PASSPHRASE = "ABCDTEST"
+KEY_USER_ID = "framework@accenture.com"
+LARGE_FILE_MB = 96
+MAX_PEAK_RSS_MB = 48
+
+# Decrypt a file in a fresh interpreter and print the peak RSS of the interpreter, read
+# from VmHWM as ru_maxrss keeps the peak of the forked test process, and of the gpg
+# processes
+MEASURE_PEAK_RSS_SCRIPT = """
+import json
+import re
+import resource
+import sys
+from pathlib import Path
+
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.gpg_stream_decryptor import (
+    GpgStreamDecryptor,
+)
+
+with GpgStreamDecryptor(sys.argv[1], sys.argv[2]) as decryptor:
+    result = decryptor.decrypt_file(sys.argv[3], sys.argv[4])
+print(
+    json.dumps(
+        {
+            "self_kb": int(re.search(r"VmHWM:\\s+(\\d+)", Path("/proc/self/status").read_text())[1]),
+            "children_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+            "mb_per_sec": result.mb_per_sec,
+        }
+    )
+)
+"""
+
+
+def test_decrypt_file(tmp_path):
+    """Test a file is decrypted, and the keyring is removed on close."""
+    with GpgStreamDecryptor(PRIVATE_KEY_FILE, PASSPHRASE) as decryptor:
+        home_directory = decryptor.home_directory
+        result = decryptor.decrypt_file(ENCRYPTED_FILE, str(tmp_path / "decrypted.txt"))
+
+    assert result.bytes_written == os.path.getsize(tmp_path / "decrypted.txt")
+    assert (tmp_path / "decrypted.txt").read_bytes().startswith(b"H01|2023-01-17")
+    assert not os.path.exists(home_directory)
+
+
+def test_decrypt_file_failure_removes_output(tmp_path):
+    """Test a failed decryption raises and leaves no partial output."""
+    not_encrypted_file = tmp_path / "plain.txt"
+    not_encrypted_file.write_text("not encrypted")
+
+    with GpgStreamDecryptor(PRIVATE_KEY_FILE, PASSPHRASE) as decryptor:
+        with pytest.raises(GpgStreamDecryptorError):
+            decryptor.decrypt_file(str(not_encrypted_file), str(tmp_path / "decrypted.txt"))
+
+    assert not (tmp_path / "decrypted.txt").exists()
+
+
+def test_open_decrypted_stream(tmp_path):
+    """Test a file is decrypted to a stream, and a failed decryption raises once the stream
+    is read."""
+    not_encrypted_file = tmp_path / "plain.txt"
+    not_encrypted_file.write_text("not encrypted")
+
+    with GpgStreamDecryptor(PRIVATE_KEY_FILE, PASSPHRASE) as decryptor:
+        with decryptor.open_decrypted_stream(ENCRYPTED_FILE) as plaintext:
+            content = plaintext.read()
+        with pytest.raises(GpgStreamDecryptorError):
+            with decryptor.open_decrypted_stream(str(not_encrypted_file)) as plaintext:
+                plaintext.read()
+
+    assert content.startswith(b"H01|2023-01-17")
+    assert list(tmp_path.iterdir()) == [not_encrypted_file]
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="Linux only")
+def test_decrypt_large_file_peak_rss(tmp_path):
+    """Test the peak RSS of a large file decryption stays far below the file size."""
+    plain_file = tmp_path / "large.txt"
+    with open(plain_file, "wb") as file:
+        for _ in range(LARGE_FILE_MB):
+            file.write(os.urandom(1024 * 1024))
+    encrypted_file = tmp_path / "large.txt.gpg"
+    with GpgStreamDecryptor(PRIVATE_KEY_FILE, PASSPHRASE) as decryptor:
+        encryption = decryptor.run_gpg(
+            "--trust-model",
+            "always",
+            "--compress-algo",
+            "none",
+            "--recipient",
+            KEY_USER_ID,
+            "--output",
+            str(encrypted_file),
+            "--encrypt",
+            str(plain_file),
+        )
+    assert encryption.returncode == 0, encryption.stderr
+
+    measure = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            MEASURE_PEAK_RSS_SCRIPT,
+            PRIVATE_KEY_FILE,
+            PASSPHRASE,
+            str(encrypted_file),
+            str(tmp_path / "decrypted.txt"),
+        ],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": "src"},
+        check=True,
+    )
+    peak_rss = json.loads(measure.stdout.splitlines()[-1])
+
+    assert os.path.getsize(tmp_path / "decrypted.txt") == LARGE_FILE_MB * 1024 * 1024
+    assert peak_rss["self_kb"] < MAX_PEAK_RSS_MB * 1024
+    assert peak_rss["children_kb"] < MAX_PEAK_RSS_MB * 1024
+    assert peak_rss["mb_per_sec"] > 0
@@ -1,6 +1,7 @@
 """Test PGP File Decryptor."""
 # import: standard
 import os
+import shutil
 from datetime import datetime
 
 # import: internal
@@ -8,6 +9,10 @@ from mdp.framework.mdp_extraction_framework.config_validator.job_parameters impo
 from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
     DataFileInformation,
 )
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    generate_data_file_info,
+)
+from mdp.framework.mdp_extraction_framework.task.file_decryptor import decryption_pool
 from mdp.framework.mdp_extraction_framework.task.file_decryptor.pgp_file_decryptor import (
     PgpFileDecryptorFileError,
 )
@@ -222,3 +227,93 @@ def test_execute(mock_task):
     assert len(decrypted_files) == 1, "Decrypted files count mismatch"
     for decrypted_file_info in decrypted_files:
         assert os.path.exists(decrypted_file_info.file_location), "Decrypted file not found"
+
+
+@pytest.mark.skipif(shutil.which("gpg") is None, reason="gpg is not installed")
+def test_execute_gpg_backend(mock_task, tmp_path):
+    """Test the gpg backend writes the same decrypted bytes as the pgpy backend."""
+    encrypted_file = shutil.copy(ENCRYPTED_FILE, tmp_path / "encrypted_file.txt")
+    param = {
+        "source_system_name": "KS",
+        "source_file_location": str(encrypted_file),
+        "decrypt_backend": "gpg",
+    }
+    module_config = mock_model(
+        module_name=PgpFileDecryptorTask, parameters=PgpFileDecryptorTaskConfigModel(**param)
+    )
+    task = PgpFileDecryptorTask(module_config, JOB_PARAMS)
+
+    decrypted_files = task.execute()
+
+    assert [file_info.file_location for file_info in decrypted_files] == [
+        str(tmp_path / "encrypted_file_decrypted.txt")
+    ]
+    expected_message = mock_task.decrypt_pgp_message(
+        PGPMessage.from_file(ENCRYPTED_FILE), PRIVATE_KEY_FILE, "ABCDTEST"
+    )
+    assert (tmp_path / "encrypted_file_decrypted.txt").read_bytes() == expected_message.encode(
+        "utf-8"
+    )
+
+
+@pytest.mark.parametrize(
+    "decrypt_backend",
+    [
+        "pgpy",
+        pytest.param(
+            "gpg",
+            marks=pytest.mark.skipif(shutil.which("gpg") is None, reason="gpg is not installed"),
+        ),
+    ],
+)
+def test_execute_concurrent(tmp_path, monkeypatch, decrypt_backend):
+    """Test concurrent decryptions return the decrypted files in the input order."""
+    monkeypatch.setattr(decryption_pool.os, "cpu_count", lambda: 4)
+    encrypted_files = [
+        str(shutil.copy(ENCRYPTED_FILE, tmp_path / f"encrypted_{index}.txt")) for index in range(4)
+    ]
+    param = {
+        "source_system_name": "KS",
+        "decrypt_backend": decrypt_backend,
+        "max_concurrent_decryptions": 4,
+    }
+    module_config = mock_model(
+        module_name=PgpFileDecryptorTask, parameters=PgpFileDecryptorTaskConfigModel(**param)
+    )
+    task = PgpFileDecryptorTask(
+        module_config,
+        JOB_PARAMS,
+        [generate_data_file_info(encrypted_file) for encrypted_file in encrypted_files],
+    )
+
+    decrypted_files = task.execute()
+
+    assert [file_info.file_location for file_info in decrypted_files] == [
+        str(tmp_path / f"encrypted_{index}_decrypted.txt") for index in range(4)
+    ]
+    assert all(file_info.file_size > 0 for file_info in decrypted_files)
+
+
+def test_execute_concurrent_failure(tmp_path, monkeypatch):
+    """Test a file failing to decrypt fails the task and leaves no output of it."""
+    monkeypatch.setattr(decryption_pool.os, "cpu_count", lambda: 4)
+    encrypted_file = str(shutil.copy(ENCRYPTED_FILE, tmp_path / "encrypted_0.txt"))
+    not_encrypted_file = tmp_path / "encrypted_1.txt"
+    not_encrypted_file.write_text("not encrypted")
+    param = {"source_system_name": "KS", "max_concurrent_decryptions": 2}
+    module_config = mock_model(
+        module_name=PgpFileDecryptorTask, parameters=PgpFileDecryptorTaskConfigModel(**param)
+    )
+    task = PgpFileDecryptorTask(
+        module_config,
+        JOB_PARAMS,
+        [
+            generate_data_file_info(encrypted_file),
+            generate_data_file_info(str(not_encrypted_file)),
+        ],
+    )
+
+    with pytest.raises(PgpFileDecryptorFileError):
+        task.execute()
+
+    assert not (tmp_path / "encrypted_1_decrypted.txt").exists()
@@ -0,0 +1,99 @@
+"""Test pgp_key_cache."""
+# import: standard
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.file_decryptor import pgp_key_cache
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.pgp_key_cache import PGP_KEY_CACHE
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.pgp_key_cache import PgpKeyCache
+from mdp.framework.mdp_extraction_framework.task.file_decryptor.pgp_key_cache import (
+    register_worker_cleanup,
+)
+
+# import: external
+import pytest
+from pgpy import PGPMessage
+from pgpy.errors import PGPDecryptionError
+
+PRIVATE_KEY_FILE = (
+    "test/mdp/unit/mdp_extraction_framework/resources/task/file_decryptor/private_key.asc"
+)
+ENCRYPTED_FILE = (
+    "test/mdp/unit/mdp_extraction_framework/resources/task/file_decryptor/encrypted_file.txt"
+)
+PASSPHRASE = "ABCDTEST"
+
+
+@pytest.fixture
+def key_file(tmp_path):
+    """Copy the private key file to a temporary path."""
+    return str(shutil.copy(PRIVATE_KEY_FILE, tmp_path / "private_key.asc"))
+
+
+def test_get_unlocked_key_loads_once(key_file, monkeypatch):
+    """Test the key file is parsed and unlocked once, and the key decrypts messages."""
+    load_calls = []
+    from_file = pgp_key_cache.PGPKey.from_file
+
+    def count_from_file(key_path):
+        load_calls.append(key_path)
+        return from_file(key_path)
+
+    monkeypatch.setattr(pgp_key_cache.PGPKey, "from_file", count_from_file)
+
+    with PgpKeyCache() as cache:
+        key = cache.get_unlocked_key(key_file, PASSPHRASE)
+        assert cache.get_unlocked_key(key_file, PASSPHRASE) is key
+        assert key.is_unlocked
+        assert key.decrypt(PGPMessage.from_file(ENCRYPTED_FILE)).message
+
+    assert len(load_calls) == 1
+    assert not key.is_unlocked
+    assert cache.entries == {}
+
+
+def test_get_unlocked_key_reloads_replaced_key_file(key_file):
+    """Test a key file modified on disk is loaded again and its old key released."""
+    with PgpKeyCache() as cache:
+        key = cache.get_unlocked_key(key_file, PASSPHRASE)
+        modified_time = os.stat(key_file).st_mtime_ns + 1_000_000_000
+        os.utime(key_file, ns=(modified_time, modified_time))
+
+        reloaded_key = cache.get_unlocked_key(key_file, PASSPHRASE)
+
+        assert reloaded_key is not key
+        assert not key.is_unlocked
+        assert len(cache.entries) == 1
+
+
+def test_get_unlocked_key_wrong_passphrase(key_file):
+    """Test a cached key is not returned for a wrong passphrase."""
+    with PgpKeyCache() as cache:
+        cache.get_unlocked_key(key_file, PASSPHRASE)
+
+        with pytest.raises(PGPDecryptionError):
+            cache.get_unlocked_key(key_file, "WRONG")
+
+        assert len(cache.entries) == 1
+
+
+def load_key_in_worker(key_file: str, cleared_marker: str) -> bool:
+    """Unlock a key in the cache of a worker process, marking when its scope is closed."""
+    key = PGP_KEY_CACHE.get_unlocked_key(key_file, PASSPHRASE)
+    for cached_key in PGP_KEY_CACHE.entries.values():
+        cached_key.unlock_scope.callback(Path(cleared_marker).touch)
+    return key.is_unlocked
+
+
+def test_register_worker_cleanup(key_file, tmp_path):
+    """Test the cache of a pool worker process is cleared when the worker exits."""
+    cleared_marker = str(tmp_path / "cleared")
+
+    with ProcessPoolExecutor(max_workers=1, initializer=register_worker_cleanup) as executor:
+        assert executor.submit(load_key_in_worker, key_file, cleared_marker).result()
+        assert not os.path.exists(cleared_marker)
+
+    assert os.path.exists(cleared_marker)
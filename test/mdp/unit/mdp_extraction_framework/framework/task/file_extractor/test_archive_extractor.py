@@ -0,0 +1,187 @@
+"""Test archive_extractor and archive_file_extractor."""
+# import: standard
+import gzip
+import io
+import os
+import tarfile
+import zipfile
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.config_validator.job_parameters import JobParameters
+from mdp.framework.mdp_extraction_framework.task.file_extractor.archive_extractor import (
+    ArchiveExtractor,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.archive_extractor import (
+    ArchiveFormat,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.archive_extractor import (
+    UnsupportedArchiveFormatError,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.archive_extractor import (
+    detect_archive_format,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.archive_file_extractor import (
+    ArchiveFileExtractorTask,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.archive_file_extractor import (
+    ArchiveFileExtractorTaskConfigModel,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    ZipSlipError,
+)
+
+# import: external
+import pytest
+from pydantic import BaseModel
+
+JOB_PARAMS = JobParameters(
+    pos_dt="2023-10-31",
+    config_file_path="",
+)
+MEMBERS = {"a.csv": b"a,1\n" * 100, "dir/b.csv": b"b,2\n" * 200}
+
+
+class mock_model(BaseModel, extra="allow"):
+    """A mock pydantic model."""
+
+    pass
+
+
+def write_tar(file_object, members: dict) -> None:
+    """Write members, and a symbolic link, to a tar stream."""
+    with tarfile.open(fileobj=file_object, mode="w|") as tar_file:
+        for name, content in members.items():
+            member = tarfile.TarInfo(name)
+            member.size = len(content)
+            tar_file.addfile(member, io.BytesIO(content))
+        link = tarfile.TarInfo("link.csv")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "/etc/passwd"
+        tar_file.addfile(link)
+
+
+def create_archive(tmp_path, archive_format: str, members: dict = MEMBERS) -> str:
+    """Create an archive of a format, named without extension to rely on magic bytes."""
+    archive_path = str(tmp_path / f"drop_{archive_format.replace('.', '_')}")
+    if archive_format == "zip":
+        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for name, content in members.items():
+                zip_file.writestr(name, content)
+    elif archive_format == "tar":
+        with open(archive_path, "wb") as file:
+            write_tar(file, members)
+    elif archive_format == "tar.gz":
+        with gzip.open(archive_path, "wb") as file:
+            write_tar(file, members)
+    elif archive_format == "gz":
+        with gzip.open(archive_path, "wb") as file:
+            file.write(members["a.csv"])
+    elif archive_format in ("zst", "tar.zst"):
+        zstandard = pytest.importorskip("zstandard")
+        with open(archive_path, "wb") as file:
+            with zstandard.ZstdCompressor().stream_writer(file) as writer:
+                if archive_format == "zst":
+                    writer.write(members["a.csv"])
+                else:
+                    write_tar(writer, members)
+    return archive_path
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar", "tar.gz", "tar.zst"])
+def test_extract_multi_member_archive(tmp_path, archive_format):
+    """Test the format is detected from magic bytes and regular members extracted."""
+    archive_path = create_archive(tmp_path, archive_format)
+    destination = tmp_path / "output"
+    destination.mkdir()
+
+    file_infos = ArchiveExtractor().extract(archive_path, str(destination))
+
+    assert detect_archive_format(archive_path) == ArchiveFormat(archive_format)
+    assert [file_info.file_location for file_info in file_infos] == [
+        os.path.join(str(destination), name) for name in MEMBERS
+    ]
+    assert [file_info.file_size for file_info in file_infos] == [
+        len(content) for content in MEMBERS.values()
+    ]
+    assert (destination / "dir/b.csv").read_bytes() == MEMBERS["dir/b.csv"]
+    assert not (destination / "link.csv").exists()
+
+
+@pytest.mark.parametrize("archive_format", ["gz", "zst"])
+def test_extract_single_file_archive(tmp_path, archive_format):
+    """Test a compressed single file is extracted under the archive name."""
+    archive_path = create_archive(tmp_path, archive_format)
+    os.rename(archive_path, f"{archive_path}.csv.{archive_format}")
+
+    file_infos = ArchiveExtractor().extract(f"{archive_path}.csv.{archive_format}", tmp_path)
+
+    assert file_infos[0].file_location == f"{archive_path}.csv"
+    assert file_infos[0].file_size == len(MEMBERS["a.csv"])
+
+
+def test_iter_members_streams(tmp_path):
+    """Test members are handed as streams, without writing them to disk."""
+    archive_path = create_archive(tmp_path, "tar.gz")
+
+    contents = {
+        member.name: member.stream.read()
+        for member in ArchiveExtractor().iter_members(archive_path)
+    }
+
+    assert contents == MEMBERS
+    assert sorted(os.listdir(tmp_path)) == [os.path.basename(archive_path)]
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar", "tar.gz", "tar.zst", "gz"])
+def test_iter_stream_members(tmp_path, archive_format):
+    """Test members are read from a forward-only stream, the format detected from its
+    first bytes."""
+    archive_path = create_archive(tmp_path, archive_format)
+
+    with open(archive_path, "rb") as file:
+        contents = {
+            member.name: member.stream.read()
+            for member in ArchiveExtractor().iter_stream_members(file, "drop.csv.gz")
+        }
+
+    assert contents == ({"drop.csv": MEMBERS["a.csv"]} if archive_format == "gz" else MEMBERS)
+
+
+def test_extract_tar_slip(tmp_path):
+    """Test a tar member escaping the destination is rejected, and the members extracted
+    before it are removed."""
+    archive_path = create_archive(tmp_path, "tar.gz", {**MEMBERS, "../escape.csv": b"escape"})
+    destination = tmp_path / "output"
+    destination.mkdir()
+    (destination / "existing.csv").write_bytes(b"existing")
+
+    with pytest.raises(ZipSlipError):
+        ArchiveExtractor().extract(archive_path, destination)
+
+    assert not (tmp_path / "escape.csv").exists()
+    assert os.listdir(destination) == ["existing.csv"]
+
+
+def test_unsupported_format(tmp_path):
+    """Test a file of an unknown format is rejected."""
+    (tmp_path / "data.csv").write_text("a,b\n")
+
+    with pytest.raises(UnsupportedArchiveFormatError):
+        detect_archive_format(tmp_path / "data.csv")
+
+
+def test_archive_file_extractor_task(tmp_path):
+    """Test the task extracts a tar.gz archive into a fresh temporary directory."""
+    archive_path = create_archive(tmp_path, "tar.gz")
+    param = {"source_file_location": archive_path}
+    module_config = mock_model(
+        module_name=ArchiveFileExtractorTask,
+        parameters=ArchiveFileExtractorTaskConfigModel(**param),
+    )
+    task = ArchiveFileExtractorTask(module_config=module_config, job_parameters=JOB_PARAMS)
+
+    file_infos = task.execute()
+
+    assert [file_info.file_location for file_info in file_infos] == [
+        os.path.join(str(tmp_path), "_tmp_drop_tar_gz", name) for name in MEMBERS
+    ]
@@ -58,3 +58,14 @@ def test_make_tmp_dir(zip_file_extractor_task, tmp_path):
         tmp_folder_location == expected_tmp_folder_location
     ), "Temporary directory location mismatch."
     assert Path(tmp_folder_location).exists(), "Temporary directory was not created."
+
+
+def test_execute(zip_file_extractor_task, tmp_path):
+    """Tests the archive is extracted and its files described from the member table."""
+    file_infos = zip_file_extractor_task.execute()
+
+    assert [file_info.file_location for file_info in file_infos] == [
+        os.path.join(f"{tmp_path}", "_tmp_test", "testfile.txt")
+    ]
+    assert file_infos[0].file_size == len("This is a test file.")
+    assert Path(file_infos[0].file_location).read_text() == "This is a test file."
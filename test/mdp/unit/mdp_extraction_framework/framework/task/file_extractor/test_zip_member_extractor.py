@@ -0,0 +1,76 @@
+"""Test zip_member_extractor."""
+# import: standard
+import os
+import zipfile
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    ZipMemberExtractor,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    ZipSlipError,
+)
+
+# import: external
+import pytest
+
+
+def test_extract(tmp_path):
+    """Test members are extracted in member table order, directories created, sizes taken
+    from the member table, and the last of duplicate members kept."""
+    zip_file_path = tmp_path / "archive.zip"
+    with zipfile.ZipFile(zip_file_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr("dir/", "")
+        for index in range(200):
+            zip_file.writestr(f"dir/sub_{index % 3}/file_{index}.csv", f"row_{index}\n" * index)
+        zip_file.writestr("large.bin", os.urandom(3 * 1024 * 1024))
+        with pytest.warns(UserWarning, match="Duplicate name"):
+            zip_file.writestr("dir/sub_0/file_0.csv", "latest")
+    destination = tmp_path / "output"
+    destination.mkdir()
+
+    file_infos = ZipMemberExtractor(max_workers=4, chunk_size=64 * 1024).extract(
+        zip_file_path, str(destination)
+    )
+
+    assert len(file_infos) == 201
+    assert file_infos[0].file_location == os.path.join(str(destination), "dir/sub_1/file_1.csv")
+    assert file_infos[-1].file_location == os.path.join(str(destination), "dir/sub_0/file_0.csv")
+    assert (destination / "dir/sub_0/file_0.csv").read_text() == "latest"
+    for file_info in file_infos:
+        assert os.path.getsize(file_info.file_location) == file_info.file_size
+
+
+@pytest.mark.parametrize(
+    "member_name", ["../escape.csv", "/tmp/escape.csv", "dir/../../escape.csv", "C:/escape.csv"]
+)
+def test_extract_zip_slip(tmp_path, member_name):
+    """Test an archive with a member escaping the destination is rejected before any
+    member is extracted."""
+    zip_file_path = tmp_path / "archive.zip"
+    with zipfile.ZipFile(zip_file_path, "w") as zip_file:
+        zip_file.writestr("safe.csv", "safe")
+        zip_file.writestr(zipfile.ZipInfo(member_name), "escape")
+    destination = tmp_path / "output" / "nested"
+    destination.mkdir(parents=True)
+
+    with pytest.raises(ZipSlipError):
+        ZipMemberExtractor().extract(zip_file_path, destination)
+
+    assert list(destination.iterdir()) == []
+    assert not (tmp_path / "escape.csv").exists()
+    assert not (tmp_path / "output" / "escape.csv").exists()
+
+
+@pytest.mark.parametrize("size", [1024, 256 * 1024], ids=["small", "streamed"])
+def test_extract_corrupted_member(tmp_path, size):
+    """Test a member whose content does not match its CRC fails the extraction."""
+    zip_file_path = tmp_path / "archive.zip"
+    content = b"a" * size
+    with zipfile.ZipFile(zip_file_path, "w") as zip_file:
+        zip_file.writestr("data.bin", content)
+    archive = zip_file_path.read_bytes()
+    zip_file_path.write_bytes(archive.replace(content, b"b" + content[1:], 1))
+
+    with pytest.raises(zipfile.BadZipFile, match="CRC"):
+        ZipMemberExtractor(chunk_size=64 * 1024).extract(zip_file_path, tmp_path)
@@ -0,0 +1,114 @@
+"""Test zip_stream_reader."""
+# import: standard
+import io
+import os
+import zipfile
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_member_extractor import (
+    ZipSlipError,
+)
+from mdp.framework.mdp_extraction_framework.task.file_extractor.zip_stream_reader import (
+    iter_zip_stream_members,
+)
+
+# import: external
+import pytest
+
+
+class ShortReadStream:
+    """A forward-only stream returning at most 7 bytes per read, as a pipe may."""
+
+    def __init__(self, data: bytes) -> None:
+        """Initialize the stream over bytes."""
+        self.data = io.BytesIO(data)
+
+    def read(self, size: int = -1) -> bytes:
+        """Read at most 7 bytes."""
+        return self.data.read(7 if size < 0 or size > 7 else size)
+
+
+class UnseekableWriter:
+    """A write-only stream, for zipfile to write data descriptors as to a pipe."""
+
+    def __init__(self) -> None:
+        """Initialize the stream."""
+        self.data = io.BytesIO()
+
+    def write(self, data: bytes) -> int:
+        """Write bytes."""
+        return self.data.write(data)
+
+    def flush(self) -> None:
+        """Flush nothing."""
+
+
+def build_zip(members: dict, seekable: bool = True) -> bytes:
+    """Build a zip archive of stored and deflated members."""
+    target = io.BytesIO() if seekable else UnseekableWriter()
+    with zipfile.ZipFile(target, "w") as zip_file:
+        for name, (data, compress_type) in members.items():
+            zip_file.writestr(name, data, compress_type=compress_type)
+    return target.getvalue() if seekable else target.data.getvalue()
+
+
+@pytest.mark.parametrize("seekable", [True, False], ids=["local_sizes", "data_descriptor"])
+def test_iter_zip_stream_members(seekable):
+    """Test stored and deflated members are read in archive order from a forward-only
+    stream, with sizes from the local header or the data descriptor."""
+    large_data = os.urandom(200000) + b"a" * 300000
+    archive = build_zip(
+        {
+            "dir/": (b"", zipfile.ZIP_STORED),
+            "dir/large.bin": (large_data, zipfile.ZIP_DEFLATED),
+            "small.txt": (b"small", zipfile.ZIP_DEFLATED),
+            "stored.txt": (b"stored", zipfile.ZIP_STORED if seekable else zipfile.ZIP_DEFLATED),
+        },
+        seekable=seekable,
+    )
+
+    members = [
+        (relative_path, file_size, member.read(1000) + member.read())
+        for relative_path, file_size, member in iter_zip_stream_members(
+            ShortReadStream(archive), chunk_size=4096
+        )
+    ]
+
+    assert [(relative_path, content) for relative_path, _, content in members] == [
+        ("dir/large.bin", large_data),
+        ("small.txt", b"small"),
+        ("stored.txt", b"stored"),
+    ]
+    assert [file_size for _, file_size, _ in members] == (
+        [len(large_data), 5, 6] if seekable else [None, None, None]
+    )
+
+
+def test_iter_zip_stream_members_skips_unread_content():
+    """Test a member left unread is skipped to reach the next member."""
+    archive = build_zip(
+        {"a.txt": (b"a" * 10000, zipfile.ZIP_DEFLATED), "b.txt": (b"b", zipfile.ZIP_STORED)},
+        seekable=False,
+    )
+
+    names = [relative_path for relative_path, _, _ in iter_zip_stream_members(io.BytesIO(archive))]
+
+    assert names == ["a.txt", "b.txt"]
+
+
+def test_iter_zip_stream_members_bad_crc():
+    """Test a corrupted member fails its CRC check."""
+    archive = bytearray(build_zip({"a.txt": (b"abcdef", zipfile.ZIP_STORED)}))
+    archive[archive.index(b"abcdef")] = ord("x")
+
+    with pytest.raises(zipfile.BadZipFile, match="CRC"):
+        for _, _, member in iter_zip_stream_members(io.BytesIO(bytes(archive))):
+            member.read()
+
+
+def test_iter_zip_stream_members_zip_slip():
+    """Test a member escaping the extraction directory is rejected."""
+    archive = build_zip({"../evil.txt": (b"evil", zipfile.ZIP_STORED)})
+
+    with pytest.raises(ZipSlipError):
+        list(iter_zip_stream_members(io.BytesIO(archive)))
@@ -0,0 +1,107 @@
+"""Test file_completeness."""
+# import: standard
+import os
+import sys
+import threading
+import time
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.utility.common.file_completeness import (
+    FileCompletenessTimeoutError,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.file_completeness import (
+    FileCompletenessWatcher,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.file_completeness import (
+    find_files_open_for_writing,
+)
+
+# import: external
+import pytest
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only")
+
+
+def write_slowly(file_path: str, chunk_count: int, interval_sec: float) -> threading.Thread:
+    """Open a file for writing and append chunks to it in a thread, closing it at the end.
+
+    Returns the started thread, once the file is open.
+    """
+    opened = threading.Event()
+
+    def write() -> None:
+        with open(file_path, "ab") as file:
+            opened.set()
+            for _ in range(chunk_count):
+                time.sleep(interval_sec)
+                file.write(b"x" * 1024)
+                file.flush()
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    opened.wait()
+    return thread
+
+
+@linux_only
+def test_find_files_open_for_writing(tmp_path):
+    """Test only the files open for writing are found."""
+    (tmp_path / "read.csv").write_text("a")
+    (tmp_path / "write.csv").write_text("a")
+
+    with open(tmp_path / "read.csv"), open(tmp_path / "write.csv", "a"):
+        open_for_writing = find_files_open_for_writing(
+            [str(tmp_path / "read.csv"), str(tmp_path / "write.csv")]
+        )
+
+    assert open_for_writing == {str(tmp_path / "write.csv")}
+
+
+@linux_only
+def test_wait_close_write(tmp_path):
+    """Test a closed file is ready at once and a written file when its writer closes it."""
+    done_file = str(tmp_path / "done.csv")
+    written_file = str(tmp_path / "written.csv")
+    open(done_file, "w").close()
+    events = []
+    thread = write_slowly(written_file, chunk_count=4, interval_sec=0.1)
+
+    ready_events = FileCompletenessWatcher(timeout_sec=10, on_file_ready=events.append).wait(
+        [written_file, done_file]
+    )
+    thread.join()
+
+    assert [(event.file_path, event.reason) for event in events] == [
+        (done_file, "not_open"),
+        (written_file, "close_write"),
+    ]
+    assert [event.file_path for event in ready_events] == [written_file, done_file]
+    assert 0.3 <= ready_events[0].elapsed_sec < 3
+    assert os.path.getsize(written_file) == 4 * 1024
+
+
+@linux_only
+def test_wait_timeout(tmp_path):
+    """Test a file still open at the timeout raises, with a timeout event."""
+    file_path = str(tmp_path / "open.csv")
+    events = []
+
+    with open(file_path, "w"):
+        with pytest.raises(FileCompletenessTimeoutError, match="open.csv"):
+            FileCompletenessWatcher(timeout_sec=0.3, on_file_ready=events.append).wait([file_path])
+
+    assert [(event.ready, event.reason) for event in events] == [(False, "timeout")]
+
+
+def test_wait_stable_size(tmp_path):
+    """Test the fallback declares a file ready once its size stops changing."""
+    file_path = str(tmp_path / "written.csv")
+    thread = write_slowly(file_path, chunk_count=4, interval_sec=0.1)
+
+    ready_events = FileCompletenessWatcher(
+        timeout_sec=10, stable_interval_sec=0.3, poll_interval_sec=0.05, use_inotify=False
+    ).wait([file_path])
+    thread.join()
+
+    assert ready_events[0].reason == "stable_size"
+    assert ready_events[0].elapsed_sec >= 0.6
@@ -0,0 +1,162 @@
+"""Test OpenMetrics Exporter Module."""
+# import: standard
+import threading
+import urllib.request
+from datetime import datetime
+from datetime import timedelta
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    OPERATION_ATTEMPTS,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import OPERATION_RETRIES
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    create_metrics_server,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    escape_label_value,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    get_connection_name,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    read_metrics_textfiles,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    record_retry_attempt,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    render_run_metrics,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.metrics_exporter import (
+    write_metrics_textfile,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.task_metrics import TaskMetrics
+
+# import: external
+import pytest
+from tenacity import retry
+from tenacity import stop_after_attempt
+
+JOB_END_DATETIME = datetime(2024, 1, 1, 10, 0, 0)
+TASK_METRICS = [
+    TaskMetrics(
+        task_name="source_data_extractor_task",
+        task_status="SUCCESS",
+        wall_time_sec=1.5,
+        rows_processed=100,
+        bytes_written=2048,
+    ),
+    TaskMetrics(task_name="azcopy_data_transfer_task", task_status="FAILED", wall_time_sec=2.0),
+]
+
+
+@pytest.fixture(autouse=True)
+def reset_operation_counters():
+    """Reset the process-wide operation counters around each test."""
+    OPERATION_ATTEMPTS.clear()
+    OPERATION_RETRIES.clear()
+    yield
+    OPERATION_ATTEMPTS.clear()
+    OPERATION_RETRIES.clear()
+
+
+def render_mock_run(job_name: str = "test_job") -> str:
+    """Render the metrics of a mock failed run."""
+    return render_run_metrics(
+        job_name=job_name,
+        area_name="test_area",
+        connection_name="UD",
+        job_status="FAILED",
+        job_start_datetime=JOB_END_DATETIME - timedelta(seconds=4),
+        job_end_datetime=JOB_END_DATETIME,
+        task_metrics=TASK_METRICS,
+    )
+
+
+def test_record_retry_attempt():
+    """Test attempts and retries of a tenacity-decorated function are counted."""
+    calls = []
+
+    @retry(stop=stop_after_attempt(3), before=record_retry_attempt("mock_operation"))
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ValueError("mock error")
+
+    flaky()
+    assert OPERATION_ATTEMPTS["mock_operation"] == 3
+    assert OPERATION_RETRIES["mock_operation"] == 2
+
+
+def test_render_run_metrics():
+    """Test job, task and operation samples are rendered with their labels."""
+    OPERATION_ATTEMPTS["azcopy_transfer"] = 2
+    OPERATION_RETRIES["azcopy_transfer"] = 1
+    content = render_mock_run()
+    labels = 'job_name="test_job",area_name="test_area",connection_name="UD"'
+
+    assert f"mdp_extraction_job_duration_seconds{{{labels}}} 4.0" in content
+    assert f"mdp_extraction_job_success{{{labels}}} 0" in content
+    assert (
+        f'mdp_extraction_task_rows{{{labels},task_name="source_data_extractor_task"}} 100'
+        in content
+    )
+    assert (
+        f'mdp_extraction_task_success{{{labels},task_name="azcopy_data_transfer_task"}} 0'
+        in content
+    )
+    assert "task_rows" not in content.split("azcopy_data_transfer_task")[-1]
+    assert f'mdp_extraction_operation_retries{{{labels},operation="azcopy_transfer"}} 1' in content
+    assert content.count("# TYPE mdp_extraction_task_duration_seconds gauge") == 1
+    assert content.endswith("# EOF\n")
+
+
+def test_escape_label_value():
+    """Test label values are escaped following the OpenMetrics format."""
+    assert escape_label_value('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+    assert escape_label_value(None) == ""
+
+
+def test_get_connection_name():
+    """Test the connection name is read from the task parameters."""
+    config = {
+        "tasks": {
+            "azcopy_data_transfer_task": {"parameters": {}},
+            "source_data_extractor_task": {"parameters": {"connection_name": "UD"}},
+        }
+    }
+    assert get_connection_name(config) == "UD"
+    assert get_connection_name({"tasks": {}}) == ""
+
+
+def test_write_and_read_metrics_textfiles(tmp_path):
+    """Test textfiles are written atomically and merged into one exposition."""
+    write_metrics_textfile(tmp_path, "job_a", render_mock_run("job_a"))
+    write_metrics_textfile(tmp_path, "job_b", render_mock_run("job_b"))
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "mdp_extraction_job_a.prom",
+        "mdp_extraction_job_b.prom",
+    ]
+    content = read_metrics_textfiles(tmp_path)
+    assert content.count("# TYPE mdp_extraction_job_success gauge") == 1
+    assert 'job_name="job_a"' in content and 'job_name="job_b"' in content
+    assert content.count("# EOF") == 1
+
+
+def test_metrics_server(tmp_path):
+    """Test the local HTTP endpoint serves the metrics textfiles."""
+    write_metrics_textfile(tmp_path, "job_a", render_mock_run("job_a"))
+    server = create_metrics_server(directory=tmp_path, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            body = response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert 'mdp_extraction_job_success{job_name="job_a"' in body
@@ -0,0 +1,44 @@
+"""Test read_ahead_reader."""
+# import: standard
+import io
+import os
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.utility.common.read_ahead_reader import ReadAheadReader
+
+# import: external
+import pytest
+
+
+class FailingStream:
+    """A stream raising after its first read."""
+
+    def __init__(self) -> None:
+        """Initialize the stream."""
+        self.read_count = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """Return bytes once, then raise."""
+        self.read_count += 1
+        if self.read_count > 1:
+            raise OSError("source failed")
+        return b"abc"
+
+
+def test_read_ahead_reader():
+    """Test the source is read through in reads of any size, across chunks."""
+    data = os.urandom(100000)
+
+    with ReadAheadReader(io.BytesIO(data), chunk_size=4096, max_chunks=2) as reader:
+        content = reader.read(10) + reader.read(5000) + reader.read()
+
+        assert content == data
+        assert reader.read(10) == b""
+
+
+def test_read_ahead_reader_error():
+    """Test an error reading the source is raised to the consumer after the bytes read."""
+    with ReadAheadReader(FailingStream(), chunk_size=3) as reader:
+        assert reader.read(3) == b"abc"
+        with pytest.raises(OSError, match="source failed"):
+            reader.read(3)
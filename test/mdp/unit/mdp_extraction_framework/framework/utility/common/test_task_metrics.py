@@ -0,0 +1,89 @@
+"""Test Task Metrics Module."""
+# import: standard
+import json
+from datetime import datetime
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.task.data_extractor.base_extractor import (
+    DataFileInformation,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.task_metrics import TASK_METRICS_HEADER
+from mdp.framework.mdp_extraction_framework.utility.common.task_metrics import measure_task
+from mdp.framework.mdp_extraction_framework.utility.common.task_metrics import (
+    write_task_metrics_file,
+)
+
+# import: external
+import pytest
+
+FILE_INFOS = [
+    DataFileInformation(
+        file_location="part-0.csv",
+        file_size=1024 * 1024,
+        file_created_datetime=datetime.now(),
+        row_count=100,
+    ),
+    DataFileInformation(
+        file_location="part-1.csv",
+        file_size=1024 * 1024,
+        file_created_datetime=datetime.now(),
+        row_count=50,
+    ),
+]
+
+
+def test_measure_task_success():
+    """Test metrics are completed for a successful task run."""
+    with measure_task("file_decryptor_task", FILE_INFOS) as task_metrics:
+        sum(range(100000))
+        task_metrics.record_output(FILE_INFOS[:1])
+
+    assert task_metrics.task_status == "SUCCESS"
+    assert task_metrics.bytes_read == 2 * 1024 * 1024
+    assert task_metrics.bytes_written == 1024 * 1024
+    assert task_metrics.rows_processed == 100
+    assert task_metrics.wall_time_sec >= 0
+    assert task_metrics.end_datetime >= task_metrics.start_datetime
+    if task_metrics.wall_time_sec > 0:
+        assert task_metrics.mb_per_sec == round(2 / task_metrics.wall_time_sec, 3)
+
+
+def test_measure_task_failure():
+    """Test metrics are completed and marked FAILED when the task raises."""
+    with pytest.raises(ValueError):
+        with measure_task("source_data_extractor_task") as task_metrics:
+            raise ValueError("mock error")
+
+    assert task_metrics.task_status == "FAILED"
+    assert task_metrics.end_datetime is not None
+
+
+def test_record_output_ignores_non_file_infos():
+    """Test outputs other than a list of DataFileInformation are ignored."""
+    with measure_task("azcopy_data_transfer_task", FILE_INFOS) as task_metrics:
+        task_metrics.record_output("https://storage/container/path")
+
+    assert task_metrics.bytes_written == 0
+    assert task_metrics.rows_processed is None
+
+
+def test_to_summary_line():
+    """Test the summary line matches the summary header columns."""
+    with measure_task("file_extractor_task") as task_metrics:
+        pass
+
+    assert len(task_metrics.to_summary_line().split("|")) == len(TASK_METRICS_HEADER.split("|"))
+
+
+def test_write_task_metrics_file(tmp_path):
+    """Test writing job and task metrics as a JSON file."""
+    with measure_task("source_data_extractor_task") as task_metrics:
+        task_metrics.record_output(FILE_INFOS)
+
+    file_path = tmp_path / "metrics" / "extraction_metrics.json"
+    write_task_metrics_file(file_path, {"job_nm": "test_job"}, [task_metrics])
+
+    content = json.loads(file_path.read_text())
+    assert content["job_nm"] == "test_job"
+    assert content["tasks"][0]["task_name"] == "source_data_extractor_task"
+    assert content["tasks"][0]["rows_processed"] == 150
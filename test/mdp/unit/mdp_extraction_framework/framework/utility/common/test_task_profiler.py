@@ -0,0 +1,80 @@
+"""Test Task Profiler Module."""
+# import: standard
+import pstats
+import time
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.utility.common.task_profiler import SamplingProfiler
+from mdp.framework.mdp_extraction_framework.utility.common.task_profiler import (
+    get_profile_file_path,
+)
+from mdp.framework.mdp_extraction_framework.utility.common.task_profiler import profile_task
+
+# import: external
+import pytest
+
+
+def busy_loop(seconds: float) -> None:
+    """Burn CPU for the given number of seconds."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(1000))
+
+
+def test_sampling_profiler_collapsed_stacks(tmp_path):
+    """Test the sampling profiler records the stack of the profiled function."""
+    file_path = tmp_path / "profile.collapsed"
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    busy_loop(0.2)
+    profiler.stop()
+    profiler.write_collapsed(file_path)
+
+    lines = file_path.read_text().splitlines()
+    assert lines, "No stack was sampled"
+    busy_lines = [line for line in lines if "busy_loop (test_task_profiler.py" in line]
+    assert busy_lines, "The profiled function was not sampled"
+    stack, count = busy_lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert stack.startswith("MainThread;")
+
+
+def test_profile_task_cprofile(tmp_path):
+    """Test cProfile mode writes a pstats file readable by the pstats module."""
+    file_path = tmp_path / "profile" / "task.pstats"
+    with profile_task("cprofile", file_path):
+        busy_loop(0.05)
+
+    stats = pstats.Stats(str(file_path))
+    assert any(func[2] == "busy_loop" for func in stats.stats)
+
+
+def test_profile_task_sampling(tmp_path):
+    """Test sampling mode writes a collapsed-stack file."""
+    file_path = tmp_path / "task.collapsed"
+    with profile_task("sampling", file_path):
+        busy_loop(0.1)
+
+    assert file_path.exists()
+
+
+def test_profile_task_disabled(tmp_path):
+    """Test no profile is written when profiling is disabled."""
+    with profile_task(None, None):
+        busy_loop(0.01)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profile_task_unsupported_mode():
+    """Test an unsupported mode raises a ValueError."""
+    with pytest.raises(ValueError):
+        with profile_task("unknown", "profile.out"):
+            pass
+
+
+def test_get_profile_file_path():
+    """Test the profile path is built next to the run log with the mode extension."""
+    file_path = get_profile_file_path("sampling", "file_extractor_task", "test_job", "2024-01-01")
+    assert file_path.name.startswith("extraction_profile_file_extractor_task_test_job_20240101_")
+    assert file_path.suffix == ".collapsed"
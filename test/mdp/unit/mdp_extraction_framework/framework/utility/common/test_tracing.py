@@ -0,0 +1,130 @@
+"""Test Tracing Module."""
+# import: standard
+import json
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import TRACER
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import SpanKind
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import TracedThreadPoolExecutor
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import Tracer
+from mdp.framework.mdp_extraction_framework.utility.common.tracing import traced_operation
+from mdp.framework.mdp_extraction_framework.utility.shell_script.common import get_command_label
+from mdp.framework.mdp_extraction_framework.utility.shell_script.common import run_command
+
+# import: external
+import pytest
+
+
+@pytest.fixture
+def tracer():
+    """Enable the process-wide tracer for a test."""
+    TRACER.start()
+    yield TRACER
+    TRACER.stop()
+
+
+def test_tracer_disabled():
+    """Test spans are yielded but not recorded while tracing is disabled."""
+    tracer = Tracer()
+    with tracer.span("mock_task", SpanKind.TASK.value, rows=1) as span:
+        span.set_attribute("bytes_read", 10)
+
+    assert span.attributes == {"rows": 1, "bytes_read": 10}
+    assert tracer.spans == []
+
+
+def test_tracer_nested_spans():
+    """Test spans are nested following the enclosing span and errors are recorded."""
+    tracer = Tracer()
+    tracer.start()
+    with tracer.span("mock_job", SpanKind.JOB.value) as job_span:
+        with tracer.span("mock_task", SpanKind.TASK.value) as task_span:
+            with pytest.raises(ValueError):
+                with tracer.span("mock_operation") as operation_span:
+                    raise ValueError("mock error")
+        assert tracer.current_span is job_span
+
+    assert [span.name for span in tracer.spans] == ["mock_operation", "mock_task", "mock_job"]
+    assert job_span.parent_id is None
+    assert task_span.parent_id == job_span.span_id
+    assert operation_span.parent_id == task_span.span_id
+    assert operation_span.status == "ERROR"
+    assert operation_span.attributes["error"] == "ValueError"
+    assert {span.trace_id for span in tracer.spans} == {tracer.trace_id}
+    assert job_span.start_time_ns <= task_span.start_time_ns
+    assert job_span.end_time_ns >= task_span.end_time_ns
+
+
+def test_traced_thread_pool_executor():
+    """Test spans opened in pool threads are children of the span open at submission."""
+    tracer = Tracer()
+    tracer.start()
+
+    def run_operation(index):
+        with tracer.span(f"mock_operation_{index}") as span:
+            return span
+
+    with tracer.span("mock_task", SpanKind.TASK.value) as task_span:
+        with TracedThreadPoolExecutor(max_workers=2) as executor:
+            operation_spans = list(executor.map(run_operation, range(4)))
+
+    assert {span.parent_id for span in operation_spans} == {task_span.span_id}
+    assert tracer.current_span is None
+
+
+def test_run_command_subprocess_span(tracer):
+    """Test 'run_command' records a subprocess span with its exit code and output
+    size."""
+
+    @traced_operation("mock_operation")
+    def run_echo():
+        return run_command("echo test_command")
+
+    run_echo()
+
+    subprocess_span, operation_span = tracer.spans
+    assert subprocess_span.kind == SpanKind.SUBPROCESS.value
+    assert subprocess_span.parent_id == operation_span.span_id
+    assert subprocess_span.attributes == {
+        "command": "echo test_command",
+        "exit_code": 0,
+        "stdout_bytes": len("test_command"),
+        "stderr_bytes": 0,
+    }
+
+
+@pytest.mark.parametrize(
+    "command, expected_label",
+    [
+        ("azcopy cp 'src' 'https://dst?sig=secret'", "azcopy cp"),
+        ("/usr/bin/gpg --batch --passphrase secret", "gpg"),
+        ("/app/script.sh JOB 2024-01-01", "script.sh JOB"),
+        ("", ""),
+    ],
+)
+def test_get_command_label(command, expected_label):
+    """Test the command label leaves out arguments that may carry credentials."""
+    assert get_command_label(command) == expected_label
+
+
+def test_tracer_export(tmp_path, tracer):
+    """Test spans are exported as JSON lines and in the Chrome trace event format."""
+    with tracer.span("mock_job", SpanKind.JOB.value):
+        with tracer.span("mock_task", SpanKind.TASK.value, rows=5):
+            pass
+
+    tracer.export(tmp_path / "trace.jsonl", "jsonl")
+    spans = [json.loads(line) for line in (tmp_path / "trace.jsonl").read_text().splitlines()]
+    assert [span["name"] for span in spans] == ["mock_job", "mock_task"]
+    assert spans[1]["attributes"] == {"rows": 5}
+    assert spans[1]["duration_ms"] >= 0
+
+    tracer.export(tmp_path / "trace.json", "chrome")
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert [event["ph"] for event in events] == ["X", "X"]
+    assert events[1]["cat"] == "task"
+    assert events[1]["args"]["rows"] == 5
+    assert events[1]["args"]["parent_id"] == spans[0]["span_id"]
+
+    with pytest.raises(ValueError):
+        tracer.export(tmp_path / "trace.txt", "txt")
@@ -0,0 +1,64 @@
+"""template_service tests."""
+# import: standard
+import os
+
+# import: internal
+from mdp.framework.mdp_extraction_framework.utility.file_reader.config_reader import render_template
+from mdp.framework.mdp_extraction_framework.utility.file_reader.template_service import (
+    get_compiled_template,
+)
+from mdp.framework.mdp_extraction_framework.utility.file_reader.template_service import (
+    get_env_settings,
+)
+from mdp.framework.mdp_extraction_framework.utility.file_reader.template_service import (
+    get_jinja_environment,
+)
+from mdp.framework.mdp_extraction_framework.utility.file_reader.template_service import (
+    invalidate_env_settings,
+)
+
+# import: external
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def setup_environment_variables():
+    """Setup environment variable to override the '.env' file for unit testing."""
+    os.environ["LOCAL_STORAGE__filepath"] = "test_local/filepath"
+    invalidate_env_settings()
+    yield
+    os.environ["LOCAL_STORAGE__filepath"] = "test_local/filepath"
+    invalidate_env_settings()
+
+
+def test_get_jinja_environment_is_shared():
+    """Test the Jinja2 environment is created once per undefined policy."""
+    assert get_jinja_environment(True) is get_jinja_environment(True)
+    assert get_jinja_environment(True) is not get_jinja_environment(False)
+
+
+def test_get_compiled_template_is_cached():
+    """Test the same template source is compiled only once."""
+    content = "{{ base_file_name }}_{{ part_number }}"
+    assert get_compiled_template(content, True) is get_compiled_template(content, True)
+    assert get_compiled_template(content, True) is not get_compiled_template(content, False)
+
+
+def test_render_template_per_part():
+    """Test rendering a cached template with a different mapping for each part."""
+    content = "file_part-{{ part_number }}"
+    rendered = [render_template(content=content, mapping={"part_number": i}) for i in range(3)]
+    assert rendered == ["file_part-0", "file_part-1", "file_part-2"]
+
+
+def test_invalidate_env_settings():
+    """Test the memoised EnvSettings snapshot is reused until explicitly invalidated."""
+    content = "{{ local_storage.filepath }}"
+    assert get_env_settings() is get_env_settings()
+    assert render_template(content=content, mapping={}) == "test_local/filepath"
+
+    os.environ["LOCAL_STORAGE__filepath"] = "changed/filepath"
+    assert render_template(content=content, mapping={}) == "test_local/filepath"
+
+    invalidate_env_settings()
+    assert render_template(content=content, mapping={}) == "changed/filepath"
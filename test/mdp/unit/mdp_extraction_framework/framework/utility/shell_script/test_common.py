@@ -1,7 +1,14 @@
 """config_reader tests."""
 
+# import: standard
+import io
+import time
+
 # import: internal
+from mdp.framework.mdp_extraction_framework.utility.shell_script.common import STALLED_EXIT_CODE
+from mdp.framework.mdp_extraction_framework.utility.shell_script.common import pipe_to_command
 from mdp.framework.mdp_extraction_framework.utility.shell_script.common import run_command
+from mdp.framework.mdp_extraction_framework.utility.shell_script.common import stream_command
 
 # import: external
 import pytest
@@ -38,3 +45,50 @@ def test_run_command(command, expected_exit_code, expected_output, expected_erro
     else:
         # Checking if the error is not an empty-string, the error message can be different based on the OS
         assert command_result.error != "", "The return error should not be None or empty-string ''"
+
+
+def test_stream_command_bounded_output():
+    """Test 'stream_command' hands every line to the callback and keeps the last lines."""
+    lines = []
+
+    command_result = stream_command(
+        "seq 1 50", on_line=lambda line: lines.append(line) or True, max_output_lines=3
+    )
+
+    assert command_result.exit_code == 0
+    assert lines == [str(number) for number in range(1, 51)]
+    assert command_result.output == "48\n49\n50"
+
+
+def test_stream_command_stall_timeout():
+    """Test 'stream_command' kills a command whose lines show no progress."""
+    start_time = time.monotonic()
+
+    command_result = stream_command(
+        "sh -c 'while true; do echo waiting; sleep 0.1; done'",
+        on_line=lambda line: False,
+        stall_timeout_sec=1,
+    )
+
+    assert command_result.exit_code == STALLED_EXIT_CODE
+    assert "no progress" in command_result.error
+    assert time.monotonic() - start_time < 10
+
+
+def test_pipe_to_command(tmp_path):
+    """Test 'pipe_to_command' writes the whole stream to the command's stdin, and stops
+    writing when the command exits early."""
+    data = b"x" * (3 * 1024 * 1024 + 7)
+
+    command_result = pipe_to_command(
+        f"sh -c 'cat > {tmp_path / 'out.bin'}; echo done'", io.BytesIO(data), chunk_size=65536
+    )
+
+    assert command_result.exit_code == 0
+    assert command_result.output == "done"
+    assert (tmp_path / "out.bin").read_bytes() == data
+
+    command_result = pipe_to_command("sh -c 'echo failed >&2; exit 3'", io.BytesIO(data))
+
+    assert command_result.exit_code == 3
+    assert command_result.error == "failed"